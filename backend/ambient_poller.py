@@ -1,4 +1,8 @@
-"""Background task to poll Home Assistant for ambient readings."""
+"""Background task to poll Home Assistant for ambient readings.
+
+While the HA event stream is connected (ha_event_listener.py), the states
+read here come from its cache rather than a REST request per entity.
+"""
 
 import asyncio
 import logging
@@ -7,7 +7,11 @@ Works in both local and cloud modes:
 - Local mode: JWT optional, validated if provided (enables BrewSignal account login)
 """
 
+import asyncio
+import hashlib
 import logging
+import time
+from collections import OrderedDict
 from typing import Optional
 from fastapi import Request, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -22,6 +26,15 @@ logger = logging.getLogger(__name__)
 # Security scheme
 security = HTTPBearer(auto_error=False)
 
+# Verified tokens kept in memory so polling clients skip signature checks
+TOKEN_CACHE_SIZE = 1024
+# The JWKS is refreshed in the background on this interval; the client's own
+# cache lifespan is longer so requests never block on a refetch
+JWKS_REFRESH_SECONDS = 240
+JWKS_CACHE_LIFESPAN = 900
+
+_jwks_refresh_task: Optional[asyncio.Task] = None
+
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -47,7 +60,36 @@ def get_jwk_client() -> Optional[PyJWKClient]:
         return None
 
     jwks_url = f"{settings.supabase_url}/auth/v1/.well-known/jwks.json"
-    return PyJWKClient(jwks_url, cache_keys=True)
+    return PyJWKClient(jwks_url, cache_keys=True, lifespan=JWKS_CACHE_LIFESPAN)
+
+
+async def _refresh_jwks_forever():
+    while True:
+        jwk_client = get_jwk_client()
+        if jwk_client is None:
+            return
+        try:
+            # PyJWKClient fetches with urllib; keep it off the event loop
+            await asyncio.to_thread(jwk_client.get_jwk_set, True)
+            logger.debug("JWKS refreshed")
+        except Exception as e:
+            logger.warning("JWKS refresh failed: %s", e)
+        await asyncio.sleep(JWKS_REFRESH_SECONDS)
+
+
+def start_jwks_refresh():
+    """Prefetch the JWKS and keep it fresh in the background (no-op without SUPABASE_URL)."""
+    global _jwks_refresh_task
+    if get_jwk_client() is None or _jwks_refresh_task is not None:
+        return
+    _jwks_refresh_task = asyncio.create_task(_refresh_jwks_forever())
+
+
+def stop_jwks_refresh():
+    global _jwks_refresh_task
+    if _jwks_refresh_task is not None:
+        _jwks_refresh_task.cancel()
+        _jwks_refresh_task = None
 
 
 class AuthUser:
@@ -62,6 +104,53 @@ class AuthUser:
         return f"AuthUser(user_id={self.user_id}, email={self.email})"
 
 
+class VerifiedTokenCache:
+    """Bounded LRU of verified token -> AuthUser, honouring each token's exp.
+
+    Keys are SHA-256 digests so raw bearer tokens aren't held in memory.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[AuthUser, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[AuthUser]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            user, expires_at = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return user
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, token: str, user: AuthUser, expires_at: Optional[float]) -> None:
+        # Tokens without exp are verified every time rather than cached forever
+        if expires_at is None:
+            return
+        key = self._key(token)
+        self._entries[key] = (user, float(expires_at))
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+token_cache = VerifiedTokenCache()
+
+
 async def get_current_user(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
@@ -90,11 +179,15 @@ async def get_current_user(
 
     token = credentials.credentials
 
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         # Decode header to check algorithm
         unverified_header = jwt.get_unverified_header(token)
         alg = unverified_header.get("alg", "HS256")
-        logger.info(f"JWT algorithm: {alg}")
+        logger.debug(f"JWT algorithm: {alg}")
 
         if alg in ("RS256", "ES256"):
             # Use JWKS for RS256 or ES256 (asymmetric algorithms)
@@ -128,7 +221,9 @@ async def get_current_user(
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token: no user ID")
 
-        return AuthUser(user_id=user_id, email=email, role=role)
+        user = AuthUser(user_id=user_id, email=email, role=role)
+        token_cache.put(token, user, payload.get("exp"))
+        return user
 
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
@@ -177,12 +272,12 @@ def require_auth(user: Optional[AuthUser] = Depends(get_current_user)) -> AuthUs
 
     # If we got a valid user from JWT, return it
     if user:
-        logger.info(f"Authenticated user: {user.user_id[:8]}...")
+        logger.debug(f"Authenticated user: {user.user_id[:8]}...")
         return user
 
     # Anonymous access allowed - create a dummy user for backward compatibility
     if not settings.require_auth:
-        logger.info("Using fallback 'local' user - anonymous access allowed")
+        logger.debug("Using fallback 'local' user - anonymous access allowed")
         return AuthUser(user_id="local", email=None, role="local")
 
     # Cloud mode without user - should not reach here as get_current_user raises 401
@@ -7,11 +7,13 @@ Default: 30 days for normal readings.
 import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete
 
-from .database import async_session_factory
-from .models import Reading, serialize_datetime_to_utc
+from .database import async_session_factory, optimize_sqlite
+from .models import Reading
+from .services.storage_stats import get_storage_stats, invalidate_size, prune_counts
 
 logger = logging.getLogger(__name__)
 
@@ -24,48 +26,27 @@ async def cleanup_old_readings(retention_days: int = 30) -> int:
     cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
 
     async with async_session_factory() as session:
-        # Get count first for logging
-        count_result = await session.execute(
-            select(func.count()).select_from(Reading).where(Reading.timestamp < cutoff)
+        result = await session.execute(
+            delete(Reading).where(Reading.timestamp < cutoff)
         )
-        count = count_result.scalar() or 0
+        count = result.rowcount or 0
 
         if count > 0:
-            await session.execute(
-                delete(Reading).where(Reading.timestamp < cutoff)
-            )
-            await session.commit()
+            # The triggers already decremented the counters; drop the
+            # device/batch/day rows that reached zero
+            await prune_counts(session)
             logger.info("Deleted %d readings older than %d days", count, retention_days)
+        await session.commit()
 
-        return count
+    if count > 0:
+        invalidate_size()
+    return count
 
 
-async def get_reading_stats() -> dict:
-    """Get statistics about stored readings."""
+async def get_reading_stats(user_id: Optional[str] = None) -> dict:
+    """Get statistics about stored readings (see services.storage_stats)."""
     async with async_session_factory() as session:
-        # Total count
-        total_result = await session.execute(
-            select(func.count()).select_from(Reading)
-        )
-        total = total_result.scalar() or 0
-
-        # Oldest reading
-        oldest_result = await session.execute(
-            select(func.min(Reading.timestamp))
-        )
-        oldest = oldest_result.scalar()
-
-        # Newest reading
-        newest_result = await session.execute(
-            select(func.max(Reading.timestamp))
-        )
-        newest = newest_result.scalar()
-
-        return {
-            "total_readings": total,
-            "oldest_reading": serialize_datetime_to_utc(oldest) if oldest else None,
-            "newest_reading": serialize_datetime_to_utc(newest) if newest else None,
-        }
+        return await get_storage_stats(session, user_id=user_id)
 
 
 class CleanupService:
@@ -109,4 +90,9 @@ class CleanupService:
             except Exception as e:
                 logger.exception("Cleanup error: %s", e)
 
+            try:
+                await optimize_sqlite()
+            except Exception as e:
+                logger.warning("SQLite optimize/checkpoint failed: %s", e)
+
             await asyncio.sleep(self.interval_seconds)
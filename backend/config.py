@@ -13,7 +13,7 @@ import os
 from enum import Enum
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -63,6 +63,23 @@ class Settings(BaseSettings):
     # For cloud: should be postgresql+asyncpg://...
     database_url: Optional[str] = None
 
+    # PostgreSQL connection pooling
+    # "queue": keep a sized pool of warm connections (long-running servers)
+    # "null": open a fresh connection per checkout (serverless)
+    db_pool_mode: Literal["queue", "null"] = "queue"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 10.0  # seconds to wait for a free connection
+    db_pool_recycle: int = 300  # seconds; stay under the pooler's idle timeout
+
+    # SQLite storage profile (local mode), applied on every connection
+    # "performance": WAL journal, synchronous=NORMAL, larger cache and mmap
+    # "default": SQLite's own defaults (rollback journal, synchronous=FULL)
+    sqlite_profile: Literal["performance", "default"] = "performance"
+    sqlite_cache_mb: int = 32
+    sqlite_mmap_mb: int = 128
+    sqlite_busy_timeout_ms: int = 5000
+
     # Authentication (only used in cloud mode)
     auth_enabled: bool = False
     supabase_url: Optional[str] = None
@@ -1,23 +1,102 @@
+import asyncio
+import logging
 import ssl
+import time
+import uuid
+import weakref
+from collections import deque
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
 # Get database URL from config (supports SQLite for local, PostgreSQL for cloud)
 DATABASE_URL = settings.get_database_url()
 
+
+class PoolMetrics:
+    """Connection-acquire timings for the PostgreSQL pool.
+
+    Records how long each checkout waited for a connection (queue wait plus
+    any new TLS connect), keeping a window of recent samples for percentiles.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.acquired = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.acquired += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self._recent.append(seconds)
+
+    def snapshot(self) -> dict:
+        recent = sorted(self._recent)
+
+        def pct(p: float) -> Optional[float]:
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))] * 1000, 2)
+
+        return {
+            "acquired": self.acquired,
+            "mean_ms": round(self.total_seconds / self.acquired * 1000, 2) if self.acquired else None,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": round(self.max_seconds * 1000, 2),
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class _TimedPoolMixin:
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_metrics.record(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(_TimedPoolMixin, NullPool):
+    pass
+
+
 # Configure engine based on database type
 engine_kwargs = {"echo": False}
 
 # PostgreSQL needs connection pooling handled differently for async
 if DATABASE_URL.startswith("postgresql"):
-    # Use NullPool for serverless/cloud deployments to avoid connection issues
-    engine_kwargs["poolclass"] = NullPool
+    if settings.db_pool_mode == "null":
+        # Serverless deployments: no connections held between requests
+        engine_kwargs["poolclass"] = TimedNullPool
+    else:
+        # Long-running servers: reuse warm connections instead of paying a
+        # TLS handshake to the Supabase pooler on every request
+        engine_kwargs.update(
+            poolclass=TimedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=True,
+        )
     # asyncpg requires SSL via connect_args, not URL parameters
     # Create SSL context that doesn't verify certificates (Supabase uses self-signed)
     ssl_context = ssl.create_default_context()
@@ -25,14 +104,198 @@ if DATABASE_URL.startswith("postgresql"):
     ssl_context.verify_mode = ssl.CERT_NONE
     # Disable prepared statements for PgBouncer/Supabase pooler compatibility
     # Need BOTH cache settings per https://github.com/orgs/supabase/discussions/20775
+    # Unique statement names stop a pooled connection from colliding with
+    # statements another client left on the same PgBouncer backend.
     engine_kwargs["connect_args"] = {
         "ssl": ssl_context,
         "statement_cache_size": 0,
         "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
     }
 
 engine = create_async_engine(DATABASE_URL, **engine_kwargs)
-async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+
+# SQLite allows one writer at a time. Sessions created by the local session
+# factory take this lock from their first write until their transaction ends,
+# so concurrent writers (scanner handlers, HTTP ingest, pollers, cleanup, API
+# routes) queue in FIFO order instead of racing for the file lock and failing
+# with "database is locked". One lock per event loop; asyncio.Lock binds to
+# the loop it first waits on.
+_sqlite_write_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+_WRITE_SQL = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER")
+
+
+def sqlite_write_lock() -> asyncio.Lock:
+    """The process-wide SQLite write lock for the running event loop."""
+    loop = asyncio.get_running_loop()
+    lock = _sqlite_write_locks.get(loop)
+    if lock is None:
+        lock = _sqlite_write_locks[loop] = asyncio.Lock()
+    return lock
+
+
+def _is_write_statement(statement) -> bool:
+    if getattr(statement, "is_dml", False):
+        return True
+    if isinstance(statement, TextClause):
+        return statement.text.lstrip().upper().startswith(_WRITE_SQL)
+    return False
+
+
+class _WriteLockedSyncSession(Session):
+    """Sync half of SerializedWriteSession; releases the write lock when the
+    outermost transaction ends (commit, rollback or close, including
+    ``async with session.begin()`` blocks)."""
+
+
+@event.listens_for(_WriteLockedSyncSession, "after_transaction_end")
+def _release_write_lock(session, transaction):
+    if transaction.parent is None:
+        lock = session.info.pop("sqlite_write_lock", None)
+        if lock is not None:
+            lock.release()
+
+
+class SerializedWriteSession(AsyncSession):
+    """AsyncSession that holds the SQLite write lock from its first write.
+
+    A write is a DML statement, or any database round trip (query, get,
+    flush, commit) while the session has pending changes that autoflush
+    would send. Reads before the first write never wait. If the lock can't be
+    had within busy_timeout the session proceeds anyway and SQLite's own
+    busy handling applies, so a coroutine that nests two writing sessions
+    degrades instead of deadlocking.
+    """
+
+    sync_session_class = _WriteLockedSyncSession
+
+    async def _claim_write(self, statement=None) -> None:
+        info = self.sync_session.info
+        if "sqlite_write_lock" in info:
+            return
+        if not (_is_write_statement(statement) or self.new or self.dirty or self.deleted):
+            return
+        lock = sqlite_write_lock()
+        try:
+            await asyncio.wait_for(lock.acquire(), settings.sqlite_busy_timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            logger.warning("SQLite write lock not acquired within busy_timeout; writing unserialized")
+            return
+        info["sqlite_write_lock"] = lock
+
+    async def execute(self, statement, *args, **kwargs):
+        await self._claim_write(statement)
+        return await super().execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        await self._claim_write(statement)
+        return await super().scalar(statement, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        await self._claim_write()
+        return await super().get(*args, **kwargs)
+
+    async def refresh(self, *args, **kwargs):
+        await self._claim_write()
+        return await super().refresh(*args, **kwargs)
+
+    async def merge(self, *args, **kwargs):
+        await self._claim_write()
+        return await super().merge(*args, **kwargs)
+
+    async def flush(self, objects=None):
+        await self._claim_write()
+        return await super().flush(objects)
+
+    async def commit(self):
+        await self._claim_write()
+        return await super().commit()
+
+
+if DATABASE_URL.startswith("sqlite"):
+    async_session_factory = async_sessionmaker(
+        engine, class_=SerializedWriteSession, expire_on_commit=False
+    )
+else:
+    async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+
+def sqlite_pragmas() -> list[str]:
+    """PRAGMAs for the configured SQLite storage profile.
+
+    WAL lets chart/API reads proceed while ingest, pollers and the control
+    loop write; synchronous=NORMAL is durable across application crashes in
+    WAL mode and only risks the last transactions on power loss.
+    """
+    pragmas = [f"PRAGMA busy_timeout = {settings.sqlite_busy_timeout_ms}"]
+    if settings.sqlite_profile == "performance":
+        pragmas += [
+            "PRAGMA journal_mode = WAL",
+            "PRAGMA synchronous = NORMAL",
+            f"PRAGMA cache_size = -{settings.sqlite_cache_mb * 1024}",  # negative = KiB
+            f"PRAGMA mmap_size = {settings.sqlite_mmap_mb * 1024 * 1024}",
+            "PRAGMA temp_store = MEMORY",
+        ]
+    return pragmas
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in sqlite_pragmas():
+        cursor.execute(pragma)
+    cursor.close()
+
+
+if DATABASE_URL.startswith("sqlite"):
+    event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+
+async def optimize_sqlite() -> None:
+    """Periodic SQLite upkeep: refresh planner statistics and checkpoint the WAL.
+
+    TRUNCATE resets the -wal file to zero bytes so it doesn't grow without
+    bound between automatic checkpoints. No-op on PostgreSQL.
+    """
+    if not DATABASE_URL.startswith("sqlite"):
+        return
+    async with engine.connect() as conn:
+        await conn.execute(text("PRAGMA optimize"))
+        if settings.sqlite_profile == "performance":
+            await conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+
+async def warm_pool() -> int:
+    """Open the pool's base connections at startup so first requests don't pay for them.
+
+    Returns the number of connections opened (0 when not pooling).
+    """
+    if not isinstance(engine.pool, TimedQueuePool):
+        return 0
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    count = engine.pool.size()
+    # Hold all connections at once so the pool opens `count` distinct ones
+    await asyncio.gather(*(ping() for _ in range(count)))
+    return count
+
+
+def pool_status() -> dict:
+    """Pool occupancy and acquire timings, for diagnostics."""
+    pool = engine.pool
+    status = {"pool": type(pool).__name__, "acquire": pool_metrics.snapshot()}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    return status
 
 
 class Base(AsyncAttrs, DeclarativeBase):
@@ -492,6 +755,78 @@ async def _reconcile_postgres_columns():
             logger.info("Schema reconcile: added %d missing column(s)", added)
 
 
+MIGRATION_LEDGER_TABLE = "schema_migrations"
+
+
+class _PhaseTimer:
+    """Accumulates wall time per named startup phase."""
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def total(self) -> float:
+        return self._last - self._start
+
+    def summary(self) -> str:
+        return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.phases.items())
+
+
+async def _load_migration_ledger(conn) -> set[str]:
+    """Create the migration ledger if needed and return the applied ids."""
+    await conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {MIGRATION_LEDGER_TABLE} ("
+        "id TEXT PRIMARY KEY, applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    ))
+    result = await conn.execute(text(f"SELECT id FROM {MIGRATION_LEDGER_TABLE}"))
+    return set(result.scalars())
+
+
+def _migration_id(migration) -> str:
+    return migration.__name__.lstrip("_").removeprefix("migrate_")
+
+
+async def _record_migration(conn, ledger: set[str], migration_id: str) -> None:
+    await conn.execute(
+        text(f"INSERT INTO {MIGRATION_LEDGER_TABLE} (id) VALUES (:id)"),
+        {"id": migration_id},
+    )
+    ledger.add(migration_id)
+
+
+async def _apply_migration(conn, ledger: set[str], migration):
+    """Run a migration on ``conn`` unless the ledger has it; record it if run.
+
+    Sync migrations go through conn.run_sync, async ones are awaited with the
+    connection. The ledger row is written in the migration's own transaction.
+    """
+    migration_id = _migration_id(migration)
+    if migration_id in ledger:
+        return None
+    if asyncio.iscoroutinefunction(migration):
+        result = await migration(conn)
+    else:
+        result = await conn.run_sync(migration)
+    await _record_migration(conn, ledger, migration_id)
+    return result
+
+
+async def _apply_standalone_migration(ledger: set[str], migration, *args):
+    """Like _apply_migration, for migrations that manage their own transactions."""
+    migration_id = _migration_id(migration)
+    if migration_id in ledger:
+        return None
+    result = await migration(*args)
+    async with engine.begin() as conn:
+        await _record_migration(conn, ledger, migration_id)
+    return result
+
+
 async def init_db():
     """Initialize database with migrations.
 
@@ -537,60 +872,70 @@ async def init_db():
         # prerequisite and is complete.
         return
 
-    # Local mode: Run full SQLite migrations
+    # Local mode: Run full SQLite migrations. Each one is recorded in the
+    # migration ledger once applied, so a boot against a current schema reads
+    # the ledger once and skips them all.
+    timer = _PhaseTimer()
+    async with engine.begin() as conn:
+        ledger = await _load_migration_ledger(conn)
+    applied_before = len(ledger)
+    timer.mark("ledger")
+
     async with engine.begin() as conn:
         # Step 1: Schema migrations for existing DBs
-        await conn.run_sync(_migrate_add_original_gravity)
-        await conn.run_sync(_migrate_create_devices_table)
-        await conn.run_sync(_migrate_add_reading_columns)
-        await conn.run_sync(_migrate_readings_nullable_tilt_id)
-        await conn.run_sync(_migrate_add_ml_columns)
+        await _apply_migration(conn, ledger, _migrate_add_original_gravity)
+        await _apply_migration(conn, ledger, _migrate_create_devices_table)
+        await _apply_migration(conn, ledger, _migrate_add_reading_columns)
+        await _apply_migration(conn, ledger, _migrate_readings_nullable_tilt_id)
+        await _apply_migration(conn, ledger, _migrate_add_ml_columns)
 
         # BeerJSON support migration (must run before create_all)
         from backend.migrations.add_beerjson_support import migrate_add_beerjson_support
-        await migrate_add_beerjson_support(conn)
+        await _apply_migration(conn, ledger, migrate_add_beerjson_support)
 
+        timer.mark("migrations")
         # Step 2: Create any missing tables (includes new Style, Recipe, Batch, ChamberReading tables)
         await conn.run_sync(Base.metadata.create_all)
+        timer.mark("create_all")
 
         # Step 3: Migrations that depend on new tables existing
-        await conn.run_sync(_migrate_create_recipe_fermentables_table)  # Create recipe_fermentables table
-        await conn.run_sync(_migrate_create_recipe_hops_table)  # Create recipe_hops table
-        await conn.run_sync(_migrate_create_recipe_yeasts_table)  # Create recipe_yeasts table
-        await conn.run_sync(_migrate_create_recipe_miscs_table)  # Create recipe_miscs table
-        await conn.run_sync(_migrate_add_recipe_expanded_fields)  # Add expanded BeerXML fields to recipes
+        await _apply_migration(conn, ledger, _migrate_create_recipe_fermentables_table)  # Create recipe_fermentables table
+        await _apply_migration(conn, ledger, _migrate_create_recipe_hops_table)  # Create recipe_hops table
+        await _apply_migration(conn, ledger, _migrate_create_recipe_yeasts_table)  # Create recipe_yeasts table
+        await _apply_migration(conn, ledger, _migrate_create_recipe_miscs_table)  # Create recipe_miscs table
+        await _apply_migration(conn, ledger, _migrate_add_recipe_expanded_fields)  # Add expanded BeerXML fields to recipes
 
         # Enhance ingredient tables with BeerJSON timing support
         from backend.migrations.enhance_ingredient_tables import migrate_enhance_ingredient_tables
-        await migrate_enhance_ingredient_tables(conn)
+        await _apply_migration(conn, ledger, migrate_enhance_ingredient_tables)
 
         # Create water chemistry and procedure tables
         from backend.migrations.create_water_and_procedure_tables import migrate_create_water_and_procedure_tables
-        await migrate_create_water_and_procedure_tables(conn)
-
-        await conn.run_sync(_migrate_add_batch_id_to_readings)  # Add this line (after batches table exists)
-        await conn.run_sync(_migrate_add_batch_heater_columns)  # Add heater control columns to batches
-        await conn.run_sync(_migrate_add_batch_id_to_control_events)  # Add batch_id to control_events
-        await conn.run_sync(_migrate_add_paired_to_tilts_and_devices)  # Add paired field
-        await conn.run_sync(_migrate_add_deleted_at)  # Add soft delete support to batches
-        await conn.run_sync(_migrate_add_deleted_at_index)  # Add index on deleted_at column
-        await conn.run_sync(_migrate_create_yeast_strains_table)  # Create yeast strain reference table
-        await conn.run_sync(_migrate_add_yeast_strain_to_batches)  # Add yeast override to batches
-        await conn.run_sync(_migrate_add_batch_phase_timestamps)  # Add phase lifecycle timestamps
-        await conn.run_sync(_migrate_add_brew_day_observations)  # Add brew day observation columns
-        await conn.run_sync(_migrate_add_packaging_columns)  # Add packaging info columns
-        await conn.run_sync(_migrate_create_tasting_notes_table)  # Create tasting notes table
-        await conn.run_sync(_migrate_extend_tasting_notes)  # Extend tasting notes with context/AI fields
-        await conn.run_sync(_migrate_add_bjcp_scoring)  # Add BJCP 50-point subcategory scoring columns
-        await conn.run_sync(_migrate_add_batch_timer_columns)  # Add brew day timer state columns
+        await _apply_migration(conn, ledger, migrate_create_water_and_procedure_tables)
+
+        await _apply_migration(conn, ledger, _migrate_add_batch_id_to_readings)  # Add this line (after batches table exists)
+        await _apply_migration(conn, ledger, _migrate_add_batch_heater_columns)  # Add heater control columns to batches
+        await _apply_migration(conn, ledger, _migrate_add_batch_id_to_control_events)  # Add batch_id to control_events
+        await _apply_migration(conn, ledger, _migrate_add_paired_to_tilts_and_devices)  # Add paired field
+        await _apply_migration(conn, ledger, _migrate_add_deleted_at)  # Add soft delete support to batches
+        await _apply_migration(conn, ledger, _migrate_add_deleted_at_index)  # Add index on deleted_at column
+        await _apply_migration(conn, ledger, _migrate_create_yeast_strains_table)  # Create yeast strain reference table
+        await _apply_migration(conn, ledger, _migrate_add_yeast_strain_to_batches)  # Add yeast override to batches
+        await _apply_migration(conn, ledger, _migrate_add_batch_phase_timestamps)  # Add phase lifecycle timestamps
+        await _apply_migration(conn, ledger, _migrate_add_brew_day_observations)  # Add brew day observation columns
+        await _apply_migration(conn, ledger, _migrate_add_packaging_columns)  # Add packaging info columns
+        await _apply_migration(conn, ledger, _migrate_create_tasting_notes_table)  # Create tasting notes table
+        await _apply_migration(conn, ledger, _migrate_extend_tasting_notes)  # Extend tasting notes with context/AI fields
+        await _apply_migration(conn, ledger, _migrate_add_bjcp_scoring)  # Add BJCP 50-point subcategory scoring columns
+        await _apply_migration(conn, ledger, _migrate_add_batch_timer_columns)  # Add brew day timer state columns
 
         # Add readings_paused column to batches
         from backend.migrations.add_readings_paused import migrate_add_readings_paused
-        await migrate_add_readings_paused(conn)
+        await _apply_migration(conn, ledger, migrate_add_readings_paused)
 
         # Add target_* stat columns to recipes (imported brewer-declared values)
         from backend.migrations.add_recipe_target_stats import migrate_add_recipe_target_stats
-        await migrate_add_recipe_target_stats(conn)
+        await _apply_migration(conn, ledger, migrate_add_recipe_target_stats)
 
         # Retag pre-2.13.0 zero-minute boil hops as whirlpool (data hygiene
         # for recipes imported before the Whirlpool mapping fix in
@@ -598,54 +943,71 @@ async def init_db():
         from backend.migrations.backfill_zero_min_boil_to_whirlpool import (
             migrate_backfill_zero_min_boil_to_whirlpool,
         )
-        await migrate_backfill_zero_min_boil_to_whirlpool(conn)
+        await _apply_migration(conn, ledger, migrate_backfill_zero_min_boil_to_whirlpool)
 
         # Add user_id columns for multi-tenant support
-        await conn.run_sync(_migrate_add_user_id_columns)
+        await _apply_migration(conn, ledger, _migrate_add_user_id_columns)
 
         # Add user_id columns to inventory tables for multi-tenant support
-        await conn.run_sync(_migrate_add_inventory_user_id_columns)
+        await _apply_migration(conn, ledger, _migrate_add_inventory_user_id_columns)
 
     # Convert temperatures F→C (runs outside conn.begin() context since it has its own)
-    await _migrate_temps_fahrenheit_to_celsius(engine)
+    await _apply_standalone_migration(ledger, _migrate_temps_fahrenheit_to_celsius, engine)
 
     async with engine.begin() as conn:
         # Step 4: Data migrations
-        await conn.run_sync(_migrate_tilts_to_devices)
-        await conn.run_sync(_migrate_mark_outliers_invalid)  # Mark historical outliers
-        await conn.run_sync(_migrate_fix_temp_outlier_detection)  # Fix F→C temp check bug
-        await conn.run_sync(_migrate_tilts_to_devices_final)  # Final migration: drop tilts table
-        await conn.run_sync(_migrate_control_events_tilt_id_to_device_id)  # Migrate control_events to use device_id
+        await _apply_migration(conn, ledger, _migrate_tilts_to_devices)
+        await _apply_migration(conn, ledger, _migrate_mark_outliers_invalid)  # Mark historical outliers
+        await _apply_migration(conn, ledger, _migrate_fix_temp_outlier_detection)  # Fix F→C temp check bug
+        await _apply_migration(conn, ledger, _migrate_tilts_to_devices_final)  # Final migration: drop tilts table
+        await _apply_migration(conn, ledger, _migrate_control_events_tilt_id_to_device_id)  # Migrate control_events to use device_id
 
     # Add cooler support (runs outside conn.begin() context since it has its own)
-    await _migrate_add_cooler_entity()
+    await _apply_standalone_migration(ledger, _migrate_add_cooler_entity)
 
     # Populate recipe_cultures from recipe yeast fields (BeerJSON compliance)
-    await _migrate_populate_recipe_cultures(engine)
+    await _apply_standalone_migration(ledger, _migrate_populate_recipe_cultures, engine)
 
     # Migrate yeast_strains table for alcohol_tolerance type change (REAL -> TEXT)
     # Must run separately and then call create_all() again to recreate the table
     reseed_styles = False
     async with engine.begin() as conn:
-        await conn.run_sync(_migrate_yeast_strains_alcohol_tolerance)
+        await _apply_migration(conn, ledger, _migrate_yeast_strains_alcohol_tolerance)
         # Add comments column to styles for alias searching (NEIPA -> Hazy IPA)
-        reseed_styles = await conn.run_sync(_migrate_add_style_comments_column)
+        reseed_styles = bool(await _apply_migration(conn, ledger, _migrate_add_style_comments_column))
         # Add is_extract + amount_ml columns to recipe_hops and relax
         # alpha_acid_percent NOT NULL for Abstrax hop extracts (tilt_ui-0l5)
-        await conn.run_sync(_migrate_add_extract_columns)
+        await _apply_migration(conn, ledger, _migrate_add_extract_columns)
         # Add title_locked column to ag_ui_threads
-        await conn.run_sync(_migrate_add_ag_ui_thread_title_locked)
+        await _apply_migration(conn, ledger, _migrate_add_ag_ui_thread_title_locked)
         # Add user_id column to ag_ui_threads for multi-tenant isolation
-        await conn.run_sync(_migrate_add_ag_ui_thread_user_id)
+        await _apply_migration(conn, ledger, _migrate_add_ag_ui_thread_user_id)
         # Add tool_call_id column to ag_ui_messages for tool history persistence
-        await conn.run_sync(_migrate_add_tool_call_id_to_ag_ui_messages)
+        await _apply_migration(conn, ledger, _migrate_add_tool_call_id_to_ag_ui_messages)
         # Create inventory_deductions table for brew-day deduction tracking
-        await conn.run_sync(_migrate_create_inventory_deductions_table)
-        # Recreate the table with correct schema
-        await conn.run_sync(Base.metadata.create_all)
+        await _apply_migration(conn, ledger, _migrate_create_inventory_deductions_table)
+        # Add boot_id/last_seq to gateways for deduplicating retried ingest messages
+        await _apply_migration(conn, ledger, _migrate_add_gateway_ingest_seq)
+        # Recreate the table with correct schema (only needed when a
+        # migration above ran; the first create_all covered everything else)
+        if len(ledger) > applied_before:
+            await conn.run_sync(Base.metadata.create_all)
+        # Full-text index over assistant messages (after create_all so the
+        # ag_ui_messages table exists to backfill from)
+        await _apply_migration(conn, ledger, _migrate_create_ag_ui_messages_fts)
+        # Reading counters (after create_all so reading_stats exists)
+        await _apply_migration(conn, ledger, _migrate_create_reading_stats)
+
+    timer.mark("migrations")
 
     # Seed reference data
     await _seed_reference_data(force_reseed_styles=reseed_styles)
+    timer.mark("seed")
+
+    print(
+        f"Database init {timer.total():.2f}s ({timer.summary()}; "
+        f"{len(ledger) - applied_before} migrations applied)"
+    )
 
     # NOTE: recipe backfills (style_id, color_srm) run off the startup critical
     # path via run_deferred_backfills() — see init_db's cloud-mode branch and
@@ -688,6 +1050,11 @@ async def run_deferred_backfills():
             migrate_backfill_recipe_color_srm,
         )
         await migrate_backfill_recipe_color_srm(engine)
+
+        # Fermentation features for finished batches that predate them (or
+        # whose update failed); only batches without a row are computed.
+        from backend.services.batch_features import backfill_batch_features
+        await backfill_batch_features()
     except Exception:
         logger.exception(
             "Deferred recipe backfills failed; will retry on next boot"
@@ -2322,6 +2689,23 @@ def _migrate_add_tool_call_id_to_ag_ui_messages(conn):
         print("Migration: Added tool_call_id column to ag_ui_messages table")
 
 
+def _migrate_add_gateway_ingest_seq(conn):
+    """Add boot_id and last_seq columns to gateways for ingest deduplication."""
+    from sqlalchemy import inspect, text
+    inspector = inspect(conn)
+
+    if "gateways" not in inspector.get_table_names():
+        return  # Fresh install, create_all will handle it
+
+    columns = [c["name"] for c in inspector.get_columns("gateways")]
+    if "boot_id" not in columns:
+        conn.execute(text("ALTER TABLE gateways ADD COLUMN boot_id VARCHAR(64)"))
+        print("Migration: Added boot_id column to gateways table")
+    if "last_seq" not in columns:
+        conn.execute(text("ALTER TABLE gateways ADD COLUMN last_seq INTEGER"))
+        print("Migration: Added last_seq column to gateways table")
+
+
 def _migrate_create_inventory_deductions_table(conn):
     """Create inventory_deductions table for tracking brew-day inventory deductions."""
     from sqlalchemy import inspect, text
@@ -2347,6 +2731,53 @@ def _migrate_create_inventory_deductions_table(conn):
     print("Migration: Created inventory_deductions table")
 
 
+def _migrate_create_ag_ui_messages_fts(conn):
+    """Create the FTS5 index over ag_ui_messages and backfill existing messages.
+
+    Virtual tables aren't part of Base.metadata, so create_all never builds it.
+    See backend.services.thread_search for how the index is maintained.
+    """
+    from sqlalchemy import inspect, text
+    from sqlalchemy.exc import OperationalError
+    from backend.services.thread_search import FTS_TABLE, create_fts_table
+
+    inspector = inspect(conn)
+    if "ag_ui_messages" not in inspector.get_table_names():
+        return
+
+    try:
+        created = create_fts_table(conn)
+    except OperationalError as e:
+        # SQLite built without FTS5 - search_threads falls back to LIKE
+        print(f"Migration: Skipping {FTS_TABLE} - {e}")
+        return
+
+    if created:
+        result = conn.execute(text(f"""
+            INSERT INTO {FTS_TABLE}(rowid, content, thread_id)
+            SELECT id, content, thread_id FROM ag_ui_messages
+            WHERE content IS NOT NULL AND content != ''
+        """))
+        print(f"Migration: Created {FTS_TABLE} and indexed {result.rowcount} messages")
+
+
+def _migrate_create_reading_stats(conn):
+    """Install the reading counter triggers and seed counts from existing readings.
+
+    See backend.services.storage_stats for how the counters are maintained.
+    """
+    from sqlalchemy import inspect
+    from backend.services.storage_stats import create_sqlite_triggers, seed_counts
+
+    inspector = inspect(conn)
+    if "reading_stats" not in inspector.get_table_names():
+        return
+
+    if create_sqlite_triggers(conn):
+        total = seed_counts(conn)
+        print(f"Migration: Created reading_stats triggers and counted {total} readings")
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
         yield session
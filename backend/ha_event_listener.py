@@ -0,0 +1,111 @@
+"""Background task keeping the Home Assistant event stream connected.
+
+Reads the HA config, runs one HAEventStream (services/ha_events.py) for it
+and tells it which entities to watch: the ambient, chamber and weather
+entities plus the heaters and coolers of active batches. Config is re-read
+periodically, so enabling HA, changing its URL or token, or adding a batch
+heater takes effect without a restart.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import select
+
+from .database import async_session_factory
+from .models import Batch
+from .routers.config import get_config_value
+from .services.ha_events import HAEventStream, get_ha_event_stream, set_ha_event_stream
+
+logger = logging.getLogger(__name__)
+
+_listener_task: asyncio.Task | None = None
+_stream_task: asyncio.Task | None = None
+CONFIG_CHECK_SECONDS = 60
+
+ENTITY_CONFIG_KEYS = (
+    "ha_ambient_temp_entity_id",
+    "ha_ambient_humidity_entity_id",
+    "ha_chamber_temp_entity_id",
+    "ha_chamber_humidity_entity_id",
+    "ha_weather_entity_id",
+    "ha_heater_entity_id",
+)
+
+
+def _ha_entity(entity_id: Optional[str]) -> Optional[str]:
+    """Device-control entity ID -> HA entity ID (None for other backends)."""
+    if not entity_id:
+        return None
+    if entity_id.startswith("ha://"):
+        return entity_id[5:]
+    if "://" in entity_id:
+        return None  # e.g. shelly://
+    return entity_id
+
+
+async def configured_entities(db) -> set[str]:
+    """HA entities BrewSignal reads: configured sensors plus batch heaters/coolers."""
+    entities = {await get_config_value(db, key) for key in ENTITY_CONFIG_KEYS}
+    result = await db.execute(
+        select(Batch.heater_entity_id, Batch.cooler_entity_id).where(
+            Batch.deleted_at.is_(None),
+            Batch.status.in_(["planning", "fermenting", "conditioning"]),
+        )
+    )
+    for heater, cooler in result.all():
+        entities.update((_ha_entity(heater), _ha_entity(cooler)))
+    return {e for e in entities if e}
+
+
+def _stop_stream() -> None:
+    global _stream_task
+    if _stream_task and not _stream_task.done():
+        _stream_task.cancel()
+    _stream_task = None
+    set_ha_event_stream(None)
+
+
+async def listen_ha_events() -> None:
+    """Run the event stream for the configured HA instance, following config changes."""
+    global _stream_task
+    while True:
+        try:
+            async with async_session_factory() as db:
+                ha_enabled = await get_config_value(db, "ha_enabled")
+                ha_url = await get_config_value(db, "ha_url")
+                ha_token = await get_config_value(db, "ha_token")
+
+                if not ha_enabled or not ha_url or not ha_token:
+                    _stop_stream()
+                else:
+                    stream = get_ha_event_stream(ha_url)
+                    if stream is None or stream.token != ha_token:
+                        _stop_stream()
+                        stream = HAEventStream(ha_url, ha_token)
+                        set_ha_event_stream(stream)
+                        _stream_task = asyncio.create_task(stream.run())
+                        logger.info("HA event stream started for %s", stream.url)
+                    stream.watch(await configured_entities(db))
+        except Exception as e:
+            logger.error(f"HA event listener error: {e}")
+
+        await asyncio.sleep(CONFIG_CHECK_SECONDS)
+
+
+def start_ha_event_listener() -> None:
+    """Start the HA event listener background task."""
+    global _listener_task
+    if _listener_task is None or _listener_task.done():
+        _listener_task = asyncio.create_task(listen_ha_events())
+        logger.info("HA event listener started")
+
+
+def stop_ha_event_listener() -> None:
+    """Stop the HA event listener and its stream."""
+    global _listener_task
+    if _listener_task and not _listener_task.done():
+        _listener_task.cancel()
+        logger.info("HA event listener stopped")
+    _stop_stream()
@@ -9,32 +9,38 @@ from typing import Optional
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 # Imports after logging configuration
-from fastapi import Depends, FastAPI, WebSocket, WebSocketDisconnect  # noqa: E402
+from fastapi import Depends, FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect  # noqa: E402
 from fastapi.responses import FileResponse, StreamingResponse  # noqa: E402
 from fastapi.staticfiles import StaticFiles  # noqa: E402
-from sqlalchemy import select, desc  # noqa: E402
+from sqlalchemy import select  # noqa: E402
 from sqlalchemy.exc import IntegrityError  # noqa: E402
 
 from . import models  # noqa: E402, F401 - Import models so SQLAlchemy sees them
-from .database import async_session_factory, init_db, run_deferred_backfills  # noqa: E402
+from .database import async_session_factory, init_db, run_deferred_backfills, warm_pool  # noqa: E402
 from .models import Device, Reading, serialize_datetime_to_utc  # noqa: E402
 from .routers import ag_ui, alerts, ambient, assistant, batches, chamber, config, control, device_control, devices, fermentables, gateway, ha, hop_varieties, ingest, inventory_equipment, inventory_hops, inventory_yeast, learnings, maintenance, mqtt, recipes, reflections, sync, system, users, yeast_strains  # noqa: E402
-from .auth import require_auth  # noqa: E402
+from .auth import AuthUser, get_optional_user, require_auth, start_jwks_refresh, stop_jwks_refresh  # noqa: E402
 from .routers.config import get_config_value  # noqa: E402
 from .ambient_poller import start_ambient_poller, stop_ambient_poller  # noqa: E402
 from .chamber_poller import start_chamber_poller, stop_chamber_poller  # noqa: E402
+from .ha_event_listener import start_ha_event_listener, stop_ha_event_listener  # noqa: E402
 from .temp_controller import start_temp_controller, stop_temp_controller  # noqa: E402
 from .mqtt_manager import start_mqtt_manager, stop_mqtt_manager, publish_batch_reading  # noqa: E402
-from .cleanup import CleanupService  # noqa: E402
+from .cleanup import CleanupService, get_reading_stats  # noqa: E402
 from .scanner import RAPTPillReading, TiltReading, TiltScanner  # noqa: E402
 from .services.calibration import calibration_service  # noqa: E402
+from .services.reference_catalog import warm_reference_catalog  # noqa: E402
+from .services.importers.recipe_importer import shutdown_bulk_pool  # noqa: E402
+from .services.http_clients import close_http_clients  # noqa: E402
+from .services.memory import shutdown_memory  # noqa: E402
 from .services.batch_linker import link_reading_to_batch  # noqa: E402
+from .services.reading_export import ReadingExportFilter, parquet_available, stream_csv, stream_parquet  # noqa: E402
 from .services.alert_service import detect_and_persist_alerts  # noqa: E402
 from .state import latest_readings, update_reading, load_readings_cache  # noqa: E402
 from .websocket import manager  # noqa: E402
 from .ml.pipeline_manager import MLPipelineManager  # noqa: E402
 from scalar_fastapi import get_scalar_api_reference  # noqa: E402
-from .config import Settings  # noqa: E402
+from .config import Settings, get_settings  # noqa: E402
 import time  # noqa: E402
 import json  # noqa: E402
 import os  # noqa: E402
@@ -534,9 +540,16 @@ async def lifespan(app: FastAPI):
     settings = Settings()
 
     # Startup
+    startup_began = time.perf_counter()
     print(f"Starting BrewSignal ({settings.deployment_mode.value.upper()} mode)...")
     await init_db()
     print("Database initialized")
+    if warmed := await warm_pool():
+        print(f"Database pool warmed ({warmed} connections)")
+    await warm_reference_catalog()
+    # Prefetch Supabase signing keys so the first authenticated request
+    # doesn't block on the JWKS download
+    start_jwks_refresh()
 
     # One-time historical recipe backfills run off the critical path: spawned
     # here (not awaited) so the app binds the port and passes the platform
@@ -562,11 +575,12 @@ async def lifespan(app: FastAPI):
         await cleanup_service.start()
         print("Cleanup service started")
 
-    # Home Assistant integration: ambient/chamber polling
+    # Home Assistant integration: event stream feeding ambient/chamber polling
     if settings.is_enabled("ha"):
+        start_ha_event_listener()
         start_ambient_poller()
         await start_chamber_poller()
-        print("HA integration started (ambient + chamber pollers)")
+        print("HA integration started (event stream + ambient/chamber pollers)")
 
     # Temperature controller
     if settings.is_enabled("control"):
@@ -582,6 +596,7 @@ async def lifespan(app: FastAPI):
     if settings.is_enabled("gateway"):
         print("Gateway WebSocket enabled")
 
+    print(f"Startup complete in {time.perf_counter() - startup_began:.2f}s")
     yield
 
     # Shutdown (reverse order)
@@ -593,6 +608,7 @@ async def lifespan(app: FastAPI):
     if settings.is_enabled("ha"):
         stop_chamber_poller()
         stop_ambient_poller()
+        stop_ha_event_listener()
     if cleanup_service:
         await cleanup_service.stop()
     if scanner:
@@ -609,6 +625,11 @@ async def lifespan(app: FastAPI):
             await backfill_task
         except asyncio.CancelledError:
             pass
+    stop_jwks_refresh()
+    shutdown_bulk_pool()
+    await shutdown_memory()
+    # Last: pollers and services above may still have requests in flight
+    await close_http_clients()
     ml_pipeline_manager = None
     print("Shutdown complete")
 
@@ -693,90 +714,79 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.disconnect(websocket)
 
 
-@app.get("/log.csv")
-async def download_log():
-    """Download all readings as CSV file."""
-    import csv
-    import io
-
-    async def generate_csv():
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Write header
-        writer.writerow([
-            "timestamp", "tilt_id", "color", "beer_name",
-            "sg_raw", "sg_calibrated", "temp_raw", "temp_calibrated", "rssi"
-        ])
-        yield output.getvalue()
-        output.seek(0)
-        output.truncate(0)
-
-        # Stream readings in batches
-        async with async_session_factory() as session:
-            # Get all tilts for beer_name lookup
-            tilts_result = await session.execute(select(Tilt))
-            tilts_map = {t.id: t for t in tilts_result.scalars()}
-
-            # Get readings ordered by timestamp
-            result = await session.execute(
-                select(Reading).order_by(Reading.timestamp)
-            )
-            for reading in result.scalars():
-                tilt = tilts_map.get(reading.tilt_id)
-                writer.writerow([
-                    serialize_datetime_to_utc(reading.timestamp) if reading.timestamp else "",
-                    reading.tilt_id,
-                    tilt.color if tilt else "",
-                    tilt.beer_name if tilt else "",
-                    reading.sg_raw,
-                    reading.sg_calibrated,
-                    reading.temp_raw,
-                    reading.temp_calibrated,
-                    reading.rssi
-                ])
-                yield output.getvalue()
-                output.seek(0)
-                output.truncate(0)
+def _export_filter(
+    user: AuthUser,
+    batch_id: Optional[int],
+    device_id: Optional[str],
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> ReadingExportFilter:
+    if start and end and start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    return ReadingExportFilter(
+        batch_id=batch_id,
+        device_id=device_id,
+        start=start,
+        end=end,
+        # Local mode is single-user; cloud exports only the caller's devices
+        user_id=None if get_settings().is_local else user.user_id,
+    )
+
 
+def _export_filename(filters: ReadingExportFilter, extension: str) -> str:
+    if filters.batch_id is not None:
+        return f"batch_{filters.batch_id}_readings.{extension}"
+    return f"readings.{extension}"
+
+
+@app.get("/log.csv")
+async def download_log(
+    batch_id: Optional[int] = Query(None, description="Only readings linked to this batch"),
+    device_id: Optional[str] = Query(None, description="Only readings from this device"),
+    start: Optional[datetime] = Query(None, description="Readings at or after this time"),
+    end: Optional[datetime] = Query(None, description="Readings before this time"),
+    gzip: bool = Query(False, description="Gzip the CSV (served as .csv.gz)"),
+    user: AuthUser = Depends(require_auth),
+):
+    """Download readings as a CSV file, streamed in pages."""
+    filters = _export_filter(user, batch_id, device_id, start, end)
+    filename = _export_filename(filters, "csv.gz" if gzip else "csv")
     return StreamingResponse(
-        generate_csv(),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=tilt_readings.csv"}
+        stream_csv(filters, compress=gzip),
+        media_type="application/gzip" if gzip else "text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
 
-@app.get("/api/stats")
-async def get_stats():
-    """Get database statistics for the logging page."""
-    async with async_session_factory() as session:
-        # Count total readings
-        from sqlalchemy import func
-        readings_count = await session.execute(
-            select(func.count()).select_from(Reading)
-        )
-        total_readings = int(readings_count.scalar() or 0)
+@app.get("/log.parquet")
+async def download_log_parquet(
+    batch_id: Optional[int] = Query(None, description="Only readings linked to this batch"),
+    device_id: Optional[str] = Query(None, description="Only readings from this device"),
+    start: Optional[datetime] = Query(None, description="Readings at or after this time"),
+    end: Optional[datetime] = Query(None, description="Readings before this time"),
+    user: AuthUser = Depends(require_auth),
+):
+    """Download readings as a Parquet file (requires pyarrow on the server)."""
+    if not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow to be installed")
+    filters = _export_filter(user, batch_id, device_id, start, end)
+    return StreamingResponse(
+        stream_parquet(filters),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": f"attachment; filename={_export_filename(filters, 'parquet')}"}
+    )
 
-        # Get oldest and newest reading timestamps
-        oldest = await session.execute(
-            select(Reading.timestamp).order_by(Reading.timestamp).limit(1)
-        )
-        oldest_time = oldest.scalar()
 
-        newest = await session.execute(
-            select(Reading.timestamp).order_by(desc(Reading.timestamp)).limit(1)
-        )
-        newest_time = newest.scalar()
-
-        # Estimate size (rough: ~100 bytes per reading)
-        estimated_size_bytes = total_readings * 100
+@app.get("/api/stats")
+async def get_stats(user: Optional[AuthUser] = Depends(get_optional_user)):
+    """Get database statistics for the logging page.
 
-        return {
-            "total_readings": total_readings,
-            "oldest_reading": serialize_datetime_to_utc(oldest_time) if oldest_time else None,
-            "newest_reading": serialize_datetime_to_utc(newest_time) if newest_time else None,
-            "estimated_size_bytes": estimated_size_bytes,
-        }
+    Public like before; in cloud mode the per-device/batch breakdown only
+    lists the signed-in user's devices and batches (none when anonymous).
+    """
+    if get_settings().is_local:
+        return await get_reading_stats()
+    return await get_reading_stats(user_id=user.user_id if user else "")
 
 
 # SPA page routes - serve pre-rendered HTML files
@@ -0,0 +1,33 @@
+"""Rebuild the full-text index over assistant messages.
+
+init_db creates and backfills ag_ui_messages_fts once, and new messages are
+indexed as they are saved. Run this to rebuild the index from scratch, e.g.
+after restoring a database backup or bulk-importing threads:
+
+    python -m backend.migrations.backfill_thread_search_index
+
+PostgreSQL deployments don't need it: the GIN index from the Supabase
+migration is maintained by Postgres.
+"""
+
+import asyncio
+import logging
+
+from backend.database import async_session_factory
+from backend.services.thread_search import rebuild_index
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def backfill_thread_search_index() -> int:
+    """Re-index every stored assistant message. Returns the indexed count."""
+    async with async_session_factory() as session:
+        count = await rebuild_index(session)
+    logger.info(f"Indexed {count} assistant messages")
+    return count
+
+
+if __name__ == "__main__":
+    total = asyncio.run(backfill_thread_search_index())
+    print(f"\n✅ Thread search index rebuilt: {total} messages indexed")
@@ -83,6 +83,9 @@ class MLPipeline:
         self.cooler_history: list[bool] = []
         self.ambient_history: list[float] = []
 
+        # Bumped whenever the history changes; keys cached predictions
+        self.history_version = 0
+
     def process_reading(
         self,
         sg: float,
@@ -165,6 +168,8 @@ class MLPipeline:
         if ambient_temp is not None:
             self.ambient_history.append(ambient_temp)
 
+        self.history_version += 1
+
         # Stage 3: Predictions (curve fitting)
         if self.curve_fitter and len(self.sg_history) >= self.config.prediction_min_readings:
             prediction_result = self.curve_fitter.fit(
@@ -234,6 +239,7 @@ class MLPipeline:
         self.heater_history = []
         self.cooler_history = []
         self.ambient_history = []
+        self.history_version += 1
 
         # Note: curve_fitter and mpc_controller don't maintain state,
         # so no reset needed
@@ -272,6 +278,7 @@ class MLPipeline:
         self.heater_history = list(heaters) if heaters else []
         self.cooler_history = list(coolers) if coolers else []
         self.ambient_history = list(ambients) if ambients else []
+        self.history_version += 1
 
         # Reset Kalman filter to last reading state
         if self.kalman_filter and len(sgs) > 0:
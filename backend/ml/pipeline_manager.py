@@ -24,6 +24,10 @@ class MLPipelineManager:
         """
         self.pipelines: dict[str, MLPipeline] = {}
         self.config = config or MLConfig()
+        # device_id -> {(history_version, model, expected_fg): device state}
+        self._prediction_cache: dict[str, dict[tuple, dict]] = {}
+        # device_id -> (batch_id, history_version) of the last database reload
+        self._reloaded: dict[str, tuple[int, int]] = {}
         logger.info(f"MLPipelineManager initialized with config: {self.config}")
 
     def get_or_create_pipeline(self, device_id: str) -> MLPipeline:
@@ -56,6 +60,7 @@ class MLPipelineManager:
         if device_id in self.pipelines:
             logger.info(f"Resetting ML pipeline for device: {device_id}")
             self.pipelines[device_id].reset(initial_sg, initial_temp)
+            self._forget(device_id)
 
     def remove_pipeline(self, device_id: str):
         """Remove pipeline for device (cleanup).
@@ -66,6 +71,32 @@ class MLPipelineManager:
         if device_id in self.pipelines:
             logger.info(f"Removing ML pipeline for device: {device_id}")
             del self.pipelines[device_id]
+            self._forget(device_id)
+
+    def _forget(self, device_id: str):
+        """Drop cached predictions and reload bookkeeping for a device."""
+        self._prediction_cache.pop(device_id, None)
+        self._reloaded.pop(device_id, None)
+
+    def history_version(self, device_id: str) -> Optional[int]:
+        """Get the device's history version, or None if it has no pipeline.
+
+        The version changes whenever a reading is processed or the history
+        is reloaded or reset, so it identifies the data a prediction was
+        fitted on.
+        """
+        pipeline = self.pipelines.get(device_id)
+        return pipeline.history_version if pipeline else None
+
+    def needs_reload(self, device_id: str, batch_id: int) -> bool:
+        """Check whether a database reload could change this device's history.
+
+        A reload that already ran for this batch at the current history
+        version would load the same readings again, so it is skipped until
+        a new reading lands.
+        """
+        version = self.history_version(device_id)
+        return version is None or self._reloaded.get(device_id) != (batch_id, version)
 
     def get_pipeline_count(self) -> int:
         """Get count of active pipelines."""
@@ -161,6 +192,16 @@ class MLPipelineManager:
 
         pipeline = self.pipelines[device_id]
 
+        # Fits are cached until the history changes, so repeated views of
+        # the same batch don't refit the whole curve
+        key = (pipeline.history_version, model, expected_fg)
+        cache = self._prediction_cache.setdefault(device_id, {})
+        if key in cache:
+            return dict(cache[key])
+        # Entries for older versions can never be hit again
+        if any(k[0] != pipeline.history_version for k in cache):
+            cache.clear()
+
         # If we have enough history for predictions, get latest prediction
         if pipeline.curve_fitter and len(pipeline.sg_history) >= self.config.prediction_min_readings:
             prediction_result = pipeline.curve_fitter.fit(
@@ -170,15 +211,18 @@ class MLPipelineManager:
                 model=model,
             )
 
-            return {
+            state = {
                 "predictions": prediction_result,
                 "history_count": len(pipeline.sg_history)
             }
+        else:
+            state = {
+                "predictions": None,
+                "history_count": len(pipeline.sg_history)
+            }
 
-        return {
-            "predictions": None,
-            "history_count": len(pipeline.sg_history)
-        }
+        cache[key] = state
+        return dict(state)
 
     async def reload_from_database(
         self,
@@ -209,6 +253,7 @@ class MLPipelineManager:
         try:
             # Get or create pipeline
             pipeline = self.get_or_create_pipeline(device_id)
+            self._reloaded[device_id] = (batch_id, pipeline.history_version)
 
             # Query ALL readings for this batch (from any device)
             # This allows ML predictions to continue when switching devices mid-ferment
@@ -269,6 +314,7 @@ class MLPipelineManager:
 
             # Load history into pipeline
             pipeline.load_history(sgs=sgs, temps=temps, times=times)
+            self._reloaded[device_id] = (batch_id, pipeline.history_version)
 
             logger.info(
                 f"Reloaded {len(sgs)} readings from database for device {device_id}, batch {batch_id}"
@@ -282,6 +328,7 @@ class MLPipelineManager:
 
         except Exception as e:
             logger.error(f"Failed to reload from database: {e}")
+            self._reloaded.pop(device_id, None)
             return {
                 "success": False,
                 "readings_loaded": 0,
@@ -158,6 +158,19 @@ class Reading(Base):
     batch: Mapped[Optional["Batch"]] = relationship(back_populates="readings")
 
 
+class ReadingStat(Base):
+    """Maintained reading counter for one scope (see services.storage_stats).
+
+    Rows are kept up to date by database triggers on readings, never by
+    application code.
+    """
+    __tablename__ = "reading_stats"
+
+    scope: Mapped[str] = mapped_column(String(10), primary_key=True)  # all, device, batch, day
+    key: Mapped[str] = mapped_column(String(100), primary_key=True)
+    readings: Mapped[int] = mapped_column(nullable=False, default=0)
+
+
 class CalibrationPoint(Base):
     """Calibration point for device (was: tilt)."""
     __tablename__ = "calibration_points"
@@ -260,6 +273,22 @@ class Config(Base):
     value: Mapped[Optional[str]] = mapped_column(Text)  # JSON encoded
 
 
+class SyncState(Base):
+    """Digest of the payload last pushed to the cloud for one local row.
+
+    Cloud sync only sends rows whose current payload digest differs from the
+    recorded one, and records digests chunk by chunk, so an interrupted sync
+    resumes where it stopped.
+    """
+    __tablename__ = "sync_state"
+
+    user_id: Mapped[str] = mapped_column(_UserId, primary_key=True)
+    table_name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    row_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    digest: Mapped[str] = mapped_column(String(64))
+    synced_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
 class Style(Base):
     """BJCP Style Guidelines reference data."""
     __tablename__ = "styles"
@@ -619,6 +648,31 @@ class Batch(Base):
         return self.deleted_at is not None
 
 
+class BatchFeatures(Base):
+    """Fermentation summary of a finished batch, for similarity search.
+
+    Written when a batch is completed or conditioned (see
+    services.batch_features); missing values are NULL.
+    """
+    __tablename__ = "batch_features"
+
+    batch_id: Mapped[int] = mapped_column(ForeignKey("batches.id", ondelete="CASCADE"), primary_key=True)
+    user_id: Mapped[Optional[str]] = mapped_column(_UserId, nullable=True, index=True)  # copied from the batch
+    og: Mapped[Optional[float]] = mapped_column()
+    fg: Mapped[Optional[float]] = mapped_column()
+    attenuation: Mapped[Optional[float]] = mapped_column()  # percent
+    mean_temp: Mapped[Optional[float]] = mapped_column()  # °C
+    duration_days: Mapped[Optional[float]] = mapped_column()
+    # Fitted by FermentationCurveFitter
+    curve_model: Mapped[Optional[str]] = mapped_column(String(20))  # exponential, gompertz, logistic
+    curve_rate: Mapped[Optional[float]] = mapped_column()  # the model's rate parameter
+    curve_r_squared: Mapped[Optional[float]] = mapped_column()
+    hours_to_half: Mapped[Optional[float]] = mapped_column()  # time to 50% of the gravity drop
+    hours_to_90: Mapped[Optional[float]] = mapped_column()  # time to 90% of the gravity drop
+    readings: Mapped[int] = mapped_column(default=0)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
 class RecipeFermentable(Base):
     """Fermentable ingredients (grains, extracts, sugars) in a recipe."""
     __tablename__ = "recipe_fermentables"
@@ -1837,7 +1891,8 @@ class MiscInput(BaseModel):
     notes: Optional[str] = None
 
 
-class RecipeResponse(BaseModel):
+class RecipeSummaryResponse(BaseModel):
+    """Recipe columns without relationships, for projected list responses."""
     model_config = ConfigDict(from_attributes=True)
 
     id: int
@@ -1869,14 +1924,17 @@ class RecipeResponse(BaseModel):
     efficiency_percent: Optional[float] = None
     notes: Optional[str] = None
     created_at: datetime
-    style: Optional[StyleResponse] = None
-    fermentables: list["RecipeFermentableSummary"] = []
 
     @field_serializer('created_at')
     def serialize_dt(self, dt: datetime) -> str:
         return serialize_datetime_to_utc(dt)
 
 
+class RecipeResponse(RecipeSummaryResponse):
+    style: Optional[StyleResponse] = None
+    fermentables: list["RecipeFermentableSummary"] = []
+
+
 class RecipeFermentableSummary(BaseModel):
     """Lightweight fermentable for recipe/batch contexts (name + amount only)."""
     model_config = ConfigDict(from_attributes=True)
@@ -2215,7 +2273,8 @@ class BatchUpdate(BaseModel):
         return v
 
 
-class BatchResponse(BaseModel):
+class BatchSummaryResponse(BaseModel):
+    """Batch columns without relationships, for projected list responses."""
     model_config = ConfigDict(from_attributes=True)
 
     id: int
@@ -2257,10 +2316,6 @@ class BatchResponse(BaseModel):
     notes: Optional[str] = None
     created_at: datetime
     deleted_at: Optional[datetime] = None
-    recipe: Optional[RecipeResponse] = None
-    yeast_strain: Optional[YeastStrainResponse] = None
-    tasting_notes: list["TastingNoteResponse"] = []
-    reflections: list["BatchReflectionResponse"] = []
     # Temperature control
     heater_entity_id: Optional[str] = None
     cooler_entity_id: Optional[str] = None
@@ -2279,6 +2334,13 @@ class BatchResponse(BaseModel):
         return serialize_datetime_to_utc(dt)
 
 
+class BatchResponse(BatchSummaryResponse):
+    recipe: Optional[RecipeResponse] = None
+    yeast_strain: Optional[YeastStrainResponse] = None
+    tasting_notes: list["TastingNoteResponse"] = []
+    reflections: list["BatchReflectionResponse"] = []
+
+
 class BatchProgressResponse(BaseModel):
     """Fermentation progress response."""
     batch_id: int
@@ -2726,6 +2788,10 @@ class Gateway(Base):
     wifi_rssi: Mapped[Optional[int]] = mapped_column()  # WiFi signal strength
     ip_address: Mapped[Optional[str]] = mapped_column(String(45))  # IPv4 or IPv6
     claimed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    # Ingest sequencing: the gateway's per-boot id and the highest message seq
+    # stored from that boot, so retried messages aren't stored twice
+    boot_id: Mapped[Optional[str]] = mapped_column(String(64))
+    last_seq: Mapped[Optional[int]] = mapped_column()
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -28,8 +28,9 @@ from backend.database import get_db
 from backend.auth import AuthUser, require_auth
 from backend.routers.assistant import get_llm_config
 from backend.services.llm import LLMService
-from backend.services.llm.tools import TOOL_DEFINITIONS, execute_tool
+from backend.services.llm.tools import TOOL_DEFINITIONS, execute_tool, registry as tool_registry
 from backend.services.llm.context import prune_messages_if_needed, context_usage_info, get_token_budget, count_context_tokens
+from backend.services import thread_search
 from backend.services.memory import search_memories, add_memory, format_memories_for_context
 from backend.models import (
     AgUiThread, AgUiMessage,
@@ -370,6 +371,9 @@ async def _save_message(
     if tool_call_id:
         message.tool_call_id = tool_call_id
     db.add(message)
+    await db.flush()
+    # Keep the full-text index in the same transaction as the message row
+    await thread_search.index_message(db, message.id, thread_id, content)
     await db.commit()
     return message
 
@@ -402,7 +406,7 @@ async def _get_lite_llm_config(db: AsyncSession) -> tuple[bool, Optional[str]]:
 
         # Check if hailo-ollama is running
         for url in ["http://localhost:8000", "http://127.0.0.1:8000"]:
-            status = check_hailo_ollama_status(url)
+            status = await check_hailo_ollama_status(url)
             if status and status.running:
                 return True, url
 
@@ -923,6 +927,12 @@ async def get_tools() -> dict:
     }
 
 
+@router.get("/tools/metrics")
+async def get_tool_metrics() -> dict:
+    """Get per-tool call counts, latency and result sizes since startup."""
+    return {"tools": tool_registry.snapshot()}
+
+
 # =============================================================================
 # Thread Management Endpoints
 # =============================================================================
@@ -1024,6 +1034,7 @@ async def delete_thread(
     if not thread:
         raise HTTPException(status_code=404, detail="Thread not found or access denied")
 
+    await thread_search.remove_thread(db, thread_id)
     await db.delete(thread)
     await db.commit()
 
@@ -5,7 +5,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -20,7 +20,9 @@ from ..models import (
     BatchCreate,
     BatchPredictionsResponse,
     BatchProgressResponse,
+    BatchReflectionResponse,
     BatchResponse,
+    BatchSummaryResponse,
     BatchUpdate,
     ControlEvent,
     ControlEventResponse,
@@ -32,19 +34,27 @@ from ..models import (
     Reading,
     ReadingResponse,
     Recipe,
+    RecipeResponse,
     TastingNote,
     TastingNoteCreate,
     TastingNoteUpdate,
     TastingNoteResponse,
     YeastInventory,
     YeastStrain,
+    YeastStrainResponse,
 )
+from ..services.batch_features import FINISHED_STATUSES, refresh_batch_features, remove_batch_features
+from ..services.fermentation_analytics import analyze_batch
+from ..services.list_projection import NEXT_CURSOR_HEADER, Projection, Relation, after_cursor, next_cursor
 from ..services.inventory import check_inventory_availability, deduct_inventory_for_batch, reverse_inventory_deductions
 from ..state import latest_readings
 from ..mqtt_manager import publish_batch_discovery, mark_batch_unavailable
 
 router = APIRouter(prefix="/api/batches", tags=["batches"])
 
+# Readings the progress endpoint derives gravity rate and time-in-range from
+PROGRESS_WINDOW_HOURS = 24
+
 
 def user_owns_batch(user: AuthUser):
     """Create a SQLAlchemy condition for batch ownership.
@@ -79,23 +89,73 @@ async def get_user_batch(batch_id: int, user: AuthUser, db: AsyncSession) -> Bat
     return batch
 
 
-@router.get("", response_model=list[BatchResponse])
+# Relationships list endpoints can embed via ?expand= (all of them by default)
+BATCH_RELATIONS = {
+    "recipe": Relation(
+        lambda: selectinload(Batch.recipe).options(selectinload(Recipe.style), selectinload(Recipe.fermentables)),
+        Optional[RecipeResponse],
+    ),
+    "yeast_strain": Relation(lambda: selectinload(Batch.yeast_strain), Optional[YeastStrainResponse]),
+    "tasting_notes": Relation(lambda: selectinload(Batch.tasting_notes), list[TastingNoteResponse]),
+    "reflections": Relation(lambda: selectinload(Batch.reflections), list[BatchReflectionResponse]),
+}
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return (default: all)"
+EXPAND_DESCRIPTION = "Comma-separated relationships to embed: " + ", ".join(BATCH_RELATIONS) + " (default: all)"
+CURSOR_DESCRIPTION = f"Continue after the last row of a previous page (its {NEXT_CURSOR_HEADER} header)"
+
+
+async def _list_projected(
+    db: AsyncSession,
+    query,
+    response: Response,
+    fields: Optional[str],
+    expand: Optional[str],
+    cursor: Optional[str],
+    limit: Optional[int],
+    sort_attr: str = "created_at",
+) -> list[dict]:
+    """Run a batch list query with projection and keyset pagination."""
+    projection = Projection.parse(BatchSummaryResponse, BATCH_RELATIONS, fields, expand)
+    sort_column = getattr(Batch, sort_attr)
+    query = (
+        after_cursor(query, sort_column, Batch.id, cursor)
+        .options(*projection.load_options())
+        .order_by(sort_column.desc(), Batch.id.desc())
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    batches = (await db.execute(query)).scalars().all()
+
+    cursor_out = next_cursor(batches, limit, sort_attr)
+    if cursor_out:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_out
+    return [projection.dump(batch) for batch in batches]
+
+
+@router.get("", response_model=None, responses={200: {"model": list[BatchResponse]}})
 async def list_batches(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by status"),
     device_id: Optional[str] = Query(None, description="Filter by device"),
     include_deleted: bool = Query(False, description="Include soft-deleted batches"),
     deleted_only: bool = Query(False, description="Show only deleted batches (for maintenance)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     user: AuthUser = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
-    """List batches with optional filters. By default excludes deleted batches."""
+    """List batches with optional filters. By default excludes deleted batches.
+
+    Newest first. Use fields/expand to fetch only what a list needs, and
+    cursor to page without offsets.
+    """
     query = (
         select(Batch)
-        .options(selectinload(Batch.recipe).selectinload(Recipe.style), selectinload(Batch.recipe).selectinload(Recipe.fermentables), selectinload(Batch.yeast_strain), selectinload(Batch.tasting_notes), selectinload(Batch.reflections))
         .where(user_owns_batch(user))  # User isolation (LOCAL mode includes unclaimed)
-        .order_by(Batch.created_at.desc())
     )
 
     # Soft delete filter (default: hide deleted)
@@ -109,49 +169,56 @@ async def list_batches(
     if device_id:
         query = query.where(Batch.device_id == device_id)
 
-    query = query.offset(offset).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+    if offset:
+        query = query.offset(offset)
+    return await _list_projected(db, query, response, fields, expand, cursor, limit)
 
 
-@router.get("/active", response_model=list[BatchResponse])
+@router.get("/active", response_model=None, responses={200: {"model": list[BatchResponse]}})
 async def list_active_batches(
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size (default: all)"),
     user: AuthUser = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
     """Active batches: planning, brewing, or fermenting status, not deleted."""
     query = (
         select(Batch)
-        .options(selectinload(Batch.recipe).selectinload(Recipe.style), selectinload(Batch.recipe).selectinload(Recipe.fermentables), selectinload(Batch.yeast_strain), selectinload(Batch.tasting_notes), selectinload(Batch.reflections))
         .where(
             user_owns_batch(user),  # User isolation (LOCAL mode includes unclaimed)
             Batch.deleted_at.is_(None),
             Batch.status.in_(["planning", "brewing", "fermenting"])
         )
-        .order_by(Batch.created_at.desc())
     )
-    result = await db.execute(query)
-    return result.scalars().all()
+    return await _list_projected(db, query, response, fields, expand, cursor, limit)
 
 
-@router.get("/completed", response_model=list[BatchResponse])
+@router.get("/completed", response_model=None, responses={200: {"model": list[BatchResponse]}})
 async def list_completed_batches(
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size (default: all)"),
     user: AuthUser = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
-    """Historical batches: completed or conditioning, not deleted."""
+    """Historical batches: completed or conditioning, not deleted.
+
+    Most recently updated first; the cursor pages on updated_at.
+    """
     query = (
         select(Batch)
-        .options(selectinload(Batch.recipe).selectinload(Recipe.style), selectinload(Batch.recipe).selectinload(Recipe.fermentables), selectinload(Batch.yeast_strain), selectinload(Batch.tasting_notes), selectinload(Batch.reflections))
         .where(
             user_owns_batch(user),  # User isolation (LOCAL mode includes unclaimed)
             Batch.deleted_at.is_(None),
             Batch.status.in_(["completed", "conditioning"])
         )
-        .order_by(Batch.updated_at.desc())
     )
-    result = await db.execute(query)
-    return result.scalars().all()
+    return await _list_projected(db, query, response, fields, expand, cursor, limit, sort_attr="updated_at")
 
 
 @router.get("/{batch_id}", response_model=BatchResponse)
@@ -362,9 +429,11 @@ async def update_batch(
         batch.recipe_id = update.recipe_id
     if update.name is not None:
         batch.name = update.name
+    features_changed = False
     if update.status is not None:
         old_status = batch.status
         batch.status = update.status
+        features_changed = (old_status in FINISHED_STATUSES) != (update.status in FINISHED_STATUSES)
         # Auto-deduct inventory when entering brewing status
         if update.status == "brewing" and old_status != "brewing":
             batch.brewing_started_at = datetime.now(timezone.utc)
@@ -515,6 +584,17 @@ async def update_batch(
     await db.commit()
     await db.refresh(batch)
 
+    # Keep the similar-batch index in step with which batches are finished
+    if features_changed:
+        try:
+            if batch.status in FINISHED_STATUSES:
+                await refresh_batch_features(db, batch_id)
+            else:
+                await remove_batch_features(db, batch_id)
+                await db.commit()
+        except Exception:
+            logger.exception("Failed to update fermentation features for batch %d", batch_id)
+
     # Always reload batch with eager loading to avoid MissingGreenlet errors
     # Load recipe relationship for response with eager loading of nested style
     stmt = select(Batch).where(Batch.id == batch_id).options(
@@ -653,7 +733,7 @@ async def get_batch_progress(
     # Get batch with recipe and user isolation
     query = (
         select(Batch)
-        .options(selectinload(Batch.recipe).selectinload(Recipe.style), selectinload(Batch.recipe).selectinload(Recipe.fermentables), selectinload(Batch.yeast_strain), selectinload(Batch.tasting_notes), selectinload(Batch.reflections))
+        .options(selectinload(Batch.recipe))
         .where(Batch.id == batch_id, user_owns_batch(user))
     )
     result = await db.execute(query)
@@ -662,6 +742,18 @@ async def get_batch_progress(
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
 
+    ymin = batch.recipe.yeast_temp_min if batch.recipe else None
+    ymax = batch.recipe.yeast_temp_max if batch.recipe else None
+
+    # Gravity trend and temperature control over the last day
+    recent = {}
+    if batch.status != "completed":
+        recent = await analyze_batch(
+            db, batch_id, hours=PROGRESS_WINDOW_HOURS,
+            temp_range=(ymin, ymax) if ymin is not None and ymax is not None else None,
+            max_samples=0,
+        )
+
     # Get current SG and temperature from latest reading
     # Temperature is in Celsius (converted from Tilt's Fahrenheit broadcast on ingestion)
     # Frontend will convert based on user preference
@@ -671,6 +763,9 @@ async def get_batch_progress(
         reading = latest_readings[batch.device_id]
         current_sg = reading.get("sg")
         current_temp = reading.get("temp")
+    elif recent.get("summary"):
+        # Device not reporting right now: fall back to the latest stored reading
+        current_sg = recent["summary"].get("sg", {}).get("end")
 
     # For completed batches, use measured_fg or last reading as the final gravity
     if batch.status == "completed":
@@ -738,16 +833,23 @@ async def get_batch_progress(
             progress["percent_complete"] = round(max(0, min(100, (current_drop / total_drop) * 100)), 1)
             progress["sg_remaining"] = round(max(0, current_sg - fg), 4)
 
+    # Extrapolate the current gravity slope to the target FG
+    sg_rate = recent.get("trend_analysis", {}).get("sg_rate_per_hour")
+    if progress["sg_remaining"] is not None and sg_rate is not None:
+        if progress["sg_remaining"] == 0:
+            progress["estimated_days_remaining"] = 0.0
+        elif sg_rate < 0:
+            progress["estimated_days_remaining"] = round(progress["sg_remaining"] / -sg_rate / 24, 1)
+
     # Temperature status
     temperature = {
         "current": current_temp,
-        "yeast_min": batch.recipe.yeast_temp_min if batch.recipe else None,
-        "yeast_max": batch.recipe.yeast_temp_max if batch.recipe else None,
+        "yeast_min": ymin,
+        "yeast_max": ymax,
         "status": "unknown",
+        "time_in_range": recent.get("summary", {}).get("temp_c", {}).get("time_in_range"),
     }
     if current_temp and batch.recipe:
-        ymin = batch.recipe.yeast_temp_min
-        ymax = batch.recipe.yeast_temp_max
         if ymin and ymax:
             if ymin <= current_temp <= ymax:
                 temperature["status"] = "in_range"
@@ -770,11 +872,17 @@ async def get_batch_progress(
 @router.get("/{batch_id}/predictions", response_model=BatchPredictionsResponse)
 async def get_batch_predictions(
     batch_id: int,
+    request: Request,
+    response: Response,
     model: str = Query("auto", description="Prediction model: exponential, gompertz, logistic, or auto (best fit)"),
     db: AsyncSession = Depends(get_db),
 ):
     """Get ML predictions for a batch.
 
+    Predictions are cached in the ML manager until a new reading lands, and
+    the response carries a weak ETag derived from the same cache key, so a
+    client revalidating with If-None-Match gets a 304 until the data changes.
+
     Args:
         batch_id: The batch ID to get predictions for
         model: Model type to use for predictions:
@@ -830,9 +938,18 @@ async def get_batch_predictions(
     device_state = ml_mgr.get_device_state(device_id, expected_fg=expected_fg, model=model)
 
     # Auto-reload from database if pipeline is empty or has insufficient history
+    # (once per history version - a repeat would load the same readings)
     if not device_state or device_state.get("history_count", 0) < 10:
-        await ml_mgr.reload_from_database(device_id, batch_id, db)
-        device_state = ml_mgr.get_device_state(device_id, expected_fg=expected_fg, model=model)
+        if ml_mgr.needs_reload(device_id, batch_id):
+            await ml_mgr.reload_from_database(device_id, batch_id, db)
+            device_state = ml_mgr.get_device_state(device_id, expected_fg=expected_fg, model=model)
+
+    version = ml_mgr.history_version(device_id)
+    if version is not None:
+        etag = f'W/"pred-{batch_id}-{device_id}-{version}-{model}-{expected_fg}"'
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
 
     if not device_state or not device_state.get("predictions"):
         return {"available": False}
@@ -3,12 +3,13 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, or_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
 from ..models import Fermentable, FermentableCreate, FermentableResponse
 from ..services.fermentable_seeder import seed_fermentables, get_fermentable_count
+from ..services.reference_catalog import contains, get_reference_catalog
 
 router = APIRouter(prefix="/api/fermentables", tags=["fermentables"])
 
@@ -24,32 +25,27 @@ async def list_fermentables(
     offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db),
 ):
-    """List all fermentables with optional filters."""
-    query = select(Fermentable).order_by(Fermentable.name)
+    """List all fermentables with optional filters.
 
-    # Apply filters
+    Served from the in-memory reference catalog. With ``search``, results are
+    ranked by relevance (fuzzy name match, then origin/maltster/flavor);
+    otherwise they are ordered by name.
+    """
+    filters = []
     if type:
-        query = query.where(Fermentable.type == type)
+        filters.append(lambda f: f.type == type)
     if origin:
-        query = query.where(Fermentable.origin.ilike(f"%{origin}%"))
+        filters.append(lambda f: contains(f.origin, origin))
     if maltster:
-        query = query.where(Fermentable.maltster.ilike(f"%{maltster}%"))
+        filters.append(lambda f: contains(f.maltster, maltster))
     if is_custom is not None:
-        query = query.where(Fermentable.is_custom == is_custom)
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            or_(
-                Fermentable.name.ilike(search_pattern),
-                Fermentable.origin.ilike(search_pattern),
-                Fermentable.maltster.ilike(search_pattern),
-                Fermentable.flavor_profile.ilike(search_pattern),
-            )
-        )
+        filters.append(lambda f: f.is_custom == is_custom)
 
-    query = query.offset(offset).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+    catalog = await get_reference_catalog(db)
+    fermentables = catalog.fermentables.search(
+        search, where=lambda f: all(check(f) for check in filters)
+    )
+    return fermentables[offset:offset + limit]
 
 
 @router.get("/stats")
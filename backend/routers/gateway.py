@@ -4,6 +4,7 @@ Gateways are ESP32 devices that relay Tilt BLE readings to the cloud.
 Each gateway authenticates via a unique gateway-specific token.
 """
 
+import asyncio
 import hashlib
 import json
 import logging
@@ -195,118 +196,304 @@ async def unclaim_gateway(
 # Track connected gateways
 connected_gateways: dict[str, WebSocket] = {}
 
+# Messages a gateway may have waiting for storage before new ones are refused
+GATEWAY_QUEUE_SIZE = 64
 
-async def process_gateway_reading(
+
+def _reading_timestamp(payload: dict, now: datetime) -> datetime:
+    """When the gateway saw the reading, or now if it didn't say.
+
+    Buffered readings replayed after a reconnect carry their own timestamp;
+    anything unparseable or in the future falls back to arrival time.
+    """
+    raw = payload.get("timestamp")
+    if not isinstance(raw, str):
+        return now
+    try:
+        ts = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        return now
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return min(ts, now)
+
+
+async def process_gateway_readings(
     gateway_id: str,
     user_id: Optional[str],
-    payload: dict,
-) -> Optional[dict]:
-    """Process a reading received from a gateway.
+    payloads: list[dict],
+    last_seq: Optional[int] = None,
+) -> list[Optional[dict]]:
+    """Process readings received from a gateway in one transaction.
+
+    Devices are loaded with a single query, each device's active batch is
+    looked up once, and all readings are committed together.
 
     Args:
         gateway_id: The gateway's unique ID
         user_id: The owning user's ID (for cloud mode)
-        payload: Reading data from gateway
+        payloads: Reading data from gateway
+        last_seq: Message seq to record on the gateway in the same transaction
 
     Returns:
-        Processed reading dict for broadcast, or None if invalid
+        Broadcast payload per input reading, None where the reading was invalid
     """
-    # Extract reading data
-    device_id = payload.get("device_id")
-    color = payload.get("color", "Unknown")
-    temp_c = payload.get("temp")  # Gateway sends Celsius
-    sg = payload.get("gravity") or payload.get("sg")
-    rssi = payload.get("rssi")
-
-    if not device_id or temp_c is None or sg is None:
-        logger.warning(f"Gateway {gateway_id}: Invalid reading payload: {payload}")
-        return None
+    results: list[Optional[dict]] = [None] * len(payloads)
+    valid = []
+    for i, payload in enumerate(payloads):
+        if not isinstance(payload, dict):
+            logger.warning(f"Gateway {gateway_id}: Invalid reading payload: {payload}")
+            continue
+        sg = payload.get("gravity") or payload.get("sg")
+        if not payload.get("device_id") or payload.get("temp") is None or sg is None:
+            logger.warning(f"Gateway {gateway_id}: Invalid reading payload: {payload}")
+            continue
+        valid.append((i, payload, sg))
+
+    if not valid and last_seq is None:
+        return results
 
     async with async_session_factory() as session:
-        # Get or create Device record
-        device = await session.get(Device, device_id)
-        if not device:
-            device = Device(
-                id=device_id,
-                device_type="tilt",
-                name=color,
-                native_temp_unit="c",
-                native_gravity_unit="sg",
-                calibration_type="linear",
-                paired=False,
-                user_id=user_id,  # Associate with gateway owner
+        if last_seq is not None:
+            gateway = await session.get(Gateway, gateway_id)
+            if gateway:
+                gateway.last_seq = last_seq
+
+        device_ids = {payload["device_id"] for _, payload, _ in valid}
+        existing = await session.execute(select(Device).where(Device.id.in_(device_ids)))
+        devices = {device.id: device for device in existing.scalars()}
+        batch_ids: dict[str, Optional[int]] = {}
+        now = datetime.now(timezone.utc)
+
+        for i, payload, sg in valid:
+            device_id = payload["device_id"]
+            color = payload.get("color", "Unknown")
+            temp_c = payload["temp"]  # Gateway sends Celsius
+            rssi = payload.get("rssi")
+            timestamp = _reading_timestamp(payload, now)
+
+            # Get or create Device record
+            device = devices.get(device_id)
+            if not device:
+                device = Device(
+                    id=device_id,
+                    device_type="tilt",
+                    name=color,
+                    native_temp_unit="c",
+                    native_gravity_unit="sg",
+                    calibration_type="linear",
+                    paired=False,
+                    user_id=user_id,  # Associate with gateway owner
+                )
+                session.add(device)
+                devices[device_id] = device
+
+            # Update device metadata
+            device.last_seen = now
+            device.color = color
+
+            # Apply calibration
+            sg_calibrated, temp_calibrated = await calibration_service.calibrate_reading(
+                session, device_id, sg, temp_c
             )
-            session.add(device)
 
-        # Update device metadata
-        timestamp = datetime.now(timezone.utc)
-        device.last_seen = timestamp
-        device.color = color
+            # Validate reading
+            status = "valid"
+            if not (0.500 <= sg_calibrated <= 1.200) or not (0.0 <= temp_calibrated <= 100.0):
+                status = "invalid"
+
+            # Link to active batch
+            if device_id not in batch_ids:
+                batch_ids[device_id] = await link_reading_to_batch(session, device_id)
+            batch_id = batch_ids[device_id]
+
+            # Store reading if device is paired and linked to batch
+            if device.paired and batch_id is not None:
+                session.add(Reading(
+                    device_id=device_id,
+                    batch_id=batch_id,
+                    timestamp=timestamp,
+                    sg_raw=sg,
+                    sg_calibrated=sg_calibrated,
+                    temp_raw=temp_c,
+                    temp_calibrated=temp_calibrated,
+                    rssi=rssi,
+                    status=status,
+                    source_protocol="gateway",  # Track that this came from gateway
+                ))
+
+            # Build broadcast payload
+            results[i] = {
+                "id": device_id,
+                "device_id": device_id,
+                "device_type": "tilt",
+                "color": color,
+                "beer_name": device.beer_name or "Untitled",
+                "original_gravity": device.original_gravity,
+                "sg": sg_calibrated,
+                "sg_raw": sg,
+                "temp": temp_calibrated,
+                "temp_raw": temp_c,
+                "rssi": rssi,
+                "timestamp": serialize_datetime_to_utc(timestamp),
+                "last_seen": serialize_datetime_to_utc(now),
+                "paired": device.paired,
+                "source": "gateway",
+                "gateway_id": gateway_id,
+            }
 
-        # Apply calibration
-        sg_calibrated, temp_calibrated = await calibration_service.calibrate_reading(
-            session, device_id, sg, temp_c
-        )
+        await session.commit()
 
-        # Validate reading
-        status = "valid"
-        if not (0.500 <= sg_calibrated <= 1.200) or not (0.0 <= temp_calibrated <= 100.0):
-            status = "invalid"
-
-        # Link to active batch
-        batch_id = await link_reading_to_batch(session, device_id)
-
-        # Store reading if device is paired and linked to batch
-        if device.paired and batch_id is not None:
-            db_reading = Reading(
-                device_id=device_id,
-                batch_id=batch_id,
-                timestamp=timestamp,
-                sg_raw=sg,
-                sg_calibrated=sg_calibrated,
-                temp_raw=temp_c,
-                temp_calibrated=temp_calibrated,
-                rssi=rssi,
-                status=status,
-                source_protocol="gateway",  # Track that this came from gateway
-            )
-            session.add(db_reading)
+    # Update state cache and broadcast to frontend clients
+    for broadcast_payload in results:
+        if broadcast_payload:
+            update_reading(broadcast_payload["device_id"], broadcast_payload)
+            await broadcast_manager.broadcast(broadcast_payload)
 
-        await session.commit()
+    return results
+
+
+async def process_gateway_reading(
+    gateway_id: str,
+    user_id: Optional[str],
+    payload: dict,
+) -> Optional[dict]:
+    """Process a single reading received from a gateway.
+
+    Returns:
+        Processed reading dict for broadcast, or None if invalid
+    """
+    return (await process_gateway_readings(gateway_id, user_id, [payload]))[0]
 
-        # Build broadcast payload
-        broadcast_payload = {
-            "id": device_id,
-            "device_id": device_id,
-            "device_type": "tilt",
-            "color": color,
-            "beer_name": device.beer_name or "Untitled",
-            "original_gravity": device.original_gravity,
-            "sg": sg_calibrated,
-            "sg_raw": sg,
-            "temp": temp_calibrated,
-            "temp_raw": temp_c,
-            "rssi": rssi,
-            "timestamp": serialize_datetime_to_utc(timestamp),
-            "last_seen": serialize_datetime_to_utc(timestamp),
-            "paired": device.paired,
-            "source": "gateway",
-            "gateway_id": gateway_id,
-        }
-
-        # Update state cache and broadcast to frontend clients
-        update_reading(device_id, broadcast_payload)
-        await broadcast_manager.broadcast(broadcast_payload)
-
-        return broadcast_payload
+
+class GatewayIngest:
+    """Per-gateway queue between the socket receive loop and the database.
+
+    The receive loop only enqueues, so a gateway is never stalled behind a
+    transaction. The worker takes everything queued at once, stores it in one
+    transaction, then acks each message's seq (or nacks it if storage
+    failed) so the gateway can drop or retry its buffer.
+
+    With ``track_seq`` (the gateway sent a boot id) the highest stored seq is
+    written to the gateway row in the same transaction as the readings, and
+    a message at or below it is acked as a duplicate without storing it
+    again — it is known to be stored already.
+    """
+
+    def __init__(
+        self,
+        gateway_id: str,
+        user_id: Optional[str],
+        websocket: WebSocket,
+        last_seq: Optional[int] = None,
+        track_seq: bool = False,
+        maxsize: int = GATEWAY_QUEUE_SIZE,
+    ):
+        self.gateway_id = gateway_id
+        self.user_id = user_id
+        self.websocket = websocket
+        self.last_seq = last_seq
+        self.track_seq = track_seq
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Store whatever was already received, then stop the worker."""
+        if not self._task:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def offer(self, seq: Optional[int], readings: list[dict]) -> bool:
+        """Queue one message's readings; False if the queue is full."""
+        try:
+            self._queue.put_nowait((seq, readings))
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def _run(self):
+        while True:
+            messages = [await self._queue.get()]
+            while not self._queue.empty():
+                messages.append(self._queue.get_nowait())
+            try:
+                await self._store(messages)
+            finally:
+                for _ in messages:
+                    self._queue.task_done()
+
+    async def _store(self, messages: list[tuple[Optional[int], list[dict]]]):
+        fresh, duplicates = [], []
+        highest = self.last_seq
+        for seq, readings in messages:
+            if self.track_seq and seq is not None and highest is not None and seq <= highest:
+                duplicates.append(seq)
+                continue
+            fresh.append((seq, readings))
+            if self.track_seq and seq is not None:
+                highest = seq
+
+        payloads = [reading for _, readings in fresh for reading in readings]
+        new_seq = highest if highest != self.last_seq else None
+        try:
+            if payloads or new_seq is not None:
+                results = await process_gateway_readings(self.gateway_id, self.user_id, payloads, last_seq=new_seq)
+            else:
+                results = []
+        except Exception as e:
+            logger.error(f"Gateway {self.gateway_id}: Failed to store {len(payloads)} readings: {e}")
+            for seq, _ in fresh:
+                if seq is not None:
+                    await self._send({"type": "nack", "seq": seq, "reason": "storage_error"})
+            results = None
+        else:
+            self.last_seq = highest
+
+        for seq in duplicates:
+            await self._send({"type": "ack", "seq": seq, "duplicate": True})
+        if results is None:
+            return
+
+        offset = 0
+        for seq, readings in fresh:
+            accepted = sum(1 for r in results[offset:offset + len(readings)] if r)
+            offset += len(readings)
+            if seq is None:
+                continue
+            await self._send({
+                "type": "ack",
+                "seq": seq,
+                "accepted": accepted,
+                "rejected": len(readings) - accepted,
+            })
+
+    async def _send(self, message: dict):
+        try:
+            await self.websocket.send_json(message)
+        except Exception:
+            pass  # Gateway went away; it retries unacked messages on reconnect
 
 
 async def register_gateway(
     session: AsyncSession,
     gateway_id: str,
     user_id: Optional[str],
+    boot: Optional[str] = None,
 ) -> Gateway:
-    """Register or update a gateway in the database."""
+    """Register or update a gateway in the database.
+
+    A boot id different from the stored one means the gateway restarted and
+    numbers its messages afresh, so the stored seq no longer applies.
+    """
     gateway = await session.get(Gateway, gateway_id)
 
     if not gateway:
@@ -320,6 +507,9 @@ async def register_gateway(
 
     gateway.last_seen = datetime.now(timezone.utc)
     gateway.is_online = True
+    if boot is not None and boot != gateway.boot_id:
+        gateway.boot_id = boot
+        gateway.last_seq = None
 
     await session.commit()
     return gateway
@@ -330,6 +520,7 @@ async def gateway_websocket(
     websocket: WebSocket,
     gateway_id: str,
     token: Optional[str] = Query(None),
+    boot: Optional[str] = Query(None, max_length=64),
 ):
     """WebSocket endpoint for gateway devices.
 
@@ -337,9 +528,18 @@ async def gateway_websocket(
     - Gateway connects with its unique ID in the URL
     - Token query param required for cloud mode (gateway-specific token from /claim)
     - Gateway sends readings as JSON: {"type": "reading", "device_id": "...", ...}
+      or batched: {"type": "readings", "seq": 42, "readings": [{...}, ...]}
+    - Messages carrying a seq are answered once stored:
+      {"type": "ack", "seq": 42, "accepted": n, "rejected": m}, or
+      {"type": "nack", "seq": 42, "reason": "busy" | "storage_error"} to retry.
+    - Optional boot query param: an id the gateway picks once per boot. With
+      it, seqs are deduplicated per boot: the welcome message reports the
+      last stored seq as "last_seq" (null after a new boot), and a retried
+      message at or below it is acked with "duplicate": true instead of
+      being stored twice. Without it, delivery is at-least-once.
     - Server can send commands: {"type": "command", "action": "...", ...}
 
-    Example URL: wss://api.brewsignal.io/ws/gateway/BSG-AABBCCDDEE00?token=bsg_xxx
+    Example URL: wss://api.brewsignal.io/ws/gateway/BSG-AABBCCDDEE00?token=bsg_xxx&boot=5f3a9c1e
     """
     gateway_id = gateway_id.upper()
 
@@ -364,7 +564,8 @@ async def gateway_websocket(
 
     # Register gateway in database
     async with async_session_factory() as session:
-        await register_gateway(session, gateway_id, user_id)
+        gateway = await register_gateway(session, gateway_id, user_id, boot)
+        last_seq = gateway.last_seq if boot else None
 
     # Track connection
     connected_gateways[gateway_id] = websocket
@@ -374,8 +575,12 @@ async def gateway_websocket(
         "type": "connected",
         "gateway_id": gateway_id,
         "server_time": serialize_datetime_to_utc(datetime.now(timezone.utc)),
+        "last_seq": last_seq,
     })
 
+    ingest = GatewayIngest(gateway_id, user_id, websocket, last_seq=last_seq, track_seq=boot is not None)
+    ingest.start()
+
     try:
         while True:
             # Receive message from gateway
@@ -389,9 +594,17 @@ async def gateway_websocket(
 
             msg_type = message.get("type")
 
-            if msg_type == "reading":
-                # Process Tilt reading
-                await process_gateway_reading(gateway_id, user_id, message)
+            if msg_type in ("reading", "readings"):
+                # Queue Tilt readings for the ingest worker
+                readings = message.get("readings") if msg_type == "readings" else [message]
+                seq = message.get("seq")
+                if not isinstance(readings, list) or not isinstance(seq, (int, type(None))):
+                    logger.warning(f"Gateway {gateway_id}: Invalid readings message: {data[:100]}")
+                    continue
+                if not ingest.offer(seq, readings):
+                    logger.warning(f"Gateway {gateway_id}: Ingest queue full, refusing message {seq}")
+                    if seq is not None:
+                        await websocket.send_json({"type": "nack", "seq": seq, "reason": "busy"})
 
             elif msg_type == "ping":
                 # Heartbeat
@@ -411,6 +624,7 @@ async def gateway_websocket(
     finally:
         # Clean up
         connected_gateways.pop(gateway_id, None)
+        await ingest.stop()
 
         # Mark gateway offline
         async with async_session_factory() as session:
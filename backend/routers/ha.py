@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
 from ..services.ha_client import HAClient, get_ha_client
+from ..services.ha_events import get_ha_event_stream
 from .config import get_config_value
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,8 @@ class HAStatusResponse(BaseModel):
     connected: bool
     url: str
     error: str | None = None
+    # WebSocket state_changed subscription is connected (reads served from cache)
+    events_live: bool = False
 
 
 class HATestRequest(BaseModel):
@@ -51,7 +54,13 @@ async def get_ha_status(db: AsyncSession = Depends(get_db)):
         )
 
     connected = await ha_client.test_connection()
-    return HAStatusResponse(enabled=True, connected=connected, url=ha_url)
+    stream = get_ha_event_stream(ha_url)
+    return HAStatusResponse(
+        enabled=True,
+        connected=connected,
+        url=ha_url,
+        events_live=bool(stream and stream.live),
+    )
 
 
 @router.post("/test", response_model=HATestResponse)
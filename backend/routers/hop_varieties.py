@@ -3,12 +3,13 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, or_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
 from ..models import HopVariety, HopVarietyCreate, HopVarietyResponse
 from ..services.hop_seeder import seed_hop_varieties, get_hop_variety_count
+from ..services.reference_catalog import contains, get_reference_catalog
 
 router = APIRouter(prefix="/api/hop-varieties", tags=["hop-varieties"])
 
@@ -23,29 +24,23 @@ async def list_hop_varieties(
     offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db),
 ):
-    """List all hop varieties with optional filters."""
-    query = select(HopVariety).order_by(HopVariety.name)
+    """List all hop varieties with optional filters.
 
-    # Apply filters
+    Served from the in-memory reference catalog. With ``search``, results are
+    ranked by relevance (fuzzy name match, then origin/aroma profile);
+    otherwise they are ordered by name.
+    """
+    filters = []
     if origin:
-        query = query.where(HopVariety.origin.ilike(f"%{origin}%"))
+        filters.append(lambda h: contains(h.origin, origin))
     if purpose:
-        query = query.where(HopVariety.purpose == purpose)
+        filters.append(lambda h: h.purpose == purpose)
     if is_custom is not None:
-        query = query.where(HopVariety.is_custom == is_custom)
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            or_(
-                HopVariety.name.ilike(search_pattern),
-                HopVariety.origin.ilike(search_pattern),
-                HopVariety.aroma_profile.ilike(search_pattern),
-            )
-        )
+        filters.append(lambda h: h.is_custom == is_custom)
 
-    query = query.offset(offset).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+    catalog = await get_reference_catalog(db)
+    varieties = catalog.hops.search(search, where=lambda h: all(f(h) for f in filters))
+    return varieties[offset:offset + limit]
 
 
 @router.get("/stats")
@@ -1,11 +1,12 @@
 """Recipe API endpoints."""
 
+import asyncio
 import json
 import re
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field, ValidationError as PydanticValidationError
-from sqlalchemy import delete, func, or_, select
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from typing import Any, Optional
@@ -15,6 +16,7 @@ from ..config import get_settings
 from ..database import get_db
 from ..models import (
     Recipe, RecipeCulture, RecipeCreate, RecipeUpdate, RecipeResponse, RecipeDetailResponse,
+    RecipeFermentableSummary, RecipeSummaryResponse,
     Style, StyleResponse,
     RecipeMashStep, MashStepInput, MashStepResponse,
     RecipeMisc, MiscInput, MiscResponse,
@@ -26,14 +28,19 @@ from ..services.brewsignal_format import BrewSignalRecipe, BeerJSONToBrewSignalC
 from ..services.brewing import calculate_og_from_fermentables, calculate_recipe_stats
 from ..services.converters.brewsignal_v2 import RecipeToBrewSignalV2Converter, to_strict_beerjson
 from ..services.converters.recipe_to_brewfather import RecipeToBrewfatherConverter
+from ..services.list_projection import NEXT_CURSOR_HEADER, Projection, Relation, after_cursor, next_cursor
 from ..services.recipe_ingredients import hydrate_recipe_ingredients
+from ..services.recipe_stats import recalculate_all_recipes
 from ..services.recipe_validation import validate_recipe_constraints
+from ..services.reference_catalog import get_reference_catalog
 from ..services.style_resolver import resolve_style_id
 
 router = APIRouter(prefix="/api/recipes", tags=["recipes"])
 
 # File upload constraints
 MAX_FILE_SIZE = 1_000_000  # 1MB in bytes
+MAX_BULK_FILE_SIZE = 25_000_000  # 25MB — multi-recipe archives
+_SNIFF_BYTES = 1024
 
 
 def user_owns_recipe(user: AuthUser):
@@ -207,21 +214,12 @@ async def search_styles(
     limit: int = Query(10, ge=1, le=50),
     db: AsyncSession = Depends(get_db),
 ):
-    """Search BJCP styles by name or alias (e.g., 'NEIPA' finds 'Hazy IPA')."""
-    search_term = q.lower()
-    query = (
-        select(Style)
-        .where(
-            or_(
-                func.lower(Style.name).contains(search_term),
-                func.lower(Style.comments).contains(search_term),
-            )
-        )
-        .order_by(Style.name)
-        .limit(limit)
-    )
-    result = await db.execute(query)
-    return result.scalars().all()
+    """Search BJCP styles by name or alias (e.g., 'NEIPA' finds 'Hazy IPA').
+
+    Ranked fuzzy match served from the in-memory reference catalog.
+    """
+    catalog = await get_reference_catalog(db)
+    return catalog.styles.search(q, limit=limit)
 
 
 @router.get("/styles/{style_id}", response_model=StyleResponse)
@@ -259,24 +257,40 @@ async def list_styles(
 # Recipes API
 # ============================================================================
 
-@router.get("", response_model=list[RecipeResponse])
+# Relationships the list endpoint can embed via ?expand= (all of them by default)
+RECIPE_RELATIONS = {
+    "style": Relation(lambda: selectinload(Recipe.style), Optional[StyleResponse]),
+    "fermentables": Relation(lambda: selectinload(Recipe.fermentables), list[RecipeFermentableSummary]),
+}
+
+
+@router.get("", response_model=None, responses={200: {"model": list[RecipeResponse]}})
 async def list_recipes(
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all)"),
+    expand: Optional[str] = Query(None, description="Comma-separated relationships to embed: style, fermentables (default: all)"),
+    cursor: Optional[str] = Query(None, description=f"Continue after the last row of a previous page (its {NEXT_CURSOR_HEADER} header)"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     user: AuthUser = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
-    """List all recipes owned by the current user."""
+    """List all recipes owned by the current user, newest first."""
+    projection = Projection.parse(RecipeSummaryResponse, RECIPE_RELATIONS, fields, expand)
     query = (
-        select(Recipe)
-        .options(selectinload(Recipe.style), selectinload(Recipe.fermentables))
+        after_cursor(select(Recipe), Recipe.created_at, Recipe.id, cursor)
+        .options(*projection.load_options())
         .where(user_owns_recipe(user))
-        .order_by(Recipe.created_at.desc())
+        .order_by(Recipe.created_at.desc(), Recipe.id.desc())
         .offset(offset)
         .limit(limit)
     )
-    result = await db.execute(query)
-    return result.scalars().all()
+    recipes = (await db.execute(query)).scalars().all()
+
+    cursor_out = next_cursor(recipes, limit, "created_at")
+    if cursor_out:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_out
+    return [projection.dump(recipe) for recipe in recipes]
 
 
 @router.post("/validate", response_model=RecipeValidationResponse)
@@ -680,6 +694,92 @@ async def import_recipe(
     return recipe
 
 
+@router.post("/import/bulk")
+async def import_recipes_bulk(
+    file: UploadFile = File(...),
+    source_format: Optional[str] = Query(
+        None,
+        description=(
+            "Optional explicit format hint: beerxml, brewfather, beerjson, "
+            "brewsignal. When omitted, format is auto-detected from content."
+        ),
+    ),
+    chunk_size: int = Query(50, ge=1, le=500, description="Recipes committed per transaction"),
+    user: AuthUser = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Import every recipe in a multi-recipe file.
+
+    Accepts a BeerXML file with many <RECIPE> elements, a BeerJSON document
+    with several recipes, or a JSON array of Brewfather/BrewSignal recipes.
+    Streams newline-delimited JSON events (start, one per recipe, progress
+    after each committed chunk, complete) so the client can show progress and
+    per-recipe errors; one bad recipe doesn't fail the rest.
+    """
+    from backend.services.importers.recipe_importer import RecipeImporter
+
+    if file.filename:
+        ext = file.filename.lower().split('.')[-1]
+        if ext not in ('xml', 'json', 'brewsignal'):
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    "Invalid file type. Only .xml, .json, and .brewsignal "
+                    "files are supported"
+                ),
+            )
+
+    if source_format is not None:
+        normalized = source_format.lower()
+        if normalized not in ("beerxml", "brewfather", "beerjson", "brewsignal"):
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    "Invalid source_format. Must be one of: "
+                    "beerxml, brewfather, beerjson, brewsignal"
+                ),
+            )
+        source_format = normalized
+
+    # Starlette has already spooled the upload (to disk past 1MB); measure it
+    # there rather than reading it into memory.
+    upload = file.file
+    size = upload.seek(0, 2)
+    upload.seek(0)
+    if size == 0:
+        raise HTTPException(status_code=400, detail="File is empty")
+    if size > MAX_BULK_FILE_SIZE:
+        raise HTTPException(status_code=400, detail="File too large (max 25MB)")
+
+    head = upload.read(_SNIFF_BYTES)
+    upload.seek(0)
+    if source_format == "beerxml" or (
+        source_format is None and head.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"<")
+    ):
+        # BeerXML is parsed incrementally straight from the spooled file
+        content: Any = upload
+    else:
+        # JSON has to be parsed whole anyway
+        try:
+            content = (await asyncio.to_thread(upload.read)).decode("utf-8")
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+
+    importer = RecipeImporter()
+
+    async def generate_events():
+        async for event in importer.import_recipes_bulk(
+            content, source_format, db, user_id=user.user_id, chunk_size=chunk_size
+        ):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(
+        generate_events(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.put("/{recipe_id}", response_model=RecipeResponse)
 async def update_recipe(
     recipe_id: int,
@@ -792,6 +892,20 @@ async def update_recipe(
     return result.scalar_one()
 
 
+@router.post("/recalculate")
+async def recalculate_all_recipe_stats(
+    dry_run: bool = Query(False, description="Count changes without saving them"),
+    user: AuthUser = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, int]:
+    """Recalculate OG, FG, ABV, IBU, and color for all of the user's recipes.
+
+    Runs as one paged pass over the recipe table; only recipes whose stats
+    change are written.
+    """
+    return await recalculate_all_recipes(db, where=user_owns_recipe(user), dry_run=dry_run)
+
+
 @router.post("/{recipe_id}/recalculate", response_model=RecipeResponse)
 async def recalculate_recipe_stats(
     recipe_id: int,
@@ -4,24 +4,34 @@ Syncs local data to Supabase cloud storage for backup and multi-device access.
 Uses the user's JWT token to authenticate with Supabase REST API.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+from collections import defaultdict
+from datetime import datetime, timezone
 from typing import Optional
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload
 
 from ..auth import AuthUser, require_auth
 from ..config import get_settings
 from ..database import async_session_factory
-from ..models import Batch, Device, Recipe
+from ..models import Batch, Device, Recipe, RecipeCulture, RecipeFermentable, RecipeHop, SyncState, serialize_datetime_to_utc
+from ..services.http_clients import get_http_client
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/sync", tags=["sync"])
 
+# Rows per PostgREST array upsert, and upserts in flight at once
+SYNC_CHUNK_SIZE = 500
+SYNC_CONCURRENCY = 4
+
 # Security scheme to get raw token
 security = HTTPBearer(auto_error=False)
 
@@ -37,13 +47,15 @@ async def get_auth_token(
 
 @router.post("/push")
 async def push_to_cloud(
+    force: bool = False,
     user: AuthUser = Depends(require_auth),
     token: Optional[str] = Depends(get_auth_token),
 ):
     """Push local data to Supabase cloud.
 
     Syncs the user's claimed data (recipes, batches, devices) to Supabase.
-    Uses upsert logic based on local IDs to handle repeated syncs safely.
+    Only rows that changed since the last successful push are sent, as bulk
+    upserts per table; ``force=true`` pushes everything again.
 
     Returns:
         Dictionary with sync results (counts per table, errors)
@@ -67,50 +79,16 @@ async def push_to_cloud(
     # Build Supabase REST API base URL
     supabase_rest_url = f"{settings.supabase_url}/rest/v1"
 
-    results = {
-        "recipes": {"synced": 0, "errors": []},
-        "batches": {"synced": 0, "errors": []},
-        "devices": {"synced": 0, "errors": []},
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "apikey": settings.supabase_anon_key or "",
+        "Content-Type": "application/json",
+        "Prefer": "resolution=merge-duplicates",  # Upsert mode
     }
 
-    async with httpx.AsyncClient() as client:
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "apikey": settings.supabase_anon_key or "",
-            "Content-Type": "application/json",
-            "Prefer": "resolution=merge-duplicates",  # Upsert mode
-        }
-
-        async with async_session_factory() as session:
-            # Sync devices first (no dependencies)
-            devices = await _fetch_user_devices(session, user.user_id)
-            for device in devices:
-                try:
-                    await _sync_device(client, supabase_rest_url, headers, device, user.user_id)
-                    results["devices"]["synced"] += 1
-                except Exception as e:
-                    logger.error(f"Failed to sync device {device.id}: {e}")
-                    results["devices"]["errors"].append({"id": device.id, "error": str(e)})
-
-            # Sync recipes (no dependencies on batches)
-            recipes = await _fetch_user_recipes(session, user.user_id)
-            for recipe in recipes:
-                try:
-                    await _sync_recipe(client, supabase_rest_url, headers, recipe, user.user_id)
-                    results["recipes"]["synced"] += 1
-                except Exception as e:
-                    logger.error(f"Failed to sync recipe {recipe.id}: {e}")
-                    results["recipes"]["errors"].append({"id": recipe.id, "error": str(e)})
-
-            # Sync batches (depends on recipes and devices)
-            batches = await _fetch_user_batches(session, user.user_id)
-            for batch in batches:
-                try:
-                    await _sync_batch(client, supabase_rest_url, headers, batch, user.user_id)
-                    results["batches"]["synced"] += 1
-                except Exception as e:
-                    logger.error(f"Failed to sync batch {batch.id}: {e}")
-                    results["batches"]["errors"].append({"id": batch.id, "error": str(e)})
+    async with async_session_factory() as session:
+        push = CloudPush(get_http_client("sync"), supabase_rest_url, headers, session, user.user_id, force=force)
+        results = await push.run()
 
     total_synced = sum(r["synced"] for r in results.values())
     total_errors = sum(len(r["errors"]) for r in results.values())
@@ -120,10 +98,154 @@ async def push_to_cloud(
         "user_id": user.user_id,
         "results": results,
         "total_synced": total_synced,
+        "total_skipped": sum(r["skipped"] for r in results.values()),
         "total_errors": total_errors,
     }
 
 
+def _digest(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class CloudPush:
+    """One incremental push of a user's local data to Supabase.
+
+    Each table is sent as PostgREST array upserts of up to SYNC_CHUNK_SIZE
+    rows, at most SYNC_CONCURRENCY requests in flight. Rows whose payload
+    digest matches the one recorded in ``sync_state`` are skipped, and digests
+    are committed after every accepted chunk, so a sync that dies half way
+    resumes from where it stopped instead of starting over.
+
+    Devices and recipes go first; recipe children and batches reference them,
+    so they follow, skipping rows whose parent failed to push.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        base_url: str,
+        headers: dict,
+        session,
+        user_id: str,
+        force: bool = False,
+    ):
+        self.client = client
+        self.base_url = base_url
+        self.headers = headers
+        self.session = session
+        self.user_id = user_id
+        self.force = force
+        self.results: dict[str, dict] = {}
+        self.failed: dict[str, set] = defaultdict(set)
+        self._requests = asyncio.Semaphore(SYNC_CONCURRENCY)
+        # The session is shared by all tables; only one may use it at a time
+        self._session_lock = asyncio.Lock()
+
+    async def run(self) -> dict[str, dict]:
+        devices = await _fetch_user_devices(self.session, self.user_id)
+        recipes = await _fetch_user_recipes(self.session, self.user_id)
+        batches = await _fetch_user_batches(self.session, self.user_id)
+
+        await asyncio.gather(
+            self.push("devices", [_device_payload(d, self.user_id) for d in devices]),
+            self.push("recipes", [_recipe_payload(r, self.user_id) for r in recipes]),
+        )
+
+        await asyncio.gather(
+            self.push(
+                "recipe_fermentables",
+                [_fermentable_payload(f) for r in recipes for f in r.fermentables],
+                parents={"recipe_id": "recipes"},
+            ),
+            self.push(
+                "recipe_hops",
+                [_hop_payload(h) for r in recipes for h in r.hops],
+                parents={"recipe_id": "recipes"},
+            ),
+            self.push(
+                "recipe_cultures",
+                [_culture_payload(c) for r in recipes for c in r.cultures],
+                parents={"recipe_id": "recipes"},
+            ),
+            self.push(
+                "batches",
+                [_batch_payload(b, self.user_id) for b in batches],
+                parents={"recipe_id": "recipes", "device_id": "devices"},
+            ),
+        )
+        return self.results
+
+    async def push(self, table: str, rows: list[dict], parents: Optional[dict[str, str]] = None):
+        """Upsert the rows of one table that changed since the last push."""
+        result = self.results.setdefault(table, {"synced": 0, "skipped": 0, "errors": []})
+
+        pending = []
+        for row in rows:
+            broken = [(col, t) for col, t in (parents or {}).items() if row.get(col) in self.failed[t]]
+            if broken:
+                col, parent = broken[0]
+                self._fail(table, result, [row], f"{parent} row {row[col]} failed to sync")
+            else:
+                pending.append(row)
+
+        async with self._session_lock:
+            state = await self._load_state(table)
+        digests = {str(row["id"]): _digest(row) for row in pending}
+        if not self.force:
+            changed = [
+                row for row in pending
+                if str(row["id"]) not in state or state[str(row["id"])].digest != digests[str(row["id"])]
+            ]
+            result["skipped"] += len(pending) - len(changed)
+            pending = changed
+
+        chunks = [pending[i:i + SYNC_CHUNK_SIZE] for i in range(0, len(pending), SYNC_CHUNK_SIZE)]
+        await asyncio.gather(*(self._push_chunk(table, chunk, digests, state, result) for chunk in chunks))
+
+    async def _push_chunk(self, table: str, chunk: list[dict], digests: dict, state: dict, result: dict):
+        # A rejected upsert must surface as an error rather than count as
+        # synced — that's how cloud recipes once ended up with no hops
+        # (tilt_ui-nyn). PostgREST applies an array body atomically, so the
+        # whole chunk is reported failed and retried on the next sync.
+        try:
+            async with self._requests:
+                response = await self.client.post(f"{self.base_url}/{table}", headers=self.headers, json=chunk)
+            if response.status_code not in (200, 201, 204):
+                raise Exception(f"Supabase {table} error: {response.status_code} - {response.text}")
+        except Exception as e:
+            logger.error(f"Failed to sync {len(chunk)} {table} rows: {e}")
+            self._fail(table, result, chunk, str(e))
+            return
+
+        now = datetime.now(timezone.utc)
+        async with self._session_lock:
+            for row in chunk:
+                row_id = str(row["id"])
+                entry = state.get(row_id)
+                if entry is None:
+                    entry = SyncState(user_id=self.user_id, table_name=table, row_id=row_id)
+                    self.session.add(entry)
+                    state[row_id] = entry
+                entry.digest = digests[row_id]
+                entry.synced_at = now
+            await self.session.commit()
+        result["synced"] += len(chunk)
+
+    async def _load_state(self, table: str) -> dict[str, SyncState]:
+        rows = await self.session.execute(
+            select(SyncState).where(
+                SyncState.user_id == self.user_id,
+                SyncState.table_name == table,
+            )
+        )
+        return {entry.row_id: entry for entry in rows.scalars()}
+
+    def _fail(self, table: str, result: dict, rows: list[dict], error: str):
+        for row in rows:
+            self.failed[table].add(row["id"])
+            result["errors"].append({"id": row["id"], "error": error})
+
+
 async def _fetch_user_devices(session, user_id: str) -> list[Device]:
     """Fetch all devices owned by user."""
     from sqlalchemy import or_
@@ -196,15 +318,9 @@ async def _fetch_user_batches(session, user_id: str) -> list[Batch]:
     return list(result.scalars().all())
 
 
-async def _sync_device(
-    client: httpx.AsyncClient,
-    base_url: str,
-    headers: dict,
-    device: Device,
-    user_id: str,
-):
-    """Sync a single device to Supabase."""
-    data = {
+def _device_payload(device: Device, user_id: str) -> dict:
+    """Cloud row for a device."""
+    return {
         "id": device.id,  # Use same ID (string)
         "user_id": user_id,
         "device_type": device.device_type,
@@ -223,42 +339,10 @@ async def _sync_device(
         "created_at": device.created_at.isoformat() if device.created_at else None,
     }
 
-    response = await client.post(
-        f"{base_url}/devices",
-        headers=headers,
-        json=data,
-    )
-
-    if response.status_code not in (200, 201):
-        raise Exception(f"Supabase error: {response.status_code} - {response.text}")
-
-
-async def _post_child(
-    client: httpx.AsyncClient, base_url: str, table: str, headers: dict, payload: dict
-):
-    """POST a nested child row and raise on failure.
-
-    Child posts used to ignore the response, so a rejected insert (e.g. a legacy
-    NOT NULL column the payload doesn't set) was silently dropped and the recipe
-    still reported "synced" — that's how cloud recipes ended up with no hops
-    (tilt_ui-nyn). Raising propagates to the per-recipe handler in
-    push_to_cloud, which records it in the sync result's errors.
-    """
-    resp = await client.post(f"{base_url}/{table}", headers=headers, json=payload)
-    if resp.status_code not in (200, 201):
-        raise Exception(f"Supabase {table} error: {resp.status_code} - {resp.text}")
-
 
-async def _sync_recipe(
-    client: httpx.AsyncClient,
-    base_url: str,
-    headers: dict,
-    recipe: Recipe,
-    user_id: str,
-):
-    """Sync a single recipe to Supabase with nested ingredients."""
-    # Main recipe data
-    data = {
+def _recipe_payload(recipe: Recipe, user_id: str) -> dict:
+    """Cloud row for a recipe (children are pushed as their own tables)."""
+    return {
         "id": recipe.id,  # Use same integer ID
         "user_id": user_id,
         "name": recipe.name,
@@ -297,83 +381,69 @@ async def _sync_recipe(
         "updated_at": recipe.updated_at.isoformat() if recipe.updated_at else None,
     }
 
-    response = await client.post(
-        f"{base_url}/recipes",
-        headers=headers,
-        json=data,
-    )
 
-    if response.status_code not in (200, 201):
-        raise Exception(f"Supabase error: {response.status_code} - {response.text}")
-
-    # Sync nested fermentables
-    for ferm in recipe.fermentables:
-        ferm_data = {
-            "id": ferm.id,
-            "recipe_id": recipe.id,
-            "name": ferm.name,
-            "type": ferm.type,
-            "grain_group": ferm.grain_group,
-            "amount_kg": ferm.amount_kg,
-            "percentage": ferm.percentage,
-            "yield_percent": ferm.yield_percent,
-            "color_srm": ferm.color_srm,
-            "origin": ferm.origin,
-            "supplier": ferm.supplier,
-            "notes": ferm.notes,
-        }
-        await _post_child(client, base_url, "recipe_fermentables", headers, ferm_data)
-
-    # Sync nested hops. Extract identity (is_extract, amount_ml) added in
-    # tilt_ui-0l5 must round-trip through sync — otherwise the receiving
-    # side loses Abstrax/Quantum extracts and reincarnates them as
-    # zero-gram pellets with null alpha.
-    for hop in recipe.hops:
-        hop_data = {
-            "id": hop.id,
-            "recipe_id": recipe.id,
-            "name": hop.name,
-            "origin": hop.origin,
-            "form": hop.form,
-            "alpha_acid_percent": hop.alpha_acid_percent,
-            "beta_acid_percent": hop.beta_acid_percent,
-            "amount_grams": hop.amount_grams,
-            "amount_ml": hop.amount_ml,
-            "is_extract": hop.is_extract,
-            "timing": hop.timing,
-            "format_extensions": hop.format_extensions,
-        }
-        await _post_child(client, base_url, "recipe_hops", headers, hop_data)
-
-    # Sync nested cultures (yeast)
-    for culture in recipe.cultures:
-        culture_data = {
-            "id": culture.id,
-            "recipe_id": recipe.id,
-            "name": culture.name,
-            "type": culture.type,
-            "form": culture.form,
-            "producer": culture.producer,
-            "product_id": culture.product_id,
-            "temp_min_c": culture.temp_min_c,
-            "temp_max_c": culture.temp_max_c,
-            "attenuation_min_percent": culture.attenuation_min_percent,
-            "attenuation_max_percent": culture.attenuation_max_percent,
-            "amount": culture.amount,
-            "amount_unit": culture.amount_unit,
-        }
-        await _post_child(client, base_url, "recipe_cultures", headers, culture_data)
-
-
-async def _sync_batch(
-    client: httpx.AsyncClient,
-    base_url: str,
-    headers: dict,
-    batch: Batch,
-    user_id: str,
-):
-    """Sync a single batch to Supabase."""
-    data = {
+def _fermentable_payload(ferm: RecipeFermentable) -> dict:
+    """Cloud row for a recipe fermentable."""
+    return {
+        "id": ferm.id,
+        "recipe_id": ferm.recipe_id,
+        "name": ferm.name,
+        "type": ferm.type,
+        "grain_group": ferm.grain_group,
+        "amount_kg": ferm.amount_kg,
+        "percentage": ferm.percentage,
+        "yield_percent": ferm.yield_percent,
+        "color_srm": ferm.color_srm,
+        "origin": ferm.origin,
+        "supplier": ferm.supplier,
+        "notes": ferm.notes,
+    }
+
+
+def _hop_payload(hop: RecipeHop) -> dict:
+    """Cloud row for a recipe hop."""
+    # Extract identity (is_extract, amount_ml) added in tilt_ui-0l5 must
+    # round-trip through sync — otherwise the receiving side loses
+    # Abstrax/Quantum extracts and reincarnates them as zero-gram pellets
+    # with null alpha.
+    return {
+        "id": hop.id,
+        "recipe_id": hop.recipe_id,
+        "name": hop.name,
+        "origin": hop.origin,
+        "form": hop.form,
+        "alpha_acid_percent": hop.alpha_acid_percent,
+        "beta_acid_percent": hop.beta_acid_percent,
+        "amount_grams": hop.amount_grams,
+        "amount_ml": hop.amount_ml,
+        "is_extract": hop.is_extract,
+        "timing": hop.timing,
+        "format_extensions": hop.format_extensions,
+    }
+
+
+def _culture_payload(culture: RecipeCulture) -> dict:
+    """Cloud row for a recipe culture (yeast)."""
+    return {
+        "id": culture.id,
+        "recipe_id": culture.recipe_id,
+        "name": culture.name,
+        "type": culture.type,
+        "form": culture.form,
+        "producer": culture.producer,
+        "product_id": culture.product_id,
+        "temp_min_c": culture.temp_min_c,
+        "temp_max_c": culture.temp_max_c,
+        "attenuation_min_percent": culture.attenuation_min_percent,
+        "attenuation_max_percent": culture.attenuation_max_percent,
+        "amount": culture.amount,
+        "amount_unit": culture.amount_unit,
+    }
+
+
+def _batch_payload(batch: Batch, user_id: str) -> dict:
+    """Cloud row for a batch."""
+    return {
         "id": batch.id,  # Use same integer ID
         "user_id": user_id,
         "recipe_id": batch.recipe_id,
@@ -396,15 +466,6 @@ async def _sync_batch(
         "updated_at": batch.updated_at.isoformat() if batch.updated_at else None,
     }
 
-    response = await client.post(
-        f"{base_url}/batches",
-        headers=headers,
-        json=data,
-    )
-
-    if response.status_code not in (200, 201):
-        raise Exception(f"Supabase error: {response.status_code} - {response.text}")
-
 
 @router.get("/status")
 async def get_sync_status(user: AuthUser = Depends(require_auth)):
@@ -416,6 +477,9 @@ async def get_sync_status(user: AuthUser = Depends(require_auth)):
         devices = await _fetch_user_devices(session, user.user_id)
         recipes = await _fetch_user_recipes(session, user.user_id)
         batches = await _fetch_user_batches(session, user.user_id)
+        last_synced_at = await session.scalar(
+            select(func.max(SyncState.synced_at)).where(SyncState.user_id == user.user_id)
+        )
 
     return {
         "user_id": user.user_id,
@@ -424,5 +488,5 @@ async def get_sync_status(user: AuthUser = Depends(require_auth)):
             "recipes": len(recipes),
             "batches": len(batches),
         },
-        "last_synced_at": None,  # TODO: Track in config table
+        "last_synced_at": serialize_datetime_to_utc(last_synced_at),
     }
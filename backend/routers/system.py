@@ -5,6 +5,7 @@ Safety: Destructive operations (reboot/shutdown) require:
 2. Explicit confirmation in request body
 """
 
+import asyncio
 import json
 import logging
 import socket
@@ -13,14 +14,21 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Request
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 
+from ..auth import AuthUser, require_auth
 from ..cleanup import cleanup_old_readings, get_reading_stats
+from ..config import get_settings
+from ..database import pool_status
+from ..services.http_clients import get_http_client, http_client_status
 
 # Hailo detection paths
 HAILORTCLI_PATH = "/usr/bin/hailortcli"
 HAILO_DEVICE_PATH = "/dev/hailo0"
+# hailo-ollama status probes are local, so give up quickly
+HAILO_PROBE_TIMEOUT = 2.0
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/system", tags=["system"])
@@ -371,13 +379,22 @@ async def set_timezone(update: TimezoneUpdate, request: Request):
         raise HTTPException(status_code=500, detail=f"Failed to set timezone: {e}")
 
 
+@router.get("/database-pool")
+async def get_database_pool_status():
+    """Get database connection pool occupancy and acquire timings."""
+    return pool_status()
+
+
+@router.get("/http-clients")
+async def get_http_clients_status():
+    """Get which shared outbound HTTP clients are open."""
+    return http_client_status()
+
+
 @router.get("/storage")
-async def get_storage_stats():
+async def get_storage_stats(user: AuthUser = Depends(require_auth)):
     """Get database storage statistics."""
-    stats = await get_reading_stats()
-    total = stats.get("total_readings") or 0
-    stats["estimated_size_bytes"] = int(total) * 100  # rough estimate
-    return stats
+    return await get_reading_stats(user_id=None if get_settings().is_local else user.user_id)
 
 
 class CleanupRequest(BaseModel):
@@ -443,40 +460,40 @@ async def trigger_cleanup(cleanup: CleanupRequest, request: Request):
     }
 
 
-def check_hailo_ollama_status(url: str) -> Optional[HailoOllamaStatus]:
+async def check_hailo_ollama_status(url: str) -> Optional[HailoOllamaStatus]:
     """Check if hailo-ollama server is running and get model info."""
-    import httpx
+    client = get_http_client("llm")
+
+    async def probe(path: str) -> Optional[httpx.Response]:
+        try:
+            return await client.get(f"{url}{path}", timeout=HAILO_PROBE_TIMEOUT)
+        except Exception:
+            return None
 
+    # Available models from the hailo model zoo, and loaded/pulled models
+    zoo, tags = await asyncio.gather(probe("/hailo/v1/list"), probe("/api/tags"))
+    if zoo is None and tags is None:
+        return HailoOllamaStatus(running=False, url=url)
+
+    available_models = []
+    loaded_models = []
     try:
-        with httpx.Client(timeout=2.0) as client:
-            # Get available models from hailo model zoo
-            available_models = []
-            try:
-                resp = client.get(f"{url}/hailo/v1/list")
-                if resp.status_code == 200:
-                    data = resp.json()
-                    available_models = data.get("models", [])
-            except Exception:
-                pass
-
-            # Get loaded/pulled models
-            loaded_models = []
-            try:
-                resp = client.get(f"{url}/api/tags")
-                if resp.status_code == 200:
-                    data = resp.json()
-                    loaded_models = [m["name"] for m in data.get("models", [])]
-            except Exception:
-                pass
-
-            return HailoOllamaStatus(
-                running=True,
-                url=url,
-                models_available=available_models,
-                models_loaded=loaded_models,
-            )
+        if zoo is not None and zoo.status_code == 200:
+            available_models = zoo.json().get("models", [])
     except Exception:
-        return HailoOllamaStatus(running=False, url=url)
+        pass
+    try:
+        if tags is not None and tags.status_code == 200:
+            loaded_models = [m["name"] for m in tags.json().get("models", [])]
+    except Exception:
+        pass
+
+    return HailoOllamaStatus(
+        running=True,
+        url=url,
+        models_available=available_models,
+        models_loaded=loaded_models,
+    )
 
 
 async def get_hailo_base_url() -> Optional[str]:
@@ -511,10 +528,10 @@ async def get_hailo_base_url() -> Optional[str]:
     return None
 
 
-def discover_hailo_ollama_status(configured_url: Optional[str]) -> HailoOllamaStatus:
+async def discover_hailo_ollama_status(configured_url: Optional[str]) -> HailoOllamaStatus:
     """Try configured URL, then common defaults to detect hailo-ollama."""
     if configured_url:
-        return check_hailo_ollama_status(configured_url)
+        return await check_hailo_ollama_status(configured_url)
 
     candidate_urls = [
         "http://localhost:8000",
@@ -523,7 +540,7 @@ def discover_hailo_ollama_status(configured_url: Optional[str]) -> HailoOllamaSt
         "http://127.0.0.1:11434",
     ]
     for url in candidate_urls:
-        status = check_hailo_ollama_status(url)
+        status = await check_hailo_ollama_status(url)
         if status and status.running:
             return status
 
@@ -627,5 +644,5 @@ def detect_ai_accelerator(ollama_status: HailoOllamaStatus) -> AIAcceleratorStat
 async def get_ai_accelerator_status():
     """Check if AI accelerator (Hailo) is available."""
     configured_url = await get_hailo_base_url()
-    ollama_status = discover_hailo_ollama_status(configured_url)
+    ollama_status = await discover_hailo_ollama_status(configured_url)
     return detect_ai_accelerator(ollama_status)
@@ -3,11 +3,12 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, or_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
 from ..models import YeastStrain, YeastStrainCreate, YeastStrainResponse
+from ..services.reference_catalog import contains, get_reference_catalog
 from ..services.yeast_seeder import seed_yeast_strains, get_yeast_strain_count
 
 router = APIRouter(prefix="/api/yeast-strains", tags=["yeast-strains"])
@@ -24,31 +25,27 @@ async def list_yeast_strains(
     offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db),
 ):
-    """List all yeast strains with optional filters."""
-    query = select(YeastStrain).order_by(YeastStrain.producer, YeastStrain.name)
+    """List all yeast strains with optional filters.
 
-    # Apply filters
+    Served from the in-memory reference catalog. With ``search``, results are
+    ranked by relevance (product code, fuzzy name match, producer);
+    otherwise they are ordered by producer and name.
+    """
+    filters = []
     if type:
-        query = query.where(YeastStrain.type == type)
+        filters.append(lambda y: y.type == type)
     if producer:
-        query = query.where(YeastStrain.producer.ilike(f"%{producer}%"))
+        filters.append(lambda y: contains(y.producer, producer))
     if form:
-        query = query.where(YeastStrain.form == form)
+        filters.append(lambda y: y.form == form)
     if is_custom is not None:
-        query = query.where(YeastStrain.is_custom == is_custom)
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            or_(
-                YeastStrain.name.ilike(search_pattern),
-                YeastStrain.producer.ilike(search_pattern),
-                YeastStrain.product_id.ilike(search_pattern),
-            )
-        )
+        filters.append(lambda y: y.is_custom == is_custom)
 
-    query = query.offset(offset).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+    catalog = await get_reference_catalog(db)
+    strains = catalog.yeast.search(search, where=lambda y: all(f(y) for f in filters))
+    if not search:
+        strains.sort(key=lambda y: ((y.producer or "").lower(), y.name.lower()))
+    return strains[offset:offset + limit]
 
 
 @router.get("/stats")
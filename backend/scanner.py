@@ -17,7 +17,7 @@ import struct
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Generic, Optional, TypeVar
 
 from .models import serialize_datetime_to_utc
 
@@ -38,6 +38,28 @@ TILT_COLORS = {
 
 COLOR_TO_UUID = {v: k for k, v in TILT_COLORS.items()}
 
+# iBeacon layout inside Apple (0x004C) manufacturer data:
+#   0x02 0x15 | 16-byte proximity UUID | major (BE u16) | minor (BE u16) | tx power
+_IBEACON_LEN = 23
+_TILT_BY_UUID = {bytes.fromhex(uuid): color for uuid, color in TILT_COLORS.items()}
+_MAJOR_MINOR = struct.Struct(">HH")
+
+
+def decode_tilt_ibeacon(data: bytes) -> Optional[tuple[str, int, int]]:
+    """Decode a Tilt iBeacon from Apple manufacturer data.
+
+    Returns (color, major, minor), or None for anything that isn't a Tilt.
+    Non-iBeacon and non-Tilt frames (phones, AirTags, other beacons) are
+    rejected on the length, type bytes and a single dict lookup of the UUID.
+    """
+    if len(data) < _IBEACON_LEN - 1 or data[0] != 0x02 or data[1] != 0x15:
+        return None
+    color = _TILT_BY_UUID.get(data[2:18])
+    if color is None:
+        return None
+    major, minor = _MAJOR_MINOR.unpack_from(data, 18)
+    return color, major, minor
+
 
 @dataclass
 class TiltReading:
@@ -79,6 +101,58 @@ class RAPTPillReading:
         return self.mac.upper()
 
 
+R = TypeVar("R", TiltReading, RAPTPillReading)
+
+
+class DeviceMailbox(Generic[R]):
+    """Latest reading per device, between the BLE callback and the drain loop.
+
+    Each device id keeps only its newest undelivered reading, so a burst from
+    one device cannot push out another device's reading. A reading replaced
+    before it was drained is counted as coalesced (the older advertisement is
+    dropped in favour of the newer one).
+    """
+
+    def __init__(self):
+        self._pending: dict[str, R] = {}
+        self.arrivals: dict[str, int] = {}
+        self.received = 0
+        self.delivered = 0
+        self.coalesced = 0
+
+    def put(self, reading: R) -> None:
+        device_id = reading.id
+        self.received += 1
+        self.arrivals[device_id] = self.arrivals.get(device_id, 0) + 1
+        if device_id in self._pending:
+            self.coalesced += 1
+        self._pending[device_id] = reading
+
+    def pop(self) -> Optional[R]:
+        """Take the oldest pending reading, if any."""
+        if not self._pending:
+            return None
+        device_id = next(iter(self._pending))
+        self.delivered += 1
+        return self._pending.pop(device_id)
+
+    def drain(self) -> list[R]:
+        """Take the pending reading of every device that changed."""
+        readings = list(self._pending.values())
+        self._pending = {}
+        self.delivered += len(readings)
+        return readings
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "pending": len(self._pending),
+            "arrivals": dict(self.arrivals),
+        }
+
+
 class MockScanner:
     """Generates fake Tilt readings for development."""
 
@@ -104,31 +178,52 @@ class MockScanner:
 
 
 class RelayScanner:
-    """Fetches readings from a remote TiltPi."""
+    """Fetches readings from a remote TiltPi.
 
-    def __init__(self, host: str):
+    All colors are requested concurrently over one pooled client. Each
+    color's ETag/Last-Modified is sent back on the next poll, so a TiltPi
+    that honours conditional requests answers 304 for unchanged colors.
+    """
+
+    def __init__(self, host: str, client: Optional[httpx.AsyncClient] = None):
         self.host = host
-        self.client = httpx.AsyncClient(timeout=5.0)
+        self.client = client or httpx.AsyncClient(
+            timeout=5.0,
+            limits=httpx.Limits(max_connections=len(TILT_COLORS)),
+        )
+        self._validators: dict[str, dict[str, str]] = {}  # color -> conditional headers
 
-    async def scan(self) -> Optional[TiltReading]:
+    async def _fetch(self, color: str) -> Optional[TiltReading]:
         # TiltPi stores readings in /home/pi/{COLOR}.json
-        for color in TILT_COLORS.values():
-            try:
-                url = f"http://{self.host}:1880/{color}.json"
-                resp = await self.client.get(url)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    return TiltReading(
-                        color=color,
-                        mac=data.get("mac", ""),
-                        temp_f=float(data.get("Temp", 0)),
-                        sg=float(data.get("SG", 1.000)),
-                        rssi=int(data.get("rssi", -100)),
-                        timestamp=datetime.now(timezone.utc),
-                    )
-            except Exception:
-                continue
-        return None
+        try:
+            url = f"http://{self.host}:1880/{color}.json"
+            resp = await self.client.get(url, headers=self._validators.get(color))
+            if resp.status_code != 200:
+                return None  # 304 = unchanged since last poll
+
+            validators = {}
+            if etag := resp.headers.get("etag"):
+                validators["If-None-Match"] = etag
+            if last_modified := resp.headers.get("last-modified"):
+                validators["If-Modified-Since"] = last_modified
+            self._validators[color] = validators
+
+            data = resp.json()
+            return TiltReading(
+                color=color,
+                mac=data.get("mac", ""),
+                temp_f=float(data.get("Temp", 0)),
+                sg=float(data.get("SG", 1.000)),
+                rssi=int(data.get("rssi", -100)),
+                timestamp=datetime.now(timezone.utc),
+            )
+        except Exception:
+            return None
+
+    async def scan_all(self) -> list[TiltReading]:
+        """Fetch every color concurrently and return the changed readings."""
+        readings = await asyncio.gather(*(self._fetch(color) for color in TILT_COLORS.values()))
+        return [r for r in readings if r is not None]
 
     async def close(self):
         await self.client.aclose()
@@ -139,53 +234,104 @@ class FileScanner:
 
     TiltPi Node-RED writes files like /home/pi/RED.json, /home/pi/GREEN.json etc.
     This scanner reads those files directly when running on the same machine.
+
+    With watch=True the directory is also watched (inotify via watchfiles) so
+    a rewritten file is picked up immediately instead of on the next poll;
+    polling stays on as the fallback.
     """
 
-    def __init__(self, path: str = "/home/pi"):
+    def __init__(self, path: str = "/home/pi", watch: bool = False):
         self.path = Path(path)
         self._last_timestamps: dict[str, float] = {}  # Track file mtimes to avoid duplicates
+        self._watch = watch
+        self._changed = asyncio.Event()
+        self._stop_watch = asyncio.Event()
+        self._watch_task: Optional[asyncio.Task] = None
 
-    async def scan(self) -> Optional[TiltReading]:
-        """Scan for Tilt JSON files and return the first one with new data."""
+    def _read_changed(self) -> list[TiltReading]:
+        readings = []
         for color in TILT_COLORS.values():
             json_file = self.path / f"{color}.json"
-            if not json_file.exists():
-                continue
-
             try:
                 # Check if file was modified since last read
                 mtime = json_file.stat().st_mtime
-                last_mtime = self._last_timestamps.get(color, 0)
-
-                if mtime <= last_mtime:
-                    continue  # No new data
+            except OSError:
+                continue
 
-                self._last_timestamps[color] = mtime
+            if mtime <= self._last_timestamps.get(color, 0):
+                continue  # No new data
 
-                # Read and parse JSON
+            try:
                 data = json.loads(json_file.read_text())
-
-                return TiltReading(
+                readings.append(TiltReading(
                     color=color,
                     mac=data.get("mac", ""),
                     temp_f=float(data.get("Temp", 0)),
                     sg=float(data.get("SG", 1.000)),
                     rssi=int(data.get("rssi", -100)),
                     timestamp=datetime.now(timezone.utc),
-                )
+                ))
+                self._last_timestamps[color] = mtime
             except Exception as e:
                 logger.debug("Error reading %s: %s", json_file, e)
-                continue
+        return readings
 
-        return None
+    async def scan_all(self) -> list[TiltReading]:
+        """Return a reading for every color file modified since the last scan."""
+        # One thread hop for the whole sweep keeps file I/O off the event loop
+        return await asyncio.to_thread(self._read_changed)
+
+    async def start(self):
+        if not self._watch:
+            return
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            logger.warning("watchfiles not installed; falling back to polling %s", self.path)
+            self._watch = False
+            return
+
+        names = {f"{color}.json" for color in TILT_COLORS.values()}
+
+        async def watch():
+            try:
+                async for _changes in awatch(
+                    self.path,
+                    watch_filter=lambda _change, path: Path(path).name in names,
+                    stop_event=self._stop_watch,
+                ):
+                    self._changed.set()
+            except Exception as e:
+                logger.warning("File watch on %s stopped, polling only: %s", self.path, e)
+
+        self._watch_task = asyncio.create_task(watch())
+
+    async def wait(self, timeout: float):
+        """Sleep until the next poll, or until a watched file changes."""
+        if not self._watch:
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._changed.clear()
+
+    async def stop(self):
+        self._stop_watch.set()
+        if self._watch_task:
+            try:
+                await asyncio.wait_for(self._watch_task, timeout=2.0)
+            except asyncio.TimeoutError:
+                self._watch_task.cancel()
 
 
 class BLEScanner:
     """Real BLE scanner using Bleak."""
 
     def __init__(self):
-        self._latest_reading: Optional[TiltReading] = None
-        self._latest_rapt_reading: Optional[RAPTPillReading] = None
+        self._tilt_mailbox: DeviceMailbox[TiltReading] = DeviceMailbox()
+        self._rapt_mailbox: DeviceMailbox[RAPTPillReading] = DeviceMailbox()
         self._running = False
         self._scanner = None
         self._scan_task: Optional[asyncio.Task] = None
@@ -220,61 +366,51 @@ class BLEScanner:
                 # payload MAC bytes which change per broadcast
                 ble_addr = device.address.upper()
 
-                self._latest_rapt_reading = RAPTPillReading(
+                self._rapt_mailbox.put(RAPTPillReading(
                     mac=ble_addr,
                     temp_c=round(temp_c, 2),
                     sg=round(sg, 4),
                     battery_percent=round(battery_pct, 1),
                     rssi=advertisement_data.rssi,
                     timestamp=datetime.now(timezone.utc),
-                )
+                ))
                 print(f"BLE: Detected RAPT Pill ({ble_addr}) - {temp_c:.1f}C, SG {sg:.4f}, Battery {battery_pct:.0f}%")
             except Exception as e:
                 logger.debug("Error parsing RAPT Pill packet: %s", e)
             return
 
         # Only process Apple manufacturer data (ID 76 = 0x004C)
-        if 76 not in advertisement_data.manufacturer_data:
+        data = advertisement_data.manufacturer_data.get(76)
+        if data is None:
             return
 
         try:
-            from beacontools import parse_packet
-
-            # Reconstruct iBeacon frame for beacontools
-            # Format: flags + manufacturer header + data
-            beacon_bytes = b'\x02\x01\x06\x1a\xff\x4c\x00' + advertisement_data.manufacturer_data[76]
-            adv = parse_packet(beacon_bytes)
-
-            if not adv:
-                return
-
             # Check if it's a Tilt (UUID matches known Tilt colors)
-            uuid = adv.uuid.replace('-', '')
-            color = TILT_COLORS.get(uuid)
-
-            if not color:
+            decoded = decode_tilt_ibeacon(data)
+            if decoded is None:
                 return
+            color, major, minor = decoded
 
             # Skip disconnected repeaters (SG = 0)
-            if adv.minor == 0:
+            if minor == 0:
                 return
 
             # Parse temperature and SG (handle high-precision mode)
-            if adv.minor < 5000:
-                temp_f = float(adv.major)
-                sg = adv.minor / 1000.0
+            if minor < 5000:
+                temp_f = float(major)
+                sg = minor / 1000.0
             else:
-                temp_f = adv.major / 10.0
-                sg = adv.minor / 10000.0
+                temp_f = major / 10.0
+                sg = minor / 10000.0
 
-            self._latest_reading = TiltReading(
+            self._tilt_mailbox.put(TiltReading(
                 color=color,
                 mac=device.address,
                 temp_f=temp_f,
                 sg=sg,
                 rssi=advertisement_data.rssi,
                 timestamp=datetime.now(timezone.utc),
-            )
+            ))
             print(f"BLE: Detected {color} Tilt - {temp_f:.1f}F, SG {sg:.4f}")
 
         except Exception as e:
@@ -310,16 +446,24 @@ class BLEScanner:
         await asyncio.sleep(0.5)  # Give scanner time to start
 
     async def scan(self) -> Optional[TiltReading]:
-        """Return latest reading and clear it."""
-        reading = self._latest_reading
-        self._latest_reading = None
-        return reading
+        """Return one pending Tilt reading and clear it."""
+        return self._tilt_mailbox.pop()
 
     async def scan_rapt(self) -> Optional[RAPTPillReading]:
-        """Return latest RAPT Pill reading and clear it."""
-        reading = self._latest_rapt_reading
-        self._latest_rapt_reading = None
-        return reading
+        """Return one pending RAPT Pill reading and clear it."""
+        return self._rapt_mailbox.pop()
+
+    def drain(self) -> list[TiltReading]:
+        """Return the latest reading of every Tilt seen since the last drain."""
+        return self._tilt_mailbox.drain()
+
+    def drain_rapt(self) -> list[RAPTPillReading]:
+        """Return the latest reading of every RAPT Pill seen since the last drain."""
+        return self._rapt_mailbox.drain()
+
+    def stats(self) -> dict:
+        """Advertisement counters per device type."""
+        return {"tilt": self._tilt_mailbox.stats(), "rapt": self._rapt_mailbox.stats()}
 
     async def stop(self):
         """Stop BLE scanning."""
@@ -352,7 +496,8 @@ class TiltScanner:
         elif files_path := os.environ.get("SCANNER_FILES_PATH"):
             # File mode: read from local TiltPi JSON files
             logger.info("Scanner mode: FILES (%s)", files_path)
-            self._scanner = FileScanner(files_path)
+            watch = os.environ.get("SCANNER_FILES_WATCH", "").lower() in ("true", "1", "yes")
+            self._scanner = FileScanner(files_path, watch=watch)
             self._interval = 5.0  # Check files every 5 seconds
         elif relay_host := os.environ.get("SCANNER_RELAY_HOST"):
             logger.info("Scanner mode: RELAY (%s)", relay_host)
@@ -367,28 +512,50 @@ class TiltScanner:
     async def start(self):
         self._running = True
 
-        if isinstance(self._scanner, BLEScanner):
+        if isinstance(self._scanner, (BLEScanner, FileScanner)):
             await self._scanner.start()
 
         while self._running:
             try:
-                reading = await self._scanner.scan()
-                if reading:
-                    await self.on_reading(reading)
-
-                # Check for RAPT Pill readings (BLE mode only)
-                if self.on_rapt_reading and isinstance(self._scanner, BLEScanner):
-                    rapt_reading = await self._scanner.scan_rapt()
-                    if rapt_reading:
-                        await self.on_rapt_reading(rapt_reading)
+                if isinstance(self._scanner, BLEScanner):
+                    # Hand every device that advertised this tick to the
+                    # handlers together, rather than one reading per tick
+                    await self._dispatch(self.on_reading, self._scanner.drain())
+                    if self.on_rapt_reading:
+                        await self._dispatch(self.on_rapt_reading, self._scanner.drain_rapt())
+                elif isinstance(self._scanner, (FileScanner, RelayScanner)):
+                    await self._dispatch(self.on_reading, await self._scanner.scan_all())
+                else:
+                    reading = await self._scanner.scan()
+                    if reading:
+                        await self.on_reading(reading)
             except Exception as e:
                 logger.exception("Scanner error: %s", e)
 
-            await asyncio.sleep(self._interval)
+            if isinstance(self._scanner, FileScanner):
+                await self._scanner.wait(self._interval)
+            else:
+                await asyncio.sleep(self._interval)
+
+    @staticmethod
+    async def _dispatch(handler: Callable, readings: list) -> None:
+        """Run the handler for each reading concurrently; one failure doesn't stop the rest."""
+        if not readings:
+            return
+        results = await asyncio.gather(*(handler(r) for r in readings), return_exceptions=True)
+        for reading, result in zip(readings, results):
+            if isinstance(result, Exception):
+                logger.error("Reading handler failed for %s: %s", reading.id, result, exc_info=result)
+
+    def stats(self) -> Optional[dict]:
+        """Advertisement counters (BLE mode only)."""
+        if isinstance(self._scanner, BLEScanner):
+            return self._scanner.stats()
+        return None
 
     async def stop(self):
         self._running = False
-        if isinstance(self._scanner, BLEScanner):
+        if isinstance(self._scanner, (BLEScanner, FileScanner)):
             await self._scanner.stop()
         elif isinstance(self._scanner, RelayScanner):
             await self._scanner.close()
@@ -0,0 +1,284 @@
+"""Per-batch fermentation features and nearest-neighbour search.
+
+When a batch is completed or moved to conditioning, its readings are
+summarized into a BatchFeatures row: gravities, attenuation, mean
+temperature, duration, and the shape of its gravity curve (the
+FermentationCurveFitter fit plus the hours taken to reach 50% and 90% of
+the total drop). compare_batches uses these to answer "which batches
+fermented like this one" without reading any readings.
+
+Search runs over an in-memory matrix of every stored feature vector. Each
+feature is divided by a fixed scale (roughly what counts as "noticeably
+different" for it) so they weigh alike, and missing values are skipped. A
+brute-force distance over a few thousand rows takes well under a
+millisecond with NumPy; the matrix is rebuilt only when a row is added or
+replaced.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from ..database import async_session_factory
+from ..ml.predictions.curve_fitter import FermentationCurveFitter
+from ..models import Batch, BatchFeatures
+from .fermentation_analytics import ReadingSeries, read_series
+
+logger = logging.getLogger(__name__)
+
+# Statuses whose batches get features and are offered as matches
+FINISHED_STATUSES = ("completed", "conditioning")
+
+# Feature -> scale: a difference of one scale unit counts as 1 in the distance
+FEATURE_SCALES = {
+    "og": 0.010,
+    "fg": 0.004,
+    "attenuation": 5.0,
+    "mean_temp": 2.0,
+    "duration_days": 3.0,
+    "hours_to_half": 12.0,
+    "hours_to_90": 24.0,
+}
+FEATURES = tuple(FEATURE_SCALES)
+_SCALES = np.array([FEATURE_SCALES[name] for name in FEATURES])
+
+# Features two batches must share to be compared at all
+MIN_SHARED_FEATURES = 3
+# Readings handed to the curve fitter (evenly thinned beyond this)
+MAX_FIT_POINTS = 500
+# Readings averaged when looking for the 50%/90% crossing
+SMOOTHING_WINDOW = 5
+
+
+def _fit_curve(times_h: np.ndarray, sg: np.ndarray, expected_fg: Optional[float]) -> dict:
+    if len(times_h) > MAX_FIT_POINTS:
+        keep = np.linspace(0, len(times_h) - 1, MAX_FIT_POINTS).astype(int)
+        times_h, sg = times_h[keep], sg[keep]
+    return FermentationCurveFitter().fit(times_h.tolist(), sg.tolist(), expected_fg=expected_fg)
+
+
+def _hours_to_fraction(times_h: np.ndarray, sg: np.ndarray, og: float, fg: float, fraction: float) -> Optional[float]:
+    """Hours until the smoothed gravity first covers ``fraction`` of og -> fg."""
+    if og - fg <= 0 or len(sg) < SMOOTHING_WINDOW:
+        return None
+    smoothed = np.convolve(sg, np.ones(SMOOTHING_WINDOW) / SMOOTHING_WINDOW, mode="valid")
+    reached = np.flatnonzero(smoothed <= og - fraction * (og - fg))
+    if not len(reached):
+        return None
+    # A window's value belongs to its middle reading
+    return round(float(times_h[reached[0] + SMOOTHING_WINDOW // 2]), 1)
+
+
+def compute_features(batch: Batch, series: ReadingSeries) -> dict:
+    """Summarize a batch and its readings into feature values.
+
+    CPU-bound (curve fitting) - run it in a thread. Needs Batch.recipe loaded.
+    """
+    mask = np.isfinite(series.sg)
+    times_h = (series.times[mask] - series.times[mask][0]) / 3600.0 if mask.any() else np.array([])
+    sg = series.sg[mask]
+
+    og = batch.measured_og or (float(sg[0]) if len(sg) else None)
+    fg = batch.measured_fg or (float(sg[-1]) if len(sg) else None)
+    attenuation = batch.measured_attenuation
+    if attenuation is None and og and fg and og > 1.0:
+        attenuation = (og - fg) / (og - 1.0) * 100
+
+    duration_days = None
+    if batch.start_time and batch.end_time:
+        duration_days = (batch.end_time - batch.start_time).total_seconds() / 86400
+    elif len(times_h) > 1:
+        duration_days = times_h[-1] / 24
+
+    temps = series.temp[np.isfinite(series.temp)]
+    features = {
+        "og": og,
+        "fg": fg,
+        "attenuation": attenuation,
+        "mean_temp": float(temps.mean()) if len(temps) else None,
+        "duration_days": round(duration_days, 2) if duration_days is not None else None,
+        "curve_model": None,
+        "curve_rate": None,
+        "curve_r_squared": None,
+        "hours_to_half": None,
+        "hours_to_90": None,
+        "readings": len(series),
+    }
+
+    if len(sg) >= 2:
+        expected_fg = batch.recipe.fg if batch.recipe else None
+        fit = _fit_curve(times_h, sg, expected_fg)
+        curve_og, curve_fg = float(sg[0]), float(sg[-1])
+        if fit.get("fitted"):
+            features.update(
+                curve_model=fit["model_type"],
+                curve_rate=fit["decay_rate"],
+                curve_r_squared=fit["r_squared"],
+            )
+            curve_og, curve_fg = fit["predicted_og"], fit["predicted_fg"]
+        features["hours_to_half"] = _hours_to_fraction(times_h, sg, curve_og, curve_fg, 0.5)
+        features["hours_to_90"] = _hours_to_fraction(times_h, sg, curve_og, curve_fg, 0.9)
+    return features
+
+
+async def load_batch(db: AsyncSession, batch_id: int) -> Optional[Batch]:
+    result = await db.execute(
+        select(Batch).options(selectinload(Batch.recipe)).where(Batch.id == batch_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def features_for(db: AsyncSession, batch: Batch) -> dict:
+    """Compute a batch's features from its readings without storing them."""
+    series = await read_series(db, batch.id)
+    return await asyncio.to_thread(compute_features, batch, series)
+
+
+async def refresh_batch_features(db: AsyncSession, batch_id: int) -> Optional[BatchFeatures]:
+    """Recompute and store a batch's features. Commits."""
+    batch = await load_batch(db, batch_id)
+    if batch is None:
+        return None
+    features = await features_for(db, batch)
+
+    row = await db.get(BatchFeatures, batch_id)
+    if row is None:
+        row = BatchFeatures(batch_id=batch_id)
+        db.add(row)
+    for name, value in features.items():
+        setattr(row, name, value)
+    row.user_id = batch.user_id
+    row.computed_at = datetime.now(timezone.utc)
+    await db.commit()
+    _invalidate()
+    return row
+
+
+async def backfill_batch_features() -> int:
+    """Store features for finished batches that don't have them yet.
+
+    Run off the startup path (see database.run_deferred_backfills); each
+    batch commits on its own so an interrupted run resumes where it stopped,
+    and a batch that fails is skipped (and retried on the next boot).
+    """
+    async with async_session_factory() as db:
+        missing = (await db.execute(
+            select(Batch.id)
+            .outerjoin(BatchFeatures, BatchFeatures.batch_id == Batch.id)
+            .where(
+                Batch.status.in_(FINISHED_STATUSES),
+                Batch.deleted_at.is_(None),
+                BatchFeatures.batch_id.is_(None),
+            )
+        )).scalars().all()
+    computed = 0
+    for batch_id in missing:
+        try:
+            async with async_session_factory() as db:
+                await refresh_batch_features(db, batch_id)
+            computed += 1
+        except Exception:
+            logger.exception("Failed to compute fermentation features for batch %d", batch_id)
+    if computed:
+        logger.info("Computed fermentation features for %d batches", computed)
+    return computed
+
+
+async def remove_batch_features(db: AsyncSession, batch_id: int) -> None:
+    """Forget a batch's features (e.g. when it goes back to fermenting)."""
+    await db.execute(delete(BatchFeatures).where(BatchFeatures.batch_id == batch_id))
+    _invalidate()
+
+
+def feature_vector(features) -> np.ndarray:
+    """Scaled vector for a features dict or BatchFeatures row (NaN = missing)."""
+    get = features.get if isinstance(features, dict) else lambda name: getattr(features, name)
+    values = [get(name) for name in FEATURES]
+    return np.array([np.nan if v is None else float(v) for v in values]) / _SCALES
+
+
+@dataclass
+class _Index:
+    stamp: tuple
+    batch_ids: np.ndarray
+    user_ids: np.ndarray
+    matrix: np.ndarray  # one scaled feature vector per row
+
+
+_index: Optional[_Index] = None
+
+
+def _invalidate() -> None:
+    global _index
+    _index = None
+
+
+async def _get_index(db: AsyncSession) -> _Index:
+    global _index
+    # Other workers may have written rows: rebuild if the table changed
+    stamp = tuple((await db.execute(
+        select(func.count(), func.max(BatchFeatures.computed_at))
+    )).one())
+    if _index is not None and _index.stamp == stamp:
+        return _index
+
+    rows = (await db.execute(select(BatchFeatures))).scalars().all()
+    _index = _Index(
+        stamp=stamp,
+        batch_ids=np.array([row.batch_id for row in rows], dtype=int),
+        user_ids=np.array([row.user_id for row in rows], dtype=object),
+        matrix=np.array([feature_vector(row) for row in rows]).reshape(len(rows), len(FEATURES)),
+    )
+    return _index
+
+
+def distances(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """Distance from each row to vector over the features both have.
+
+    Root-mean-square of the scaled differences, so rows sharing fewer
+    features aren't favoured. Rows sharing fewer than MIN_SHARED_FEATURES
+    get inf.
+    """
+    diff = matrix - vector
+    shared = np.isfinite(diff)
+    shared_count = shared.sum(axis=1)
+    squared = np.where(shared, diff, 0.0) ** 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = np.sqrt(squared.sum(axis=1) / shared_count)
+    result[shared_count < MIN_SHARED_FEATURES] = np.inf
+    return result
+
+
+async def nearest_batches(
+    db: AsyncSession,
+    features,
+    limit: int,
+    user_id: Optional[str] = None,
+    exclude_batch_id: Optional[int] = None,
+) -> list[tuple[int, float]]:
+    """Stored batches closest to ``features``, as (batch_id, distance).
+
+    Args:
+        features: A features dict (compute_features) or BatchFeatures row
+        user_id: Only consider this user's batches (cloud mode); None for all
+    """
+    index = await _get_index(db)
+    if not len(index.batch_ids):
+        return []
+    dist = distances(index.matrix, feature_vector(features))
+    if user_id is not None:
+        dist[index.user_ids != user_id] = np.inf
+    if exclude_batch_id is not None:
+        dist[index.batch_ids == exclude_batch_id] = np.inf
+
+    k = min(limit, len(dist))
+    candidates = np.argpartition(dist, k - 1)[:k]
+    ranked = candidates[np.argsort(dist[candidates], kind="stable")]
+    return [(int(index.batch_ids[i]), float(dist[i])) for i in ranked if np.isfinite(dist[i])]
@@ -7,8 +7,10 @@ Parses BeerXML files and extracts fermentation-relevant data:
 - Style information
 """
 
+import io
+import xml.etree.ElementTree as StdET
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import IO, Iterator, Optional, Union
 
 import defusedxml.ElementTree as ET
 
@@ -166,14 +168,40 @@ def parse_beerxml(xml_content: str) -> list[ParsedRecipe]:
     Raises:
         ET.ParseError: If XML is malformed
     """
-    root = ET.fromstring(xml_content)
-    recipes = []
+    return list(iter_beerxml(xml_content))
 
-    for recipe_elem in root.findall('.//RECIPE'):
-        recipe = _parse_recipe(recipe_elem, xml_content)
-        recipes.append(recipe)
 
-    return recipes
+def iter_beerxml(source: Union[str, IO]) -> Iterator[ParsedRecipe]:
+    """Parse BeerXML incrementally, yielding one recipe at a time.
+
+    Each RECIPE is parsed when its end tag is reached and then detached and
+    cleared, so memory stays bounded by the largest recipe rather than the
+    file. ``raw_xml`` holds just that recipe, wrapped in <RECIPES> so it
+    re-parses as a standalone BeerXML document.
+
+    Args:
+        source: BeerXML string or file object
+
+    Raises:
+        ET.ParseError: If XML is malformed (after yielding the recipes before it)
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+
+    stack = []
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag != 'RECIPE' or not stack:
+            continue
+        elem.tail = None
+        raw_xml = f"<RECIPES>{StdET.tostring(elem, encoding='unicode')}</RECIPES>"
+        recipe = _parse_recipe(elem, raw_xml)
+        stack[-1].remove(elem)
+        elem.clear()
+        yield recipe
 
 
 def _get_text(elem, tag: str) -> Optional[str]:
@@ -2,9 +2,16 @@
 
 Provides deterministic server-side calculation of OG, FG, ABV, IBU, and color
 from recipe ingredients. These calculations replace LLM-based estimation.
+
+calculate_recipe_stats goes through RecipeStatsEngine, which memoizes results
+per ingredient fingerprint, so re-running stats on an unchanged recipe (the
+recalculate/scale endpoints, backfills, bulk recalculation) is a dict lookup.
 """
+import json
 import math
-from typing import TYPE_CHECKING
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from backend.models import Recipe, RecipeFermentable, RecipeHop, RecipeCulture
@@ -49,7 +56,12 @@ def get_extract_potential(name: str, yield_percent: float | None = None) -> floa
         return yield_percent * 46
 
     # Otherwise look up by name
-    name_lower = name.lower()
+    return _potential_by_name(name.lower())
+
+
+@lru_cache(maxsize=2048)
+def _potential_by_name(name_lower: str) -> float:
+    """Substring lookup in DEFAULT_POTENTIALS, memoized per grain name."""
     for key, val in DEFAULT_POTENTIALS.items():
         if key in name_lower:
             return val
@@ -57,6 +69,14 @@ def get_extract_potential(name: str, yield_percent: float | None = None) -> floa
     return 36  # Default for unknown grains
 
 
+@lru_cache(maxsize=512)
+def _boil_factor(boil_min: float) -> float:
+    """Tinseth boil time factor = (1 - e^(-0.04 * time)) / 4.15"""
+    if boil_min > 0:
+        return (1 - math.exp(-0.04 * boil_min)) / 4.15
+    return 0
+
+
 def calculate_og_from_fermentables(
     fermentables: list["RecipeFermentable"],
     batch_liters: float,
@@ -81,6 +101,11 @@ def calculate_og_from_fermentables(
     total_gravity_points = 0
     total_mcu = 0  # Malt Color Units
 
+    # Per-batch constants, hoisted out of the per-grain loop
+    # Where: 1 kg = 2.205 lbs, 1 gallon = 3.785 liters
+    gravity_gal = batch_liters / 3.785
+    color_gal = batch_liters * 0.264172
+
     for ferm in fermentables:
         amount_kg = ferm.amount_kg or 0
         if amount_kg <= 0:
@@ -90,20 +115,15 @@ def calculate_og_from_fermentables(
         potential = get_extract_potential(ferm.name, ferm.yield_percent)
 
         # Convert to metric: gravity points = (lbs * PPG * efficiency) / gallons
-        # Where: 1 kg = 2.205 lbs, 1 gallon = 3.785 liters
         ferm_type = (ferm.type or "").lower()
         ferm_efficiency = 1.0 if ferm_type in NO_EFFICIENCY_TYPES else efficiency
         grain_lbs = amount_kg * 2.205
-        batch_gal = batch_liters / 3.785
-        points = (grain_lbs * potential * ferm_efficiency) / batch_gal
-        total_gravity_points += points
+        total_gravity_points += (grain_lbs * potential * ferm_efficiency) / gravity_gal
 
         # Color contribution (MCU)
         color_lov = ferm.color_srm or 3  # Default pale malt color
-        grain_lbs = amount_kg * 2.205
-        batch_gal = batch_liters * 0.264172
-        if batch_gal > 0:
-            total_mcu += (grain_lbs * color_lov) / batch_gal
+        if color_gal > 0:
+            total_mcu += (grain_lbs * color_lov) / color_gal
 
     # Calculate OG
     calculated_og = 1.0 + (total_gravity_points / 1000)
@@ -140,6 +160,8 @@ def _calculate_ibu(
         batch_liters = 20
 
     total_ibu = 0
+    # Tinseth bigness factor depends only on OG: 1.65 * 0.000125^(OG - 1)
+    bigness = 1.65 * (0.000125 ** (og - 1))
 
     for hop in hops:
         if getattr(hop, "is_extract", False):
@@ -173,15 +195,7 @@ def _calculate_ibu(
         # Handle both naming conventions: "boil" vs "add_to_boil"
         if use in ["boil", "add_to_boil", "mash", "add_to_mash", "first_wort"]:
             # Tinseth utilization formula
-            # Bigness factor = 1.65 * 0.000125^(OG - 1)
-            bigness = 1.65 * (0.000125 ** (og - 1))
-
-            # Boil time factor = (1 - e^(-0.04 * time)) / 4.15
-            if boil_min > 0:
-                boil_factor = (1 - math.exp(-0.04 * boil_min)) / 4.15
-            else:
-                boil_factor = 0
-            utilization = bigness * boil_factor
+            utilization = bigness * _boil_factor(boil_min)
 
             # Pellet (+10%) and first-wort (+10%) utilization adjustments —
             # mirrors the frontend Tinseth calculator so the displayed IBU
@@ -292,12 +306,19 @@ def get_attenuation_from_cultures(
 def calculate_recipe_stats(recipe: "Recipe") -> dict[str, float]:
     """Calculate all brewing statistics for a recipe from its ingredients.
 
+    Memoized through ``stats_engine``: an unchanged ingredient list returns
+    the previously computed stats.
+
     Args:
         recipe: Recipe model with fermentables, hops, and cultures loaded
 
     Returns:
         Dict with og, fg, abv, ibu, color_srm
     """
+    return stats_engine.stats(recipe)
+
+
+def _compute_recipe_stats(recipe: "Recipe") -> dict[str, float]:
     batch_liters = recipe.batch_size_liters or 20
     efficiency = recipe.efficiency_percent or 75  # Default 75% efficiency
     if efficiency > 1:
@@ -333,3 +354,72 @@ def calculate_recipe_stats(recipe: "Recipe") -> dict[str, float]:
         "ibu": round(ibu, 0),
         "color_srm": round(color_srm, 1),
     }
+
+
+def _timing_key(timing: Any) -> str:
+    if not timing:
+        return ""
+    return json.dumps(timing, sort_keys=True, default=str)
+
+
+class RecipeStatsEngine:
+    """Memoizing front end for the recipe stat calculations.
+
+    Results are keyed on a fingerprint of every input the calculation reads
+    (batch size, efficiency, attenuation and each fermentable/hop/culture's
+    relevant fields), so any ingredient edit is a new revision and a cache
+    miss, while recalculating an unchanged recipe costs a tuple hash. The
+    cache is a bounded LRU; ``hits``/``misses`` are kept for diagnostics.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._cache: OrderedDict[tuple, dict[str, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(recipe: "Recipe") -> tuple:
+        """Hashable revision key covering every input to the stats."""
+        return (
+            recipe.batch_size_liters,
+            recipe.efficiency_percent,
+            recipe.yeast_attenuation,
+            tuple(
+                (f.name, f.type, f.amount_kg, f.yield_percent, f.color_srm)
+                for f in (recipe.fermentables or [])
+            ),
+            tuple(
+                (
+                    h.amount_grams,
+                    h.alpha_acid_percent,
+                    getattr(h, "form", None),
+                    getattr(h, "is_extract", False),
+                    _timing_key(h.timing),
+                )
+                for h in (recipe.hops or [])
+            ),
+            tuple(c.attenuation_min_percent for c in (recipe.cultures or [])),
+        )
+
+    def stats(self, recipe: "Recipe") -> dict[str, float]:
+        key = self.fingerprint(recipe)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return dict(cached)
+
+        self.misses += 1
+        result = _compute_recipe_stats(recipe)
+        self._cache[key] = result
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return dict(result)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+
+stats_engine = RecipeStatsEngine()
@@ -17,10 +17,13 @@ import httpx
 
 from .base import DeviceControlAdapter, DeviceInfo
 
-logger = logging.getLogger(__name__)
+# Same fallback as ha_adapter for test contexts that import this package directly
+try:
+    from backend.services.http_clients import get_http_client
+except ImportError:
+    from http_clients import get_http_client
 
-# Timeout for HTTP requests to Shelly devices (local network should be fast)
-REQUEST_TIMEOUT = 5.0
+logger = logging.getLogger(__name__)
 
 
 class ShellyDirectAdapter(DeviceControlAdapter):
@@ -30,15 +33,12 @@ class ShellyDirectAdapter(DeviceControlAdapter):
     """
 
     def __init__(self):
-        self._client: Optional[httpx.AsyncClient] = None
         # Cache device info: {ip: {"gen": 1|2, "model": "...", ...}}
         self._devices: dict[str, dict] = {}
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=REQUEST_TIMEOUT)
-        return self._client
+        """Get the shared Shelly HTTP client (5s timeout, pooled keep-alive)."""
+        return get_http_client("shelly")
 
     def _parse_entity_id(self, entity_id: str) -> tuple[str, int]:
         """Parse entity ID into (ip, channel).
@@ -293,7 +293,4 @@ class ShellyDirectAdapter(DeviceControlAdapter):
         return devices
 
     async def close(self) -> None:
-        """Close HTTP client."""
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
-            self._client = None
+        """No-op: the shared HTTP client is closed at app shutdown."""
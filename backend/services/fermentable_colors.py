@@ -6,13 +6,14 @@ color, the roasted contribution vanishes and a stout reads as ~3 SRM
 (tilt_ui-81n). The Fermentable reference table knows real colors
 (Roasted Barley = 500 SRM), so we fill missing colors from it before the SRM
 calc and before serialization writes the recipe_fermentables rows.
+Lookups go through the in-memory reference catalog, so enriching a large
+import costs no queries per grain.
 """
 from typing import Any, Optional
 
-from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import Fermentable
+from .reference_catalog import get_reference_catalog
 
 
 async def resolve_fermentable_color_srm(
@@ -30,20 +31,12 @@ async def resolve_fermentable_color_srm(
     if not n:
         return None
 
-    result = await db.execute(
-        select(Fermentable)
-        .where(func.lower(Fermentable.name) == n.lower())
-        .limit(1)
-    )
-    ref = result.scalar_one_or_none()
+    catalog = await get_reference_catalog(db)
+    matches = catalog.fermentables.exact(n)
+    ref = matches[0] if matches else None
     if ref is None:
-        result = await db.execute(
-            select(Fermentable)
-            .where(Fermentable.name.ilike(f"%{n}%"))
-            .order_by(func.length(Fermentable.name))
-            .limit(1)
-        )
-        ref = result.scalar_one_or_none()
+        candidates = catalog.fermentables.substring(n)
+        ref = min(candidates, key=lambda f: len(f.name)) if candidates else None
 
     return ref.color_srm if ref is not None and ref.color_srm is not None else None
 
@@ -0,0 +1,473 @@
+"""Fermentation analytics over a batch's readings.
+
+Shared by the assistant's fermentation tools and the batch progress
+endpoint. A batch's readings are loaded once as column arrays (timestamp,
+gravity, temperature, confidence, anomaly flag) and kept in a small per-batch
+cache. Later calls only fetch readings newer than the last one cached, so
+repeated questions about a fermenting batch don't rescan its history.
+
+The batch's counter row in reading_stats (see services.storage_stats) tells
+whether anything else changed - readings deleted or moved to another batch -
+in which case the series is reloaded. Summaries are computed with NumPy:
+least-squares gravity and temperature slopes, percentiles, time-weighted
+time-in-range for temperature, and fermentation phases. Results are cached
+until a new reading arrives.
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Reading, ReadingStat
+
+logger = logging.getLogger(__name__)
+
+# Batches whose reading series are kept in memory
+SERIES_CACHE_SIZE = 16
+# Computed results kept (across all batches)
+RESULT_CACHE_SIZE = 128
+
+# Gravity slope thresholds, in SG per hour (~10 and ~2.4 points per day)
+ACTIVE_SG_RATE = -0.0004
+SLOW_SG_RATE = -0.0001
+# Temperature slope beyond which the trend counts as rising/falling (°C/hour)
+TEMP_TREND_RATE = 0.5
+# Window each phase is classified over
+PHASE_WINDOW_HOURS = 6.0
+# Gravity drop that ends the lag phase
+LAG_DROP = 0.003
+# Gaps longer than this don't count towards time-in-range
+MAX_GAP_SECONDS = 2 * 3600
+
+
+@dataclass
+class ReadingSeries:
+    """A batch's readings as parallel arrays, oldest first."""
+
+    times: np.ndarray  # epoch seconds
+    sg: np.ndarray  # calibrated SG, falling back to raw (NaN if missing)
+    temp: np.ndarray  # calibrated °C, falling back to raw (NaN if missing)
+    confidence: np.ndarray
+    anomaly: np.ndarray  # bool
+    reasons: list = field(default_factory=list)  # anomaly_reasons JSON text
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def select(self, mask: np.ndarray) -> "ReadingSeries":
+        """The readings where a boolean mask is set."""
+        return self.take(np.flatnonzero(mask))
+
+    def take(self, indices: np.ndarray) -> "ReadingSeries":
+        """The readings at the given positions, in that order."""
+        return ReadingSeries(
+            times=self.times[indices],
+            sg=self.sg[indices],
+            temp=self.temp[indices],
+            confidence=self.confidence[indices],
+            anomaly=self.anomaly[indices],
+            reasons=[self.reasons[i] for i in indices],
+        )
+
+    def extend(self, other: "ReadingSeries") -> "ReadingSeries":
+        merged = ReadingSeries(
+            times=np.concatenate([self.times, other.times]),
+            sg=np.concatenate([self.sg, other.sg]),
+            temp=np.concatenate([self.temp, other.temp]),
+            confidence=np.concatenate([self.confidence, other.confidence]),
+            anomaly=np.concatenate([self.anomaly, other.anomaly]),
+            reasons=self.reasons + other.reasons,
+        )
+        # Buffered gateway readings can arrive after newer ones
+        if len(merged) > 1 and np.any(np.diff(merged.times) < 0):
+            merged = merged.take(np.argsort(merged.times, kind="stable"))
+        return merged
+
+
+@dataclass
+class _CachedSeries:
+    series: ReadingSeries
+    since: Optional[datetime]  # None = the batch's whole history
+    last_id: int
+    count: Optional[int]  # batch counter when loaded (None without counters)
+    version: int = 0
+
+
+_series_cache: "OrderedDict[int, _CachedSeries]" = OrderedDict()
+_result_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+
+
+def clear_cache() -> None:
+    """Drop every cached series and result."""
+    _series_cache.clear()
+    _result_cache.clear()
+
+
+def _epoch(dt: datetime) -> float:
+    # SQLite hands back naive datetimes; they are UTC
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _as_datetime(epoch: float) -> datetime:
+    return datetime.fromtimestamp(float(epoch), tz=timezone.utc)
+
+
+def _to_series(rows) -> ReadingSeries:
+    def floats(values):
+        return np.array([np.nan if v is None else float(v) for v in values], dtype=float)
+
+    rows = list(rows)
+    columns = list(zip(*rows)) if rows else [()] * 7
+    return ReadingSeries(
+        times=np.array([_epoch(t) for t in columns[1]], dtype=float),
+        sg=floats(columns[2]),
+        temp=floats(columns[3]),
+        confidence=floats(columns[4]),
+        anomaly=np.array([bool(v) for v in columns[5]], dtype=bool),
+        reasons=list(columns[6]),
+    )
+
+
+async def _fetch(
+    db: AsyncSession,
+    batch_id: int,
+    since: Optional[datetime] = None,
+    after_id: Optional[int] = None,
+) -> tuple[ReadingSeries, int]:
+    """Load readings as column tuples. Returns the series and its highest id."""
+    stmt = (
+        select(
+            Reading.id,
+            Reading.timestamp,
+            func.coalesce(Reading.sg_calibrated, Reading.sg_raw),
+            func.coalesce(Reading.temp_calibrated, Reading.temp_raw),
+            Reading.confidence,
+            Reading.is_anomaly,
+            Reading.anomaly_reasons,
+        )
+        .where(Reading.batch_id == batch_id)
+        .order_by(Reading.timestamp, Reading.id)
+    )
+    if since is not None:
+        stmt = stmt.where(Reading.timestamp >= since)
+    if after_id is not None:
+        stmt = stmt.where(Reading.id > after_id)
+    rows = (await db.execute(stmt)).all()
+    last_id = max((row[0] for row in rows), default=after_id or 0)
+    return _to_series(rows), last_id
+
+
+async def read_series(db: AsyncSession, batch_id: int) -> ReadingSeries:
+    """A batch's whole reading history, bypassing the cache.
+
+    For one-off scans of finished batches, which would otherwise evict the
+    series of batches still fermenting.
+    """
+    series, _ = await _fetch(db, batch_id)
+    return series
+
+
+async def _batch_version(db: AsyncSession, batch_id: int) -> tuple[int, Optional[int]]:
+    """(highest reading id, counter) for a batch - both single index lookups."""
+    last_id = await db.scalar(
+        select(func.max(Reading.id)).where(Reading.batch_id == batch_id)
+    )
+    count = await db.scalar(
+        select(ReadingStat.readings).where(
+            ReadingStat.scope == "batch", ReadingStat.key == str(batch_id)
+        )
+    )
+    return last_id or 0, count
+
+
+async def load_series(
+    db: AsyncSession,
+    batch_id: int,
+    since: Optional[datetime] = None,
+) -> tuple[ReadingSeries, int]:
+    """Get a batch's readings from ``since`` on (all if None), oldest first.
+
+    Returns the series and a version that changes whenever the batch's
+    readings do.
+    """
+    last_id, count = await _batch_version(db, batch_id)
+    cached = _series_cache.get(batch_id)
+
+    covers = cached is not None and (
+        cached.since is None or (since is not None and cached.since <= since)
+    )
+    if covers and last_id >= cached.last_id:
+        if last_id > cached.last_id:
+            new, _ = await _fetch(db, batch_id, cached.since, after_id=cached.last_id)
+            cached.series = cached.series.extend(new)
+            cached.last_id = last_id
+            cached.version += 1
+            # Anything besides the new readings changed -> reload below
+            expected = (cached.count + len(new)) if cached.count is not None else None
+            cached.count, count_matches = count, expected == count
+        else:
+            count_matches = cached.count == count
+        if count_matches:
+            _series_cache.move_to_end(batch_id)
+            return _slice(cached.series, since), cached.version
+
+    series, loaded_id = await _fetch(db, batch_id, since)
+    version = (cached.version + 1) if cached else 0
+    _series_cache[batch_id] = _CachedSeries(series, since, loaded_id, count, version)
+    _series_cache.move_to_end(batch_id)
+    while len(_series_cache) > SERIES_CACHE_SIZE:
+        _series_cache.popitem(last=False)
+    return series, version
+
+
+def _slice(series: ReadingSeries, since: Optional[datetime]) -> ReadingSeries:
+    if since is None or not len(series):
+        return series
+    return series.select(series.times >= _epoch(since))
+
+
+def _round(value, digits: int) -> Optional[float]:
+    if value is None or not np.isfinite(value):
+        return None
+    return round(float(value), digits)
+
+
+def regression(times: np.ndarray, values: np.ndarray) -> Optional[dict]:
+    """Least-squares slope per hour and R² of values against time."""
+    mask = np.isfinite(values)
+    if mask.sum() < 2:
+        return None
+    hours = (times[mask] - times[mask][0]) / 3600.0
+    y = values[mask]
+    if np.ptp(hours) == 0:
+        return None
+    slope, intercept = np.polyfit(hours, y, 1)
+    residual = y - (slope * hours + intercept)
+    total = np.sum((y - y.mean()) ** 2)
+    r_squared = 1.0 - np.sum(residual ** 2) / total if total > 0 else 1.0
+    return {"slope_per_hour": float(slope), "r_squared": float(r_squared)}
+
+
+def _percentiles(values: np.ndarray, digits: int) -> dict:
+    p10, p50, p90 = np.percentile(values, [10, 50, 90])
+    return {"p10": _round(p10, digits), "median": _round(p50, digits), "p90": _round(p90, digits)}
+
+
+def sg_summary(series: ReadingSeries) -> Optional[dict]:
+    """Gravity range, percentiles and change over the series."""
+    sg = series.sg[np.isfinite(series.sg)]
+    if not len(sg):
+        return None
+    return {
+        "min": _round(sg.min(), 4),
+        "max": _round(sg.max(), 4),
+        "start": _round(sg[0], 4),
+        "end": _round(sg[-1], 4),
+        "change": _round(sg[-1] - sg[0], 4),
+        **_percentiles(sg, 4),
+    }
+
+
+def time_in_range(
+    series: ReadingSeries,
+    low: Optional[float],
+    high: Optional[float],
+) -> Optional[dict]:
+    """Share of time spent below, within and above a temperature range.
+
+    Each reading's temperature holds until the next reading, up to
+    MAX_GAP_SECONDS; longer gaps (device offline) are left out.
+    """
+    if low is None or high is None or len(series) < 2:
+        return None
+    durations = np.minimum(np.diff(series.times), MAX_GAP_SECONDS)
+    temps = series.temp[:-1]
+    mask = np.isfinite(temps)
+    durations, temps = durations[mask], temps[mask]
+    total = durations.sum()
+    if total <= 0:
+        return None
+    below = durations[temps < low].sum()
+    above = durations[temps > high].sum()
+    return {
+        "low_c": low,
+        "high_c": high,
+        "in_range_percent": _round(100.0 * (total - below - above) / total, 1),
+        "below_percent": _round(100.0 * below / total, 1),
+        "above_percent": _round(100.0 * above / total, 1),
+        "hours_counted": _round(total / 3600.0, 1),
+    }
+
+
+def temp_summary(series: ReadingSeries, low: Optional[float] = None, high: Optional[float] = None) -> Optional[dict]:
+    """Temperature range, percentiles and time-in-range over the series."""
+    temp = series.temp[np.isfinite(series.temp)]
+    if not len(temp):
+        return None
+    summary = {
+        "min": _round(temp.min(), 1),
+        "max": _round(temp.max(), 1),
+        "avg": _round(temp.mean(), 1),
+        **_percentiles(temp, 1),
+    }
+    in_range = time_in_range(series, low, high)
+    if in_range:
+        summary["time_in_range"] = in_range
+    return summary
+
+
+def _sg_trend(rate: float) -> str:
+    if rate < ACTIVE_SG_RATE:
+        return "actively_fermenting"
+    if rate < SLOW_SG_RATE:
+        return "slowly_fermenting"
+    return "stable"
+
+
+def trend_analysis(series: ReadingSeries) -> dict:
+    """Regression slopes and trend labels for gravity and temperature."""
+    trend = {}
+    sg_fit = regression(series.times, series.sg)
+    if sg_fit:
+        trend["sg_rate_per_hour"] = round(sg_fit["slope_per_hour"], 6)
+        trend["sg_r_squared"] = round(sg_fit["r_squared"], 3)
+        trend["sg_trend"] = _sg_trend(sg_fit["slope_per_hour"])
+    temp_fit = regression(series.times, series.temp)
+    if temp_fit:
+        rate = temp_fit["slope_per_hour"]
+        trend["temp_rate_per_hour"] = round(rate, 3)
+        if rate > TEMP_TREND_RATE:
+            trend["temp_trend"] = "rising"
+        elif rate < -TEMP_TREND_RATE:
+            trend["temp_trend"] = "falling"
+        else:
+            trend["temp_trend"] = "stable"
+    return trend
+
+
+def detect_phases(series: ReadingSeries) -> list[dict]:
+    """Split the series into lag, active, slowing and stable phases.
+
+    Each PHASE_WINDOW_HOURS window is classified by its gravity slope;
+    before the gravity has dropped LAG_DROP below the start it is lag.
+    Adjacent windows with the same phase are merged.
+    """
+    mask = np.isfinite(series.sg)
+    times, sg = series.times[mask], series.sg[mask]
+    if len(times) < 2:
+        return []
+
+    window = PHASE_WINDOW_HOURS * 3600.0
+    edges = np.arange(times[0], times[-1] + window, window)
+    buckets = np.searchsorted(edges, times, side="right") - 1
+    start_sg = sg[0]
+    fermenting = False
+    phases: list[dict] = []
+    for bucket in np.unique(buckets):
+        in_bucket = buckets == bucket
+        fit = regression(times[in_bucket], sg[in_bucket])
+        rate = fit["slope_per_hour"] if fit else 0.0
+        fermenting = fermenting or (start_sg - sg[in_bucket].min()) >= LAG_DROP
+        if not fermenting:
+            phase = "lag"
+        elif rate < ACTIVE_SG_RATE:
+            phase = "active"
+        elif rate < SLOW_SG_RATE:
+            phase = "slowing"
+        else:
+            phase = "stable"
+
+        start, end = times[in_bucket][0], times[in_bucket][-1]
+        if phases and phases[-1]["phase"] == phase:
+            phases[-1]["end"] = end
+        else:
+            phases.append({"phase": phase, "start": start, "end": end})
+
+    for phase in phases:
+        phase["hours"] = round((phase["end"] - phase["start"]) / 3600.0, 1)
+        phase["start"] = _as_datetime(phase["start"]).isoformat()
+        phase["end"] = _as_datetime(phase["end"]).isoformat()
+    return phases
+
+
+def sample_readings(series: ReadingSeries, max_readings: int = 50) -> list[dict]:
+    """Evenly spaced readings (all of them if there are few) as dicts."""
+    if max_readings <= 0:
+        return []
+    if len(series) <= max_readings:
+        indices = range(len(series))
+    else:
+        step = len(series) / max_readings
+        indices = [int(i * step) for i in range(max_readings)]
+    return [
+        {
+            "timestamp": _as_datetime(series.times[i]).isoformat(),
+            "sg": _round(series.sg[i], 4),
+            "temp_c": _round(series.temp[i], 2),
+            "confidence": _round(series.confidence[i], 3),
+            "is_anomaly": bool(series.anomaly[i]),
+            "anomaly_reasons": series.reasons[i],
+        }
+        for i in indices
+    ]
+
+
+async def analyze_batch(
+    db: AsyncSession,
+    batch_id: int,
+    hours: Optional[int] = None,
+    anomalies_only: bool = False,
+    temp_range: Optional[tuple[Optional[float], Optional[float]]] = None,
+    max_samples: int = 50,
+) -> dict[str, Any]:
+    """Summarize a batch's readings over the last ``hours`` (all if None).
+
+    Returns count, time_range, summary (sg, temp_c incl. time-in-range when
+    temp_range is given), trend_analysis, phases and sampled readings.
+    """
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(hours=hours) if hours else None
+    series, version = await load_series(db, batch_id, since)
+
+    # The window start moves with the clock, so results for a time window
+    # are reused for at most a minute even without new readings
+    key = (batch_id, version, hours, anomalies_only, temp_range, max_samples,
+           int(now.timestamp() // 60) if hours else None)
+    if key in _result_cache:
+        _result_cache.move_to_end(key)
+        return _result_cache[key]
+
+    if anomalies_only:
+        series = series.select(series.anomaly)
+
+    low, high = temp_range or (None, None)
+    result: dict[str, Any] = {"count": len(series)}
+    if len(series):
+        result.update({
+            "time_range": {
+                "start": _as_datetime(series.times[0]).isoformat(),
+                "end": _as_datetime(series.times[-1]).isoformat(),
+            },
+            "summary": {
+                name: value for name, value in (
+                    ("sg", sg_summary(series)),
+                    ("temp_c", temp_summary(series, low, high)),
+                ) if value
+            },
+            "trend_analysis": trend_analysis(series),
+            "phases": detect_phases(series),
+            "readings": sample_readings(series, max_samples),
+        })
+
+    _result_cache[key] = result
+    while len(_result_cache) > RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+    return result
@@ -1,10 +1,17 @@
-"""Home Assistant REST API client."""
+"""Home Assistant REST API client.
+
+Entity state reads are answered from the WebSocket event stream's cache
+(ha_events.py) when it is connected to the same HA instance.
+"""
 
 import logging
 from typing import Any, Optional
 
 import httpx
 
+from .ha_events import get_ha_event_stream
+from .http_clients import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,7 +26,6 @@ class HAClient:
     def __init__(self, url: str, token: str):
         self.url = url.rstrip("/")
         self.token = token
-        self._client: Optional[httpx.AsyncClient] = None
 
     @property
     def headers(self) -> dict[str, str]:
@@ -29,14 +35,11 @@ class HAClient:
         }
 
     async def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=10.0)
-        return self._client
+        # Shared across HA clients so connections are reused between polls
+        return get_http_client("ha")
 
     async def close(self) -> None:
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
-            self._client = None
+        """No-op: the shared HTTP client is closed at app shutdown."""
 
     async def test_connection(self) -> bool:
         """Test if HA is reachable and token is valid."""
@@ -54,6 +57,11 @@ class HAClient:
         Returns dict with 'state', 'attributes', 'last_changed', etc.
         Returns None if entity not found or error.
         """
+        stream = get_ha_event_stream(self.url)
+        if stream:
+            cached = stream.get(entity_id)
+            if cached is not None:
+                return cached
         try:
             client = await self._get_client()
             response = await client.get(
@@ -61,7 +69,11 @@ class HAClient:
                 headers=self.headers
             )
             if response.status_code == 200:
-                return response.json()
+                state = response.json()
+                if stream:
+                    # Kept current by state_changed events from now on
+                    stream.seed(entity_id, state)
+                return state
             elif response.status_code == 404:
                 logger.warning(f"Entity not found: {entity_id}")
                 return None
@@ -92,6 +104,10 @@ class HAClient:
             )
             if response.status_code == 200:
                 logger.info(f"HA service called: {domain}/{service} on {entity_id}")
+                stream = get_ha_event_stream(self.url)
+                if stream:
+                    # Read back from HA until the resulting state_changed arrives
+                    stream.invalidate(entity_id)
                 return True
             else:
                 logger.error(f"HA call_service failed: {response.status_code}")
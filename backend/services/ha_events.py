@@ -0,0 +1,208 @@
+"""Home Assistant WebSocket event stream and entity state cache.
+
+The ambient and chamber pollers and the temperature controller read the same
+handful of HA entities every 30-60 seconds, each with its own REST request.
+Instead, one WebSocket connection subscribes to ``state_changed`` events and
+keeps the latest state of every watched entity in memory. HAClient.get_state
+answers from this cache while the stream is live and falls back to REST when
+it isn't.
+
+Watched entities are the configured ones (ambient, chamber, weather, batch
+heaters and coolers; see ha_event_listener.py) plus any entity HAClient has
+read over REST. Events for other entities are ignored, so the cache stays
+small even on large HA installs.
+
+After each (re)connect, events missed while disconnected are covered by one
+bulk ``/api/states`` fetch. It runs after subscribing, so nothing changes
+unseen in between; an event older than the state already cached (by
+``last_updated``) is dropped.
+
+Protocol: https://developers.home-assistant.io/docs/api/websocket
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Iterable, Optional
+
+import websockets
+
+from .http_clients import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Reconnect backoff bounds (doubles after each failed attempt)
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 60.0
+# Bulk /api/states fetch timeout; large HA installs return a few MB
+SNAPSHOT_TIMEOUT_SECONDS = 30.0
+
+
+class HAEventStreamError(Exception):
+    """HA rejected the WebSocket handshake or subscription."""
+    pass
+
+
+def websocket_url(url: str) -> str:
+    """HA base URL -> its WebSocket API URL."""
+    url = url.rstrip("/")
+    if url.startswith("https://"):
+        url = "wss://" + url[len("https://"):]
+    elif url.startswith("http://"):
+        url = "ws://" + url[len("http://"):]
+    return f"{url}/api/websocket"
+
+
+class HAEventStream:
+    """One HA WebSocket subscription and the entity states it keeps current."""
+
+    def __init__(self, url: str, token: str, entities: Iterable[str] = ()):
+        self.url = url.rstrip("/")
+        self.token = token
+        self.live = False
+        self.connects = 0
+        self.events = 0
+        self._watched: set[str] = set(entities)
+        self._states: dict[str, dict[str, Any]] = {}
+        self._next_id = 1
+
+    def watch(self, entity_ids: Iterable[str]) -> None:
+        """Track these entities too (their state arrives with the next event or read)."""
+        self._watched.update(e for e in entity_ids if e)
+
+    def get(self, entity_id: str) -> Optional[dict[str, Any]]:
+        """Cached state of an entity, or None if not live or not cached."""
+        if not self.live:
+            return None
+        return self._states.get(entity_id)
+
+    def seed(self, entity_id: str, state: dict[str, Any]) -> None:
+        """Cache a state read over REST and watch the entity from now on."""
+        self._watched.add(entity_id)
+        self._apply(entity_id, state)
+
+    def invalidate(self, entity_id: str) -> None:
+        """Drop an entity's cached state (e.g. after commanding it) until it changes."""
+        self._states.pop(entity_id, None)
+
+    def _apply(self, entity_id: str, state: Optional[dict[str, Any]]) -> None:
+        if entity_id not in self._watched:
+            return
+        if state is None:
+            # Entity removed from HA
+            self._states.pop(entity_id, None)
+            return
+        cached = self._states.get(entity_id)
+        # ISO 8601 UTC timestamps in HA's fixed format compare as strings
+        if cached and (cached.get("last_updated") or "") > (state.get("last_updated") or ""):
+            return
+        self._states[entity_id] = state
+
+    def _command(self, payload: dict) -> str:
+        payload = {"id": self._next_id, **payload}
+        self._next_id += 1
+        return json.dumps(payload)
+
+    async def _handshake(self, ws) -> None:
+        message = json.loads(await ws.recv())
+        if message.get("type") != "auth_required":
+            raise HAEventStreamError(f"Unexpected HA greeting: {message.get('type')}")
+        await ws.send(json.dumps({"type": "auth", "access_token": self.token}))
+        message = json.loads(await ws.recv())
+        if message.get("type") != "auth_ok":
+            raise HAEventStreamError(message.get("message") or "HA authentication failed")
+
+        self._next_id = 1
+        await ws.send(self._command({"type": "subscribe_events", "event_type": "state_changed"}))
+        message = json.loads(await ws.recv())
+        if message.get("type") != "result" or not message.get("success"):
+            error = (message.get("error") or {}).get("message", "subscription failed")
+            raise HAEventStreamError(f"HA subscribe_events failed: {error}")
+
+    async def refresh(self) -> None:
+        """Replace cached states of watched entities with one bulk REST fetch."""
+        response = await get_http_client("ha").get(
+            f"{self.url}/api/states",
+            headers={"Authorization": f"Bearer {self.token}"},
+            timeout=SNAPSHOT_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        states = {
+            state["entity_id"]: state
+            for state in response.json()
+            if state.get("entity_id") in self._watched
+        }
+        # Anything not in the snapshot no longer exists
+        for entity_id in set(self._states) - set(states):
+            self._states.pop(entity_id, None)
+        for entity_id, state in states.items():
+            self._apply(entity_id, state)
+
+    def _handle(self, message: dict) -> None:
+        if message.get("type") != "event":
+            return
+        event = message.get("event") or {}
+        if event.get("event_type") != "state_changed":
+            return
+        data = event.get("data") or {}
+        entity_id = data.get("entity_id")
+        if entity_id:
+            self.events += 1
+            self._apply(entity_id, data.get("new_state"))
+
+    async def connect_once(self) -> None:
+        """Connect, subscribe, refresh, then apply events until disconnected."""
+        async with websockets.connect(websocket_url(self.url), max_size=None) as ws:
+            await self._handshake(ws)
+            await self.refresh()
+            self.live = True
+            self.connects += 1
+            logger.info("HA event stream connected (%d entities watched)", len(self._watched))
+            try:
+                async for raw in ws:
+                    self._handle(json.loads(raw))
+            finally:
+                self.live = False
+
+    async def run(self) -> None:
+        """Keep the stream connected, reconnecting with backoff. Runs until cancelled."""
+        delay = RECONNECT_MIN_SECONDS
+        while True:
+            try:
+                await self.connect_once()
+                # Clean close after a good session (e.g. HA restart): reconnect promptly
+                delay = RECONNECT_MIN_SECONDS
+                logger.warning("HA event stream closed, reconnecting")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.warning("HA event stream error: %s (retrying in %.0fs)", e, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+            finally:
+                self.live = False
+
+    def status(self) -> dict:
+        return {
+            "url": self.url,
+            "live": self.live,
+            "connects": self.connects,
+            "events": self.events,
+            "watched": len(self._watched),
+            "cached": len(self._states),
+        }
+
+
+# The stream for the configured HA instance (managed by ha_event_listener)
+_stream: Optional[HAEventStream] = None
+
+
+def get_ha_event_stream(url: Optional[str] = None) -> Optional[HAEventStream]:
+    """The active stream, optionally only if it is for ``url``."""
+    if _stream is None or (url is not None and _stream.url != url.rstrip("/")):
+        return None
+    return _stream
+
+
+def set_ha_event_stream(stream: Optional[HAEventStream]) -> None:
+    global _stream
+    _stream = stream
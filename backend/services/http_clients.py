@@ -0,0 +1,96 @@
+"""Shared HTTP clients, one per outbound service.
+
+Creating an ``httpx.AsyncClient`` per call throws away its connection pool,
+so every request paid a new TCP (and TLS) handshake. Callers now borrow a
+long-lived client per service instead:
+
+- ``ha``: Home Assistant REST API
+- ``shelly``: Shelly relays on the LAN
+- ``llm``: local LLM servers (hailo-ollama generation and status probes)
+- ``sync``: Supabase REST (cloud sync pushes)
+- ``web``: arbitrary pages fetched by the assistant's fetch_url tool
+
+Each client has its own connection limits, so a slow service can't use up
+the connections of another. Idle connections are kept alive for reuse.
+HTTP/2 is negotiated over TLS when the optional ``h2`` package is installed.
+Plain-HTTP LAN devices keep using HTTP/1.1.
+
+Clients are created on first use and closed by ``close_http_clients`` in the
+app lifespan. A closed client is recreated on next use, so calls made after
+shutdown (e.g. in tests) still work. Pass per-request ``timeout=`` to
+override a client's default.
+"""
+
+import importlib.util
+import logging
+from dataclasses import dataclass
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class ClientProfile:
+    """Settings for one shared client."""
+
+    timeout: float
+    max_connections: int
+    max_keepalive: int
+    keepalive_expiry: float = 30.0
+    follow_redirects: bool = False
+
+
+PROFILES: dict[str, ClientProfile] = {
+    "ha": ClientProfile(timeout=10.0, max_connections=10, max_keepalive=5),
+    "shelly": ClientProfile(timeout=5.0, max_connections=10, max_keepalive=5),
+    "llm": ClientProfile(timeout=30.0, max_connections=4, max_keepalive=2),
+    # Room for two overlapping pushes at SYNC_CONCURRENCY (4) requests each
+    "sync": ClientProfile(timeout=5.0, max_connections=8, max_keepalive=4),
+    "web": ClientProfile(timeout=15.0, max_connections=10, max_keepalive=2, follow_redirects=True),
+}
+
+_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """Get the shared client for a service (see PROFILES).
+
+    Don't close it - it belongs to the app lifespan.
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        profile = PROFILES[name]
+        client = httpx.AsyncClient(
+            timeout=profile.timeout,
+            limits=httpx.Limits(
+                max_connections=profile.max_connections,
+                max_keepalive_connections=profile.max_keepalive,
+                keepalive_expiry=profile.keepalive_expiry,
+            ),
+            follow_redirects=profile.follow_redirects,
+            http2=HTTP2_AVAILABLE,
+        )
+        _clients[name] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every shared client (app shutdown)."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning("Error closing HTTP client: %s", e)
+
+
+def http_client_status() -> dict[str, dict]:
+    """Which shared clients are open, for diagnostics."""
+    return {
+        name: {"open": name in _clients and not _clients[name].is_closed, "http2": HTTP2_AVAILABLE}
+        for name in PROFILES
+    }
@@ -106,7 +106,7 @@ class LLMService:
         max_tokens: Optional[int],
     ) -> str:
         """Fallback to /api/generate for hailo-ollama when chat fails."""
-        import httpx
+        from backend.services.http_clients import get_http_client
 
         base_url = self.config.base_url or DEFAULT_BASE_URLS.get(
             LLMProvider.HAILO, "http://localhost:8000"
@@ -122,16 +122,15 @@ class LLMService:
         if max_tokens is not None:
             payload["num_predict"] = max_tokens
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(f"{base_url}/api/generate", json=payload)
-            resp.raise_for_status()
-            data = resp.json()
-            if "response" in data:
-                return data["response"]
-            # Fallback if server returns chat-style payload
-            if "message" in data and isinstance(data["message"], dict):
-                return data["message"].get("content", "")
-            raise LLMServiceError("Unexpected hailo-ollama response format")
+        resp = await get_http_client("llm").post(f"{base_url}/api/generate", json=payload)
+        resp.raise_for_status()
+        data = resp.json()
+        if "response" in data:
+            return data["response"]
+        # Fallback if server returns chat-style payload
+        if "message" in data and isinstance(data["message"], dict):
+            return data["message"].get("content", "")
+        raise LLMServiceError("Unexpected hailo-ollama response format")
 
     async def chat(
         self,
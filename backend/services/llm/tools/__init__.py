@@ -2,6 +2,10 @@
 
 This package defines tools that the LLM can call to query the database
 for yeast strains, beer styles, and other brewing information.
+
+TOOL_DEFINITIONS holds the schemas sent to the LLM; the implementations
+live in the submodules and are dispatched through ``registry`` (see
+registry.py), which imports each module on its first call.
 """
 
 import logging
@@ -10,72 +14,21 @@ from typing import Any, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-# Import all tool implementations from submodules
-from .yeast_style import (
-    search_yeast,
-    search_styles,
-    get_yeast_by_id,
-    get_style_by_name,
-)
-from .inventory import (
-    search_inventory_hops,
-    search_inventory_yeast,
-    check_recipe_ingredients,
-    get_inventory_summary,
-    get_equipment,
-)
-from .ingredients import (
-    search_hop_varieties,
-    search_fermentables,
-)
-from .fermentation import (
-    list_fermentations,
-    get_fermentation_status,
-    get_fermentation_history,
-    get_ambient_conditions,
-    compare_batches,
-    get_yeast_fermentation_advice,
-)
-from .recipe import (
-    normalize_recipe_to_beerjson,
-    calculate_recipe_stats,
-    save_recipe,
-    update_recipe,
-    review_recipe,
-    review_recipe_narrative,  # back-compat alias for review_recipe
-    review_recipe_style,
-    get_recipe,
-    list_recipes,
-)
-from .utility import (
-    get_current_datetime,
-    strip_html_tags,
-    fetch_url,
-    rename_chat,
-    list_recent_threads,
-    get_thread_context,
-    search_threads,
-)
-from .reflections import (
-    create_batch_reflection,
-    get_batch_reflections,
-    update_batch_reflection,
-)
-from .tasting import (
-    start_tasting_session,
-    save_tasting_note,
-    get_batch_tasting_notes,
-)
+from .budget import ToolBudget
+from .registry import DB, DB_USER, ToolRegistry
 
 logger = logging.getLogger(__name__)
 
-__all__ = ['TOOL_DEFINITIONS', 'execute_tool']
+__all__ = ['TOOL_DEFINITIONS', 'execute_tool', 'registry']
+
+registry = ToolRegistry(__name__)
 
 
 # ==============================================================================
 # Memory Search Tool
 # ==============================================================================
 
+@registry.tool(context=DB_USER)
 async def search_brewing_memories(
     db: AsyncSession,
     query: str,
@@ -115,6 +68,7 @@ async def search_brewing_memories(
         return {"count": 0, "memories": [], "error": str(e)}
 
 
+@registry.tool(context=DB_USER)
 async def save_brewing_learning(
     db: AsyncSession,
     learning: str,
@@ -527,7 +481,7 @@ TOOL_DEFINITIONS = [
         "type": "function",
         "function": {
             "name": "compare_batches",
-            "description": "Find similar historical batches for comparison. Useful for comparing current fermentation to past batches with the same recipe, style, or yeast strain.",
+            "description": "Find similar historical batches for comparison. Useful for comparing current fermentation to past batches with the same recipe, style, or yeast strain, or to find batches that fermented like this one.",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -537,8 +491,8 @@ TOOL_DEFINITIONS = [
                     },
                     "comparison_type": {
                         "type": "string",
-                        "enum": ["recipe", "style", "yeast"],
-                        "description": "Type of comparison: 'recipe' matches same recipe, 'style' matches same beer style, 'yeast' matches same yeast strain"
+                        "enum": ["recipe", "style", "yeast", "fermentation"],
+                        "description": "Type of comparison: 'recipe' matches same recipe, 'style' matches same beer style, 'yeast' matches same yeast strain, 'fermentation' ranks batches by how similarly they fermented (gravities, attenuation, temperature, duration, curve shape)"
                     },
                     "limit": {
                         "type": "integer",
@@ -1351,6 +1305,65 @@ TOOL_DEFINITIONS = [
 ]
 
 
+# Tool implementations, imported on first call. Tools reading or writing
+# per-user data get user_id for multi-tenant isolation.
+for _name, _target, _context in [
+    # Yeast and style tools
+    ("search_yeast", "yeast_style:search_yeast", DB),
+    ("search_styles", "yeast_style:search_styles", DB),
+    ("get_yeast_by_id", "yeast_style:get_yeast_by_id", DB),
+    ("get_style_by_name", "yeast_style:get_style_by_name", DB),
+    # Inventory tools
+    ("search_inventory_hops", "inventory:search_inventory_hops", DB_USER),
+    ("search_inventory_yeast", "inventory:search_inventory_yeast", DB_USER),
+    ("check_recipe_ingredients", "inventory:check_recipe_ingredients", DB_USER),
+    ("get_inventory_summary", "inventory:get_inventory_summary", DB_USER),
+    ("get_equipment", "inventory:get_equipment", DB_USER),
+    # Fermentation monitoring tools
+    ("list_fermentations", "fermentation:list_fermentations", DB_USER),
+    ("get_fermentation_status", "fermentation:get_fermentation_status", DB_USER),
+    ("get_fermentation_history", "fermentation:get_fermentation_history", DB_USER),
+    ("get_ambient_conditions", "fermentation:get_ambient_conditions", DB),
+    ("compare_batches", "fermentation:compare_batches", DB_USER),
+    ("get_yeast_fermentation_advice", "fermentation:get_yeast_fermentation_advice", DB_USER),
+    # Recipe tools
+    ("get_recipe", "recipe:get_recipe", DB_USER),
+    ("list_recipes", "recipe:list_recipes", DB_USER),
+    ("save_recipe", "recipe:save_recipe", DB_USER),
+    ("update_recipe", "recipe:update_recipe", DB_USER),
+    ("review_recipe_style", "recipe:review_recipe_style", DB_USER),
+    # Ingredient reference library tools
+    ("search_hop_varieties", "ingredients:search_hop_varieties", DB),
+    ("search_fermentables", "ingredients:search_fermentables", DB),
+    # System / utility tools
+    ("get_current_datetime", "utility:get_current_datetime", {}),
+    ("fetch_url", "utility:fetch_url", {}),
+    ("rename_chat", "utility:rename_chat", {"db": "db", "thread_id": "thread_id"}),
+    ("search_threads", "utility:search_threads", {**DB_USER, "current_thread_id": "thread_id"}),
+    ("list_recent_threads", "utility:list_recent_threads", {**DB_USER, "current_thread_id": "thread_id"}),
+    ("get_thread_context", "utility:get_thread_context", DB_USER),
+    # Batch reflection tools
+    ("create_batch_reflection", "reflections:create_batch_reflection", DB_USER),
+    ("get_batch_reflections", "reflections:get_batch_reflections", DB_USER),
+    ("update_batch_reflection", "reflections:update_batch_reflection", DB_USER),
+    # Tasting note tools
+    ("start_tasting_session", "tasting:start_tasting_session", DB_USER),
+    ("save_tasting_note", "tasting:save_tasting_note", DB_USER),
+    ("get_batch_tasting_notes", "tasting:get_batch_tasting_notes", DB_USER),
+]:
+    registry.register(_name, _target, _context)
+# review_recipe_narrative is the tool's former name
+registry.register("review_recipe", "recipe:review_recipe", DB_USER, aliases=("review_recipe_narrative",))
+registry.set_definitions(TOOL_DEFINITIONS)
+
+# Output budgets (JSON characters) beyond the default. get_recipe's
+# ingredient lists are round-tripped into update_recipe, so they are never cut.
+registry.set_budget("get_recipe", ToolBudget(chars=24000, keep=("fermentables", "hops", "cultures")))
+registry.set_budget("list_recipes", ToolBudget(chars=8000, project={"recipes": ("id", "name", "style", "abv", "og", "fg")}))
+registry.set_budget("list_fermentations", ToolBudget(chars=8000))
+registry.set_budget("get_fermentation_history", ToolBudget(chars=8000))
+
+
 async def execute_tool(
     db: AsyncSession,
     tool_name: str,
@@ -1371,89 +1384,4 @@ async def execute_tool(
         Tool result as a dictionary
     """
     logger.info(f"Executing tool: {tool_name} with args: {arguments}")
-
-    # Yeast and style tools
-    if tool_name == "search_yeast":
-        return await search_yeast(db, **arguments)
-    elif tool_name == "search_styles":
-        return await search_styles(db, **arguments)
-    elif tool_name == "get_yeast_by_id":
-        return await get_yeast_by_id(db, **arguments)
-    elif tool_name == "get_style_by_name":
-        return await get_style_by_name(db, **arguments)
-    # Inventory tools - pass user_id for multi-tenant isolation
-    elif tool_name == "search_inventory_hops":
-        return await search_inventory_hops(db, user_id=user_id, **arguments)
-    elif tool_name == "search_inventory_yeast":
-        return await search_inventory_yeast(db, user_id=user_id, **arguments)
-    elif tool_name == "check_recipe_ingredients":
-        return await check_recipe_ingredients(db, user_id=user_id, **arguments)
-    elif tool_name == "get_inventory_summary":
-        return await get_inventory_summary(db, user_id=user_id)
-    elif tool_name == "get_equipment":
-        return await get_equipment(db, user_id=user_id, **arguments)
-    # Fermentation monitoring tools - pass user_id for multi-tenant isolation
-    elif tool_name == "list_fermentations":
-        return await list_fermentations(db, user_id=user_id, **arguments)
-    elif tool_name == "get_fermentation_status":
-        return await get_fermentation_status(db, user_id=user_id, **arguments)
-    elif tool_name == "get_fermentation_history":
-        return await get_fermentation_history(db, user_id=user_id, **arguments)
-    elif tool_name == "get_ambient_conditions":
-        return await get_ambient_conditions(db)
-    elif tool_name == "compare_batches":
-        return await compare_batches(db, user_id=user_id, **arguments)
-    elif tool_name == "get_yeast_fermentation_advice":
-        return await get_yeast_fermentation_advice(db, user_id=user_id, **arguments)
-    # Recipe tools - pass user_id for multi-tenant isolation
-    elif tool_name == "get_recipe":
-        return await get_recipe(db, user_id=user_id, **arguments)
-    elif tool_name == "list_recipes":
-        return await list_recipes(db, user_id=user_id, **arguments)
-    elif tool_name == "save_recipe":
-        return await save_recipe(db, user_id=user_id, **arguments)
-    elif tool_name == "update_recipe":
-        return await update_recipe(db, user_id=user_id, **arguments)
-    elif tool_name in ("review_recipe", "review_recipe_narrative"):
-        return await review_recipe(db, user_id=user_id, **arguments)
-    elif tool_name == "review_recipe_style":
-        return await review_recipe_style(db, user_id=user_id, **arguments)
-    # Ingredient reference library tools
-    elif tool_name == "search_hop_varieties":
-        return await search_hop_varieties(db, **arguments)
-    elif tool_name == "search_fermentables":
-        return await search_fermentables(db, **arguments)
-    # System / utility tools
-    elif tool_name == "get_current_datetime":
-        return get_current_datetime()
-    elif tool_name == "fetch_url":
-        return await fetch_url(**arguments)
-    elif tool_name == "rename_chat":
-        return await rename_chat(db, thread_id, **arguments)
-    elif tool_name == "search_threads":
-        return await search_threads(db, current_thread_id=thread_id, user_id=user_id, **arguments)
-    elif tool_name == "list_recent_threads":
-        return await list_recent_threads(db, current_thread_id=thread_id, user_id=user_id, **arguments)
-    elif tool_name == "get_thread_context":
-        return await get_thread_context(db, user_id=user_id, **arguments)
-    # Batch reflection tools - pass user_id for multi-tenant isolation
-    elif tool_name == "create_batch_reflection":
-        return await create_batch_reflection(db, user_id=user_id, **arguments)
-    elif tool_name == "get_batch_reflections":
-        return await get_batch_reflections(db, user_id=user_id, **arguments)
-    elif tool_name == "update_batch_reflection":
-        return await update_batch_reflection(db, user_id=user_id, **arguments)
-    # Tasting note tools - pass user_id for multi-tenant isolation
-    elif tool_name == "start_tasting_session":
-        return await start_tasting_session(db, user_id=user_id, **arguments)
-    elif tool_name == "save_tasting_note":
-        return await save_tasting_note(db, user_id=user_id, **arguments)
-    elif tool_name == "get_batch_tasting_notes":
-        return await get_batch_tasting_notes(db, user_id=user_id, **arguments)
-    # Memory search tools - pass user_id for multi-tenant isolation
-    elif tool_name == "search_brewing_memories":
-        return await search_brewing_memories(db, user_id=user_id, **arguments)
-    elif tool_name == "save_brewing_learning":
-        return await save_brewing_learning(db, user_id=user_id, **arguments)
-    else:
-        return {"error": f"Unknown tool: {tool_name}"}
+    return await registry.execute(tool_name, arguments, db=db, user_id=user_id, thread_id=thread_id)
@@ -0,0 +1,111 @@
+"""Output budgets for tool results.
+
+Tool results are appended verbatim to the conversation, so one large result
+(a long reading series, a big recipe list, a fetched page) is paid for on
+every later LLM call of the turn. The registry therefore measures each
+result and, when it exceeds the tool's budget, compacts it deterministically:
+
+1. Projection: list items are reduced to the fields the tool names.
+2. Lists are shortened, step by step. Time series (items with a
+   ``timestamp``, or plain numbers) are evenly downsampled, keeping the
+   first and last points. Other lists keep their first items.
+3. Long strings are cut at the same steps.
+
+Whatever was shortened is listed under ``_truncated`` in the result (path,
+total and shown), so the model knows to ask for less or page. Keys named in
+``keep`` are never touched, for results the model must round-trip intact
+(e.g. a recipe's ingredient lists).
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+# Budget for tools without their own, in JSON characters (~4 per token)
+DEFAULT_BUDGET_CHARS = 16000
+
+# (max list items, max string chars) tried in turn until the result fits
+COMPACTION_STEPS = ((50, 4000), (20, 2000), (10, 1000), (5, 400), (2, 200))
+
+
+@dataclass(frozen=True)
+class ToolBudget:
+    """How large a tool's result may get, and what compaction may touch."""
+
+    chars: int = DEFAULT_BUDGET_CHARS
+    keep: tuple[str, ...] = ()  # top-level keys never compacted
+    project: dict[str, tuple[str, ...]] = field(default_factory=dict)  # list key -> item fields kept
+
+
+def result_size(result: Any) -> int:
+    return len(json.dumps(result, default=str))
+
+
+def _is_series(items: list) -> bool:
+    first = items[0]
+    return isinstance(first, (int, float)) or (isinstance(first, dict) and "timestamp" in first)
+
+
+def _shorten_list(items: list, limit: int) -> tuple[list, str]:
+    if _is_series(items):
+        if limit == 1:
+            return items[-1:], "downsampled"
+        last = len(items) - 1
+        return [items[round(i * last / (limit - 1))] for i in range(limit)], "downsampled"
+    return items[:limit], "truncated"
+
+
+def _compact(value: Any, path: str, max_items: int, max_chars: int, notes: dict) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _compact(item, f"{path}.{key}" if path else key, max_items, max_chars, notes)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        total = notes.get(path, {}).get("total", len(value))
+        if len(value) > max_items:
+            value, method = _shorten_list(value, max_items)
+            notes[path] = {**notes.get(path, {}), "total": total, "shown": len(value), "method": method}
+        return [_compact(item, f"{path}[]", max_items, max_chars, notes) for item in value]
+    if isinstance(value, str) and len(value) > max_chars:
+        total = notes.get(path, {}).get("total_chars", len(value))
+        notes[path] = {"total_chars": total, "shown_chars": max_chars}
+        return value[:max_chars] + "…"
+    return value
+
+
+def _project(result: dict, project: dict[str, tuple[str, ...]], notes: dict) -> dict:
+    result = dict(result)
+    for key, fields in project.items():
+        items = result.get(key)
+        if isinstance(items, list) and items and isinstance(items[0], dict):
+            result[key] = [{name: item.get(name) for name in fields if name in item} for item in items]
+            notes[key] = {"fields": list(fields)}
+    return result
+
+
+def apply_budget(result: Any, budget: ToolBudget) -> tuple[Any, Optional[dict]]:
+    """Compact a tool result to fit its budget.
+
+    Returns the (possibly) compacted result and the truncation notes, or
+    None if the result already fit.
+    """
+    if not isinstance(result, dict) or result_size(result) <= budget.chars:
+        return result, None
+
+    notes: dict = {}
+    kept = {key: result[key] for key in budget.keep if key in result}
+    rest = _project({k: v for k, v in result.items() if k not in kept}, budget.project, notes)
+
+    room = budget.chars - result_size(kept)
+    compacted = rest
+    for max_items, max_chars in COMPACTION_STEPS:
+        if result_size(compacted) <= room:
+            break
+        compacted = _compact(compacted, "", max_items, max_chars, notes)
+
+    compacted = {**compacted, **kept}
+    # Preserve the tool's key order
+    ordered = {key: compacted[key] for key in result if key in compacted}
+    ordered["_truncated"] = notes
+    return ordered, notes
@@ -1,7 +1,7 @@
 """Fermentation monitoring tools for the AI brewing assistant."""
 
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Any, Optional
 
 from sqlalchemy import select, or_
@@ -10,9 +10,11 @@ from sqlalchemy.orm import selectinload
 
 from backend.config import get_settings
 from backend.models import (
-    Batch, Reading, Device, Recipe, YeastStrain, AmbientReading, RecipeCulture
+    Batch, BatchFeatures, Device, Recipe, YeastStrain, AmbientReading, RecipeCulture
 )
 from backend.services.alert_service import get_active_alerts
+from backend.services.batch_features import features_for, nearest_batches
+from backend.services.fermentation_analytics import analyze_batch
 from backend.state import latest_readings
 
 logger = logging.getLogger(__name__)
@@ -31,6 +33,23 @@ def _user_owns_batch_condition(user_id: Optional[str]):
     return Batch.user_id == user_id
 
 
+def _yeast_temp_range(batch: Batch) -> tuple[Optional[str], Optional[float], Optional[float]]:
+    """Yeast name and temperature range (°C) for a batch.
+
+    Prefers the batch's yeast strain, then the recipe's first culture, then
+    the yeast fields stored directly on the recipe. Needs Batch.yeast_strain
+    and Batch.recipe -> Recipe.cultures loaded.
+    """
+    if batch.yeast_strain:
+        return batch.yeast_strain.name, batch.yeast_strain.temp_low, batch.yeast_strain.temp_high
+    if batch.recipe and batch.recipe.cultures:
+        culture = batch.recipe.cultures[0]
+        return culture.name, culture.temp_min_c, culture.temp_max_c
+    if batch.recipe and batch.recipe.yeast_name:
+        return batch.recipe.yeast_name, batch.recipe.yeast_temp_min, batch.recipe.yeast_temp_max
+    return None, None, None
+
+
 async def list_fermentations(
     db: AsyncSession,
     user_id: Optional[str] = None,
@@ -255,24 +274,7 @@ async def get_fermentation_status(
 
     # Temperature analysis
     temp_info = {"available": False}
-    yeast_temp_min = None
-    yeast_temp_max = None
-    yeast_name = None
-
-    if batch.yeast_strain:
-        yeast_name = batch.yeast_strain.name
-        yeast_temp_min = batch.yeast_strain.temp_low
-        yeast_temp_max = batch.yeast_strain.temp_high
-    elif batch.recipe and batch.recipe.cultures:
-        culture = batch.recipe.cultures[0]
-        yeast_name = culture.name
-        yeast_temp_min = culture.temp_min_c
-        yeast_temp_max = culture.temp_max_c
-    elif batch.recipe and batch.recipe.yeast_name:
-        # Fallback to yeast fields stored directly on Recipe
-        yeast_name = batch.recipe.yeast_name
-        yeast_temp_min = batch.recipe.yeast_temp_min
-        yeast_temp_max = batch.recipe.yeast_temp_max
+    yeast_name, yeast_temp_min, yeast_temp_max = _yeast_temp_range(batch)
 
     if current_temp is not None:
         temp_info = {
@@ -387,7 +389,10 @@ async def get_fermentation_history(
     # First verify batch exists and user owns it
     batch_stmt = (
         select(Batch)
-        .options(selectinload(Batch.recipe))
+        .options(
+            selectinload(Batch.recipe).selectinload(Recipe.cultures),
+            selectinload(Batch.yeast_strain),
+        )
         .where(Batch.id == batch_id)
     )
     if user_id:
@@ -399,119 +404,28 @@ async def get_fermentation_history(
     if not batch:
         return {"error": f"Batch not found: {batch_id}"}
 
-    # Query readings
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-    stmt = (
-        select(Reading)
-        .where(
-            Reading.batch_id == batch_id,
-            Reading.timestamp >= cutoff
-        )
-        .order_by(Reading.timestamp.asc())
+    _, yeast_temp_min, yeast_temp_max = _yeast_temp_range(batch)
+    analysis = await analyze_batch(
+        db,
+        batch_id,
+        hours=hours,
+        anomalies_only=include_anomalies_only,
+        temp_range=(yeast_temp_min, yeast_temp_max),
     )
 
-    if include_anomalies_only:
-        stmt = stmt.where(Reading.is_anomaly == True)
-
-    result = await db.execute(stmt)
-    readings = result.scalars().all()
-
-    if not readings:
+    history = {
+        "batch_id": batch_id,
+        "batch_name": batch.name or (batch.recipe.name if batch.recipe else f"Batch #{batch.id}"),
+        "hours_requested": hours,
+    }
+    if not analysis["count"]:
         return {
-            "batch_id": batch_id,
-            "batch_name": batch.name or (batch.recipe.name if batch.recipe else f"Batch #{batch.id}"),
-            "hours_requested": hours,
+            **history,
             "count": 0,
             "message": "No readings found in the specified time period",
             "readings": []
         }
-
-    # Calculate summary statistics
-    sg_values = [r.sg_calibrated or r.sg_raw for r in readings if (r.sg_calibrated or r.sg_raw)]
-    temp_values = [r.temp_calibrated or r.temp_raw for r in readings if (r.temp_calibrated or r.temp_raw)]
-
-    summary = {}
-    if sg_values:
-        summary["sg"] = {
-            "min": round(min(sg_values), 4),
-            "max": round(max(sg_values), 4),
-            "start": round(sg_values[0], 4),
-            "end": round(sg_values[-1], 4),
-            "change": round(sg_values[-1] - sg_values[0], 4),
-        }
-
-    if temp_values:
-        summary["temp_c"] = {
-            "min": round(min(temp_values), 1),
-            "max": round(max(temp_values), 1),
-            "avg": round(sum(temp_values) / len(temp_values), 1),
-        }
-
-    # Calculate trend (simple linear regression approximation)
-    trend_analysis = {}
-    if len(sg_values) >= 2:
-        # Points per hour rate
-        time_span_hours = (readings[-1].timestamp - readings[0].timestamp).total_seconds() / 3600
-        if time_span_hours > 0:
-            sg_rate_per_hour = (sg_values[-1] - sg_values[0]) / time_span_hours
-            trend_analysis["sg_rate_per_hour"] = round(sg_rate_per_hour, 6)
-
-            if sg_rate_per_hour < -0.001:
-                trend_analysis["sg_trend"] = "actively_fermenting"
-            elif sg_rate_per_hour < -0.0001:
-                trend_analysis["sg_trend"] = "slowly_fermenting"
-            else:
-                trend_analysis["sg_trend"] = "stable"
-
-    if len(temp_values) >= 2:
-        time_span_hours = (readings[-1].timestamp - readings[0].timestamp).total_seconds() / 3600
-        if time_span_hours > 0:
-            temp_rate = (temp_values[-1] - temp_values[0]) / time_span_hours
-            trend_analysis["temp_rate_per_hour"] = round(temp_rate, 3)
-
-            if temp_rate > 0.5:
-                trend_analysis["temp_trend"] = "rising"
-            elif temp_rate < -0.5:
-                trend_analysis["temp_trend"] = "falling"
-            else:
-                trend_analysis["temp_trend"] = "stable"
-
-    # Sample readings (downsample if too many)
-    max_readings = 50
-    sample_readings = []
-    if len(readings) <= max_readings:
-        sample_readings = readings
-    else:
-        # Evenly sample
-        step = len(readings) / max_readings
-        indices = [int(i * step) for i in range(max_readings)]
-        sample_readings = [readings[i] for i in indices]
-
-    readings_list = [
-        {
-            "timestamp": r.timestamp.isoformat(),
-            "sg": r.sg_calibrated or r.sg_raw,
-            "temp_c": r.temp_calibrated or r.temp_raw,
-            "confidence": r.confidence,
-            "is_anomaly": r.is_anomaly,
-            "anomaly_reasons": r.anomaly_reasons,
-        }
-        for r in sample_readings
-    ]
-
-    return {
-        "batch_id": batch_id,
-        "batch_name": batch.name or (batch.recipe.name if batch.recipe else f"Batch #{batch.id}"),
-        "hours_requested": hours,
-        "time_range": {
-            "start": readings[0].timestamp.isoformat(),
-            "end": readings[-1].timestamp.isoformat(),
-        },
-        "count": len(readings),
-        "summary": summary,
-        "trend_analysis": trend_analysis,
-        "readings": readings_list,
-    }
+    return {**history, **analysis}
 
 
 async def get_ambient_conditions(db: AsyncSession) -> dict[str, Any]:
@@ -620,8 +534,23 @@ async def compare_batches(
         similar_stmt = similar_stmt.where(_user_owns_batch_condition(user_id))
 
     comparison_type = comparison_type or "recipe"
-
-    if comparison_type == "recipe" and ref_batch.recipe_id:
+    distances: dict[int, float] = {}
+
+    if comparison_type == "fermentation":
+        # Rank by fermentation features; over-fetch since some matches may
+        # be filtered out below (deleted, not finished)
+        stored = await db.get(BatchFeatures, ref_batch.id)
+        ref_features = stored or await features_for(db, ref_batch)
+        ranked = await nearest_batches(
+            db,
+            ref_features,
+            limit=limit * 3,
+            user_id=None if get_settings().is_local else user_id,
+            exclude_batch_id=ref_batch.id,
+        )
+        distances = dict(ranked)
+        similar_stmt = similar_stmt.where(Batch.id.in_(distances))
+    elif comparison_type == "recipe" and ref_batch.recipe_id:
         similar_stmt = similar_stmt.where(Batch.recipe_id == ref_batch.recipe_id)
     elif comparison_type == "style" and ref_batch.recipe and ref_batch.recipe.style_id:
         # Join through recipe to style
@@ -640,10 +569,13 @@ async def compare_batches(
                 .where(RecipeCulture.name.ilike(f"%{yeast_name}%"))
             )
 
-    similar_stmt = similar_stmt.order_by(Batch.end_time.desc().nullsfirst()).limit(limit)
-
-    similar_result = await db.execute(similar_stmt)
-    similar_batches = similar_result.scalars().all()
+    if distances:
+        similar_result = await db.execute(similar_stmt)
+        similar_batches = sorted(similar_result.scalars().all(), key=lambda b: distances[b.id])[:limit]
+    else:
+        similar_stmt = similar_stmt.order_by(Batch.end_time.desc().nullsfirst()).limit(limit)
+        similar_result = await db.execute(similar_stmt)
+        similar_batches = similar_result.scalars().all()
 
     # Build reference batch info
     ref_info = {
@@ -677,6 +609,9 @@ async def compare_batches(
             "measured_attenuation": batch.measured_attenuation,
             "fermentation_days": fermentation_days,
         })
+        if batch.id in distances:
+            # 1.0 = identical; 0.5 = one "noticeable difference" per feature
+            similar_list[-1]["similarity"] = round(1 / (1 + distances[batch.id]), 3)
 
     # Generate comparison insights
     insights = []
@@ -1,11 +1,14 @@
-"""Ingredient reference library tools for the AI brewing assistant."""
+"""Ingredient reference library tools for the AI brewing assistant.
+
+Served from the in-memory reference catalog (ranked fuzzy matching), not
+ILIKE scans of the reference tables.
+"""
 
 from typing import Any, Optional
 
-from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.models import HopVariety, Fermentable
+from backend.services.reference_catalog import at_least, at_most, contains, get_reference_catalog
 
 
 async def search_hop_varieties(
@@ -18,36 +21,25 @@ async def search_hop_varieties(
     limit: int = 15
 ) -> dict[str, Any]:
     """Search the hop variety reference database."""
-    stmt = select(HopVariety).order_by(HopVariety.name)
-
-    # Text search on name, aroma profile, description
-    if query:
-        search_term = f"%{query}%"
-        stmt = stmt.where(
-            or_(
-                HopVariety.name.ilike(search_term),
-                HopVariety.aroma_profile.ilike(search_term),
-                HopVariety.description.ilike(search_term),
-                HopVariety.substitutes.ilike(search_term),
-            )
-        )
+    filters = []
 
     # Exact/partial filters
     if purpose:
-        stmt = stmt.where(HopVariety.purpose == purpose.lower())
+        filters.append(lambda h: h.purpose == purpose.lower())
     if origin:
-        stmt = stmt.where(HopVariety.origin.ilike(f"%{origin}%"))
+        filters.append(lambda h: contains(h.origin, origin))
 
     # Alpha acid range filters
     if min_alpha is not None:
-        stmt = stmt.where(HopVariety.alpha_acid_high >= min_alpha)
+        filters.append(lambda h: at_least(h.alpha_acid_high, min_alpha))
     if max_alpha is not None:
-        stmt = stmt.where(HopVariety.alpha_acid_low <= max_alpha)
-
-    stmt = stmt.limit(limit)
+        filters.append(lambda h: at_most(h.alpha_acid_low, max_alpha))
 
-    result = await db.execute(stmt)
-    hops = result.scalars().all()
+    # Ranked text search on name, aroma profile, substitutes, description
+    catalog = await get_reference_catalog(db)
+    hops = catalog.hops.search(
+        query, where=lambda h: all(f(h) for f in filters), limit=limit
+    )
 
     if not hops:
         return {
@@ -87,42 +79,31 @@ async def search_fermentables(
     limit: int = 15
 ) -> dict[str, Any]:
     """Search the fermentables reference database."""
-    stmt = select(Fermentable).order_by(Fermentable.name)
-
-    # Text search on name, flavor profile, description
-    if query:
-        search_term = f"%{query}%"
-        stmt = stmt.where(
-            or_(
-                Fermentable.name.ilike(search_term),
-                Fermentable.flavor_profile.ilike(search_term),
-                Fermentable.description.ilike(search_term),
-                Fermentable.substitutes.ilike(search_term),
-            )
-        )
+    filters = []
 
     # Exact/partial filters
     if type:
-        stmt = stmt.where(Fermentable.type == type.lower())
+        filters.append(lambda f: f.type == type.lower())
     if origin:
-        stmt = stmt.where(Fermentable.origin.ilike(f"%{origin}%"))
+        filters.append(lambda f: contains(f.origin, origin))
     if maltster:
-        stmt = stmt.where(Fermentable.maltster.ilike(f"%{maltster}%"))
+        filters.append(lambda f: contains(f.maltster, maltster))
 
     # Color range filters
     if max_color_srm is not None:
-        stmt = stmt.where(Fermentable.color_srm <= max_color_srm)
+        filters.append(lambda f: at_most(f.color_srm, max_color_srm))
     if min_color_srm is not None:
-        stmt = stmt.where(Fermentable.color_srm >= min_color_srm)
+        filters.append(lambda f: at_least(f.color_srm, min_color_srm))
 
     # Diastatic power filter (for base malts)
     if min_diastatic_power is not None:
-        stmt = stmt.where(Fermentable.diastatic_power >= min_diastatic_power)
-
-    stmt = stmt.limit(limit)
+        filters.append(lambda f: at_least(f.diastatic_power, min_diastatic_power))
 
-    result = await db.execute(stmt)
-    fermentables = result.scalars().all()
+    # Ranked text search on name, flavor profile, substitutes, description
+    catalog = await get_reference_catalog(db)
+    fermentables = catalog.fermentables.search(
+        query, where=lambda f: all(check(f) for check in filters), limit=limit
+    )
 
     if not fermentables:
         return {
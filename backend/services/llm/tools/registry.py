@@ -0,0 +1,217 @@
+"""Tool registry for the AI brewing assistant.
+
+Maps each tool name to its implementation and dispatches calls with a dict
+lookup. Implementations are registered by import path ("module:function",
+relative to this package) and imported on their first call, so loading the
+assistant doesn't import every tool module and its dependencies up front.
+Functions defined alongside the registry can use the ``tool`` decorator.
+
+Arguments come from the LLM, so they are checked against the tool's JSON
+schema: names the schema doesn't declare are dropped, and context values
+(db session, user, current thread) are always supplied by the server,
+never by the model.
+
+Results over the tool's output budget are compacted before they are
+returned (see budget.py), so they don't inflate every later LLM call.
+
+Every call is timed and its JSON result size recorded per tool; see
+``ToolRegistry.snapshot``.
+"""
+
+import importlib
+import inspect
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from .budget import ToolBudget, apply_budget, result_size
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; slower calls go in "+Inf"
+LATENCY_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Context a tool can ask for: parameter name -> context key
+DB = {"db": "db"}
+DB_USER = {"db": "db", "user_id": "user_id"}
+
+
+class ToolMetrics:
+    """Call count, latency and result size for one tool.
+
+    Keeps a window of recent latencies for percentiles, like
+    database.PoolMetrics, plus a cumulative latency histogram.
+    """
+
+    def __init__(self, window: int = 256):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.result_bytes = 0
+        self.max_result_bytes = 0
+        self.compacted = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float, result_bytes: Optional[int], compacted: bool = False) -> None:
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self._recent.append(seconds)
+        ms = seconds * 1000
+        index = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if ms <= bound), len(LATENCY_BUCKETS_MS))
+        self.buckets[index] += 1
+        if result_bytes is None:
+            self.errors += 1
+        else:
+            self.result_bytes += result_bytes
+            self.max_result_bytes = max(self.max_result_bytes, result_bytes)
+        if compacted:
+            self.compacted += 1
+
+    def snapshot(self) -> dict:
+        recent = sorted(self._recent)
+
+        def pct(p: float) -> Optional[float]:
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))] * 1000, 2)
+
+        succeeded = self.calls - self.errors
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + ["+Inf"]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.total_seconds * 1000, 2),
+            "mean_ms": round(self.total_seconds / self.calls * 1000, 2) if self.calls else None,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "latency_histogram": dict(zip(labels, self.buckets)),
+            "mean_result_bytes": round(self.result_bytes / succeeded) if succeeded else None,
+            "max_result_bytes": self.max_result_bytes,
+            "compacted": self.compacted,
+        }
+
+
+@dataclass
+class ToolSpec:
+    """A registered tool and how to call it."""
+
+    name: str
+    target: str | Callable  # "module:function" or the function itself
+    context: dict[str, str] = field(default_factory=dict)
+    _func: Optional[Callable] = None
+    _accepts: Optional[frozenset] = None  # None = accepts any keyword
+
+    def resolve(self, package: str) -> Callable:
+        """Import the implementation on first use."""
+        if self._func is None:
+            if callable(self.target):
+                func = self.target
+            else:
+                module_name, func_name = self.target.split(":")
+                func = getattr(importlib.import_module(f".{module_name}", package), func_name)
+            params = inspect.signature(func).parameters.values()
+            if not any(p.kind is p.VAR_KEYWORD for p in params):
+                self._accepts = frozenset(p.name for p in params)
+            self._func = func
+        return self._func
+
+
+class ToolRegistry:
+    """Tool name -> implementation, with per-tool metrics."""
+
+    def __init__(self, package: str):
+        self.package = package
+        self._specs: dict[str, ToolSpec] = {}
+        self._schemas: dict[str, Optional[set]] = {}
+        self._budgets: dict[str, ToolBudget] = {}
+        self.metrics: dict[str, ToolMetrics] = {}
+
+    def register(self, name: str, target: str | Callable, context: Optional[dict] = None, aliases: tuple = ()) -> None:
+        """Register a tool implementation.
+
+        Args:
+            name: Tool name, as in the tool definitions
+            target: "module:function" (imported lazily) or a function
+            context: Parameter name -> context key ("db", "user_id",
+                "thread_id") for values the server passes in
+            aliases: Other names dispatched to the same implementation
+        """
+        spec = ToolSpec(name, target, dict(context or {}))
+        for tool_name in (name, *aliases):
+            self._specs[tool_name] = spec
+
+    def tool(self, name: Optional[str] = None, context: Optional[dict] = None, aliases: tuple = ()):
+        """Decorator form of register() for functions defined in the package."""
+        def decorator(func: Callable) -> Callable:
+            self.register(name or func.__name__, func, context, aliases)
+            return func
+        return decorator
+
+    def set_definitions(self, definitions: list[dict]) -> None:
+        """Record each tool's declared argument names from its JSON schema."""
+        for definition in definitions:
+            function = definition["function"]
+            properties = function.get("parameters", {}).get("properties")
+            self._schemas[function["name"]] = set(properties) if properties is not None else None
+
+    def set_budget(self, name: str, budget: ToolBudget) -> None:
+        """Give a tool its own output budget instead of the default."""
+        self._budgets[name] = budget
+
+    def budget_for(self, name: str) -> ToolBudget:
+        spec = self._specs.get(name)
+        return self._budgets.get(spec.name if spec else name, ToolBudget())
+
+    def names(self) -> set[str]:
+        return set(self._specs)
+
+    def _arguments(self, name: str, spec: ToolSpec, arguments: dict, context: dict) -> dict:
+        declared = self._schemas.get(spec.name)
+        kwargs = {}
+        for key, value in arguments.items():
+            if key in spec.context or (declared is not None and key not in declared):
+                logger.warning("Tool %s: ignoring undeclared argument %r", name, key)
+                continue
+            kwargs[key] = value
+        for param, key in spec.context.items():
+            kwargs[param] = context.get(key)
+        if spec._accepts is not None:
+            kwargs = {key: value for key, value in kwargs.items() if key in spec._accepts}
+        return kwargs
+
+    async def execute(self, name: str, arguments: dict[str, Any], **context) -> dict[str, Any]:
+        """Run a tool with LLM-supplied arguments and server-supplied context."""
+        spec = self._specs.get(name)
+        if spec is None:
+            return {"error": f"Unknown tool: {name}"}
+
+        func = spec.resolve(self.package)
+        kwargs = self._arguments(name, spec, arguments or {}, context)
+        metrics = self.metrics.setdefault(spec.name, ToolMetrics())
+        start = time.perf_counter()
+        result_bytes = None
+        notes = None
+        try:
+            result = func(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            # Size before compaction, to show which tools return the most
+            result_bytes = result_size(result)
+            budget = self.budget_for(name)
+            if result_bytes > budget.chars:
+                result, notes = apply_budget(result, budget)
+                logger.info("Tool %s: compacted %d-char result to budget %d", name, result_bytes, budget.chars)
+            return result
+        finally:
+            metrics.record(time.perf_counter() - start, result_bytes, compacted=notes is not None)
+
+    def snapshot(self) -> dict[str, dict]:
+        """Per-tool metrics, most total time first."""
+        ranked = sorted(self.metrics.items(), key=lambda item: item[1].total_seconds, reverse=True)
+        return {name: metrics.snapshot() for name, metrics in ranked}
@@ -10,6 +10,8 @@ from sqlalchemy import select, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models import AgUiThread, AgUiMessage
+from backend.services import thread_search
+from backend.services.http_clients import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -75,41 +77,39 @@ async def fetch_url(url: str) -> dict[str, Any]:
         return {"error": "Invalid URL - must start with http:// or https://"}
 
     try:
-        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-            response = await client.get(
-                url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (compatible; BrewSignal/1.0; +https://brewsignal.local)"
-                }
-            )
-            response.raise_for_status()
-
-            content_type = response.headers.get("content-type", "")
-
-            # Handle JSON responses directly
-            if "application/json" in content_type:
-                return {
-                    "url": str(response.url),
-                    "content_type": "json",
-                    "content": response.text[:MAX_CONTENT_LENGTH],
-                }
-
-            # For HTML, strip tags
-            if "text/html" in content_type:
-                text = strip_html_tags(response.text)
-            else:
-                text = response.text
+        response = await get_http_client("web").get(
+            url,
+            headers={
+                "User-Agent": "Mozilla/5.0 (compatible; BrewSignal/1.0; +https://brewsignal.local)"
+            }
+        )
+        response.raise_for_status()
 
-            # Truncate if too long
-            if len(text) > MAX_CONTENT_LENGTH:
-                text = text[:MAX_CONTENT_LENGTH] + "\n... [truncated]"
+        content_type = response.headers.get("content-type", "")
 
+        # Handle JSON responses directly
+        if "application/json" in content_type:
             return {
                 "url": str(response.url),
-                "content_type": content_type.split(";")[0] if content_type else "unknown",
-                "content": text,
+                "content_type": "json",
+                "content": response.text[:MAX_CONTENT_LENGTH],
             }
 
+        # For HTML, strip tags
+        if "text/html" in content_type:
+            text = strip_html_tags(response.text)
+        else:
+            text = response.text
+
+        # Truncate if too long
+        if len(text) > MAX_CONTENT_LENGTH:
+            text = text[:MAX_CONTENT_LENGTH] + "\n... [truncated]"
+
+        return {
+            "url": str(response.url),
+            "content_type": content_type.split(";")[0] if content_type else "unknown",
+            "content": text,
+        }
     except httpx.TimeoutException:
         return {"error": f"Request timed out fetching {url}"}
     except httpx.HTTPStatusError as e:
@@ -318,7 +318,10 @@ async def search_threads(
 ) -> dict[str, Any]:
     """Search previous chat threads for recipes, discussions, and brewing information.
 
-    Enforces user_id filtering for multi-tenant isolation.
+    Message content is searched through the full-text index (see
+    backend.services.thread_search) and ranked by relevance; threads whose
+    title matches are listed first. Falls back to a substring scan when the
+    index is unavailable. Enforces user_id filtering for multi-tenant isolation.
     """
     if not query or not query.strip():
         return {"error": "Search query cannot be empty"}
@@ -327,93 +330,60 @@ async def search_threads(
     limit = min(max(1, limit), 10)  # Clamp between 1 and 10
 
     try:
-        # Search in thread titles and message content
-        # Use LIKE for SQLite compatibility
-        search_pattern = f"%{query}%"
-
-        # Build base query with user isolation
-        base_query = (
-            select(AgUiThread)
-            .outerjoin(AgUiMessage, AgUiThread.id == AgUiMessage.thread_id)
+        hits = await thread_search.search_messages(
+            db,
+            query,
+            user_id=user_id,
+            exclude_thread_id=current_thread_id,
+            limit=limit,
         )
+        if hits is None:
+            return await _search_threads_like(db, query, current_thread_id, user_id, limit)
 
-        # User isolation filter
-        filters = [
-            or_(
-                func.lower(AgUiThread.title).like(search_pattern),
-                func.lower(AgUiMessage.content).like(search_pattern),
-            )
-        ]
+        # Thread titles are short and few compared to messages, so a
+        # substring match on the threads table alone stays cheap.
+        title_query = select(AgUiThread).where(
+            func.lower(AgUiThread.title).like(f"%{query}%")
+        )
         if user_id:
-            filters.append(AgUiThread.user_id == user_id)
-
-        # Find threads with matching titles or message content
-        result = await db.execute(
-            base_query
-            .where(*filters)
-            .distinct()
-            .order_by(AgUiThread.updated_at.desc())
-            .limit(limit)
+            title_query = title_query.where(AgUiThread.user_id == user_id)
+        if current_thread_id:
+            title_query = title_query.where(AgUiThread.id != current_thread_id)
+        title_result = await db.execute(
+            title_query.order_by(AgUiThread.updated_at.desc()).limit(limit)
         )
-        threads = result.scalars().all()
+        title_threads = title_result.scalars().all()
+
+        hits_by_thread = {h["thread_id"]: h for h in hits}
+        missing_ids = set(hits_by_thread) - {t.id for t in title_threads}
+        threads_by_id = {t.id: t for t in title_threads}
+        if missing_ids:
+            thread_result = await db.execute(
+                select(AgUiThread).where(AgUiThread.id.in_(missing_ids))
+            )
+            threads_by_id.update({t.id: t for t in thread_result.scalars().all()})
 
-        if not threads:
-            return {
-                "results": [],
-                "message": f"No conversations found matching '{query}'",
-            }
+        ordered_ids = [t.id for t in title_threads]
+        ordered_ids += [h["thread_id"] for h in hits if h["thread_id"] not in ordered_ids]
 
-        # For each matching thread, get relevant message snippets
         results = []
-        for thread in threads:
-            # Skip current thread
-            if current_thread_id and thread.id == current_thread_id:
+        for tid in ordered_ids[:limit]:
+            thread = threads_by_id.get(tid)
+            if thread is None:
                 continue
-
-            # Get messages that match the query
-            msg_result = await db.execute(
-                select(AgUiMessage)
-                .where(
-                    AgUiMessage.thread_id == thread.id,
-                    func.lower(AgUiMessage.content).like(search_pattern),
-                )
-                .order_by(AgUiMessage.created_at)
-                .limit(3)  # Get up to 3 matching messages
-            )
-            matching_messages = msg_result.scalars().all()
-
-            # Extract relevant snippets
-            snippets = []
-            for msg in matching_messages:
-                content = msg.content
-                # Find the query in the content and extract surrounding context
-                lower_content = content.lower()
-                idx = lower_content.find(query)
-                if idx != -1:
-                    # Extract ~150 chars around the match
-                    start = max(0, idx - 75)
-                    end = min(len(content), idx + len(query) + 75)
-                    snippet = content[start:end]
-                    if start > 0:
-                        snippet = "..." + snippet
-                    if end < len(content):
-                        snippet = snippet + "..."
-                    snippets.append({
-                        "role": msg.role,
-                        "snippet": snippet,
-                    })
-
+            hit = hits_by_thread.get(tid)
             results.append({
                 "thread_id": thread.id,
                 "title": thread.title or "Untitled",
                 "updated_at": thread.updated_at.isoformat(),
-                "snippets": snippets[:2],  # Limit to 2 snippets per thread
+                "score": hit["score"] if hit else None,
+                "snippets": hit["snippets"] if hit else [],
             })
 
         if not results:
             return {
                 "results": [],
-                "message": f"No conversations found matching '{query}' (excluding current thread)",
+                "message": f"No conversations found matching '{query}'",
             }
 
         return {
@@ -424,3 +394,106 @@ async def search_threads(
     except Exception as e:
         logger.error(f"Error searching threads for '{query}': {e}")
         return {"error": f"Failed to search conversations: {str(e)}"}
+
+
+async def _search_threads_like(
+    db: AsyncSession,
+    query: str,
+    current_thread_id: Optional[str],
+    user_id: Optional[str],
+    limit: int,
+) -> dict[str, Any]:
+    """Substring-scan fallback for search_threads when no full-text index exists."""
+    # Search in thread titles and message content
+    # Use LIKE for SQLite compatibility
+    search_pattern = f"%{query}%"
+
+    # Build base query with user isolation
+    base_query = (
+        select(AgUiThread)
+        .outerjoin(AgUiMessage, AgUiThread.id == AgUiMessage.thread_id)
+    )
+
+    # User isolation filter
+    filters = [
+        or_(
+            func.lower(AgUiThread.title).like(search_pattern),
+            func.lower(AgUiMessage.content).like(search_pattern),
+        )
+    ]
+    if user_id:
+        filters.append(AgUiThread.user_id == user_id)
+
+    # Find threads with matching titles or message content
+    result = await db.execute(
+        base_query
+        .where(*filters)
+        .distinct()
+        .order_by(AgUiThread.updated_at.desc())
+        .limit(limit)
+    )
+    threads = result.scalars().all()
+
+    if not threads:
+        return {
+            "results": [],
+            "message": f"No conversations found matching '{query}'",
+        }
+
+    # For each matching thread, get relevant message snippets
+    results = []
+    for thread in threads:
+        # Skip current thread
+        if current_thread_id and thread.id == current_thread_id:
+            continue
+
+        # Get messages that match the query
+        msg_result = await db.execute(
+            select(AgUiMessage)
+            .where(
+                AgUiMessage.thread_id == thread.id,
+                func.lower(AgUiMessage.content).like(search_pattern),
+            )
+            .order_by(AgUiMessage.created_at)
+            .limit(3)  # Get up to 3 matching messages
+        )
+        matching_messages = msg_result.scalars().all()
+
+        # Extract relevant snippets
+        snippets = []
+        for msg in matching_messages:
+            content = msg.content
+            # Find the query in the content and extract surrounding context
+            lower_content = content.lower()
+            idx = lower_content.find(query)
+            if idx != -1:
+                # Extract ~150 chars around the match
+                start = max(0, idx - 75)
+                end = min(len(content), idx + len(query) + 75)
+                snippet = content[start:end]
+                if start > 0:
+                    snippet = "..." + snippet
+                if end < len(content):
+                    snippet = snippet + "..."
+                snippets.append({
+                    "role": msg.role,
+                    "snippet": snippet,
+                })
+
+        results.append({
+            "thread_id": thread.id,
+            "title": thread.title or "Untitled",
+            "updated_at": thread.updated_at.isoformat(),
+            "snippets": snippets[:2],  # Limit to 2 snippets per thread
+        })
+
+    if not results:
+        return {
+            "results": [],
+            "message": f"No conversations found matching '{query}' (excluding current thread)",
+        }
+
+    return {
+        "results": results,
+        "message": f"Found {len(results)} conversation(s) matching '{query}'",
+    }
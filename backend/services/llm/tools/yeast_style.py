@@ -1,11 +1,14 @@
-"""Yeast and style search tools for the AI brewing assistant."""
+"""Yeast and style search tools for the AI brewing assistant.
+
+Served from the in-memory reference catalog (ranked fuzzy matching), not
+ILIKE scans of the reference tables.
+"""
 
 from typing import Any, Optional
 
-from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.models import YeastStrain, Style
+from backend.services.reference_catalog import at_least, at_most, contains, get_reference_catalog
 
 
 async def search_yeast(
@@ -20,45 +23,33 @@ async def search_yeast(
     limit: int = 10
 ) -> dict[str, Any]:
     """Search yeast strains with various filters."""
-    stmt = select(YeastStrain)
-
-    # Text search on name, producer, product_id
-    if query:
-        search_term = f"%{query}%"
-        stmt = stmt.where(
-            or_(
-                YeastStrain.name.ilike(search_term),
-                YeastStrain.producer.ilike(search_term),
-                YeastStrain.product_id.ilike(search_term),
-                YeastStrain.description.ilike(search_term)
-            )
-        )
+    filters = []
 
     # Exact filters
     if type:
-        stmt = stmt.where(YeastStrain.type == type.lower())
+        filters.append(lambda y: y.type == type.lower())
     if form:
-        stmt = stmt.where(YeastStrain.form == form.lower())
+        filters.append(lambda y: y.form == form.lower())
     if producer:
-        stmt = stmt.where(YeastStrain.producer.ilike(f"%{producer}%"))
+        filters.append(lambda y: contains(y.producer, producer))
 
     # Attenuation range
     if min_attenuation:
-        stmt = stmt.where(YeastStrain.attenuation_high >= min_attenuation)
+        filters.append(lambda y: at_least(y.attenuation_high, min_attenuation))
     if max_attenuation:
-        stmt = stmt.where(YeastStrain.attenuation_low <= max_attenuation)
+        filters.append(lambda y: at_most(y.attenuation_low, max_attenuation))
 
     # Temperature compatibility
     if temp_range:
-        stmt = stmt.where(
-            YeastStrain.temp_low <= temp_range,
-            YeastStrain.temp_high >= temp_range
+        filters.append(
+            lambda y: at_most(y.temp_low, temp_range) and at_least(y.temp_high, temp_range)
         )
 
-    stmt = stmt.limit(limit)
-
-    result = await db.execute(stmt)
-    yeasts = result.scalars().all()
+    # Ranked text search on name, product_id, producer, description
+    catalog = await get_reference_catalog(db)
+    yeasts = catalog.yeast.search(
+        query, where=lambda y: all(f(y) for f in filters), limit=limit
+    )
 
     return {
         "count": len(yeasts),
@@ -90,43 +81,33 @@ async def search_styles(
     limit: int = 10
 ) -> dict[str, Any]:
     """Search beer styles with various filters."""
-    stmt = select(Style)
-
-    # Text search on name, category
-    if query:
-        search_term = f"%{query}%"
-        stmt = stmt.where(
-            or_(
-                Style.name.ilike(search_term),
-                Style.category.ilike(search_term),
-                Style.description.ilike(search_term)
-            )
-        )
+    filters = []
 
     # Exact filters
     if type:
-        stmt = stmt.where(Style.type == type)
+        filters.append(lambda s: s.type == type)
     if category_number:
-        stmt = stmt.where(Style.category_number == category_number)
+        filters.append(lambda s: s.category_number == category_number)
 
     # OG range
     if og_range:
         if og_range.get("min"):
-            stmt = stmt.where(Style.og_max >= og_range["min"])
+            filters.append(lambda s: at_least(s.og_max, og_range["min"]))
         if og_range.get("max"):
-            stmt = stmt.where(Style.og_min <= og_range["max"])
+            filters.append(lambda s: at_most(s.og_min, og_range["max"]))
 
     # IBU range
     if ibu_range:
         if ibu_range.get("min"):
-            stmt = stmt.where(Style.ibu_max >= ibu_range["min"])
+            filters.append(lambda s: at_least(s.ibu_max, ibu_range["min"]))
         if ibu_range.get("max"):
-            stmt = stmt.where(Style.ibu_min <= ibu_range["max"])
-
-    stmt = stmt.limit(limit)
+            filters.append(lambda s: at_most(s.ibu_min, ibu_range["max"]))
 
-    result = await db.execute(stmt)
-    styles = result.scalars().all()
+    # Ranked text search on name, aliases, category, description
+    catalog = await get_reference_catalog(db)
+    styles = catalog.styles.search(
+        query, where=lambda s: all(f(s) for f in filters), limit=limit
+    )
 
     return {
         "count": len(styles),
@@ -154,23 +135,10 @@ async def get_yeast_by_id(
     product_id: str
 ) -> dict[str, Any]:
     """Get detailed yeast info by product ID."""
-    stmt = select(YeastStrain).where(
-        YeastStrain.product_id.ilike(product_id)
-    )
-
-    result = await db.execute(stmt)
-    yeast = result.scalar_one_or_none()
-
-    if not yeast:
-        # Try broader search
-        stmt = select(YeastStrain).where(
-            or_(
-                YeastStrain.product_id.ilike(f"%{product_id}%"),
-                YeastStrain.name.ilike(f"%{product_id}%")
-            )
-        ).limit(1)
-        result = await db.execute(stmt)
-        yeast = result.scalar_one_or_none()
+    catalog = await get_reference_catalog(db)
+    # Exact product code first, then the best ranked match on code or name
+    matches = catalog.yeast.code(product_id) or catalog.yeast.search(product_id, limit=1)
+    yeast = matches[0] if matches else None
 
     if not yeast:
         return {"error": f"Yeast not found: {product_id}"}
@@ -199,16 +167,10 @@ async def get_style_by_name(
     name: str
 ) -> dict[str, Any]:
     """Get detailed style info by name."""
-    # Try exact match first
-    stmt = select(Style).where(Style.name.ilike(name))
-    result = await db.execute(stmt)
-    style = result.scalar_one_or_none()
-
-    if not style:
-        # Try partial match
-        stmt = select(Style).where(Style.name.ilike(f"%{name}%")).limit(1)
-        result = await db.execute(stmt)
-        style = result.scalar_one_or_none()
+    catalog = await get_reference_catalog(db)
+    # Exact name first, then the best ranked (alias/partial/fuzzy) match
+    matches = catalog.styles.exact(name) or catalog.styles.search(name, limit=1)
+    style = matches[0] if matches else None
 
     if not style:
         return {"error": f"Style not found: {name}"}
@@ -12,12 +12,23 @@ LLM Configuration:
 - Uses the same LLM config as the assistant (from database)
 - Supports OpenRouter, Anthropic, OpenAI, Groq, etc. via LiteLLM
 - Memory features disabled if no LLM is configured
+
+Concurrency:
+- The Mem0 client is synchronous (embedding HTTP calls, Qdrant I/O), so every
+  call runs on a small dedicated thread pool with a timeout, never on the
+  event loop
+- Query embeddings are cached (LRU, keyed by normalized text)
+- Writes go through a bounded queue drained by one task, so memory
+  extraction runs one add at a time instead of competing with ingest
 """
 
+import asyncio
 import logging
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from backend.config import settings
 from backend.services.llm.config import LLMConfig, LLMProvider
@@ -28,6 +39,123 @@ logger = logging.getLogger(__name__)
 _memory_instance = None
 _memory_config_hash = None
 
+# Seconds a Mem0 read (search, list, delete) or write (add, which runs an LLM
+# extraction) may take before the caller gives up on it
+MEMORY_READ_TIMEOUT = 10.0
+MEMORY_WRITE_TIMEOUT = 120.0
+# Adds waiting for the writer; beyond this the oldest is dropped
+MEMORY_WRITE_QUEUE_SIZE = 100
+EMBEDDING_CACHE_SIZE = 512
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="mem0")
+
+
+class CachedEmbedder:
+    """LRU cache in front of a Mem0 embedder.
+
+    Keys are the whitespace-collapsed, case-folded text plus the memory
+    action, so the same question asked again (or re-searched on every turn
+    of a thread) is embedded once. Everything else is delegated.
+    """
+
+    def __init__(self, embedder, maxsize: int = EMBEDDING_CACHE_SIZE):
+        self._embedder = embedder
+        self._maxsize = maxsize
+        self._cache: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def embed(self, text, memory_action=None):
+        if not isinstance(text, str):
+            return self._embedder.embed(text, memory_action)
+        key = (" ".join(text.split()).casefold(), memory_action)
+        vector = self._cache.get(key)
+        if vector is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return vector
+        self.misses += 1
+        vector = self._embedder.embed(text, memory_action)
+        self._cache[key] = vector
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+        return vector
+
+    def __getattr__(self, name):
+        return getattr(self._embedder, name)
+
+
+async def _run(fn: Callable[[], Any], timeout: float) -> Any:
+    """Run a blocking Mem0 call on the memory thread pool."""
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(loop.run_in_executor(_executor, fn), timeout)
+
+
+class MemoryWriter:
+    """Single consumer for Mem0 adds.
+
+    Jobs are queued and run one at a time on the memory pool. The queue is
+    bounded: when it is full the oldest job is dropped (its caller gets an
+    empty result), since memory extraction is best effort.
+    """
+
+    def __init__(self, maxsize: int = MEMORY_WRITE_QUEUE_SIZE):
+        self._maxsize = maxsize
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def submit(self, fn: Callable[[], Any]) -> "asyncio.Future":
+        """Queue a blocking write; the future resolves with its result."""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        if self._queue.qsize() >= self._maxsize:
+            _, oldest = self._queue.get_nowait()
+            self._queue.task_done()
+            self.dropped += 1
+            if not oldest.done():
+                oldest.set_result({"results": []})
+            logger.warning("Memory write queue full; dropped oldest add")
+        self._queue.put_nowait((fn, future))
+        return future
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            fn, future = await self._queue.get()
+            try:
+                result = await _run(fn, MEMORY_WRITE_TIMEOUT)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+
+memory_writer = MemoryWriter()
+
+
+async def shutdown_memory() -> None:
+    """Stop the memory writer (lifespan shutdown); queued adds are dropped."""
+    await memory_writer.stop()
+
 
 def _get_llm_provider_config(llm_config: LLMConfig) -> Optional[dict]:
     """Convert LLMConfig to Mem0's LLM provider config.
@@ -237,6 +365,7 @@ def get_memory(llm_config: Optional[LLMConfig] = None):
         _seed_provider_env(llm_config)
 
         _memory_instance = Memory.from_config(config)
+        _memory_instance.embedding_model = CachedEmbedder(_memory_instance.embedding_model)
         _memory_config_hash = new_hash
         logger.info(f"Mem0 memory initialized (provider={llm_config._provider_str()})")
         return _memory_instance
@@ -262,16 +391,21 @@ async def search_memories(
     Returns:
         List of memory dicts with 'memory' and 'score' keys
     """
-    memory = get_memory(llm_config)
-    if not memory:
-        return []
+    def search():
+        memory = get_memory(llm_config)
+        if not memory:
+            return []
+        return memory.search(query, user_id=user_id, limit=limit)
 
     try:
-        results = memory.search(query, user_id=user_id, limit=limit)
+        results = await _run(search, MEMORY_READ_TIMEOUT)
         # Handle both dict and list return types from mem0
         if isinstance(results, dict):
             return results.get("results", [])
         return results or []
+    except asyncio.TimeoutError:
+        logger.warning("Memory search timed out")
+        return []
     except Exception as e:
         logger.warning(f"Memory search failed: {e}")
         return []
@@ -285,6 +419,9 @@ async def add_memory(
 ) -> dict:
     """Extract and store memories from a conversation.
 
+    The add is queued on the memory writer and awaited; callers that
+    don't need the result should run this as a background task.
+
     Args:
         messages: List of message dicts with 'role' and 'content'
         user_id: The user's ID for isolation
@@ -294,13 +431,18 @@ async def add_memory(
     Returns:
         Dict with 'results' containing extracted memories
     """
-    memory = get_memory(llm_config)
-    if not memory:
-        return {"results": []}
+    def add():
+        memory = get_memory(llm_config)
+        if not memory:
+            return None
+        return memory.add(messages, user_id=user_id, metadata=metadata)
 
     try:
-        result = memory.add(messages, user_id=user_id, metadata=metadata)
+        result = await memory_writer.submit(add)
         return result or {"results": []}
+    except asyncio.TimeoutError:
+        logger.warning("Memory add timed out")
+        return {"results": []}
     except Exception as e:
         logger.warning(f"Memory add failed: {e}")
         return {"results": []}
@@ -319,12 +461,14 @@ async def get_all_memories(
     Returns:
         List of all memory dicts for this user
     """
-    memory = get_memory(llm_config)
-    if not memory:
-        return []
+    def get_all():
+        memory = get_memory(llm_config)
+        if not memory:
+            return []
+        return memory.get_all(user_id=user_id)
 
     try:
-        results = memory.get_all(user_id=user_id)
+        results = await _run(get_all, MEMORY_READ_TIMEOUT)
         # Handle both dict and list return types
         if isinstance(results, dict):
             return results.get("results", [])
@@ -347,15 +491,17 @@ async def delete_memory(
     Returns:
         True if deleted successfully
     """
-    memory = get_memory(llm_config)
-    if not memory:
-        return False
-
-    try:
+    def delete():
+        memory = get_memory(llm_config)
+        if not memory:
+            return False
         memory.delete(memory_id)
         return True
+
+    try:
+        return await _run(delete, MEMORY_READ_TIMEOUT)
     except Exception as e:
-        logger.warning(f"Memory delete failed: {e}")
+        logger.warning(f"Memory delete failed: {e!r}")
         return False
 
 
@@ -372,15 +518,17 @@ async def delete_all_memories(
     Returns:
         True if deleted successfully
     """
-    memory = get_memory(llm_config)
-    if not memory:
-        return False
-
-    try:
+    def delete_all():
+        memory = get_memory(llm_config)
+        if not memory:
+            return False
         memory.delete_all(user_id=user_id)
         return True
+
+    try:
+        return await _run(delete_all, MEMORY_READ_TIMEOUT)
     except Exception as e:
-        logger.warning(f"Delete all memories failed: {e}")
+        logger.warning(f"Delete all memories failed: {e!r}")
         return False
 
 
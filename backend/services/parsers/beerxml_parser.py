@@ -1,6 +1,7 @@
 """Parse BeerXML files to Python dict."""
+import io
 import xml.etree.ElementTree as ET
-from typing import Dict, Any, List, Union
+from typing import IO, Dict, Any, Iterator, List, Union
 from defusedxml import ElementTree as DefusedET
 
 
@@ -27,6 +28,44 @@ class BeerXMLParser:
         # Return the root element as a dict with its tag as the key
         return {root.tag: self._element_to_dict(root)}
 
+    def iter_recipes(self, source: Union[str, bytes, IO[bytes]]) -> Iterator[Dict[str, Any]]:
+        """Stream <RECIPE> elements one at a time as single-recipe BeerXML dicts.
+
+        Uses iterparse, so a multi-recipe export is never held as a whole tree:
+        each RECIPE becomes a dict when its end tag is parsed and is then
+        detached from its parent. Yields ``{'RECIPES': {'RECIPE': {...}}}`` —
+        what ``parse`` returns for a single-recipe file — so each item can be
+        handed to BeerXMLToBeerJSONConverter as it arrives.
+
+        Args:
+            source: BeerXML as a string, bytes, or a binary file object
+
+        Raises:
+            ValueError: Invalid XML. Raised when the parser reaches the bad
+                part, so recipes before it have already been yielded.
+        """
+        if isinstance(source, str):
+            source = source.encode('utf-8')
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+
+        stack: List[ET.Element] = []
+        try:
+            for event, elem in DefusedET.iterparse(source, events=("start", "end")):
+                if event == "start":
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                if elem.tag == "RECIPE":
+                    recipe = self._element_to_dict(elem)
+                    # Drop the finished subtree before handing the recipe out
+                    if stack:
+                        stack[-1].remove(elem)
+                    elem.clear()
+                    yield {'RECIPES': {'RECIPE': recipe}}
+        except ET.ParseError as e:
+            raise ValueError(f"Invalid XML: {e}")
+
     def _element_to_dict(self, element: ET.Element) -> Union[Dict[str, Any], str]:
         """Convert XML element to dict or string.
 
@@ -0,0 +1,235 @@
+"""Streaming export of readings as CSV or Parquet.
+
+Readings are paged out with keyset pagination on (timestamp, id), selecting
+plain column tuples instead of ORM objects. Each page is read in its own
+short session and encoded as one chunk, so a slow download never holds a
+database transaction open and memory stays bounded by the page size.
+
+CSV can be gzipped on the fly. Parquet output needs pyarrow, which is not a
+hard dependency - `parquet_available()` tells the caller whether it can be
+offered.
+"""
+
+import asyncio
+import csv
+import io
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import and_, or_, select
+
+from ..database import async_session_factory
+from ..models import Device, Reading, serialize_datetime_to_utc
+
+EXPORT_PAGE_SIZE = 5000
+
+# (header, column, arrow type) in export order
+EXPORT_COLUMNS = (
+    ("id", Reading.id, "int64"),
+    ("timestamp", Reading.timestamp, "timestamp"),
+    ("device_id", Reading.device_id, "string"),
+    ("device_type", Reading.device_type, "string"),
+    ("device_name", Device.name, "string"),
+    ("beer_name", Device.beer_name, "string"),
+    ("batch_id", Reading.batch_id, "int64"),
+    ("sg_raw", Reading.sg_raw, "float64"),
+    ("sg_calibrated", Reading.sg_calibrated, "float64"),
+    ("sg_filtered", Reading.sg_filtered, "float64"),
+    ("temp_raw", Reading.temp_raw, "float64"),
+    ("temp_calibrated", Reading.temp_calibrated, "float64"),
+    ("temp_filtered", Reading.temp_filtered, "float64"),
+    ("rssi", Reading.rssi, "int64"),
+    ("battery_voltage", Reading.battery_voltage, "float64"),
+    ("battery_percent", Reading.battery_percent, "int64"),
+    ("angle", Reading.angle, "float64"),
+    ("status", Reading.status, "string"),
+)
+
+_ID = 0
+_TIMESTAMP = 1
+
+
+@dataclass
+class ReadingExportFilter:
+    """Which readings to export. Unset fields don't filter."""
+
+    batch_id: Optional[int] = None
+    device_id: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    # Cloud mode: only readings from devices this user owns
+    user_id: Optional[str] = None
+
+
+def parquet_available() -> bool:
+    """Check whether pyarrow is installed for Parquet output."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _page_query(filters: ReadingExportFilter, after: Optional[tuple], page_size: int):
+    query = (
+        select(*(column for _, column, _ in EXPORT_COLUMNS))
+        .select_from(Reading)
+        .outerjoin(Device, Device.id == Reading.device_id)
+    )
+    if filters.batch_id is not None:
+        query = query.where(Reading.batch_id == filters.batch_id)
+    if filters.device_id is not None:
+        query = query.where(Reading.device_id == filters.device_id)
+    if filters.start is not None:
+        query = query.where(Reading.timestamp >= filters.start)
+    if filters.end is not None:
+        query = query.where(Reading.timestamp < filters.end)
+    if filters.user_id is not None:
+        query = query.where(Device.user_id == filters.user_id)
+    if after is not None:
+        last_timestamp, last_id = after
+        query = query.where(or_(
+            Reading.timestamp > last_timestamp,
+            and_(Reading.timestamp == last_timestamp, Reading.id > last_id),
+        ))
+    return query.order_by(Reading.timestamp, Reading.id).limit(page_size)
+
+
+async def iter_reading_pages(
+    filters: ReadingExportFilter,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> AsyncIterator[list[tuple]]:
+    """Yield pages of reading rows, in EXPORT_COLUMNS order, oldest first."""
+    after = None
+    while True:
+        async with async_session_factory() as session:
+            result = await session.execute(_page_query(filters, after, page_size))
+            rows = [tuple(row) for row in result.all()]
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        after = (rows[-1][_TIMESTAMP], rows[-1][_ID])
+
+
+def _encode_csv(rows: list[tuple], header: bool = False) -> bytes:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    if header:
+        writer.writerow([name for name, _, _ in EXPORT_COLUMNS])
+    for row in rows:
+        row = list(row)
+        row[_TIMESTAMP] = serialize_datetime_to_utc(row[_TIMESTAMP]) or ""
+        writer.writerow(row)
+    return output.getvalue().encode("utf-8")
+
+
+async def stream_csv(
+    filters: ReadingExportFilter,
+    compress: bool = False,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> AsyncIterator[bytes]:
+    """Stream readings as CSV, one chunk per page, optionally gzipped."""
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    gzip = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def emit(data: bytes) -> bytes:
+        return gzip.compress(data) if gzip else data
+
+    yield emit(_encode_csv([], header=True))
+    async for rows in iter_reading_pages(filters, page_size):
+        chunk = emit(await asyncio.to_thread(_encode_csv, rows))
+        if chunk:
+            yield chunk
+    if gzip:
+        yield gzip.flush()
+
+
+class _ChunkSink:
+    """Write-only file object that hands back what was written since the last drain.
+
+    ParquetWriter needs a file with a monotonically increasing tell() to lay
+    out its footer, so the position keeps counting while the bytes are
+    drained to the response.
+    """
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _arrow_schema(pa):
+    fields = []
+    for name, _, type_name in EXPORT_COLUMNS:
+        if type_name == "timestamp":
+            arrow_type = pa.timestamp("us", tz="UTC")
+        else:
+            arrow_type = getattr(pa, type_name)()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _as_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    if dt is None or dt.tzinfo is not None:
+        return dt
+    return dt.replace(tzinfo=timezone.utc)
+
+
+async def stream_parquet(
+    filters: ReadingExportFilter,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> AsyncIterator[bytes]:
+    """Stream readings as a Parquet file with one row group per page.
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+
+    def write_page(rows: list[tuple]) -> None:
+        columns = [list(column) for column in zip(*rows)]
+        columns[_TIMESTAMP] = [_as_utc(dt) for dt in columns[_TIMESTAMP]]
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema,
+        ))
+
+    try:
+        async for rows in iter_reading_pages(filters, page_size):
+            await asyncio.to_thread(write_page, rows)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        # Closing writes the footer; an empty export is still a valid file
+        writer.close()
+    yield sink.drain()
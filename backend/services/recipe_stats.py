@@ -0,0 +1,91 @@
+"""Bulk recipe statistics recalculation.
+
+Recomputes OG, FG, ABV, IBU and color for every recipe matching a filter in
+one pass: recipes are read in id-ordered pages with their ingredients
+eager-loaded (three IN queries per page rather than three lazy loads per
+recipe), stats come from the memoized engine in services.brewing, and only
+recipes whose stats actually changed are written, flushed as a single
+executemany UPDATE per page.
+"""
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from ..models import Recipe
+from .brewing import calculate_recipe_stats
+
+logger = logging.getLogger(__name__)
+
+STAT_FIELDS = ("og", "fg", "abv", "ibu", "color_srm")
+
+
+async def recalculate_all_recipes(
+    db: AsyncSession,
+    where: Optional[Any] = None,
+    batch_size: int = 200,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """Recalculate stats for all recipes matching ``where``.
+
+    Args:
+        db: Database session
+        where: Optional SQLAlchemy condition (e.g. an ownership filter)
+        batch_size: Recipes loaded and committed per page
+        dry_run: Compute and count changes without writing them
+
+    Returns:
+        Dict with processed, updated and skipped (no ingredients) counts
+    """
+    processed = updated = skipped = 0
+    last_id = 0
+
+    while True:
+        query = (
+            select(Recipe)
+            .options(
+                selectinload(Recipe.fermentables),
+                selectinload(Recipe.hops),
+                selectinload(Recipe.cultures),
+            )
+            .where(Recipe.id > last_id)
+            .order_by(Recipe.id)
+            .limit(batch_size)
+        )
+        if where is not None:
+            query = query.where(where)
+        recipes = (await db.execute(query)).scalars().all()
+        if not recipes:
+            break
+
+        for recipe in recipes:
+            processed += 1
+            if not recipe.fermentables and not recipe.hops:
+                skipped += 1
+                continue
+
+            stats = calculate_recipe_stats(recipe)
+            changed = {
+                field: value
+                for field, value in stats.items()
+                if getattr(recipe, field) != value
+            }
+            if changed:
+                updated += 1
+                if not dry_run:
+                    for field, value in changed.items():
+                        setattr(recipe, field, value)
+
+        last_id = recipes[-1].id
+        if not dry_run:
+            await db.commit()
+        # Drop the page from the identity map so memory stays flat
+        db.expunge_all()
+
+    logger.info(
+        "Recalculated recipe stats: %d processed, %d updated, %d skipped%s",
+        processed, updated, skipped, " (dry run)" if dry_run else "",
+    )
+    return {"processed": processed, "updated": updated, "skipped": skipped}
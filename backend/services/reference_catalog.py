@@ -0,0 +1,394 @@
+"""In-memory catalog of the seeded reference data (styles, hops, fermentables, yeast).
+
+The reference tables are seeded from backend/seed/*.json and only change when
+a brewer adds a custom entry or refreshes from the seed file, yet the LLM
+search tools, the REST list endpoints, style_resolver and
+resolve_fermentable_color_srm all used to run ``ILIKE '%…%'`` scans against
+them on every call — including once per ingredient during bulk recipe imports
+and backfills.
+
+This module keeps one process-wide, immutable snapshot of those tables with
+token, trigram and alias indexes, and answers exact, substring and ranked
+fuzzy lookups from memory. The snapshot is loaded at startup (see
+``warm_reference_catalog`` in the lifespan) or lazily on first use, and is
+dropped whenever an ORM session writes to one of the reference tables, so the
+next lookup reloads it. Readers never see a half-built catalog: a reload builds
+a new snapshot and swaps it in.
+"""
+
+import bisect
+import logging
+import re
+from itertools import chain
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Writes to these tables invalidate the catalog.
+_REFERENCE_TABLES = frozenset({"styles", "hop_varieties", "fermentables", "yeast_strains"})
+
+# Secondary text fields searched (with a lower score) besides the name.
+_TEXT_FIELDS = {
+    "styles": ("category", "comments", "description"),
+    "hops": ("origin", "aroma_profile", "substitutes", "description"),
+    "fermentables": ("origin", "maltster", "flavor_profile", "substitutes", "description"),
+    "yeast": ("producer", "product_id", "description"),
+}
+
+# Minimum trigram similarity for a typo-tolerant name match.
+FUZZY_THRESHOLD = 0.35
+
+# Ranking scores, strongest signal first.
+_SCORE_EXACT = 100.0
+_SCORE_ALIAS = 95.0
+_SCORE_PREFIX = 85.0
+_SCORE_SUBSTRING = 70.0
+_SCORE_NAME_TOKENS = 60.0
+_SCORE_FUZZY = 50.0  # scaled by similarity
+_SCORE_TEXT_TOKENS = 40.0
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_SESSION_DIRTY_KEY = "reference_catalog_dirty"
+
+
+def normalize(value: Optional[str]) -> str:
+    """Lowercase and collapse whitespace for matching."""
+    if not value:
+        return ""
+    return " ".join(value.lower().split())
+
+
+def tokenize(value: Optional[str]) -> list[str]:
+    return _TOKEN_RE.findall(value.lower()) if value else []
+
+
+def trigrams(value: str) -> frozenset[str]:
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space."""
+    grams = set()
+    for word in tokenize(value):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def contains(value: Optional[str], needle: str) -> bool:
+    """Case-insensitive substring filter (the in-memory ILIKE '%needle%')."""
+    return value is not None and needle.lower() in value.lower()
+
+
+def at_least(value: Optional[float], bound: float) -> bool:
+    """Range filter; NULL never matches, as in SQL."""
+    return value is not None and value >= bound
+
+
+def at_most(value: Optional[float], bound: float) -> bool:
+    """Range filter; NULL never matches, as in SQL."""
+    return value is not None and value <= bound
+
+
+class CatalogRecord:
+    """Read-only snapshot of one reference row.
+
+    Exposes columns as attributes, like the ORM instance it was read from, so
+    formatting code and ``from_attributes`` response models accept it as-is.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict[str, Any]):
+        object.__setattr__(self, "_data", MappingProxyType(dict(data)))
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("catalog records are read-only")
+
+    def __repr__(self) -> str:
+        return f"CatalogRecord(id={self._data.get('id')!r}, name={self._data.get('name')!r})"
+
+
+class CatalogIndex:
+    """Indexes over one reference table: exact names, aliases, tokens, trigrams."""
+
+    def __init__(
+        self,
+        records: Iterable[CatalogRecord],
+        text_fields: tuple[str, ...] = (),
+        aliases: Optional[dict[str, str]] = None,
+        code_field: Optional[str] = None,
+    ):
+        self.records: tuple[CatalogRecord, ...] = tuple(
+            sorted(records, key=lambda r: normalize(r.name))
+        )
+        self._by_id = {r.id: r for r in self.records}
+        self._names = [normalize(r.name) for r in self.records]
+        self._name_grams = [trigrams(n) for n in self._names]
+
+        by_name: dict[str, list[int]] = {}
+        name_tokens: dict[str, set[int]] = {}
+        text_tokens: dict[str, set[int]] = {}
+        gram_index: dict[str, set[int]] = {}
+        for i, record in enumerate(self.records):
+            by_name.setdefault(self._names[i], []).append(i)
+            for token in tokenize(record.name):
+                name_tokens.setdefault(token, set()).add(i)
+            for field in text_fields:
+                for token in tokenize(getattr(record, field, None)):
+                    text_tokens.setdefault(token, set()).add(i)
+            for gram in self._name_grams[i]:
+                gram_index.setdefault(gram, set()).add(i)
+
+        self._by_name = by_name
+        self._name_tokens = name_tokens
+        self._name_vocab = sorted(name_tokens)
+        self._text_tokens = text_tokens
+        self._text_vocab = sorted(text_tokens)
+        self._grams = gram_index
+
+        # Alias -> record positions, resolved once against the exact-name index.
+        self._aliases: dict[str, list[int]] = {}
+        for alias, canonical in (aliases or {}).items():
+            positions = by_name.get(normalize(canonical))
+            if positions:
+                self._aliases[normalize(alias)] = positions
+
+        # Code -> record positions (e.g. yeast product_id). Keyed per record,
+        # not via the name: the same strain name is sold by several labs.
+        self._codes: dict[str, list[int]] = {}
+        if code_field:
+            for i, record in enumerate(self.records):
+                code = normalize(getattr(record, code_field, None))
+                if code:
+                    self._codes.setdefault(code, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, record_id: Any) -> Optional[CatalogRecord]:
+        return self._by_id.get(record_id)
+
+    def exact(self, name: Optional[str]) -> list[CatalogRecord]:
+        """Records whose name equals ``name`` case-insensitively."""
+        return [self.records[i] for i in self._by_name.get(normalize(name), ())]
+
+    def alias(self, name: Optional[str]) -> list[CatalogRecord]:
+        """Records an alias (e.g. "NEIPA") points at."""
+        return [self.records[i] for i in self._aliases.get(normalize(name), ())]
+
+    def code(self, value: Optional[str]) -> list[CatalogRecord]:
+        """Records whose code field (e.g. yeast product_id) equals ``value``."""
+        return [self.records[i] for i in self._codes.get(normalize(value), ())]
+
+    def substring(self, text: Optional[str]) -> list[CatalogRecord]:
+        """Records whose name contains ``text`` case-insensitively (name order)."""
+        return [self.records[i] for i in self._substring_positions(normalize(text))]
+
+    def search(
+        self,
+        query: Optional[str],
+        where: Optional[Callable[[CatalogRecord], bool]] = None,
+        limit: Optional[int] = None,
+    ) -> list[CatalogRecord]:
+        """Ranked fuzzy search; without a query, all records in name order.
+
+        Ranking: exact name > alias or code > name prefix > name substring > all query
+        words in the name > typo-tolerant trigram match on the name > all query
+        words in the secondary text fields. ``where`` filters before ``limit``.
+        """
+        scored = self.scored(query)
+        if scored is None:
+            matches = list(self.records)
+        else:
+            matches = [self.records[i] for i, _ in scored]
+        if where is not None:
+            matches = [r for r in matches if where(r)]
+        return matches[:limit] if limit is not None else matches
+
+    def scored(self, query: Optional[str]) -> Optional[list[tuple[int, float]]]:
+        """(position, score) pairs best-first, or None for an empty query."""
+        q = normalize(query)
+        if not q:
+            return None
+
+        scores: dict[int, float] = {}
+
+        def bump(positions: Iterable[int], score: float) -> None:
+            for i in positions:
+                if score > scores.get(i, 0.0):
+                    scores[i] = score
+
+        bump(self._by_name.get(q, ()), _SCORE_EXACT)
+        bump(self._aliases.get(q, ()), _SCORE_ALIAS)
+        bump(self._codes.get(q, ()), _SCORE_ALIAS)
+        for i in self._substring_positions(q):
+            bump((i,), _SCORE_PREFIX if self._names[i].startswith(q) else _SCORE_SUBSTRING)
+
+        tokens = tokenize(q)
+        if tokens:
+            bump(self._token_matches(tokens, self._name_tokens, self._name_vocab), _SCORE_NAME_TOKENS)
+
+        q_grams = trigrams(q)
+        candidates: set[int] = set()
+        for gram in q_grams:
+            candidates |= self._grams.get(gram, set())
+        for i in candidates:
+            sim = similarity(q_grams, self._name_grams[i])
+            if sim >= FUZZY_THRESHOLD:
+                bump((i,), _SCORE_FUZZY * sim)
+
+        if tokens:
+            bump(self._token_matches(tokens, self._text_tokens, self._text_vocab), _SCORE_TEXT_TOKENS)
+
+        return sorted(scores.items(), key=lambda item: (-item[1], self._names[item[0]]))
+
+    def _substring_positions(self, text: str) -> list[int]:
+        if not text:
+            return []
+        if len(text) < 3:
+            return [i for i, name in enumerate(self._names) if text in name]
+        # Every unpadded trigram of a substring appears in the containing
+        # name, so the rarest one's posting list bounds the candidates to
+        # verify. Padded grams only hold at word boundaries, so skip them.
+        grams = sorted(
+            (self._grams.get(g, set()) for g in trigrams(text) if " " not in g),
+            key=len,
+        )
+        if not grams:
+            return [i for i, name in enumerate(self._names) if text in name]
+        return sorted(i for i in grams[0] if text in self._names[i])
+
+    @staticmethod
+    def _token_matches(
+        tokens: list[str], index: dict[str, set[int]], vocab: list[str]
+    ) -> set[int]:
+        """Positions where every query token prefix-matches some indexed token."""
+        result: Optional[set[int]] = None
+        for token in tokens:
+            hits: set[int] = set()
+            start = bisect.bisect_left(vocab, token)
+            for word in vocab[start:]:
+                if not word.startswith(token):
+                    break
+                hits |= index[word]
+            result = hits if result is None else result & hits
+            if not result:
+                return set()
+        return result or set()
+
+
+class ReferenceCatalog:
+    """Immutable snapshot of all four reference tables."""
+
+    def __init__(
+        self,
+        styles: CatalogIndex,
+        hops: CatalogIndex,
+        fermentables: CatalogIndex,
+        yeast: CatalogIndex,
+    ):
+        self.styles = styles
+        self.hops = hops
+        self.fermentables = fermentables
+        self.yeast = yeast
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> "ReferenceCatalog":
+        """Read all reference rows (as plain column tuples, not ORM objects)."""
+        from ..models import Fermentable, HopVariety, Style, YeastStrain
+        from .style_resolver import _STYLE_ALIASES
+
+        async def rows(model) -> list[CatalogRecord]:
+            result = await db.execute(select(model.__table__))
+            return [CatalogRecord(row) for row in result.mappings()]
+
+        return cls(
+            styles=CatalogIndex(await rows(Style), _TEXT_FIELDS["styles"], _STYLE_ALIASES),
+            hops=CatalogIndex(await rows(HopVariety), _TEXT_FIELDS["hops"]),
+            fermentables=CatalogIndex(await rows(Fermentable), _TEXT_FIELDS["fermentables"]),
+            # Product codes ("US-05", "WLP001") are how brewers usually name yeast.
+            yeast=CatalogIndex(await rows(YeastStrain), _TEXT_FIELDS["yeast"], code_field="product_id"),
+        )
+
+
+_catalog: Optional[ReferenceCatalog] = None
+_generation = 0
+
+
+def invalidate_reference_catalog() -> None:
+    """Drop the current snapshot; the next lookup reloads it."""
+    global _catalog, _generation
+    _catalog = None
+    _generation += 1
+
+
+async def get_reference_catalog(db: AsyncSession) -> ReferenceCatalog:
+    """Return the current catalog, loading it through ``db`` if needed."""
+    global _catalog
+    catalog = _catalog
+    if catalog is not None:
+        return catalog
+
+    generation = _generation
+    catalog = await ReferenceCatalog.load(db)
+    # Don't install a snapshot that was invalidated while it was loading.
+    if generation == _generation:
+        _catalog = catalog
+        logger.info(
+            "Reference catalog loaded: %d styles, %d hops, %d fermentables, %d yeast",
+            len(catalog.styles), len(catalog.hops), len(catalog.fermentables), len(catalog.yeast),
+        )
+    return catalog
+
+
+async def warm_reference_catalog() -> None:
+    """Load the catalog at startup so the first request doesn't pay for it."""
+    from ..database import async_session_factory
+
+    async with async_session_factory() as session:
+        await get_reference_catalog(session)
+
+
+def _touches_reference_tables(objects: Iterable[Any]) -> bool:
+    return any(getattr(obj, "__tablename__", None) in _REFERENCE_TABLES for obj in objects)
+
+
+@event.listens_for(Session, "after_flush")
+def _on_flush(session: Session, flush_context) -> None:
+    if _touches_reference_tables(chain(session.new, session.dirty, session.deleted)):
+        session.info[_SESSION_DIRTY_KEY] = True
+        invalidate_reference_catalog()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_orm_execute(orm_execute_state) -> None:
+    # Bulk insert()/update()/delete() against a reference model bypass flush.
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "name", None) in _REFERENCE_TABLES:
+        orm_execute_state.session.info[_SESSION_DIRTY_KEY] = True
+        invalidate_reference_catalog()
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _on_transaction_end(session: Session) -> None:
+    # Invalidate again once the write is visible (or undone) to other sessions,
+    # in case a reload raced the still-open transaction.
+    if session.info.pop(_SESSION_DIRTY_KEY, False):
+        invalidate_reference_catalog()
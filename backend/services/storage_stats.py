@@ -0,0 +1,243 @@
+"""Reading storage statistics without scanning the readings table.
+
+``/api/stats`` and ``/api/system/storage`` used to run ``COUNT(*)`` over every
+reading on each call and guess the size as ``count * 100``. Counts now live in
+the ``reading_stats`` table, one row per scope:
+
+- ``("all", "")`` - every reading
+- ``("device", <device_id>)`` and ``("batch", <batch_id>)`` - per owner
+- ``("day", "YYYY-MM-DD")`` - per reading date, used for the growth rate
+
+The rows are maintained by triggers on ``readings`` (insert, delete, and
+updates that move a reading to another device, batch or day), so every
+writer - BLE scanner, gateways, HTTP ingest, cleanup - is covered without
+touching it:
+
+- Local (SQLite): created and seeded from the existing readings by
+  ``database._migrate_create_reading_stats``.
+- Cloud (PostgreSQL): created by the Supabase migration.
+
+If the counters are missing (a cloud database without the migration) the
+stats fall back to counting the table. Oldest/newest come from the timestamp
+index, and the on-disk size from ``dbstat`` / ``pg_total_relation_size``,
+cached briefly because ``dbstat`` walks the table's pages.
+"""
+
+import logging
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Batch, Device, Reading, ReadingStat, serialize_datetime_to_utc
+
+logger = logging.getLogger(__name__)
+
+# Days averaged for readings_per_day
+GROWTH_WINDOW_DAYS = 7
+
+# How long a measured table size is served before it is measured again
+SIZE_CACHE_SECONDS = 300.0
+
+_size_cache: Optional[tuple[float, int]] = None  # (measured_at, bytes)
+
+_SQLITE_UPSERT = (
+    "INSERT INTO reading_stats (scope, key, readings) SELECT {scope}, {key}, 1 "
+    "WHERE {key} IS NOT NULL "
+    "ON CONFLICT (scope, key) DO UPDATE SET readings = readings + 1;"
+)
+_SQLITE_DECREMENT = (
+    "UPDATE reading_stats SET readings = readings - 1 WHERE "
+    "(scope = 'all' AND key = '') "
+    "OR (scope = 'device' AND key = {row}.device_id) "
+    "OR (scope = 'batch' AND key = CAST({row}.batch_id AS TEXT)) "
+    "OR (scope = 'day' AND key = date({row}.timestamp));"
+)
+
+
+def _sqlite_increment(row: str) -> str:
+    return "\n".join(
+        _SQLITE_UPSERT.format(scope=f"'{scope}'", key=key)
+        for scope, key in (
+            ("all", "''"),
+            ("device", f"{row}.device_id"),
+            ("batch", f"CAST({row}.batch_id AS TEXT)"),
+            ("day", f"date({row}.timestamp)"),
+        )
+    )
+
+
+SQLITE_TRIGGERS = {
+    "reading_stats_insert": (
+        "AFTER INSERT ON readings BEGIN\n" + _sqlite_increment("NEW") + "\nEND"
+    ),
+    "reading_stats_delete": (
+        "AFTER DELETE ON readings BEGIN\n" + _SQLITE_DECREMENT.format(row="OLD") + "\nEND"
+    ),
+    "reading_stats_update": (
+        "AFTER UPDATE OF device_id, batch_id, timestamp ON readings BEGIN\n"
+        + _SQLITE_DECREMENT.format(row="OLD") + "\n"
+        + _sqlite_increment("NEW") + "\nEND"
+    ),
+}
+
+
+def create_sqlite_triggers(conn) -> bool:
+    """Create the SQLite counter triggers if missing. Returns True if any were created.
+
+    Sync function for ``conn.run_sync``.
+    """
+    existing = {
+        row[0] for row in conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type='trigger' AND tbl_name='readings'")
+        )
+    }
+    created = False
+    for name, body in SQLITE_TRIGGERS.items():
+        if name not in existing:
+            conn.execute(text(f"CREATE TRIGGER {name} {body}"))
+            created = True
+    return created
+
+
+def seed_counts(conn) -> int:
+    """Rebuild reading_stats from the readings table. Returns the total count.
+
+    Sync function for ``conn.run_sync``; one full scan, run once when the
+    triggers are installed.
+    """
+    conn.execute(text("DELETE FROM reading_stats"))
+    conn.execute(text("""
+        INSERT INTO reading_stats (scope, key, readings)
+        SELECT 'all', '', COUNT(*) FROM readings
+        UNION ALL
+        SELECT 'device', device_id, COUNT(*) FROM readings
+            WHERE device_id IS NOT NULL GROUP BY device_id
+        UNION ALL
+        SELECT 'batch', CAST(batch_id AS TEXT), COUNT(*) FROM readings
+            WHERE batch_id IS NOT NULL GROUP BY batch_id
+        UNION ALL
+        SELECT 'day', date(timestamp), COUNT(*) FROM readings
+            WHERE timestamp IS NOT NULL GROUP BY date(timestamp)
+    """))
+    return conn.execute(
+        text("SELECT readings FROM reading_stats WHERE scope = 'all'")
+    ).scalar() or 0
+
+
+async def prune_counts(session: AsyncSession) -> None:
+    """Drop counter rows that have reached zero (caller commits)."""
+    await session.execute(
+        delete(ReadingStat).where(ReadingStat.scope != "all", ReadingStat.readings <= 0)
+    )
+
+
+def invalidate_size() -> None:
+    """Forget the cached table size, e.g. after cleanup deleted readings."""
+    global _size_cache
+    _size_cache = None
+
+
+async def _measure_size(session: AsyncSession) -> Optional[int]:
+    dialect = session.get_bind().dialect.name
+    try:
+        if dialect == "postgresql":
+            return await session.scalar(text("SELECT pg_total_relation_size('readings')"))
+        try:
+            # The table plus its indexes, as stored on disk
+            return await session.scalar(text("""
+                SELECT SUM(pgsize) FROM dbstat WHERE name = 'readings'
+                OR name IN (SELECT name FROM sqlite_master
+                            WHERE type = 'index' AND tbl_name = 'readings')
+            """))
+        except DBAPIError:
+            # SQLite built without dbstat: fall back to the whole file
+            await session.rollback()
+            page_count = await session.scalar(text("PRAGMA page_count"))
+            page_size = await session.scalar(text("PRAGMA page_size"))
+            return int(page_count or 0) * int(page_size or 0)
+    except DBAPIError as e:
+        logger.warning(f"Could not measure readings table size: {e}")
+        await session.rollback()
+        return None
+
+
+async def get_table_size(session: AsyncSession) -> Optional[int]:
+    """Get the on-disk size of the readings table, cached for SIZE_CACHE_SECONDS."""
+    global _size_cache
+    now = time.monotonic()
+    if _size_cache and now - _size_cache[0] < SIZE_CACHE_SECONDS:
+        return _size_cache[1]
+    size = await _measure_size(session)
+    if size is not None:
+        _size_cache = (now, int(size))
+    return size
+
+
+async def get_storage_stats(session: AsyncSession, user_id: Optional[str] = None) -> dict:
+    """Get reading counts, date range, size and growth rate.
+
+    Args:
+        session: Database session
+        user_id: If set (cloud mode), the per-device and per-batch breakdown
+            only lists that user's devices and batches
+    """
+    rows = (await session.execute(select(ReadingStat))).scalars().all()
+    counts: dict[str, dict[str, int]] = {}
+    for row in rows:
+        if row.readings > 0 or row.scope == "all":
+            counts.setdefault(row.scope, {})[row.key] = row.readings
+
+    if user_id is not None:
+        owned_devices = set((await session.execute(
+            select(Device.id).where(Device.user_id == user_id)
+        )).scalars())
+        owned_batches = {str(b) for b in (await session.execute(
+            select(Batch.id).where(Batch.user_id == user_id)
+        )).scalars()}
+        counts["device"] = {k: v for k, v in counts.get("device", {}).items() if k in owned_devices}
+        counts["batch"] = {k: v for k, v in counts.get("batch", {}).items() if k in owned_batches}
+
+    if "all" in counts:
+        total = counts["all"].get("", 0)
+    else:
+        # Counters not installed on this database
+        total = await session.scalar(select(func.count()).select_from(Reading)) or 0
+
+    # Both are a single seek on the timestamp index
+    oldest = await session.scalar(select(func.min(Reading.timestamp)))
+    newest = await session.scalar(select(func.max(Reading.timestamp)))
+
+    today = datetime.now(timezone.utc).date()
+    window = [(today - timedelta(days=i)).isoformat() for i in range(1, GROWTH_WINDOW_DAYS + 1)]
+    per_day = counts.get("day", {})
+    days_stored = _days_between(oldest, today)
+    days_counted = min(GROWTH_WINDOW_DAYS, days_stored) if days_stored else 0
+    readings_per_day = (
+        round(sum(per_day.get(day, 0) for day in window) / days_counted, 1)
+        if days_counted else None
+    )
+
+    size = await get_table_size(session)
+    return {
+        "total_readings": total,
+        "oldest_reading": serialize_datetime_to_utc(oldest) if oldest else None,
+        "newest_reading": serialize_datetime_to_utc(newest) if newest else None,
+        "size_bytes": size,
+        # Kept for existing clients; now the measured size when available
+        "estimated_size_bytes": size if size is not None else int(total) * 100,
+        "readings_today": per_day.get(today.isoformat(), 0),
+        "readings_per_day": readings_per_day,
+        "readings_by_device": counts.get("device", {}),
+        "readings_by_batch": {int(k): v for k, v in counts.get("batch", {}).items()},
+    }
+
+
+def _days_between(oldest: Optional[datetime], today: date) -> int:
+    """Whole days of history before today (0 if everything is from today)."""
+    if oldest is None:
+        return 0
+    return max((today - oldest.date()).days, 0)
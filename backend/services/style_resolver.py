@@ -5,13 +5,15 @@ emitted by the model) and the REST POST/PUT /recipes endpoints (which pass
 style names typed into the edit form's autocomplete). Keeping this in
 services/ avoids the REST layer importing private helpers from
 services/llm/tools/.
+
+Lookups are served from the in-memory reference catalog
+(services/reference_catalog.py) rather than querying the styles table.
 """
-from typing import Optional
+from typing import Any, Optional
 
-from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import Style
+from .reference_catalog import get_reference_catalog
 
 
 # Colloquial brewer shorthand -> canonical BJCP 2021 style name. Brewers and
@@ -46,27 +48,24 @@ _STYLE_ALIASES = {
 }
 
 
-async def _exact(db: AsyncSession, name: str) -> Optional[Style]:
-    """Case-insensitive exact name match. .limit(1) + deterministic ordering
-    keeps the result stable across duplicate names / guide versions."""
-    result = await db.execute(
-        select(Style)
-        .where(func.lower(Style.name) == name.lower())
-        .order_by(Style.guide.desc(), Style.id)
-        .limit(1)
-    )
-    return result.scalar_one_or_none()
+def _preferred(styles: list) -> Optional[Any]:
+    """Deterministic pick among duplicate names / guide versions: newest guide
+    first (guide DESC), then id."""
+    if not styles:
+        return None
+    return sorted(sorted(styles, key=lambda s: s.id), key=lambda s: s.guide, reverse=True)[0]
+
+
+async def _exact(db: AsyncSession, name: str) -> Optional[Any]:
+    """Case-insensitive exact name match."""
+    catalog = await get_reference_catalog(db)
+    return _preferred(catalog.styles.exact(name))
 
 
-async def _substring(db: AsyncSession, name: str) -> Optional[Style]:
+async def _substring(db: AsyncSession, name: str) -> Optional[Any]:
     """Loose substring name match — last resort."""
-    result = await db.execute(
-        select(Style)
-        .where(Style.name.ilike(f"%{name}%"))
-        .order_by(Style.guide.desc(), Style.id)
-        .limit(1)
-    )
-    return result.scalar_one_or_none()
+    catalog = await get_reference_catalog(db)
+    return _preferred(catalog.styles.substring(name))
 
 
 async def resolve_style_id(
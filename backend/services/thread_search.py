@@ -0,0 +1,250 @@
+"""Full-text search over AG-UI assistant conversations.
+
+``search_threads`` used to run ``lower(content) LIKE '%q%'`` over an outer join
+of threads and messages — a full scan of every message ever stored. This
+module backs it with a real full-text index instead:
+
+- Local (SQLite): an FTS5 virtual table, ``ag_ui_messages_fts``, whose rowid
+  mirrors ``ag_ui_messages.id``. ``routers.ag_ui._save_message`` writes to it in
+  the same transaction as the message row and ``delete_thread`` removes a
+  thread's rows. The table is created (and backfilled from existing messages)
+  by ``database._migrate_create_ag_ui_messages_fts``.
+- Cloud (PostgreSQL): a GIN expression index on
+  ``to_tsvector('english', content)`` created by the Supabase migration. The
+  index is maintained by Postgres itself, so there is nothing to write per
+  message.
+
+Results are ranked (bm25 / ts_rank), carry highlighted snippets, and are
+scoped to the requesting user's threads. ``rebuild_index`` re-populates the
+SQLite index from scratch; run it via
+``python -m backend.migrations.backfill_thread_search_index``.
+"""
+
+import logging
+import re
+from typing import Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "ag_ui_messages_fts"
+
+# Cap on matching messages pulled back before grouping them into threads.
+_MAX_MESSAGE_HITS = 100
+
+# The missing-index fallback is logged once per process, not per search.
+_unavailable_logged = False
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _dialect_name(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+def query_tokens(query: str) -> list[str]:
+    """Split a free-text query into lowercase word tokens.
+
+    Punctuation and FTS operators are dropped, so user input can never be
+    interpreted as MATCH / tsquery syntax.
+    """
+    return [t.lower() for t in _TOKEN_RE.findall(query or "")]
+
+
+def build_fts5_match(query: str) -> Optional[str]:
+    """Build an FTS5 MATCH expression: every token, prefix-matched, ANDed."""
+    tokens = query_tokens(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+def build_tsquery(query: str) -> Optional[str]:
+    """Build a Postgres to_tsquery expression: every token, prefix-matched, ANDed."""
+    tokens = query_tokens(query)
+    if not tokens:
+        return None
+    return " & ".join(f"{t}:*" for t in tokens)
+
+
+def create_fts_table(conn) -> bool:
+    """Create the SQLite FTS5 table if missing. Returns True if it was created.
+
+    Sync function for ``conn.run_sync``. The table stores its own copy of the
+    content (rather than ``content=ag_ui_messages``) so that snippet() works
+    without triggers on the base table.
+    """
+    existing = conn.execute(
+        text("SELECT name FROM sqlite_master WHERE type='table' AND name=:name"),
+        {"name": FTS_TABLE},
+    ).fetchone()
+    if existing:
+        return False
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+        "content, thread_id UNINDEXED, tokenize='porter unicode61')"
+    ))
+    return True
+
+
+async def index_message(
+    db: AsyncSession,
+    message_id: int,
+    thread_id: str,
+    content: Optional[str],
+) -> None:
+    """Add (or replace) one message in the SQLite FTS index.
+
+    Runs inside the caller's transaction; the caller commits. A no-op in
+    PostgreSQL mode, where the GIN index tracks the table automatically.
+    """
+    if _dialect_name(db) != "sqlite" or not content:
+        return
+    try:
+        await db.execute(
+            text(
+                f"INSERT OR REPLACE INTO {FTS_TABLE}(rowid, content, thread_id) "
+                "VALUES (:id, :content, :thread_id)"
+            ),
+            {"id": message_id, "content": content, "thread_id": thread_id},
+        )
+    except DBAPIError as e:
+        # Missing FTS5 support must never block saving a chat message.
+        logger.debug(f"Thread search index unavailable, skipping message {message_id}: {e}")
+
+
+async def remove_thread(db: AsyncSession, thread_id: str) -> None:
+    """Drop a thread's messages from the SQLite FTS index (caller commits)."""
+    if _dialect_name(db) != "sqlite":
+        return
+    try:
+        await db.execute(
+            text(f"DELETE FROM {FTS_TABLE} WHERE thread_id = :thread_id"),
+            {"thread_id": thread_id},
+        )
+    except DBAPIError as e:
+        logger.debug(f"Thread search index unavailable, skipping removal of {thread_id}: {e}")
+
+
+async def rebuild_index(db: AsyncSession) -> int:
+    """Re-populate the SQLite FTS index from ag_ui_messages.
+
+    Returns the number of indexed messages. Commits.
+    """
+    if _dialect_name(db) != "sqlite":
+        return 0
+    await db.run_sync(lambda session: create_fts_table(session.connection()))
+    await db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    result = await db.execute(text(
+        f"INSERT INTO {FTS_TABLE}(rowid, content, thread_id) "
+        "SELECT id, content, thread_id FROM ag_ui_messages "
+        "WHERE content IS NOT NULL AND content != ''"
+    ))
+    await db.commit()
+    return result.rowcount or 0
+
+
+def _sqlite_search_sql(user_id: Optional[str], exclude_thread_id: Optional[str]) -> str:
+    filters = [f"{FTS_TABLE} MATCH :match"]
+    if user_id:
+        filters.append("t.user_id = :user_id")
+    if exclude_thread_id:
+        filters.append("m.thread_id != :exclude")
+    return (
+        "SELECT m.thread_id, m.role, "
+        f"snippet({FTS_TABLE}, 0, '**', '**', '...', 24) AS snippet, "
+        f"-bm25({FTS_TABLE}) AS score "
+        f"FROM {FTS_TABLE} "
+        f"JOIN ag_ui_messages m ON m.id = {FTS_TABLE}.rowid "
+        "JOIN ag_ui_threads t ON t.id = m.thread_id "
+        f"WHERE {' AND '.join(filters)} "
+        "ORDER BY score DESC LIMIT :max_hits"
+    )
+
+
+def _postgres_search_sql(user_id: Optional[str], exclude_thread_id: Optional[str]) -> str:
+    filters = ["to_tsvector('english', m.content) @@ q"]
+    if user_id:
+        filters.append("t.user_id = :user_id")
+    if exclude_thread_id:
+        filters.append("m.thread_id != :exclude")
+    return (
+        "SELECT m.thread_id, m.role, "
+        "ts_headline('english', m.content, q, "
+        "'StartSel=**, StopSel=**, MaxWords=30, MinWords=10, MaxFragments=1') AS snippet, "
+        "ts_rank(to_tsvector('english', m.content), q) AS score "
+        "FROM ag_ui_messages m "
+        "JOIN ag_ui_threads t ON t.id = m.thread_id, "
+        "to_tsquery('english', :match) q "
+        f"WHERE {' AND '.join(filters)} "
+        "ORDER BY score DESC LIMIT :max_hits"
+    )
+
+
+async def search_messages(
+    db: AsyncSession,
+    query: str,
+    user_id: Optional[str] = None,
+    exclude_thread_id: Optional[str] = None,
+    limit: int = 5,
+    snippets_per_thread: int = 2,
+) -> Optional[list[dict[str, Any]]]:
+    """Ranked full-text search over message content, grouped by thread.
+
+    Returns up to ``limit`` threads ordered by their best-scoring message, each
+    with ``thread_id``, ``score`` and up to ``snippets_per_thread`` snippets
+    (matched terms wrapped in ``**``). Returns None when the full-text index is
+    unavailable so the caller can fall back to a substring scan.
+    """
+    dialect = _dialect_name(db)
+    if dialect == "sqlite":
+        match = build_fts5_match(query)
+        sql = _sqlite_search_sql(user_id, exclude_thread_id)
+    elif dialect == "postgresql":
+        match = build_tsquery(query)
+        sql = _postgres_search_sql(user_id, exclude_thread_id)
+    else:
+        return None
+
+    if match is None:
+        return []
+
+    params: dict[str, Any] = {"match": match, "max_hits": _MAX_MESSAGE_HITS}
+    if user_id:
+        params["user_id"] = user_id
+    if exclude_thread_id:
+        params["exclude"] = exclude_thread_id
+
+    # A savepoint confines a failure (e.g. no FTS5 table) to this query; a
+    # full rollback would expire every ORM instance on the caller's session.
+    global _unavailable_logged
+    try:
+        async with db.begin_nested():
+            rows = (await db.execute(text(sql), params)).all()
+    except DBAPIError as e:
+        if not _unavailable_logged:
+            logger.warning(f"Full-text thread search unavailable, falling back to LIKE: {e}")
+            _unavailable_logged = True
+        else:
+            logger.debug(f"Full-text thread search failed: {e}")
+        return None
+
+    # Rows arrive best-first, so the first hit per thread carries its score.
+    threads: dict[str, dict[str, Any]] = {}
+    for thread_id, role, snippet, score in rows:
+        entry = threads.get(thread_id)
+        if entry is None:
+            if len(threads) >= limit:
+                continue
+            entry = threads[thread_id] = {
+                "thread_id": thread_id,
+                "score": round(float(score or 0.0), 4),
+                "snippets": [],
+            }
+        if len(entry["snippets"]) < snippets_per_thread:
+            entry["snippets"].append({"role": role, "snippet": snippet})
+
+    return list(threads.values())
@@ -66,6 +66,10 @@ async def test_db() -> AsyncGenerator[AsyncSession, None]:
         db_module.engine = original_engine
         db_module.async_session_factory = original_session_factory
 
+    # Series cached by batch id would otherwise leak between test databases
+    from backend.services import fermentation_analytics
+    fermentation_analytics.clear_cache()
+
     # Create session factory
     async_session = async_sessionmaker(engine, expire_on_commit=False)
 
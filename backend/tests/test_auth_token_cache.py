@@ -0,0 +1,97 @@
+"""Tests for the verified-JWT cache in backend.auth."""
+
+import time
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from backend import auth
+from backend.auth import AuthUser, VerifiedTokenCache, get_current_user
+
+SECRET = "test-secret-for-token-cache-0123456789"
+
+
+@pytest.fixture(autouse=True)
+def hs256_secret(monkeypatch):
+    monkeypatch.setenv("SUPABASE_JWT_SECRET", SECRET)
+    auth.get_jwt_secret.cache_clear()
+    auth.token_cache.clear()
+    yield
+    auth.get_jwt_secret.cache_clear()
+    auth.token_cache.clear()
+
+
+def _token(sub: str = "user-1", exp_in: float = 3600) -> str:
+    payload = {"sub": sub, "aud": "authenticated", "exp": int(time.time() + exp_in)}
+    return jwt.encode(payload, SECRET, algorithm="HS256")
+
+
+async def _user(token: str) -> AuthUser:
+    request = SimpleNamespace(headers={"Authorization": f"Bearer {token}"})
+    return await get_current_user(request, HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+@pytest.mark.asyncio
+async def test_repeat_request_skips_verification(monkeypatch):
+    token = _token()
+    first = await _user(token)
+
+    def no_decode(*args, **kwargs):
+        raise AssertionError("token verified twice")
+
+    monkeypatch.setattr(auth.jwt, "decode", no_decode)
+    second = await _user(token)
+
+    assert second is first
+    assert (auth.token_cache.hits, auth.token_cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_reverified_and_rejected(monkeypatch):
+    token = _token(exp_in=60)
+    await _user(token)
+
+    later = time.time() + 120
+    monkeypatch.setattr(auth.time, "time", lambda: later)
+    decoded = []
+
+    def expired(*args, **kwargs):
+        decoded.append(args)
+        raise jwt.ExpiredSignatureError("Signature has expired")
+
+    monkeypatch.setattr(auth.jwt, "decode", expired)
+
+    with pytest.raises(HTTPException) as exc:
+        await _user(token)
+    assert exc.value.detail == "Token expired"
+    assert len(decoded) == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_is_not_cached():
+    bad = jwt.encode({"sub": "x", "aud": "authenticated", "exp": int(time.time()) + 60}, "wrong-secret-0123456789abcdefghij", algorithm="HS256")
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await _user(bad)
+    assert auth.token_cache.hits == 0
+
+
+def test_cache_is_bounded_lru():
+    cache = VerifiedTokenCache(maxsize=2)
+    exp = time.time() + 60
+    for name in ("a", "b", "c"):
+        cache.put(name, AuthUser(user_id=name), exp)
+
+    assert cache.get("a") is None
+    assert cache.get("c").user_id == "c"
+
+
+def test_token_without_exp_is_not_cached():
+    cache = VerifiedTokenCache()
+    cache.put("t", AuthUser(user_id="u"), None)
+
+    assert cache.get("t") is None
@@ -0,0 +1,104 @@
+"""Tests for per-batch fermentation features and similar-batch search."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.models import Batch, BatchFeatures, Reading
+from backend.services import batch_features
+from backend.services.batch_features import (
+    MIN_SHARED_FEATURES,
+    backfill_batch_features,
+    distances,
+    feature_vector,
+)
+from backend.services.llm.tools.fermentation import compare_batches
+
+
+def _curve(batch_id, start, og=1.050, fg=1.010, k=0.05, temp=19.0, hours=120):
+    return [
+        Reading(
+            batch_id=batch_id,
+            timestamp=start + timedelta(hours=h),
+            sg_raw=fg + (og - fg) * np.exp(-k * h),
+            temp_raw=temp,
+        )
+        for h in range(0, hours, 2)
+    ]
+
+
+async def _finished_batch(db, name, **curve):
+    start = datetime.now(timezone.utc) - timedelta(days=30)
+    batch = Batch(name=name, status="fermenting", start_time=start, end_time=start + timedelta(days=5))
+    db.add(batch)
+    await db.commit()
+    db.add_all(_curve(batch.id, start, **curve))
+    await db.commit()
+    return batch.id
+
+
+def test_distances_skip_missing_features():
+    matrix = np.array([
+        feature_vector({"og": 1.050, "fg": 1.010, "attenuation": 80.0}),
+        feature_vector({"og": 1.060, "fg": 1.010, "attenuation": 80.0, "mean_temp": 30.0}),
+        feature_vector({"og": 1.050}),
+    ])
+
+    result = distances(matrix, feature_vector({"og": 1.050, "fg": 1.010, "attenuation": 80.0, "mean_temp": 19.0}))
+
+    assert result[0] == 0.0
+    assert 0 < result[1] < np.inf
+    # Fewer than MIN_SHARED_FEATURES in common: not comparable
+    assert MIN_SHARED_FEATURES > 1 and result[2] == np.inf
+
+
+@pytest.mark.asyncio
+async def test_completing_batch_stores_features(client, test_db):
+    batch_id = await _finished_batch(test_db, "Pale")
+
+    response = await client.put(f"/api/batches/{batch_id}", json={"status": "completed"})
+    assert response.status_code == 200
+
+    row = await test_db.get(BatchFeatures, batch_id)
+    await test_db.refresh(row)
+    assert row.og == pytest.approx(1.050, abs=0.001)
+    assert row.mean_temp == pytest.approx(19.0)
+    assert row.curve_model is not None
+    assert 10 <= row.hours_to_half <= 20  # ln(2) / 0.05 ≈ 14h
+
+    await client.put(f"/api/batches/{batch_id}", json={"status": "fermenting"})
+    test_db.expire_all()
+    assert await test_db.get(BatchFeatures, batch_id) is None
+
+
+@pytest.mark.asyncio
+async def test_compare_batches_ranks_by_fermentation(client, test_db):
+    slow = await _finished_batch(test_db, "Slow", k=0.01, temp=15.0)
+    fast = await _finished_batch(test_db, "Fast", k=0.06, temp=21.0)
+    for batch_id in (slow, fast):
+        await client.put(f"/api/batches/{batch_id}", json={"status": "completed"})
+    reference = await _finished_batch(test_db, "Reference", k=0.05, temp=20.0)
+
+    result = await compare_batches(test_db, reference, comparison_type="fermentation")
+
+    names = [b["name"] for b in result["similar_batches"]]
+    assert names == ["Fast", "Slow"]
+    similarities = [b["similarity"] for b in result["similar_batches"]]
+    assert similarities[0] > similarities[1]
+
+
+@pytest.mark.asyncio
+async def test_backfill_computes_missing_features(test_db, monkeypatch):
+    monkeypatch.setattr(batch_features, "async_session_factory", async_sessionmaker(test_db.bind, expire_on_commit=False))
+    batch_id = await _finished_batch(test_db, "Old")
+    batch = await test_db.get(Batch, batch_id)
+    batch.status = "completed"
+    await test_db.commit()
+
+    assert await backfill_batch_features() == 1
+    assert await backfill_batch_features() == 0
+    rows = (await test_db.execute(select(BatchFeatures.batch_id))).scalars().all()
+    assert rows == [batch_id]
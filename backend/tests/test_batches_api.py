@@ -309,3 +309,80 @@ async def test_heater_entity_conflict_on_update(client):
     assert response.status_code == 400
     assert "already in use" in response.json()["detail"]
     assert "switch.heater_1" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_batch_predictions_etag(client, monkeypatch):
+    """GET /api/batches/{id}/predictions should revalidate with If-None-Match."""
+    from backend import main
+    from backend.ml.pipeline_manager import MLPipelineManager
+
+    batch_id = (await client.post(
+        "/api/batches", json={"name": "Predicted", "status": "completed"}
+    )).json()["id"]
+
+    manager = MLPipelineManager()
+    for i in range(12):
+        manager.process_reading(
+            f"batch-{batch_id}", sg=1.050 - 0.003 * i, temp=20.0, rssi=-60, time_hours=float(i * 6)
+        )
+    monkeypatch.setattr(main, "ml_pipeline_manager", manager)
+
+    first = await client.get(f"/api/batches/{batch_id}/predictions")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = await client.get(
+        f"/api/batches/{batch_id}/predictions", headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+
+    manager.process_reading(
+        f"batch-{batch_id}", sg=1.014, temp=20.0, rssi=-60, time_hours=72.0
+    )
+    changed = await client.get(
+        f"/api/batches/{batch_id}/predictions", headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_list_batches_projection(client):
+    """GET /api/batches?fields=... returns only the requested fields and relations."""
+    await client.post("/api/batches", json={"name": "Projected"})
+
+    legacy = (await client.get("/api/batches")).json()[0]
+    assert "tasting_notes" in legacy and "recipe" in legacy
+
+    slim = (await client.get("/api/batches", params={"fields": "name,status"})).json()[0]
+    assert slim == {"id": legacy["id"], "name": "Projected", "status": "planning"}
+
+    expanded = (await client.get(
+        "/api/batches", params={"fields": "name", "expand": "tasting_notes"}
+    )).json()[0]
+    assert set(expanded) == {"id", "name", "tasting_notes"}
+
+    bad = await client.get("/api/batches", params={"fields": "name,secret"})
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_batches_keyset_pages(client):
+    """Cursor pages walk every batch exactly once, newest first."""
+    for i in range(5):
+        await client.post("/api/batches", json={"name": f"Batch {i}"})
+
+    seen, cursor = [], None
+    while True:
+        params = {"fields": "name", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/batches", params=params)
+        seen += [b["name"] for b in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+
+    assert seen == [f"Batch {i}" for i in reversed(range(5))]
+    assert (await client.get("/api/batches", params={"cursor": "nope"})).status_code == 400
@@ -131,3 +131,23 @@ def test_parse_beerxml_rejects_malformed_xml():
 
     with pytest.raises(ET.ParseError):
         parse_beerxml("<invalid><xml>")
+
+
+def test_iter_beerxml_yields_recipes_lazily_with_own_raw_xml():
+    """Recipes stream one at a time; raw_xml holds just that recipe."""
+    from backend.services.beerxml_parser import iter_beerxml, parse_beerxml
+
+    multi_xml = """<?xml version="1.0"?>
+    <RECIPES>
+      <RECIPE><NAME>Recipe One</NAME></RECIPE>
+      <RECIPE><NAME>Recipe Two</NAME></RECIPE>
+      <RECIPE><NAME>Broken
+    """
+
+    recipes = iter_beerxml(multi_xml)
+    first = next(recipes)
+
+    assert first.name == "Recipe One"
+    assert "Recipe Two" not in first.raw_xml
+    assert parse_beerxml(first.raw_xml)[0].name == "Recipe One"
+    assert next(recipes).name == "Recipe Two"
@@ -0,0 +1,121 @@
+"""Tests for incremental cloud sync (bulk upserts of changed rows only)."""
+
+import json
+
+import httpx
+import pytest
+
+from backend.models import Batch, Device, Recipe, RecipeHop
+from backend.routers import sync
+from backend.routers.sync import CloudPush
+
+BASE = "https://cloud.test/rest/v1"
+
+
+class FakePostgrest:
+    """Records upsert bodies per table; tables in ``reject`` answer 400."""
+
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.bodies: dict[str, list[list[dict]]] = {}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        table = request.url.path.rsplit("/", 1)[-1]
+        self.bodies.setdefault(table, []).append(json.loads(request.content))
+        if table in self.reject:
+            return httpx.Response(400, text="rejected")
+        return httpx.Response(201)
+
+
+@pytest.fixture
+async def local_data(test_db):
+    device = Device(id="tilt-red", device_type="tilt", name="Red", user_id="local")
+    recipe = Recipe(name="Pale Ale", user_id="local")
+    recipe.hops = [
+        RecipeHop(name="Cascade", amount_grams=30),
+        RecipeHop(name="Citra", amount_grams=20),
+    ]
+    test_db.add_all([device, recipe])
+    await test_db.commit()
+    batch = Batch(recipe_id=recipe.id, device_id=device.id, name="Pale #1", user_id="local", status="fermenting")
+    test_db.add(batch)
+    await test_db.commit()
+    return test_db, device, recipe, batch
+
+
+async def _push(session, api, force=False):
+    async with httpx.AsyncClient(transport=httpx.MockTransport(api.handler)) as client:
+        return await CloudPush(client, BASE, {}, session, "local", force=force).run()
+
+
+@pytest.mark.asyncio
+async def test_first_push_sends_one_array_per_table(local_data):
+    session, *_ = local_data
+    api = FakePostgrest()
+
+    results = await _push(session, api)
+
+    assert results["devices"]["synced"] == 1
+    assert results["recipe_hops"]["synced"] == 2
+    assert results["batches"]["synced"] == 1
+    assert len(api.bodies["recipe_hops"]) == 1
+    assert {hop["name"] for hop in api.bodies["recipe_hops"][0]} == {"Cascade", "Citra"}
+
+
+@pytest.mark.asyncio
+async def test_second_push_only_sends_changed_rows(local_data):
+    session, device, recipe, batch = local_data
+    await _push(session, FakePostgrest())
+
+    batch.notes = "dry hopped"
+    await session.commit()
+    api = FakePostgrest()
+    results = await _push(session, api)
+
+    assert set(api.bodies) == {"batches"}
+    assert results["batches"] == {"synced": 1, "skipped": 0, "errors": []}
+    assert results["devices"]["skipped"] == 1
+    assert results["recipe_hops"]["skipped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_force_pushes_everything(local_data):
+    session, *_ = local_data
+    await _push(session, FakePostgrest())
+
+    api = FakePostgrest()
+    results = await _push(session, api, force=True)
+
+    assert results["recipes"]["synced"] == 1
+    assert "recipe_hops" in api.bodies
+
+
+@pytest.mark.asyncio
+async def test_failed_parent_skips_children_and_is_retried(local_data):
+    session, device, recipe, batch = local_data
+
+    api = FakePostgrest(reject={"recipes"})
+    results = await _push(session, api)
+
+    assert results["recipes"]["errors"][0]["id"] == recipe.id
+    assert "recipe_hops" not in api.bodies and "batches" not in api.bodies
+    assert len(results["recipe_hops"]["errors"]) == 2
+    assert results["devices"]["synced"] == 1
+
+    api = FakePostgrest()
+    results = await _push(session, api)
+
+    assert set(api.bodies) == {"recipes", "recipe_hops", "batches"}
+    assert results["devices"]["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_large_tables_are_chunked(local_data, monkeypatch):
+    session, *_ = local_data
+    monkeypatch.setattr(sync, "SYNC_CHUNK_SIZE", 1)
+    api = FakePostgrest()
+
+    results = await _push(session, api)
+
+    assert len(api.bodies["recipe_hops"]) == 2
+    assert results["recipe_hops"]["synced"] == 2
@@ -0,0 +1,57 @@
+"""Tests for database connection pool timing and warm-up."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend import database
+from backend.database import PoolMetrics, TimedQueuePool
+
+
+def test_pool_metrics_percentiles():
+    metrics = PoolMetrics()
+    for ms in range(1, 101):
+        metrics.record(ms / 1000)
+
+    snap = metrics.snapshot()
+    assert snap["acquired"] == 100
+    assert snap["p50_ms"] == 51.0
+    assert snap["p95_ms"] == 96.0
+    assert snap["max_ms"] == 100.0
+
+
+def test_empty_metrics():
+    assert PoolMetrics().snapshot()["p50_ms"] is None
+
+
+@pytest.mark.asyncio
+async def test_timed_pool_records_acquires_and_warms(tmp_path, monkeypatch):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=3,
+        max_overflow=0,
+    )
+    metrics = PoolMetrics()
+    monkeypatch.setattr(database, "pool_metrics", metrics)
+    monkeypatch.setattr(database, "engine", engine)
+
+    assert await database.warm_pool() == 3
+    assert engine.pool.checkedin() == 3
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    status = database.pool_status()
+    assert status["pool"] == "TimedQueuePool"
+    assert status["size"] == 3 and status["checked_out"] == 0
+    assert status["acquire"]["acquired"] == metrics.acquired == 4
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_status_endpoint(client):
+    response = await client.get("/api/system/database-pool")
+
+    assert response.status_code == 200
+    assert "acquire" in response.json()
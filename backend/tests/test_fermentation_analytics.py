@@ -0,0 +1,188 @@
+"""Tests for the shared fermentation analytics service."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sqlalchemy import delete
+
+from backend.models import Batch, Device, Reading
+from backend.services import fermentation_analytics
+from backend.services.fermentation_analytics import (
+    ReadingSeries,
+    analyze_batch,
+    detect_phases,
+    load_series,
+    regression,
+    time_in_range,
+)
+from backend.services.llm.tools.fermentation import get_fermentation_history
+
+
+def _series(hours, sg, temp=None) -> ReadingSeries:
+    n = len(hours)
+    return ReadingSeries(
+        times=np.asarray(hours, dtype=float) * 3600,
+        sg=np.asarray(sg, dtype=float),
+        temp=np.asarray(temp if temp is not None else [20.0] * n, dtype=float),
+        confidence=np.ones(n),
+        anomaly=np.zeros(n, dtype=bool),
+        reasons=[None] * n,
+    )
+
+
+@pytest.fixture
+async def batch_id(test_db):
+    test_db.add(Device(id="tilt-red", device_type="tilt", name="Red"))
+    batch = Batch(device_id="tilt-red", name="Pale", status="fermenting")
+    test_db.add(batch)
+    await test_db.commit()
+    return batch.id
+
+
+def _readings(batch_id, start, count, sg0=1.050, rate=-0.0005, temp=19.0):
+    return [
+        Reading(
+            device_id="tilt-red",
+            batch_id=batch_id,
+            timestamp=start + timedelta(hours=i),
+            sg_raw=sg0 + rate * i,
+            temp_raw=temp,
+        )
+        for i in range(count)
+    ]
+
+
+def test_regression_slope_and_fit():
+    fit = regression(np.arange(5) * 3600.0, np.array([1.050, 1.049, 1.048, 1.047, 1.046]))
+
+    assert fit["slope_per_hour"] == pytest.approx(-0.001)
+    assert fit["r_squared"] == pytest.approx(1.0)
+    assert regression(np.array([0.0]), np.array([1.050])) is None
+
+
+def test_time_in_range_is_time_weighted():
+    # 1h at 16°C, a 4h gap at 20°C counted as 2h, then 1h at 25°C;
+    # the last reading carries no duration
+    series = _series([0, 1, 5, 6], [1.05] * 4, temp=[16.0, 20.0, 25.0, 25.0])
+
+    result = time_in_range(series, 18.0, 22.0)
+
+    assert result["below_percent"] == 25.0
+    assert result["in_range_percent"] == 50.0
+    assert result["above_percent"] == 25.0
+    assert result["hours_counted"] == 4.0
+
+
+def test_detect_phases():
+    hours = np.arange(0, 72)
+    sg = np.where(hours < 12, 1.050, 1.050 - 0.0006 * (hours - 12))
+    sg = np.where(hours >= 48, sg[48], sg)
+
+    phases = [p["phase"] for p in detect_phases(_series(hours, sg))]
+
+    assert phases[0] == "lag"
+    assert "active" in phases
+    assert phases[-1] == "stable"
+
+
+@pytest.mark.asyncio
+async def test_series_extended_incrementally(test_db, batch_id, monkeypatch):
+    start = datetime.now(timezone.utc) - timedelta(hours=10)
+    test_db.add_all(_readings(batch_id, start, 5))
+    await test_db.commit()
+    series, version = await load_series(test_db, batch_id)
+    assert len(series) == 5
+
+    fetched = []
+    original_fetch = fermentation_analytics._fetch
+
+    async def tracking_fetch(db, batch, since=None, after_id=None):
+        fetched.append(after_id)
+        return await original_fetch(db, batch, since, after_id)
+
+    monkeypatch.setattr(fermentation_analytics, "_fetch", tracking_fetch)
+    test_db.add_all(_readings(batch_id, start + timedelta(hours=5), 2))
+    await test_db.commit()
+
+    series, new_version = await load_series(test_db, batch_id)
+    assert len(series) == 7
+    assert new_version != version
+    assert fetched == [5]
+
+    # Unchanged batch: served from the cache
+    await load_series(test_db, batch_id)
+    assert fetched == [5]
+
+
+@pytest.mark.asyncio
+async def test_series_reloaded_after_delete(test_db, batch_id):
+    start = datetime.now(timezone.utc) - timedelta(hours=10)
+    test_db.add_all(_readings(batch_id, start, 5))
+    await test_db.commit()
+    await load_series(test_db, batch_id)
+
+    await test_db.execute(delete(Reading).where(Reading.id == 2))
+    await test_db.commit()
+
+    series, _ = await load_series(test_db, batch_id)
+    assert len(series) == 4
+
+
+@pytest.mark.asyncio
+async def test_analyze_batch_results_cached_until_new_reading(test_db, batch_id):
+    start = datetime.now(timezone.utc) - timedelta(hours=20)
+    test_db.add_all(_readings(batch_id, start, 10))
+    await test_db.commit()
+
+    first = await analyze_batch(test_db, batch_id, hours=24, temp_range=(18.0, 22.0))
+    assert first is await analyze_batch(test_db, batch_id, hours=24, temp_range=(18.0, 22.0))
+    assert first["count"] == 10
+    assert first["trend_analysis"]["sg_rate_per_hour"] == pytest.approx(-0.0005)
+    assert first["trend_analysis"]["sg_trend"] == "actively_fermenting"
+    assert first["summary"]["temp_c"]["time_in_range"]["in_range_percent"] == 100.0
+
+    test_db.add_all(_readings(batch_id, start + timedelta(hours=10), 1, sg0=1.045))
+    await test_db.commit()
+
+    second = await analyze_batch(test_db, batch_id, hours=24, temp_range=(18.0, 22.0))
+    assert second["count"] == 11
+
+
+@pytest.mark.asyncio
+async def test_fermentation_history_tool(test_db, batch_id):
+    start = datetime.now(timezone.utc) - timedelta(hours=100)
+    test_db.add_all(_readings(batch_id, start, 100))
+    await test_db.commit()
+
+    result = await get_fermentation_history(test_db, batch_id, hours=48)
+
+    assert result["batch_name"] == "Pale"
+    assert 47 <= result["count"] <= 49
+    assert len(result["readings"]) == 48 or len(result["readings"]) == result["count"]
+    assert result["summary"]["sg"]["change"] < 0
+    assert result["phases"]
+
+
+@pytest.mark.asyncio
+async def test_batch_progress_uses_recent_trend(client, test_db):
+    recipe = (await client.post("/api/recipes", json={
+        "name": "Trend", "og": 1.050, "fg": 1.010, "yeast_temp_min": 18.0, "yeast_temp_max": 22.0,
+    })).json()
+    batch = (await client.post("/api/batches", json={
+        "recipe_id": recipe["id"], "status": "fermenting", "measured_og": 1.050,
+    })).json()
+    start = datetime.now(timezone.utc) - timedelta(hours=20)
+    # Falling 0.0005/hour, i.e. 12 points a day, with 0.030 left to 1.010
+    test_db.add_all([
+        Reading(batch_id=batch["id"], timestamp=start + timedelta(hours=i), sg_raw=1.050 - 0.0005 * i, temp_raw=19.0)
+        for i in range(21)
+    ])
+    await test_db.commit()
+
+    data = (await client.get(f"/api/batches/{batch['id']}/progress")).json()
+
+    # No live reading, so the latest stored gravity (1.040) is used
+    assert data["measured"]["current_sg"] == pytest.approx(1.040)
+    assert data["progress"]["estimated_days_remaining"] == 2.5
+    assert data["temperature"]["time_in_range"]["in_range_percent"] == 100.0
@@ -0,0 +1,151 @@
+"""Tests for batched gateway ingest and sequence acks."""
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.models import Batch, Device, Gateway, Reading
+from backend.routers import gateway
+from backend.routers.gateway import GatewayIngest, process_gateway_readings, register_gateway
+
+GATEWAY = "BSG-AABBCCDDEE00"
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+
+@pytest.fixture
+async def gateway_db(test_db, monkeypatch):
+    monkeypatch.setattr(gateway, "async_session_factory", async_sessionmaker(test_db.bind, expire_on_commit=False))
+    test_db.add(Gateway(id=GATEWAY, boot_id="boot-1"))
+    test_db.add(Device(id="tilt-red", device_type="tilt", name="Red", paired=True))
+    test_db.add(Batch(device_id="tilt-red", name="Pale", status="fermenting"))
+    await test_db.commit()
+    return test_db
+
+
+def _reading(device_id="tilt-red", **extra):
+    return {"device_id": device_id, "color": "RED", "temp": 19.5, "sg": 1.050, **extra}
+
+
+async def _stored(session) -> int:
+    return await session.scalar(select(func.count()).select_from(Reading))
+
+
+@pytest.mark.asyncio
+async def test_batch_stores_all_readings_and_creates_devices(gateway_db):
+    results = await process_gateway_readings(
+        GATEWAY, None, [_reading(), _reading(), _reading("tilt-blue"), {"device_id": "tilt-red"}],
+    )
+
+    assert [r is not None for r in results] == [True, True, True, False]
+    assert await _stored(gateway_db) == 2  # tilt-blue is unpaired
+    assert await gateway_db.get(Device, "tilt-blue") is not None
+
+
+@pytest.mark.asyncio
+async def test_buffered_reading_keeps_its_timestamp(gateway_db):
+    [result] = await process_gateway_readings(GATEWAY, None, [_reading(timestamp="2026-10-01T12:00:00Z")])
+
+    assert result["timestamp"].startswith("2026-10-01T12:00:00")
+
+
+@pytest.mark.asyncio
+async def test_ingest_acks_each_seq_after_storing(gateway_db):
+    socket = FakeSocket()
+    ingest = GatewayIngest(GATEWAY, None, socket)
+    ingest.start()
+
+    assert ingest.offer(1, [_reading(), _reading()])
+    assert ingest.offer(2, [_reading(), {"bad": True}])
+    assert ingest.offer(None, [_reading()])
+    await ingest.stop()
+
+    assert socket.sent == [
+        {"type": "ack", "seq": 1, "accepted": 2, "rejected": 0},
+        {"type": "ack", "seq": 2, "accepted": 1, "rejected": 1},
+    ]
+    assert await _stored(gateway_db) == 4
+
+
+@pytest.mark.asyncio
+async def test_storage_failure_nacks(gateway_db, monkeypatch):
+    async def broken(*args):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(gateway, "process_gateway_readings", broken)
+    socket = FakeSocket()
+    ingest = GatewayIngest(GATEWAY, None, socket)
+    ingest.start()
+
+    ingest.offer(7, [_reading()])
+    await ingest.stop()
+
+    assert socket.sent == [{"type": "nack", "seq": 7, "reason": "storage_error"}]
+    assert ingest.last_seq is None
+
+
+async def _last_seq(session) -> int:
+    session.expire_all()
+    return (await session.get(Gateway, GATEWAY)).last_seq
+
+
+@pytest.mark.asyncio
+async def test_seq_persists_and_retry_after_restart_is_not_stored_twice(gateway_db):
+    first = GatewayIngest(GATEWAY, None, FakeSocket(), track_seq=True)
+    first.start()
+    first.offer(5, [_reading()])
+    await first.stop()
+    assert await _last_seq(gateway_db) == 5
+
+    # A new connection (restart, other worker) starts from the stored seq
+    socket = FakeSocket()
+    retry = GatewayIngest(GATEWAY, None, socket, last_seq=await _last_seq(gateway_db), track_seq=True)
+    retry.start()
+    retry.offer(5, [_reading()])
+    retry.offer(6, [_reading()])
+    await retry.stop()
+
+    assert socket.sent == [
+        {"type": "ack", "seq": 5, "duplicate": True},
+        {"type": "ack", "seq": 6, "accepted": 1, "rejected": 0},
+    ]
+    assert await _stored(gateway_db) == 2
+    assert await _last_seq(gateway_db) == 6
+
+
+@pytest.mark.asyncio
+async def test_new_boot_resets_seq(gateway_db):
+    gw = await gateway_db.get(Gateway, GATEWAY)
+    gw.last_seq = 900
+    await gateway_db.commit()
+
+    same = await register_gateway(gateway_db, GATEWAY, None, "boot-1")
+    assert same.last_seq == 900
+
+    rebooted = await register_gateway(gateway_db, GATEWAY, None, "boot-2")
+    assert rebooted.last_seq is None and rebooted.boot_id == "boot-2"
+
+
+@pytest.mark.asyncio
+async def test_without_boot_id_every_message_is_stored(gateway_db):
+    socket = FakeSocket()
+    ingest = GatewayIngest(GATEWAY, None, socket, last_seq=10)
+    ingest.start()
+    ingest.offer(3, [_reading()])
+    await ingest.stop()
+
+    assert socket.sent == [{"type": "ack", "seq": 3, "accepted": 1, "rejected": 0}]
+    assert await _stored(gateway_db) == 1
+
+
+def test_full_queue_refuses_messages():
+    ingest = GatewayIngest(GATEWAY, None, FakeSocket(), maxsize=1)
+
+    assert ingest.offer(1, [_reading()])
+    assert not ingest.offer(2, [_reading()])
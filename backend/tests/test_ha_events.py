@@ -0,0 +1,231 @@
+"""Tests for the Home Assistant event stream, against a local fake HA server."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import websockets
+
+from backend.services import ha_events, http_clients
+from backend.services.ha_client import HAClient
+from backend.services.ha_events import HAEventStream, set_ha_event_stream
+from backend.services.http_clients import close_http_clients
+
+TOKEN = "secret"
+
+
+def make_state(entity_id, state, last_updated="2026-10-19T10:00:00.000000+00:00"):
+    return {
+        "entity_id": entity_id,
+        "state": state,
+        "attributes": {},
+        "last_changed": last_updated,
+        "last_updated": last_updated,
+    }
+
+
+class FakeHA:
+    """HA WebSocket API (auth + subscribe_events) plus REST states via MockTransport."""
+
+    def __init__(self):
+        self.states = {}
+        self.rest_requests = []
+        self.connections = []
+        self.server = None
+        self.url = None
+
+    async def _handler(self, ws):
+        await ws.send(json.dumps({"type": "auth_required", "ha_version": "2026.10.0"}))
+        auth = json.loads(await ws.recv())
+        if auth.get("access_token") != TOKEN:
+            await ws.send(json.dumps({"type": "auth_invalid", "message": "Invalid access token"}))
+            return
+        await ws.send(json.dumps({"type": "auth_ok", "ha_version": "2026.10.0"}))
+        subscribe = json.loads(await ws.recv())
+        assert subscribe["type"] == "subscribe_events"
+        assert subscribe["event_type"] == "state_changed"
+        await ws.send(json.dumps({"id": subscribe["id"], "type": "result", "success": True, "result": None}))
+        self.connections.append(ws)
+        await ws.wait_closed()
+
+    def _rest(self, request):
+        self.rest_requests.append(request.url.path)
+        if request.method == "POST":
+            return httpx.Response(200, json=[])
+        if request.url.path == "/api/states":
+            return httpx.Response(200, json=list(self.states.values()))
+        entity_id = request.url.path.rsplit("/", 1)[-1]
+        if entity_id in self.states:
+            return httpx.Response(200, json=self.states[entity_id])
+        return httpx.Response(404)
+
+    async def start(self):
+        self.server = await websockets.serve(self._handler, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        http_clients._clients["ha"] = httpx.AsyncClient(transport=httpx.MockTransport(self._rest))
+
+    async def set_state(self, entity_id, state, last_updated):
+        old = self.states.get(entity_id)
+        new = make_state(entity_id, state, last_updated)
+        self.states[entity_id] = new
+        event = {
+            "id": 1,
+            "type": "event",
+            "event": {
+                "event_type": "state_changed",
+                "data": {"entity_id": entity_id, "old_state": old, "new_state": new},
+            },
+        }
+        for ws in list(self.connections):
+            await ws.send(json.dumps(event))
+
+    async def drop_connections(self):
+        connections, self.connections = self.connections, []
+        for ws in connections:
+            await ws.close()
+
+
+async def wait_until(condition, timeout=3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def fake_ha(monkeypatch):
+    monkeypatch.setattr(ha_events, "RECONNECT_MIN_SECONDS", 0.01)
+    ha = FakeHA()
+    ha.states["sensor.ambient"] = make_state("sensor.ambient", "18.5")
+    ha.states["switch.heater"] = make_state("switch.heater", "off")
+    ha.states["sensor.unrelated"] = make_state("sensor.unrelated", "1")
+    await ha.start()
+    yield ha
+    set_ha_event_stream(None)
+    ha.server.close()
+    await ha.server.wait_closed()
+    await close_http_clients()
+
+
+@pytest.fixture
+async def run_stream(fake_ha):
+    tasks = []
+
+    async def start(token=TOKEN, entities=("sensor.ambient", "switch.heater")):
+        stream = HAEventStream(fake_ha.url, token, entities)
+        set_ha_event_stream(stream)
+        tasks.append(asyncio.create_task(stream.run()))
+        return stream
+
+    yield start
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_reads_served_from_snapshot(fake_ha, run_stream):
+    stream = await run_stream()
+    await wait_until(lambda: stream.live)
+
+    state = await HAClient(fake_ha.url, TOKEN).get_state("sensor.ambient")
+
+    assert state["state"] == "18.5"
+    # Only the bulk fetch after subscribing; no per-entity request
+    assert fake_ha.rest_requests == ["/api/states"]
+    # Unwatched entities aren't cached
+    assert stream.status()["cached"] == 2
+
+
+@pytest.mark.asyncio
+async def test_state_changed_events_update_cache(fake_ha, run_stream):
+    stream = await run_stream()
+    await wait_until(lambda: stream.live)
+    client = HAClient(fake_ha.url, TOKEN)
+
+    await fake_ha.set_state("switch.heater", "on", "2026-10-19T10:01:00.000000+00:00")
+    await wait_until(lambda: stream.get("switch.heater")["state"] == "on")
+    assert (await client.get_state("switch.heater"))["state"] == "on"
+
+    # An event older than the cached state is ignored
+    await fake_ha.set_state("switch.heater", "off", "2026-10-19T09:00:00.000000+00:00")
+    await fake_ha.set_state("sensor.unrelated", "2", "2026-10-19T10:02:00.000000+00:00")
+    await wait_until(lambda: stream.events == 3)
+    assert stream.get("switch.heater")["state"] == "on"
+    assert stream.get("sensor.unrelated") is None
+
+
+@pytest.mark.asyncio
+async def test_reconnect_refreshes_missed_changes(fake_ha, run_stream):
+    stream = await run_stream()
+    await wait_until(lambda: stream.live)
+
+    await fake_ha.drop_connections()
+    await wait_until(lambda: not stream.live)
+    # Changed while disconnected: no event will ever arrive for it
+    fake_ha.states["sensor.ambient"] = make_state("sensor.ambient", "21.0", "2026-10-19T10:05:00.000000+00:00")
+
+    await wait_until(lambda: stream.connects == 2 and stream.live)
+    assert stream.get("sensor.ambient")["state"] == "21.0"
+    assert fake_ha.rest_requests == ["/api/states", "/api/states"]
+
+
+@pytest.mark.asyncio
+async def test_rest_fallback_when_not_connected(fake_ha, run_stream):
+    stream = await run_stream(token="wrong")
+    await asyncio.sleep(0.1)
+    assert not stream.live
+
+    state = await HAClient(fake_ha.url, TOKEN).get_state("sensor.ambient")
+
+    assert state["state"] == "18.5"
+    assert fake_ha.rest_requests == ["/api/states/sensor.ambient"]
+
+
+@pytest.mark.asyncio
+async def test_rest_reads_start_watching_entity(fake_ha, run_stream):
+    stream = await run_stream(entities=())
+    await wait_until(lambda: stream.live)
+    client = HAClient(fake_ha.url, TOKEN)
+
+    await client.get_state("sensor.ambient")
+    await client.get_state("sensor.ambient")
+
+    # First read over REST seeds the cache; the second is served from it
+    assert fake_ha.rest_requests == ["/api/states", "/api/states/sensor.ambient"]
+    await fake_ha.set_state("sensor.ambient", "19.0", "2026-10-19T10:03:00.000000+00:00")
+    await wait_until(lambda: stream.get("sensor.ambient")["state"] == "19.0")
+
+
+@pytest.mark.asyncio
+async def test_commanded_entity_read_back_from_ha(fake_ha, run_stream):
+    stream = await run_stream()
+    await wait_until(lambda: stream.live)
+    client = HAClient(fake_ha.url, TOKEN)
+
+    assert await client.call_service("switch", "turn_on", "switch.heater")
+    fake_ha.states["switch.heater"] = make_state("switch.heater", "on", "2026-10-19T10:04:00.000000+00:00")
+
+    # Cached "off" was dropped, so this read doesn't wait for the event
+    assert (await client.get_state("switch.heater"))["state"] == "on"
+    assert fake_ha.rest_requests[-1] == "/api/states/switch.heater"
+
+
+@pytest.mark.asyncio
+async def test_configured_entities(test_db):
+    from backend.ha_event_listener import configured_entities
+    from backend.models import Batch
+    from backend.routers.config import set_config_value
+
+    await set_config_value(test_db, "ha_ambient_temp_entity_id", "sensor.ambient")
+    await set_config_value(test_db, "ha_weather_entity_id", "weather.home")
+    test_db.add(Batch(name="Active", status="fermenting", heater_entity_id="ha://switch.heater",
+                      cooler_entity_id="shelly://192.168.1.50/0"))
+    test_db.add(Batch(name="Done", status="completed", heater_entity_id="switch.old_heater"))
+    await test_db.commit()
+
+    # Shelly relays and finished batches aren't watched
+    assert await configured_entities(test_db) == {"sensor.ambient", "weather.home", "switch.heater"}
@@ -0,0 +1,110 @@
+"""Tests for the shared outbound HTTP clients."""
+
+import httpx
+import pytest
+
+from backend.routers.system import check_hailo_ollama_status
+from backend.services import http_clients
+from backend.services.device_control.shelly_adapter import ShellyDirectAdapter
+from backend.services.ha_client import HAClient
+from backend.services.http_clients import close_http_clients, get_http_client, http_client_status
+from backend.services.llm.tools.utility import fetch_url
+
+
+@pytest.fixture
+async def mock_client():
+    """Install a MockTransport-backed client under a profile name."""
+    installed = []
+
+    def install(name, handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        http_clients._clients[name] = client
+        installed.append(name)
+        return client
+
+    yield install
+    await close_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_client_reused_and_recreated_after_close():
+    client = get_http_client("ha")
+    assert get_http_client("ha") is client
+    assert http_client_status()["ha"]["open"] is True
+
+    await close_http_clients()
+
+    assert client.is_closed
+    assert http_client_status()["ha"]["open"] is False
+    replacement = get_http_client("ha")
+    assert replacement is not client and not replacement.is_closed
+    await close_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_profiles_configure_clients():
+    web = get_http_client("web")
+    shelly = get_http_client("shelly")
+
+    assert web.follow_redirects is True
+    assert shelly.follow_redirects is False
+    assert shelly.timeout.read == 5.0
+    assert web is not shelly
+    await close_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_ha_and_shelly_share_pooled_clients():
+    first = HAClient("http://ha.local:8123", "token")
+    second = HAClient("http://other.local:8123", "token")
+
+    assert await first._get_client() is await second._get_client()
+    assert await ShellyDirectAdapter()._get_client() is get_http_client("shelly")
+
+    # Closing one HA client must not close the pool the others use
+    await first.close()
+    assert not (await second._get_client()).is_closed
+    await close_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_hailo_status_reports_models(mock_client):
+    def handler(request):
+        if request.url.path == "/hailo/v1/list":
+            return httpx.Response(200, json={"models": ["qwen2:1.5b"]})
+        return httpx.Response(200, json={"models": [{"name": "qwen2:1.5b"}]})
+
+    mock_client("llm", handler)
+    status = await check_hailo_ollama_status("http://localhost:8000")
+
+    assert status.running is True
+    assert status.models_available == ["qwen2:1.5b"]
+    assert status.models_loaded == ["qwen2:1.5b"]
+
+
+@pytest.mark.asyncio
+async def test_hailo_status_unreachable(mock_client):
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    mock_client("llm", handler)
+    status = await check_hailo_ollama_status("http://localhost:8000")
+
+    assert status.running is False
+
+
+@pytest.mark.asyncio
+async def test_fetch_url_uses_shared_web_client(mock_client):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, headers={"content-type": "text/html"}, text="<p>Hello &amp; welcome</p>")
+
+    mock_client("web", handler)
+    first = await fetch_url("https://example.com/a")
+    await fetch_url("https://example.com/b")
+
+    assert first["content"] == "Hello & welcome"
+    assert [r.url.path for r in requests] == ["/a", "/b"]
+    assert not get_http_client("web").is_closed
@@ -0,0 +1,118 @@
+"""Tests for the non-blocking Mem0 wrapper: thread pool, timeouts, embedding cache, write queue."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.services import memory
+from backend.services.memory import CachedEmbedder, MemoryWriter
+
+
+class FakeMemory:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.threads = set()
+        self.adds = []
+        self.active = 0
+        self.overlap = False
+
+    def search(self, query, user_id, limit):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        return {"results": [{"memory": f"likes {query}"}]}
+
+    def add(self, messages, user_id, metadata=None):
+        self.active += 1
+        self.overlap = self.overlap or self.active > 1
+        time.sleep(0.01)
+        self.adds.append(messages)
+        self.active -= 1
+        return {"results": [{"memory": messages[0]["content"]}]}
+
+
+@pytest.fixture
+def fake_memory(monkeypatch):
+    fake = FakeMemory()
+    monkeypatch.setattr(memory, "get_memory", lambda llm_config=None: fake)
+    monkeypatch.setattr(memory, "memory_writer", MemoryWriter())
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_search_runs_off_the_event_loop(fake_memory):
+    results = await memory.search_memories("lagers", user_id="u1")
+
+    assert results == [{"memory": "likes lagers"}]
+    assert threading.get_ident() not in fake_memory.threads
+
+
+@pytest.mark.asyncio
+async def test_slow_search_times_out_without_blocking(fake_memory, monkeypatch):
+    fake_memory.delay = 0.5
+    monkeypatch.setattr(memory, "MEMORY_READ_TIMEOUT", 0.05)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    assert await memory.search_memories("slow", user_id="u1") == []
+    task.cancel()
+    assert ticks >= 2  # the loop kept running while Mem0 was stuck
+
+
+@pytest.mark.asyncio
+async def test_adds_are_queued_and_run_one_at_a_time(fake_memory):
+    results = await asyncio.gather(*(
+        memory.add_memory([{"role": "user", "content": f"fact {i}"}], user_id="u1")
+        for i in range(4)
+    ))
+
+    assert [r["results"][0]["memory"] for r in results] == [f"fact {i}" for i in range(4)]
+    assert not fake_memory.overlap
+    await memory.memory_writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_write_queue_drops_oldest():
+    writer = MemoryWriter(maxsize=1)
+    gate = threading.Event()
+    first = writer.submit(gate.wait)
+    await asyncio.sleep(0.01)  # first job is running
+    second = writer.submit(lambda: {"results": ["second"]})
+    third = writer.submit(lambda: {"results": ["third"]})
+
+    assert await second == {"results": []}
+    gate.set()
+    await first
+    assert await third == {"results": ["third"]}
+    assert writer.dropped == 1
+    await writer.stop()
+
+
+def test_embedding_cache_normalizes_and_evicts():
+    calls = []
+
+    class Embedder:
+        config = "cfg"
+
+        def embed(self, text, memory_action=None):
+            calls.append(text)
+            return [float(len(text))]
+
+    cached = CachedEmbedder(Embedder(), maxsize=2)
+    cached.embed("Dry  hop timing", "search")
+    cached.embed("dry hop timing ", "search")
+    cached.embed("mash temp", "search")
+    cached.embed("water profile", "search")
+    cached.embed("dry hop timing", "search")
+
+    assert calls == ["Dry  hop timing", "mash temp", "water profile", "dry hop timing"]
+    assert (cached.hits, cached.misses) == (1, 4)
+    assert cached.config == "cfg"
@@ -0,0 +1,55 @@
+"""Tests for the local migration ledger that lets init_db skip applied migrations."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend import database
+
+
+@pytest.fixture
+async def fresh_db(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ledger.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "async_session_factory", async_sessionmaker(engine, expire_on_commit=False))
+    yield engine
+    await engine.dispose()
+
+
+async def _ledger(engine) -> set[str]:
+    async with engine.connect() as conn:
+        return set((await conn.execute(text("SELECT id FROM schema_migrations"))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_second_boot_skips_recorded_migrations(fresh_db, monkeypatch, capsys):
+    await database.init_db()
+    applied = await _ledger(fresh_db)
+    assert {"add_original_gravity", "add_beerjson_support", "temps_fahrenheit_to_celsius"} <= applied
+
+    def must_not_run(conn):
+        raise AssertionError("applied migration ran again")
+
+    must_not_run.__name__ = "_migrate_add_original_gravity"
+    monkeypatch.setattr(database, "_migrate_add_original_gravity", must_not_run)
+    capsys.readouterr()
+
+    await database.init_db()
+
+    assert await _ledger(fresh_db) == applied
+    assert "0 migrations applied" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_unrecorded_migration_runs_and_is_recorded(fresh_db):
+    await database.init_db()
+    async with fresh_db.begin() as conn:
+        await conn.execute(text("DELETE FROM schema_migrations WHERE id = 'add_deleted_at_index'"))
+        await conn.execute(text("DROP INDEX IF EXISTS ix_batches_deleted_at"))
+
+    await database.init_db()
+
+    assert "add_deleted_at_index" in await _ledger(fresh_db)
+    async with fresh_db.connect() as conn:
+        indexes = (await conn.execute(text("PRAGMA index_list(batches)"))).fetchall()
+    assert "ix_batches_deleted_at" in {row[1] for row in indexes}
@@ -0,0 +1,96 @@
+"""Tests for the streaming readings export (/log.csv)."""
+
+import csv
+import gzip
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.models import Batch, Device, Reading
+from backend.services import reading_export
+from backend.services.reading_export import ReadingExportFilter, iter_reading_pages
+
+START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def export_db(test_db, monkeypatch):
+    monkeypatch.setattr(
+        reading_export, "async_session_factory", async_sessionmaker(test_db.bind, expire_on_commit=False)
+    )
+    test_db.add(Device(id="tilt-red", device_type="tilt", name="Red", beer_name="Pale"))
+    test_db.add(Device(id="tilt-blue", device_type="tilt", name="Blue"))
+    batch = Batch(device_id="tilt-red", name="Pale", status="fermenting")
+    test_db.add(batch)
+    await test_db.flush()
+    for i in range(7):
+        # Two readings share each timestamp so paging has to break ties on id
+        test_db.add(Reading(
+            device_id="tilt-red", batch_id=batch.id, timestamp=START + timedelta(hours=i // 2),
+            sg_raw=1.050 - i * 0.001, temp_raw=20.0,
+        ))
+    test_db.add(Reading(device_id="tilt-blue", timestamp=START, sg_raw=1.040, temp_raw=18.0))
+    await test_db.commit()
+    return batch.id
+
+
+def _rows(text: str) -> list[dict]:
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_every_reading_once(export_db):
+    pages = [page async for page in iter_reading_pages(ReadingExportFilter(), page_size=3)]
+
+    ids = [row[0] for page in pages for row in page]
+    assert [len(page) for page in pages] == [3, 3, 2]
+    assert sorted(ids) == list(range(1, 9))
+    assert len(set(ids)) == len(ids)
+
+
+@pytest.mark.asyncio
+async def test_csv_export_filters_by_batch_and_time(client, export_db):
+    response = await client.get("/log.csv", params={
+        "batch_id": export_db,
+        "start": (START + timedelta(hours=1)).isoformat(),
+        "end": (START + timedelta(hours=3)).isoformat(),
+    })
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = _rows(response.text)
+    assert len(rows) == 4
+    assert {row["device_name"] for row in rows} == {"Red"}
+    assert rows[0]["beer_name"] == "Pale"
+    assert rows[0]["timestamp"].startswith("2025-03-01T01:00:00")
+    assert rows[0]["timestamp"].endswith("Z")
+
+
+@pytest.mark.asyncio
+async def test_csv_export_gzip(client, export_db):
+    response = await client.get("/log.csv", params={"device_id": "tilt-blue", "gzip": True})
+
+    assert response.status_code == 200
+    assert "readings.csv.gz" in response.headers["content-disposition"]
+    rows = _rows(gzip.decompress(response.content).decode())
+    assert [row["sg_raw"] for row in rows] == ["1.04"]
+
+
+@pytest.mark.asyncio
+async def test_rejects_inverted_time_range(client, export_db):
+    response = await client.get("/log.csv", params={
+        "start": START.isoformat(), "end": (START - timedelta(hours=1)).isoformat(),
+    })
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_parquet_export_reports_missing_pyarrow(client, export_db, monkeypatch):
+    monkeypatch.setattr("backend.main.parquet_available", lambda: False)
+
+    response = await client.get("/log.parquet")
+
+    assert response.status_code == 501
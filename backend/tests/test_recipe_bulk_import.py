@@ -0,0 +1,211 @@
+"""Tests for bulk (multi-recipe) import: POST /api/recipes/import/bulk."""
+
+import json
+import re
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from backend.models import Recipe
+from backend.services.importers import recipe_importer
+from backend.services.importers.recipe_importer import RecipeImporter
+
+DOCS = Path(__file__).resolve().parents[2] / "docs"
+
+
+def _beerxml_with(names: list[str]) -> str:
+    """Philter XPA BeerXML with its <RECIPE> repeated under each name."""
+    xml = (DOCS / "Brewfather_BeerXML_PhilterXPAClone_20251207.xml").read_text()
+    start = xml.index("<RECIPE>")
+    end = xml.index("</RECIPE>") + len("</RECIPE>")
+    recipe = xml[start:end]
+    copies = [
+        re.sub(r"<NAME>[^<]*</NAME>", f"<NAME>{name}</NAME>", recipe, count=1)
+        for name in names
+    ]
+    return xml[:start] + "".join(copies) + xml[end:]
+
+
+def _events(body: str) -> list[dict]:
+    return [json.loads(line) for line in body.splitlines() if line]
+
+
+async def _collect(importer: RecipeImporter, content: str, db: AsyncSession, **kwargs) -> list[dict]:
+    return [event async for event in importer.import_recipes_bulk(content, None, db, **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_beerxml_archive_imports_every_recipe_in_chunks(test_db: AsyncSession):
+    names = [f"Bulk XPA {i}" for i in range(5)]
+
+    events = await _collect(RecipeImporter(), _beerxml_with(names), test_db, user_id="u1", chunk_size=2)
+
+    # BeerXML is streamed, so the count is only known at the end
+    assert events[0] == {"event": "start", "format": "beerxml", "total": None}
+    recipe_events = [e for e in events if e["event"] == "recipe"]
+    assert [e["index"] for e in recipe_events] == [0, 1, 2, 3, 4]
+    assert all(e["status"] == "imported" for e in recipe_events)
+    assert [e["processed"] for e in events if e["event"] == "progress"] == [2, 4, 5]
+    assert events[-1] == {"event": "complete", "total": 5, "imported": 5, "failed": 0}
+
+    recipes = (
+        await test_db.execute(
+            select(Recipe).where(Recipe.name.like("Bulk XPA %")).options(selectinload(Recipe.fermentables))
+        )
+    ).scalars().all()
+    assert sorted(r.name for r in recipes) == names
+    assert {r.user_id for r in recipes} == {"u1"}
+    assert all(len(r.fermentables) == 4 for r in recipes)
+
+
+@pytest.mark.asyncio
+async def test_bad_recipe_is_reported_without_failing_the_rest(test_db: AsyncSession):
+    content = _beerxml_with(["Good One", "PLACEHOLDER", "Good Two"]).replace(
+        "<NAME>PLACEHOLDER</NAME>", "<NAME></NAME>", 1
+    )
+
+    events = await _collect(RecipeImporter(), content, test_db)
+
+    statuses = [(e["index"], e["status"]) for e in events if e["event"] == "recipe"]
+    assert statuses == [(0, "imported"), (1, "failed"), (2, "imported")]
+    failed = next(e for e in events if e["event"] == "recipe" and e["status"] == "failed")
+    assert "NAME is required" in failed["errors"][0]
+    assert events[-1]["imported"] == 2 and events[-1]["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_grain_color_filled_and_srm_recomputed(test_db: AsyncSession):
+    content = (
+        _beerxml_with(["Dark XPA"])
+        .replace("<NAME>Caramel&#32;Pils</NAME>", "<NAME>Roasted Barley</NAME>", 1)
+        .replace("<COLOR>2.5380711</COLOR>", "", 1)
+    )
+
+    events = await _collect(RecipeImporter(), content, test_db)
+
+    recipe_id = next(e["recipe_id"] for e in events if e["event"] == "recipe")
+    recipe = (
+        await test_db.execute(
+            select(Recipe).where(Recipe.id == recipe_id).options(selectinload(Recipe.fermentables))
+        )
+    ).scalar_one()
+    roast = next(f for f in recipe.fermentables if f.name == "Roasted Barley")
+    assert roast.color_srm and roast.color_srm > 100
+    assert recipe.color_srm > 10
+
+
+@pytest.mark.asyncio
+async def test_conversion_runs_on_process_pool(test_db: AsyncSession, monkeypatch):
+    monkeypatch.setattr(recipe_importer, "BULK_POOL_MIN_RECIPES", 1)
+    content = _beerxml_with(["Pool A", "PLACEHOLDER", "Pool B"]).replace(
+        "<NAME>PLACEHOLDER</NAME>", "<NAME></NAME>", 1
+    )
+
+    try:
+        events = await _collect(RecipeImporter(), content, test_db, workers=2)
+    finally:
+        recipe_importer.shutdown_bulk_pool()
+
+    statuses = [e["status"] for e in events if e["event"] == "recipe"]
+    assert statuses == ["imported", "failed", "imported"]
+    failed = next(e for e in events if e.get("status") == "failed")
+    # RecipeImportError survives pickling with its error list intact
+    assert failed["errors"] == ["Conversion error: Invalid BeerXML: recipe NAME is required"]
+
+
+@pytest.mark.asyncio
+async def test_process_pool_is_shared_across_imports(test_db: AsyncSession, monkeypatch):
+    monkeypatch.setattr(recipe_importer, "BULK_POOL_MIN_RECIPES", 1)
+    recipe_importer.shutdown_bulk_pool()
+    importer = RecipeImporter()
+    try:
+        await _collect(importer, _beerxml_with(["Shared A"]), test_db, workers=2)
+        pool = recipe_importer._bulk_pool
+        await _collect(importer, _beerxml_with(["Shared B"]), test_db, workers=2)
+
+        assert pool is not None and recipe_importer._bulk_pool is pool
+    finally:
+        recipe_importer.shutdown_bulk_pool()
+    assert recipe_importer._bulk_pool is None
+
+
+@pytest.mark.asyncio
+async def test_small_import_prepares_off_the_event_loop(test_db: AsyncSession, monkeypatch):
+    import threading
+
+    loop_thread = threading.get_ident()
+    threads = set()
+    original = RecipeImporter._prepare_document
+
+    def spy(self, document):
+        threads.add(threading.get_ident())
+        return original(self, document)
+
+    monkeypatch.setattr(RecipeImporter, "_prepare_document", spy)
+    events = await _collect(RecipeImporter(), _beerxml_with(["Thread A", "Thread B"]), test_db)
+
+    assert [e["status"] for e in events if e["event"] == "recipe"] == ["imported", "imported"]
+    assert threads and loop_thread not in threads
+
+
+@pytest.mark.asyncio
+async def test_truncated_beerxml_keeps_recipes_before_the_error(test_db: AsyncSession):
+    xml = _beerxml_with(["Kept One", "Kept Two", "Lost"])
+    content = xml[: xml.rindex("<RECIPE>") + 200]
+
+    events = await _collect(RecipeImporter(), content, test_db, chunk_size=1)
+
+    assert [e["name"] for e in events if e["event"] == "recipe"] == ["Kept One", "Kept Two"]
+    assert events[-2]["event"] == "error"
+    assert events[-2]["errors"][0].startswith("Parse error: Invalid XML")
+    assert events[-1] == {"event": "complete", "total": 2, "imported": 2, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_json_array_of_brewfather_recipes(test_db: AsyncSession):
+    recipe = json.loads((DOCS / "Brewfather_RECIPE_PhilterXPAClone_20251207.json").read_text())
+    content = json.dumps([{**recipe, "name": "BF One"}, {**recipe, "name": "BF Two"}])
+
+    events = await _collect(RecipeImporter(), content, test_db)
+
+    assert events[0]["format"] == "brewfather"
+    assert [e["name"] for e in events if e["event"] == "recipe"] == ["BF One", "BF Two"]
+    assert events[-1]["imported"] == 2
+
+
+@pytest.mark.asyncio
+async def test_unrecognised_file_yields_error_event(test_db: AsyncSession):
+    events = await _collect(RecipeImporter(), "not a recipe", test_db)
+
+    assert events == [{
+        "event": "error",
+        "errors": ["Unable to detect recipe format. File must be BeerXML, Brewfather JSON, or BeerJSON."],
+    }]
+
+
+@pytest.mark.asyncio
+async def test_bulk_endpoint_streams_ndjson(client):
+    content = _beerxml_with(["Api Bulk A", "Api Bulk B"]).encode()
+
+    response = await client.post(
+        "/api/recipes/import/bulk",
+        files={"file": ("recipes.xml", content, "application/xml")},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = _events(response.text)
+    assert events[-1] == {"event": "complete", "total": 2, "imported": 2, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_bulk_endpoint_rejects_bad_extension(client):
+    response = await client.post(
+        "/api/recipes/import/bulk",
+        files={"file": ("recipes.txt", b"<RECIPES/>", "text/plain")},
+    )
+
+    assert response.status_code == 400
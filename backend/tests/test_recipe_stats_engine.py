@@ -0,0 +1,106 @@
+"""Tests for the memoized recipe stats engine and bulk recalculation."""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Recipe, RecipeCulture, RecipeFermentable, RecipeHop
+from backend.services.brewing import RecipeStatsEngine, calculate_recipe_stats, stats_engine
+from backend.services.recipe_stats import recalculate_all_recipes
+
+
+def _recipe(name: str = "Stats Pale", hop_grams: float = 30.0) -> Recipe:
+    return Recipe(
+        name=name,
+        batch_size_liters=20,
+        efficiency_percent=72,
+        fermentables=[
+            RecipeFermentable(name="Pale Ale Malt", type="grain", amount_kg=4.5, color_srm=3),
+            RecipeFermentable(name="Crystal 60", type="grain", amount_kg=0.3, color_srm=60),
+        ],
+        hops=[
+            RecipeHop(
+                name="Cascade",
+                amount_grams=hop_grams,
+                alpha_acid_percent=6.5,
+                timing={"use": "add_to_boil", "duration": {"value": 60, "unit": "min"}},
+            ),
+        ],
+        cultures=[RecipeCulture(name="US-05", attenuation_min_percent=78)],
+    )
+
+
+class TestRecipeStatsEngine:
+    def test_unchanged_recipe_is_served_from_cache(self):
+        engine = RecipeStatsEngine()
+        recipe = _recipe()
+
+        first = engine.stats(recipe)
+        second = engine.stats(recipe)
+
+        assert first == second
+        assert (engine.hits, engine.misses) == (1, 1)
+
+    def test_ingredient_edit_is_a_new_revision(self):
+        engine = RecipeStatsEngine()
+        recipe = _recipe()
+        before = engine.stats(recipe)
+
+        recipe.hops[0].timing = {"use": "add_to_boil", "duration": {"value": 15, "unit": "min"}}
+        after = engine.stats(recipe)
+
+        assert engine.misses == 2
+        assert after["ibu"] < before["ibu"]
+        assert after["og"] == before["og"]
+
+    def test_returned_dict_does_not_alias_cache(self):
+        engine = RecipeStatsEngine()
+        recipe = _recipe()
+
+        engine.stats(recipe)["og"] = 0
+        assert engine.stats(recipe)["og"] > 1
+
+    def test_cache_is_bounded(self):
+        engine = RecipeStatsEngine(maxsize=2)
+        for grams in (10, 20, 30):
+            engine.stats(_recipe(hop_grams=grams))
+
+        assert len(engine._cache) == 2
+
+    def test_matches_expected_values(self):
+        stats_engine.clear()
+        stats = calculate_recipe_stats(_recipe())
+
+        assert stats == {"og": 1.053, "fg": 1.012, "abv": 5.4, "ibu": 24.0, "color_srm": 8.7}
+
+
+@pytest.mark.asyncio
+async def test_bulk_recalculation_updates_stale_recipes(test_db: AsyncSession):
+    stale = _recipe("Stale Stats")
+    stale.og = 1.000
+    fresh = _recipe("Fresh Stats")
+    fresh.og, fresh.fg, fresh.abv, fresh.ibu, fresh.color_srm = calculate_recipe_stats(fresh).values()
+    empty = Recipe(name="No Ingredients", og=1.050)
+    test_db.add_all([stale, fresh, empty])
+    await test_db.commit()
+
+    preview = await recalculate_all_recipes(test_db, batch_size=2, dry_run=True)
+    assert preview == {"processed": 3, "updated": 1, "skipped": 1}
+    assert (await test_db.execute(select(Recipe.og).where(Recipe.name == "Stale Stats"))).scalar_one() == 1.000
+
+    result = await recalculate_all_recipes(test_db, batch_size=2)
+    assert result == {"processed": 3, "updated": 1, "skipped": 1}
+    og = (await test_db.execute(select(Recipe.og).where(Recipe.name == "Stale Stats"))).scalar_one()
+    assert og == calculate_recipe_stats(_recipe())["og"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_recalculate_endpoint(client, test_db: AsyncSession):
+    recipe = _recipe("Api Stats")
+    test_db.add(recipe)
+    await test_db.commit()
+
+    response = await client.post("/api/recipes/recalculate")
+
+    assert response.status_code == 200
+    assert response.json()["updated"] >= 1
@@ -512,3 +512,17 @@ async def test_update_recipe_recalculates_when_explicitly_requested(
     # Calculator should drive these away from the imported targets.
     assert data["og"] != 1.067
     assert data["ibu"] != 60.0
+
+
+@pytest.mark.asyncio
+async def test_list_recipes_projection(client, test_recipe):
+    """GET /api/recipes?fields=... skips relationships that weren't requested."""
+    legacy = (await client.get("/api/recipes")).json()[0]
+    assert legacy["fermentables"] == [] and "style" in legacy
+
+    slim = (await client.get("/api/recipes", params={"fields": "name,og"})).json()[0]
+    assert slim == {"id": test_recipe.id, "name": "Test Recipe", "og": 1.050}
+
+    styled = (await client.get("/api/recipes", params={"expand": "style"})).json()[0]
+    assert "style" in styled and "fermentables" not in styled
+    assert styled["created_at"] == legacy["created_at"]
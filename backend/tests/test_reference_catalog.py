@@ -0,0 +1,130 @@
+"""Tests for the in-memory reference catalog (styles, hops, fermentables, yeast)."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import HopVariety
+from backend.services.llm.tools.yeast_style import get_yeast_by_id
+from backend.services.reference_catalog import (
+    CatalogIndex,
+    CatalogRecord,
+    get_reference_catalog,
+    invalidate_reference_catalog,
+)
+
+
+def _index(names, aliases=None, **text):
+    records = [
+        CatalogRecord({"id": i, "name": name, **{k: v[i] for k, v in text.items()}})
+        for i, name in enumerate(names)
+    ]
+    return CatalogIndex(records, tuple(text), aliases)
+
+
+class TestCatalogIndex:
+    def test_ranking_prefers_exact_then_prefix_then_substring(self):
+        index = _index(["Citra Pale Ale", "Neo Citra", "Citra"])
+
+        assert [r.name for r in index.search("citra")] == ["Citra", "Citra Pale Ale", "Neo Citra"]
+
+    def test_alias_lookup(self):
+        index = _index(["Hazy IPA", "American IPA"], aliases={"NEIPA": "Hazy IPA"})
+
+        assert [r.name for r in index.search("neipa")][0] == "Hazy IPA"
+        assert [r.name for r in index.alias("NEIPA")] == ["Hazy IPA"]
+
+    def test_code_lookup_is_per_record_not_per_name(self):
+        records = [
+            CatalogRecord({"id": 1, "name": "American Ale", "producer": "Escarpment", "product_id": None}),
+            CatalogRecord({"id": 2, "name": "American Ale", "producer": "Wyeast", "product_id": "1056"}),
+        ]
+        index = CatalogIndex(records, ("producer",), code_field="product_id")
+
+        assert [r.id for r in index.code("1056")] == [2]
+        assert index.search("1056")[0].id == 2
+
+    def test_fuzzy_match_tolerates_typos(self):
+        index = _index(["Cascade", "Centennial", "Chinook"])
+
+        assert [r.name for r in index.search("cascde")] == ["Cascade"]
+
+    def test_secondary_text_fields_rank_below_name(self):
+        index = _index(
+            ["Mosaic", "Simcoe"],
+            aroma_profile=["blueberry, tropical", "pine, mosaic-like"],
+        )
+
+        assert [r.name for r in index.search("mosaic")] == ["Mosaic", "Simcoe"]
+
+    def test_substring_short_and_long_queries(self):
+        index = _index(["Pale Ale Malt", "Pilsner Malt", "Caramel 60"])
+
+        assert [r.name for r in index.substring("malt")] == ["Pale Ale Malt", "Pilsner Malt"]
+        assert [r.name for r in index.substring("60")] == ["Caramel 60"]
+        assert [r.name for r in index.substring("e ale m")] == ["Pale Ale Malt"]
+
+    def test_where_filters_before_limit(self):
+        index = _index(["Ale A", "Ale B", "Ale C"])
+
+        results = index.search("ale", where=lambda r: r.name != "Ale A", limit=1)
+        assert [r.name for r in results] == ["Ale B"]
+
+    def test_empty_query_returns_all_in_name_order(self):
+        index = _index(["Zeus", "Amarillo"])
+
+        assert [r.name for r in index.search(None)] == ["Amarillo", "Zeus"]
+
+    def test_records_are_read_only(self):
+        record = CatalogRecord({"id": 1, "name": "Citra"})
+
+        with pytest.raises(AttributeError):
+            record.name = "Mosaic"
+        with pytest.raises(AttributeError):
+            record.missing
+
+
+class TestReferenceCatalog:
+    @pytest.mark.asyncio
+    async def test_loads_seeded_tables(self, test_db: AsyncSession):
+        invalidate_reference_catalog()
+        catalog = await get_reference_catalog(test_db)
+
+        assert len(catalog.styles) > 0
+        assert len(catalog.hops) > 0
+        assert catalog.hops.search("citra")[0].name == "Citra"
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_reused(self, test_db: AsyncSession):
+        first = await get_reference_catalog(test_db)
+        assert await get_reference_catalog(test_db) is first
+
+    @pytest.mark.asyncio
+    async def test_insert_invalidates_snapshot(self, test_db: AsyncSession):
+        before = await get_reference_catalog(test_db)
+        assert before.hops.exact("Zz Test Hop") == []
+
+        test_db.add(HopVariety(name="Zz Test Hop", source="custom", is_custom=True))
+        await test_db.commit()
+
+        after = await get_reference_catalog(test_db)
+        assert after is not before
+        assert [h.name for h in after.hops.exact("zz test hop")] == ["Zz Test Hop"]
+
+    @pytest.mark.asyncio
+    async def test_yeast_by_product_id_returns_that_strain(self, test_db: AsyncSession):
+        invalidate_reference_catalog()
+        catalog = await get_reference_catalog(test_db)
+        # Shared strain names across labs must not redirect a product code
+        for strain in catalog.yeast.records:
+            if strain.product_id:
+                assert strain in catalog.yeast.code(strain.product_id)
+
+        result = await get_yeast_by_id(test_db, "WY1056")
+        assert result["yeast"]["product_id"] == "WY1056"
+
+    @pytest.mark.asyncio
+    async def test_list_endpoint_serves_catalog(self, client, test_db: AsyncSession):
+        response = await client.get("/api/hop-varieties", params={"search": "citra", "limit": 1})
+
+        assert response.status_code == 200
+        assert [h["name"] for h in response.json()] == ["Citra"]
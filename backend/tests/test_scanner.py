@@ -0,0 +1,180 @@
+"""Tests for the Tilt scanners: BLE decoding/mailbox, file and relay polling."""
+
+import asyncio
+import json
+import os
+import struct
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from backend.scanner import (
+    BLEScanner,
+    COLOR_TO_UUID,
+    FileScanner,
+    RelayScanner,
+    TiltScanner,
+    decode_tilt_ibeacon,
+)
+
+
+def _tilt_advert(color: str, temp_f: int, sg_milli: int, rssi: int = -60):
+    payload = (
+        b"\x02\x15"
+        + bytes.fromhex(COLOR_TO_UUID[color])
+        + struct.pack(">HHb", temp_f, sg_milli, -59)
+    )
+    return SimpleNamespace(manufacturer_data={76: payload}, rssi=rssi)
+
+
+def _rapt_advert(sg: float, rssi: int = -70):
+    payload = b"PT" + struct.pack(">B6sHfhhhH", 1, b"\x00" * 6, int((20 + 273.15) * 128), sg * 1000, 0, 0, 0, 25600)
+    return SimpleNamespace(manufacturer_data={0x4152: payload}, rssi=rssi)
+
+
+def _device(address: str):
+    return SimpleNamespace(address=address)
+
+
+class TestDecodeTiltIBeacon:
+    def test_decodes_tilt_color_major_minor(self):
+        data = _tilt_advert("PURPLE", 685, 10502).manufacturer_data[76]
+
+        assert decode_tilt_ibeacon(data) == ("PURPLE", 685, 10502)
+
+    def test_rejects_foreign_ibeacon_and_non_ibeacon_frames(self):
+        foreign = b"\x02\x15" + bytes(16) + struct.pack(">HHb", 1, 2, -59)
+        continuity = b"\x10\x05\x01\x18\x44\x00\x00"
+
+        assert decode_tilt_ibeacon(foreign) is None
+        assert decode_tilt_ibeacon(continuity) is None
+        assert decode_tilt_ibeacon(b"") is None
+
+    def test_high_precision_reading_through_callback(self):
+        scanner = BLEScanner()
+        scanner._detection_callback(_device("aa:01"), _tilt_advert("RED", 685, 10502))
+
+        [reading] = scanner.drain()
+        assert (reading.temp_f, reading.sg) == (68.5, 1.0502)
+
+
+class TestBLEScannerMailbox:
+    def test_each_color_keeps_its_latest_reading(self):
+        scanner = BLEScanner()
+        scanner._detection_callback(_device("aa:01"), _tilt_advert("RED", 68, 1050))
+        scanner._detection_callback(_device("aa:02"), _tilt_advert("BLUE", 66, 1040))
+        scanner._detection_callback(_device("aa:01"), _tilt_advert("RED", 69, 1049))
+
+        readings = {r.color: r for r in scanner.drain()}
+
+        assert set(readings) == {"RED", "BLUE"}
+        assert readings["RED"].sg == 1.049
+        assert scanner.drain() == []
+
+    def test_stats_count_arrivals_and_coalesced(self):
+        scanner = BLEScanner()
+        for sg in (1050, 1049, 1048):
+            scanner._detection_callback(_device("aa:01"), _tilt_advert("RED", 68, sg))
+        scanner._detection_callback(_device("bb:01"), _rapt_advert(1.045))
+        scanner.drain()
+
+        stats = scanner.stats()
+        assert stats["tilt"]["received"] == 3
+        assert stats["tilt"]["coalesced"] == 2
+        assert stats["tilt"]["delivered"] == 1
+        assert stats["tilt"]["arrivals"] == {"RED": 3}
+        assert stats["rapt"]["arrivals"] == {"BB:01": 1}
+
+    @pytest.mark.asyncio
+    async def test_scan_still_returns_one_reading(self):
+        scanner = BLEScanner()
+        scanner._detection_callback(_device("aa:01"), _tilt_advert("RED", 68, 1050))
+        scanner._detection_callback(_device("aa:02"), _tilt_advert("GREEN", 68, 1050))
+
+        assert (await scanner.scan()).color == "RED"
+        assert (await scanner.scan()).color == "GREEN"
+        assert await scanner.scan() is None
+
+
+@pytest.mark.asyncio
+async def test_tilt_scanner_dispatches_all_devices_per_tick(monkeypatch):
+    monkeypatch.delenv("SCANNER_MOCK", raising=False)
+    monkeypatch.delenv("SCANNER_FILES_PATH", raising=False)
+    monkeypatch.delenv("SCANNER_RELAY_HOST", raising=False)
+    handled = []
+
+    async def on_reading(reading):
+        if reading.color == "BLUE":
+            raise RuntimeError("db down")
+        handled.append(reading.color)
+
+    tilt_scanner = TiltScanner(on_reading=on_reading)
+    ble = tilt_scanner._scanner
+    for color in ("RED", "BLUE", "PINK"):
+        ble._detection_callback(_device("aa"), _tilt_advert(color, 68, 1050))
+
+    async def no_start(device: int = 0):
+        return None
+
+    ble.start = no_start
+    task = asyncio.create_task(tilt_scanner.start())
+    await asyncio.sleep(0.05)
+    tilt_scanner._running = False
+    task.cancel()
+
+    # A failing handler for one device doesn't block the others
+    assert sorted(handled) == ["PINK", "RED"]
+
+
+class TestFileScanner:
+    @pytest.mark.asyncio
+    async def test_returns_every_changed_color(self, tmp_path):
+        for color, sg in (("RED", 1.050), ("BLUE", 1.040)):
+            (tmp_path / f"{color}.json").write_text(json.dumps({"Temp": 68, "SG": sg}))
+        scanner = FileScanner(str(tmp_path))
+
+        assert sorted(r.color for r in await scanner.scan_all()) == ["BLUE", "RED"]
+        assert await scanner.scan_all() == []
+
+        red = tmp_path / "RED.json"
+        red.write_text(json.dumps({"Temp": 67, "SG": 1.049}))
+        os.utime(red, (red.stat().st_atime, red.stat().st_mtime + 5))
+        assert [(r.color, r.sg) for r in await scanner.scan_all()] == [("RED", 1.049)]
+
+    @pytest.mark.asyncio
+    async def test_watch_wakes_on_file_change(self, tmp_path):
+        scanner = FileScanner(str(tmp_path), watch=True)
+        await scanner.start()
+        await asyncio.sleep(0.2)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        loop.call_later(0.1, (tmp_path / "RED.json").write_text, '{"SG": 1.05}')
+        await scanner.wait(10)
+        await scanner.stop()
+
+        assert loop.time() - started < 5
+
+
+class TestRelayScanner:
+    @pytest.mark.asyncio
+    async def test_fetches_all_colors_and_honours_etags(self):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            color = request.url.path.strip("/").removesuffix(".json")
+            requests.append((color, request.headers.get("if-none-match")))
+            if color not in ("RED", "GREEN"):
+                return httpx.Response(404)
+            if request.headers.get("if-none-match") == f'"{color}-1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"Temp": 68, "SG": 1.050}, headers={"ETag": f'"{color}-1"'})
+
+        scanner = RelayScanner("tiltpi", client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+        assert sorted(r.color for r in await scanner.scan_all()) == ["GREEN", "RED"]
+        assert len(requests) == 8
+        assert await scanner.scan_all() == []
+        assert ("RED", '"RED-1"') in requests
+        await scanner.close()
@@ -0,0 +1,99 @@
+"""Tests for the local SQLite storage profile and serialized write sessions."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend import database
+from backend.database import SerializedWriteSession
+
+
+@pytest.fixture
+async def file_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}")
+    event.listen(engine.sync_engine, "connect", database._apply_sqlite_pragmas)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_performance_profile_applied_on_connect(file_engine):
+    async with file_engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+        assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 5000
+        assert (await conn.execute(text("PRAGMA cache_size"))).scalar() == -32 * 1024
+
+
+@pytest.mark.asyncio
+async def test_optimize_and_checkpoint(file_engine, monkeypatch):
+    monkeypatch.setattr(database, "engine", file_engine)
+    async with file_engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        await conn.execute(text("INSERT INTO t VALUES (1)"))
+
+    await database.optimize_sqlite()
+
+    async with file_engine.connect() as conn:
+        busy, log, checkpointed = (await conn.execute(text("PRAGMA wal_checkpoint"))).one()
+    assert (busy, log) == (0, 0)
+
+
+@pytest.fixture
+async def serialized_sessions(file_engine):
+    async with file_engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE t (x INTEGER)"))
+    return async_sessionmaker(file_engine, class_=SerializedWriteSession, expire_on_commit=False)
+
+
+@pytest.mark.asyncio
+async def test_writers_wait_for_the_open_write_transaction(serialized_sessions):
+    order = []
+
+    async def first():
+        async with serialized_sessions() as session:
+            await session.execute(text("INSERT INTO t VALUES (1)"))
+            order.append("first wrote")
+            await asyncio.sleep(0.05)
+            await session.commit()
+            order.append("first committed")
+
+    async def second():
+        await asyncio.sleep(0.01)
+        async with serialized_sessions() as session:
+            await session.execute(text("INSERT INTO t VALUES (2)"))
+            order.append("second wrote")
+            await session.commit()
+
+    await asyncio.gather(first(), second())
+
+    assert order == ["first wrote", "first committed", "second wrote"]
+    assert not database.sqlite_write_lock().locked()
+
+
+@pytest.mark.asyncio
+async def test_reads_do_not_take_the_lock(serialized_sessions):
+    async with serialized_sessions() as writer, serialized_sessions() as reader:
+        await writer.execute(text("INSERT INTO t VALUES (1)"))
+        assert database.sqlite_write_lock().locked()
+
+        count = await asyncio.wait_for(reader.scalar(text("SELECT count(*) FROM t")), 1)
+        assert count == 0
+        await writer.rollback()
+
+    assert not database.sqlite_write_lock().locked()
+
+
+@pytest.mark.asyncio
+async def test_lock_released_when_session_closes_or_begin_block_ends(serialized_sessions):
+    async with serialized_sessions() as session:
+        await session.execute(text("INSERT INTO t VALUES (1)"))
+    assert not database.sqlite_write_lock().locked()
+
+    async with serialized_sessions() as session:
+        async with session.begin():
+            await session.execute(text("INSERT INTO t VALUES (2)"))
+            assert database.sqlite_write_lock().locked()
+        assert not database.sqlite_write_lock().locked()
@@ -0,0 +1,139 @@
+"""Tests for the trigger-maintained reading counters behind /api/stats."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend import cleanup
+from backend.models import Batch, Device, Reading, ReadingStat
+from backend.services import storage_stats
+from backend.services.storage_stats import get_storage_stats, seed_counts
+
+
+@pytest.fixture
+async def stats_db(test_db, monkeypatch):
+    monkeypatch.setattr(cleanup, "async_session_factory", async_sessionmaker(test_db.bind, expire_on_commit=False))
+    storage_stats.invalidate_size()
+    test_db.add(Device(id="tilt-red", device_type="tilt", name="Red"))
+    test_db.add(Device(id="tilt-blue", device_type="tilt", name="Blue"))
+    batch = Batch(device_id="tilt-red", name="Pale", status="fermenting")
+    test_db.add(batch)
+    await test_db.commit()
+    return test_db, batch.id
+
+
+async def _counts(session) -> dict:
+    rows = (await session.execute(select(ReadingStat))).scalars().all()
+    return {(r.scope, r.key): r.readings for r in rows}
+
+
+@pytest.mark.asyncio
+async def test_inserts_and_deletes_keep_counts(stats_db):
+    session, batch_id = stats_db
+    now = datetime.now(timezone.utc)
+    session.add_all([
+        Reading(device_id="tilt-red", batch_id=batch_id, timestamp=now, sg_raw=1.050),
+        Reading(device_id="tilt-red", batch_id=batch_id, timestamp=now, sg_raw=1.049),
+        Reading(device_id="tilt-blue", timestamp=now - timedelta(days=1), sg_raw=1.040),
+    ])
+    await session.commit()
+
+    counts = await _counts(session)
+    assert counts[("all", "")] == 3
+    assert counts[("device", "tilt-red")] == 2
+    assert counts[("batch", str(batch_id))] == 2
+    assert counts[("day", now.date().isoformat())] == 2
+
+    await session.execute(delete(Reading).where(Reading.device_id == "tilt-blue"))
+    await session.commit()
+
+    counts = await _counts(session)
+    assert counts[("all", "")] == 2
+    assert counts[("device", "tilt-blue")] == 0
+
+
+@pytest.mark.asyncio
+async def test_moving_readings_between_batches(stats_db):
+    session, batch_id = stats_db
+    session.add(Reading(device_id="tilt-blue", timestamp=datetime.now(timezone.utc), sg_raw=1.040))
+    await session.commit()
+
+    await session.execute(update(Reading).values(batch_id=batch_id))
+    await session.commit()
+
+    counts = await _counts(session)
+    assert counts[("batch", str(batch_id))] == 1
+    assert counts[("device", "tilt-blue")] == 1
+    assert counts[("all", "")] == 1
+
+
+@pytest.mark.asyncio
+async def test_stats_served_from_counters(stats_db):
+    session, batch_id = stats_db
+    now = datetime.now(timezone.utc)
+    for days_ago in range(1, 4):
+        session.add(Reading(device_id="tilt-red", batch_id=batch_id, timestamp=now - timedelta(days=days_ago)))
+    await session.commit()
+    # A counter that disagrees with the table proves no COUNT(*) was run
+    await session.execute(text("UPDATE reading_stats SET readings = 42 WHERE scope = 'all'"))
+    await session.commit()
+
+    stats = await get_storage_stats(session)
+
+    assert stats["total_readings"] == 42
+    assert stats["readings_by_device"] == {"tilt-red": 3}
+    assert stats["readings_by_batch"] == {batch_id: 3}
+    assert stats["readings_per_day"] == 1.0
+    assert stats["size_bytes"] > 0
+    assert stats["estimated_size_bytes"] == stats["size_bytes"]
+
+
+@pytest.mark.asyncio
+async def test_breakdown_scoped_to_user(stats_db):
+    session, batch_id = stats_db
+    session.add(Reading(device_id="tilt-red", batch_id=batch_id))
+    await session.commit()
+
+    stats = await get_storage_stats(session, user_id="someone-else")
+
+    assert stats["readings_by_device"] == {}
+    assert stats["readings_by_batch"] == {}
+
+
+@pytest.mark.asyncio
+async def test_cleanup_prunes_empty_counters(stats_db):
+    session, batch_id = stats_db
+    old = datetime.now(timezone.utc) - timedelta(days=60)
+    session.add(Reading(device_id="tilt-blue", timestamp=old))
+    session.add(Reading(device_id="tilt-red", batch_id=batch_id))
+    await session.commit()
+
+    assert await cleanup.cleanup_old_readings(retention_days=30) == 1
+
+    counts = await _counts(session)
+    assert ("device", "tilt-blue") not in counts
+    assert ("day", old.date().isoformat()) not in counts
+    assert counts[("all", "")] == 1
+
+
+@pytest.mark.asyncio
+async def test_seed_matches_table(stats_db):
+    session, batch_id = stats_db
+    session.add_all([Reading(device_id="tilt-red", batch_id=batch_id) for _ in range(3)])
+    await session.commit()
+    before = await _counts(session)
+
+    await (await session.connection()).run_sync(seed_counts)
+    await session.commit()
+
+    assert await _counts(session) == before
+
+
+@pytest.mark.asyncio
+async def test_stats_endpoint(client, stats_db):
+    response = await client.get("/api/stats")
+
+    assert response.status_code == 200
+    assert response.json()["total_readings"] == 0
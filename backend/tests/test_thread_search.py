@@ -0,0 +1,126 @@
+"""Tests for full-text search over assistant threads (search_threads tool)."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import AgUiThread
+from backend.routers.ag_ui import _save_message
+from backend.services import thread_search
+from backend.services.llm.tools.utility import search_threads
+
+
+@pytest_asyncio.fixture
+async def threads(test_db: AsyncSession):
+    """Two users' threads with messages saved through the normal save path."""
+    test_db.add_all([
+        AgUiThread(id="stout-thread", title="Weekend brew", user_id="alice"),
+        AgUiThread(id="lager-thread", title="Lager planning", user_id="alice"),
+        AgUiThread(id="bob-thread", title="Bob's stout", user_id="bob"),
+    ])
+    await test_db.commit()
+
+    await _save_message(test_db, "stout-thread", "user", "I want to brew a dry Irish stout with roasted barley")
+    await _save_message(test_db, "stout-thread", "assistant", "For a dry stout, mash at 65C and use 10% roasted barley.")
+    await _save_message(test_db, "lager-thread", "user", "How long should I lager a pilsner?")
+    await _save_message(test_db, "lager-thread", "assistant", "Lager the pilsner for 4-6 weeks near freezing.")
+    await _save_message(test_db, "bob-thread", "user", "Oatmeal stout recipe please")
+    return test_db
+
+
+class TestQueryBuilding:
+    def test_fts5_match_quotes_and_prefixes_tokens(self):
+        assert thread_search.build_fts5_match("Dry Stout") == '"dry"* "stout"*'
+
+    def test_fts5_match_strips_operators(self):
+        # FTS5 syntax characters must never reach MATCH
+        assert thread_search.build_fts5_match('stout" OR NEAR(') == '"stout"* "or"* "near"*'
+
+    def test_empty_query_has_no_match(self):
+        assert thread_search.build_fts5_match("?!") is None
+        assert thread_search.build_tsquery("  ") is None
+
+    def test_tsquery_ands_prefix_terms(self):
+        assert thread_search.build_tsquery("roasted barley") == "roasted:* & barley:*"
+
+
+class TestSearchThreads:
+    @pytest.mark.asyncio
+    async def test_finds_message_content_with_snippet(self, threads):
+        result = await search_threads(threads, "roasted", user_id="alice")
+
+        assert [r["thread_id"] for r in result["results"]] == ["stout-thread"]
+        snippet = result["results"][0]["snippets"][0]["snippet"]
+        assert "**roasted**" in snippet.lower()
+
+    @pytest.mark.asyncio
+    async def test_stemmed_and_prefix_matches(self, threads):
+        # porter stemming: "lagering" matches "lager"
+        result = await search_threads(threads, "lagering", user_id="alice")
+        assert [r["thread_id"] for r in result["results"]] == ["lager-thread"]
+
+    @pytest.mark.asyncio
+    async def test_scoped_to_user(self, threads):
+        result = await search_threads(threads, "stout", user_id="alice")
+        ids = [r["thread_id"] for r in result["results"]]
+        assert "bob-thread" not in ids
+        assert ids == ["stout-thread"]
+
+    @pytest.mark.asyncio
+    async def test_excludes_current_thread(self, threads):
+        result = await search_threads(
+            threads, "stout", current_thread_id="stout-thread", user_id="alice"
+        )
+        assert result["results"] == []
+
+    @pytest.mark.asyncio
+    async def test_title_match_without_message_hit(self, threads):
+        result = await search_threads(threads, "planning", user_id="alice")
+        assert [r["thread_id"] for r in result["results"]] == ["lager-thread"]
+        assert result["results"][0]["snippets"] == []
+
+    @pytest.mark.asyncio
+    async def test_results_are_ranked(self, threads):
+        result = await search_threads(threads, "pilsner", user_id="alice")
+        assert result["results"][0]["score"] > 0
+
+    @pytest.mark.asyncio
+    async def test_delete_thread_removes_index_rows(self, threads):
+        await thread_search.remove_thread(threads, "stout-thread")
+        await threads.commit()
+
+        hits = await thread_search.search_messages(threads, "roasted", user_id="alice")
+        assert hits == []
+
+    @pytest.mark.asyncio
+    async def test_rebuild_index_backfills_all_messages(self, threads):
+        await threads.execute(text(f"DELETE FROM {thread_search.FTS_TABLE}"))
+        await threads.commit()
+        assert await thread_search.search_messages(threads, "roasted") == []
+
+        indexed = await thread_search.rebuild_index(threads)
+
+        assert indexed == 5
+        hits = await thread_search.search_messages(threads, "roasted")
+        assert [h["thread_id"] for h in hits] == ["stout-thread"]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_like_without_index(self, threads):
+        await threads.execute(text(f"DROP TABLE {thread_search.FTS_TABLE}"))
+        await threads.commit()
+
+        result = await search_threads(threads, "roasted", user_id="alice")
+
+        assert [r["thread_id"] for r in result["results"]] == ["stout-thread"]
+
+    @pytest.mark.asyncio
+    async def test_fallback_keeps_caller_session_state(self, threads):
+        thread = await threads.get(AgUiThread, "stout-thread")
+        await threads.execute(text(f"DROP TABLE {thread_search.FTS_TABLE}"))
+
+        assert await thread_search.search_messages(threads, "roasted") is None
+
+        # Only the savepoint rolled back: loaded instances aren't expired
+        # (touching an expired attribute here would raise MissingGreenlet).
+        assert thread.title == "Weekend brew"
@@ -0,0 +1,86 @@
+"""Tests for tool result budgets."""
+
+import pytest
+
+from backend.services.llm.tools import registry
+from backend.services.llm.tools.budget import ToolBudget, apply_budget, result_size
+from backend.services.llm.tools.registry import ToolRegistry
+
+
+def _history(count: int) -> dict:
+    return {
+        "batch_id": 1,
+        "count": count,
+        "readings": [
+            {"timestamp": f"2026-10-{1 + i // 24:02d}T{i % 24:02d}:00:00", "sg": 1.050 - i * 0.0001}
+            for i in range(count)
+        ],
+    }
+
+
+def test_small_results_untouched():
+    result = _history(3)
+
+    assert apply_budget(result, ToolBudget(chars=10_000)) == (result, None)
+
+
+def test_series_downsampled_keeping_endpoints():
+    result = _history(500)
+
+    compacted, notes = apply_budget(result, ToolBudget(chars=2_000))
+
+    readings = compacted["readings"]
+    assert result_size(compacted) <= 2_000 + result_size({"_truncated": notes})
+    assert readings[0] == result["readings"][0]
+    assert readings[-1] == result["readings"][-1]
+    assert notes["readings"]["total"] == 500
+    assert notes["readings"]["method"] == "downsampled"
+    assert compacted["_truncated"] == notes
+    # Deterministic
+    assert apply_budget(result, ToolBudget(chars=2_000)) == (compacted, notes)
+
+
+def test_projection_and_truncation():
+    result = {"count": 200, "recipes": [{"id": i, "name": f"Recipe {i}", "notes": "x" * 200} for i in range(200)]}
+
+    compacted, notes = apply_budget(result, ToolBudget(chars=1_500, project={"recipes": ("id", "name")}))
+
+    assert set(compacted["recipes"][0]) == {"id", "name"}
+    assert compacted["recipes"][0]["id"] == 0  # lists keep their head
+    assert notes["recipes"]["fields"] == ["id", "name"]
+    assert notes["recipes"]["total"] == 200
+
+
+def test_kept_keys_never_compacted():
+    hops = [{"name": f"Hop {i}", "amount_g": i} for i in range(100)]
+    result = {"id": 1, "notes": "n" * 5_000, "hops": hops}
+
+    compacted, notes = apply_budget(result, ToolBudget(chars=4_000, keep=("hops",)))
+
+    assert compacted["hops"] == hops
+    assert len(compacted["notes"]) < 5_000
+    assert "notes" in notes
+
+
+@pytest.mark.asyncio
+async def test_registry_applies_budget_and_counts_compactions():
+    tools = ToolRegistry(__name__)
+
+    @tools.tool()
+    def big():
+        return _history(1_000)
+
+    tools.set_budget("big", ToolBudget(chars=3_000))
+
+    result = await tools.execute("big", {})
+
+    assert result["_truncated"]["readings"]["total"] == 1_000
+    snapshot = tools.snapshot()["big"]
+    assert snapshot["compacted"] == 1
+    assert snapshot["max_result_bytes"] > 3_000  # size before compaction
+
+
+def test_recipe_ingredients_protected():
+    budget = registry.budget_for("get_recipe")
+
+    assert {"fermentables", "hops", "cultures"} <= set(budget.keep)
@@ -0,0 +1,91 @@
+"""Tests for the assistant tool registry and dispatch."""
+
+import subprocess
+import sys
+
+import pytest
+
+from backend.services.llm.tools import TOOL_DEFINITIONS, execute_tool, registry
+from backend.services.llm.tools.registry import DB_USER, ToolRegistry
+
+
+def test_every_definition_is_registered():
+    defined = {t["function"]["name"] for t in TOOL_DEFINITIONS}
+
+    assert defined <= registry.names()
+    # Only the legacy alias has no definition of its own
+    assert registry.names() - defined == {"review_recipe_narrative"}
+
+
+def test_tool_modules_imported_lazily():
+    code = (
+        "import sys; import backend.services.llm.tools; "
+        "print(sorted(m for m in sys.modules if m.startswith('backend.services.llm.tools.')))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    # Only the dispatch machinery, none of the tool modules
+    assert result.stdout.strip() == "['backend.services.llm.tools.budget', 'backend.services.llm.tools.registry']"
+
+
+@pytest.mark.asyncio
+async def test_context_comes_from_server_not_arguments():
+    tools = ToolRegistry(__name__)
+    calls = []
+
+    @tools.tool(context=DB_USER)
+    async def whoami(db, user_id=None, limit: int = 5):
+        calls.append((db, user_id, limit))
+        return {"user": user_id}
+
+    tools.set_definitions([{"function": {"name": "whoami", "parameters": {"properties": {"limit": {}}}}}])
+
+    result = await tools.execute("whoami", {"user_id": "intruder", "limit": 2, "bogus": 1}, db="session", user_id="me")
+
+    assert result == {"user": "me"}
+    assert calls == [("session", "me", 2)]
+
+
+@pytest.mark.asyncio
+async def test_metrics_record_latency_size_and_errors():
+    tools = ToolRegistry(__name__)
+
+    @tools.tool()
+    def ok():
+        return {"value": "x" * 100}
+
+    @tools.tool()
+    async def broken():
+        raise RuntimeError("boom")
+
+    await tools.execute("ok", {})
+    await tools.execute("ok", {})
+    with pytest.raises(RuntimeError):
+        await tools.execute("broken", {})
+
+    snapshot = tools.snapshot()
+    assert snapshot["ok"]["calls"] == 2
+    assert snapshot["ok"]["errors"] == 0
+    assert snapshot["ok"]["max_result_bytes"] > 100
+    assert sum(snapshot["ok"]["latency_histogram"].values()) == 2
+    assert snapshot["broken"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_dispatch(test_db):
+    assert (await execute_tool(test_db, "nope", {})) == {"error": "Unknown tool: nope"}
+
+    result = await execute_tool(test_db, "get_current_datetime", {})
+    assert "current_datetime" in result
+
+    result = await execute_tool(test_db, "list_fermentations", {"limit": 3})
+    assert "error" not in result
+    assert registry.snapshot()["list_fermentations"]["calls"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_tool_metrics_endpoint(client):
+    response = await client.get("/api/ag-ui/tools/metrics")
+
+    assert response.status_code == 200
+    assert "tools" in response.json()
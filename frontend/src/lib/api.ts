@@ -889,10 +889,11 @@ export async function fetchBatches(
 /**
  * Fetch active batches (planning or fermenting)
  */
-export async function fetchActiveBatches(limit: number = 50, offset: number = 0): Promise<BatchResponse[]> {
+export async function fetchActiveBatches(expand: string = 'recipe'): Promise<BatchResponse[]> {
+	// Only embed what the list renders; tasting notes and reflections are
+	// loaded with the batch detail
 	const params = new URLSearchParams();
-	params.append('limit', String(limit));
-	params.append('offset', String(offset));
+	params.append('expand', expand);
 
 	const response = await authFetch(`${BASE_URL}/batches/active?${params}`);
 	if (!response.ok) {
@@ -904,10 +905,11 @@ export async function fetchActiveBatches(limit: number = 50, offset: number = 0)
 /**
  * Fetch completed batches (completed or conditioning)
  */
-export async function fetchCompletedBatches(limit: number = 50, offset: number = 0): Promise<BatchResponse[]> {
+export async function fetchCompletedBatches(expand: string = 'recipe'): Promise<BatchResponse[]> {
+	// Only embed what the list renders; tasting notes and reflections are
+	// loaded with the batch detail
 	const params = new URLSearchParams();
-	params.append('limit', String(limit));
-	params.append('offset', String(offset));
+	params.append('expand', expand);
 
 	const response = await authFetch(`${BASE_URL}/batches/completed?${params}`);
 	if (!response.ok) {
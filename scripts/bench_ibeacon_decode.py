@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the BLE detection callback's iBeacon decoding.
+
+Compares backend.scanner.decode_tilt_ibeacon against the previous
+beacontools-based path (synthetic frame + parse_packet) on a mix of Tilt and
+non-Tilt Apple advertisements, then measures adverts/second through
+BLEScanner._detection_callback. Run it on the target Pi for real numbers.
+
+Usage:
+    python scripts/bench_ibeacon_decode.py [--tilt-ratio 0.1] [--seconds 1]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import struct
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.scanner import BLEScanner, TILT_COLORS, decode_tilt_ibeacon  # noqa: E402
+
+
+def make_frames(count: int, tilt_ratio: float) -> list[bytes]:
+    """Apple manufacturer payloads: Tilt iBeacons, foreign iBeacons, and
+    non-iBeacon Apple frames (Continuity/AirTag-style)."""
+    rng = random.Random(42)
+    tilt_uuids = [bytes.fromhex(u) for u in TILT_COLORS]
+    frames = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < tilt_ratio:
+            uuid = rng.choice(tilt_uuids)
+            frames.append(b"\x02\x15" + uuid + struct.pack(">HHb", 68, 1050, -59))
+        elif roll < tilt_ratio + (1 - tilt_ratio) / 2:
+            frames.append(b"\x02\x15" + os.urandom(16) + struct.pack(">HHb", 1, 2, -59))
+        else:
+            frames.append(bytes([rng.choice((0x10, 0x12, 0x07))]) + os.urandom(rng.randint(5, 25)))
+    return frames
+
+
+def beacontools_decode(data: bytes):
+    from beacontools import parse_packet
+
+    adv = parse_packet(b"\x02\x01\x06\x1a\xff\x4c\x00" + data)
+    if not adv or not hasattr(adv, "uuid"):
+        return None
+    color = TILT_COLORS.get(adv.uuid.replace("-", ""))
+    if not color:
+        return None
+    return color, adv.major, adv.minor
+
+
+def rate(func, frames: list[bytes], seconds: float) -> float:
+    """Frames per second processed by func over roughly `seconds`."""
+    processed = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for frame in frames:
+            func(frame)
+        processed += len(frames)
+    return processed / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tilt-ratio", type=float, default=0.1, help="share of frames that are Tilts")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time per measurement")
+    args = parser.parse_args()
+
+    frames = make_frames(2000, args.tilt_ratio)
+    # Both decoders must agree before timing anything
+    for frame in frames:
+        assert decode_tilt_ibeacon(frame) == beacontools_decode(frame), frame.hex()
+
+    fast = rate(decode_tilt_ibeacon, frames, args.seconds)
+    print(f"decode_tilt_ibeacon:   {fast:>12,.0f} adverts/s  ({1e9 / fast:,.0f} ns/advert)")
+    try:
+        slow = rate(beacontools_decode, frames, args.seconds)
+        print(f"beacontools (before):  {slow:>12,.0f} adverts/s  ({1e9 / slow:,.0f} ns/advert)")
+        print(f"speedup:               {fast / slow:>12.1f}x")
+    except ImportError:
+        print("beacontools not installed; skipping comparison")
+
+    scanner = BLEScanner()
+    device = SimpleNamespace(address="AA:BB:CC:DD:EE:FF")
+    adverts = [SimpleNamespace(manufacturer_data={76: f}, rssi=-60) for f in frames]
+
+    def callback(advert):
+        scanner._detection_callback(device, advert)
+
+    # The callback prints each Tilt it detects; keep that out of the timing output
+    with contextlib.redirect_stdout(io.StringIO()):
+        full = rate(callback, adverts, args.seconds)
+    print(f"_detection_callback:   {full:>12,.0f} adverts/s  (tilt ratio {args.tilt_ratio:.0%})")
+
+
+if __name__ == "__main__":
+    main()
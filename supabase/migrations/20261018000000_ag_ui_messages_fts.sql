@@ -0,0 +1,9 @@
+-- Full-text search over assistant messages (search_threads tool).
+-- Replaces the lower(content) LIKE '%q%' scan with a GIN index on the same
+-- to_tsvector('english', content) expression the query uses
+-- (backend/services/thread_search.py). Postgres maintains the index itself,
+-- so existing rows are covered as soon as it is built.
+
+CREATE INDEX IF NOT EXISTS "ix_ag_ui_messages_content_fts"
+    ON "public"."ag_ui_messages"
+    USING GIN (to_tsvector('english', "content"));
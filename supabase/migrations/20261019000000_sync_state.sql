@@ -0,0 +1,18 @@
+-- Cloud sync change tracking (backend/routers/sync.py CloudPush).
+-- Local installs record the digest of every row they pushed so the next sync
+-- only sends what changed. The table is bookkeeping for the pushing side;
+-- create_all adds it to cloud databases too, so lock it away from the REST
+-- API the same way as config.
+
+CREATE TABLE IF NOT EXISTS "public"."sync_state" (
+    "user_id" "uuid" NOT NULL,
+    "table_name" VARCHAR(50) NOT NULL,
+    "row_id" VARCHAR(100) NOT NULL,
+    "digest" VARCHAR(64) NOT NULL,
+    "synced_at" TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT "sync_state_pkey" PRIMARY KEY ("user_id", "table_name", "row_id")
+);
+
+ALTER TABLE "public"."sync_state" ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "sync_state_service_policy" ON "public"."sync_state" USING (false);
@@ -0,0 +1,8 @@
+-- Gateway ingest sequencing (backend/routers/gateway.py GatewayIngest).
+-- boot_id is the gateway's per-boot id from the WebSocket URL; last_seq is the
+-- highest message seq stored from that boot, written in the same transaction
+-- as the readings so a retried message is acked without being stored twice.
+-- The app also adds these at boot via _reconcile_postgres_columns().
+
+ALTER TABLE "public"."gateways" ADD COLUMN IF NOT EXISTS "boot_id" VARCHAR(64);
+ALTER TABLE "public"."gateways" ADD COLUMN IF NOT EXISTS "last_seq" INTEGER;
@@ -0,0 +1,77 @@
+-- Maintained reading counters (backend/services/storage_stats.py).
+-- /api/stats and /api/system/storage read counts from reading_stats instead
+-- of running COUNT(*) over readings. Rows per scope: ('all', ''),
+-- ('device', device_id), ('batch', batch_id) and ('day', 'YYYY-MM-DD');
+-- the triggers below keep them in step with every insert, delete and
+-- reassignment. The app falls back to COUNT(*) if this hasn't been applied.
+
+CREATE TABLE IF NOT EXISTS "public"."reading_stats" (
+    "scope" VARCHAR(10) NOT NULL,
+    "key" VARCHAR(100) NOT NULL,
+    "readings" INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT "reading_stats_pkey" PRIMARY KEY ("scope", "key")
+);
+
+ALTER TABLE "public"."reading_stats" ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "reading_stats_service_policy" ON "public"."reading_stats" USING (false);
+
+CREATE OR REPLACE FUNCTION "public"."reading_stats_apply"(
+    "p_device_id" VARCHAR, "p_batch_id" INTEGER, "p_timestamp" TIMESTAMP, "p_delta" INTEGER
+) RETURNS VOID LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO "public"."reading_stats" ("scope", "key", "readings")
+    SELECT s.scope, s.key, p_delta
+    FROM (VALUES
+        ('all', ''),
+        ('device', p_device_id),
+        ('batch', p_batch_id::TEXT),
+        ('day', p_timestamp::DATE::TEXT)
+    ) AS s(scope, key)
+    WHERE s.key IS NOT NULL
+    ON CONFLICT ("scope", "key")
+    DO UPDATE SET "readings" = "reading_stats"."readings" + EXCLUDED."readings";
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION "public"."reading_stats_trigger"() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        PERFORM "public"."reading_stats_apply"(OLD.device_id, OLD.batch_id, OLD.timestamp, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM "public"."reading_stats_apply"(NEW.device_id, NEW.batch_id, NEW.timestamp, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS "reading_stats_insert_delete" ON "public"."readings";
+CREATE TRIGGER "reading_stats_insert_delete"
+    AFTER INSERT OR DELETE ON "public"."readings"
+    FOR EACH ROW EXECUTE FUNCTION "public"."reading_stats_trigger"();
+
+DROP TRIGGER IF EXISTS "reading_stats_update" ON "public"."readings";
+CREATE TRIGGER "reading_stats_update"
+    AFTER UPDATE OF "device_id", "batch_id", "timestamp" ON "public"."readings"
+    FOR EACH ROW
+    WHEN (OLD.device_id IS DISTINCT FROM NEW.device_id
+          OR OLD.batch_id IS DISTINCT FROM NEW.batch_id
+          OR OLD.timestamp::DATE IS DISTINCT FROM NEW.timestamp::DATE)
+    EXECUTE FUNCTION "public"."reading_stats_trigger"();
+
+-- Seed from the existing readings (one scan, in the same transaction as the
+-- triggers so nothing inserted meanwhile is counted twice or missed)
+DELETE FROM "public"."reading_stats";
+INSERT INTO "public"."reading_stats" ("scope", "key", "readings")
+SELECT 'all', '', COUNT(*) FROM "public"."readings"
+UNION ALL
+SELECT 'device', device_id, COUNT(*) FROM "public"."readings"
+    WHERE device_id IS NOT NULL GROUP BY device_id
+UNION ALL
+SELECT 'batch', batch_id::TEXT, COUNT(*) FROM "public"."readings"
+    WHERE batch_id IS NOT NULL GROUP BY batch_id
+UNION ALL
+SELECT 'day', timestamp::DATE::TEXT, COUNT(*) FROM "public"."readings"
+    WHERE timestamp IS NOT NULL GROUP BY timestamp::DATE;
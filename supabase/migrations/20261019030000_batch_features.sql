@@ -0,0 +1,29 @@
+-- Per-batch fermentation features (backend/services/batch_features.py).
+-- One row per completed/conditioning batch, used by the assistant's
+-- compare_batches tool to rank batches that fermented alike. The app also
+-- creates the table at boot via create_all and backfills missing rows off
+-- the startup path.
+
+CREATE TABLE IF NOT EXISTS "public"."batch_features" (
+    "batch_id" INTEGER NOT NULL REFERENCES "public"."batches"("id") ON DELETE CASCADE,
+    "user_id" UUID,
+    "og" DOUBLE PRECISION,
+    "fg" DOUBLE PRECISION,
+    "attenuation" DOUBLE PRECISION,
+    "mean_temp" DOUBLE PRECISION,
+    "duration_days" DOUBLE PRECISION,
+    "curve_model" VARCHAR(20),
+    "curve_rate" DOUBLE PRECISION,
+    "curve_r_squared" DOUBLE PRECISION,
+    "hours_to_half" DOUBLE PRECISION,
+    "hours_to_90" DOUBLE PRECISION,
+    "readings" INTEGER NOT NULL DEFAULT 0,
+    "computed_at" TIMESTAMPTZ NOT NULL DEFAULT now(),
+    CONSTRAINT "batch_features_pkey" PRIMARY KEY ("batch_id")
+);
+
+CREATE INDEX IF NOT EXISTS "ix_batch_features_user_id" ON "public"."batch_features" ("user_id");
+
+ALTER TABLE "public"."batch_features" ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "batch_features_service_policy" ON "public"."batch_features" USING (false);
@@ -38,3 +38,24 @@ def test_parse_brewfather_beerxml():
                      if h['NAME'] == 'Citra' and h['USE'] == 'Aroma')
     assert 'TEMPERATURE' in citra_hop
     assert int(citra_hop['TEMPERATURE']) == 80
+
+
+def test_iter_recipes_streams_single_recipe_documents():
+    """iter_recipes yields what parse() returns for a single-recipe file."""
+    with open("docs/Brewfather_BeerXML_PhilterXPAClone_20251207.xml", "rb") as f:
+        xml_bytes = f.read()
+    start = xml_bytes.index(b"<RECIPE>")
+    end = xml_bytes.index(b"</RECIPE>") + len(b"</RECIPE>")
+    doubled = xml_bytes[:end] + xml_bytes[start:end] + xml_bytes[end:]
+
+    parser = BeerXMLParser()
+    recipes = list(parser.iter_recipes(doubled))
+
+    assert len(recipes) == 2
+    assert recipes[0] == parser.parse(xml_bytes.decode("utf-8"))
+
+
+def test_iter_recipes_raises_value_error_on_bad_xml():
+    parser = BeerXMLParser()
+    with pytest.raises(ValueError, match="Invalid XML"):
+        list(parser.iter_recipes("<RECIPES><RECIPE>"))
@@ -717,11 +717,10 @@ class TestShellyDirectAdapter:
 
     @pytest.fixture
     def mock_httpx_client(self):
-        """Create a mock httpx.AsyncClient."""
-        with patch("device_control.shelly_adapter.httpx.AsyncClient") as mock_class:
-            mock_client = AsyncMock()
-            mock_client.is_closed = False
-            mock_class.return_value = mock_client
+        """Stand in a mock httpx.AsyncClient for the shared Shelly client."""
+        mock_client = AsyncMock()
+        mock_client.is_closed = False
+        with patch("device_control.shelly_adapter.get_http_client", return_value=mock_client):
             yield mock_client
 
     def _make_response(self, status_code: int, json_data: dict = None):
@@ -1035,14 +1034,14 @@ class TestShellyDirectAdapter:
         assert second_call_count == first_call_count + 1
 
     @pytest.mark.asyncio
-    async def test_close(self, mock_httpx_client):
+    async def test_close_leaves_shared_client_open(self, mock_httpx_client):
         from device_control.shelly_adapter import ShellyDirectAdapter
 
-        # Need to trigger client creation first
         mock_httpx_client.get.return_value = self._make_response(200, {"output": True})
 
         adapter = ShellyDirectAdapter()
-        await adapter.get_state("shelly://192.168.1.50/0")  # Creates client
+        await adapter.get_state("shelly://192.168.1.50/0")
         await adapter.close()
 
-        mock_httpx_client.aclose.assert_called_once()
+        # The pooled client is shared and closed at app shutdown instead
+        mock_httpx_client.aclose.assert_not_called()
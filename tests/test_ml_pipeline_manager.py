@@ -61,3 +61,55 @@ class TestMLPipelineManager:
         manager.remove_pipeline("device-1")
 
         assert manager.get_pipeline_count() == 0
+
+
+class TestPredictionCache:
+    """Test cached predictions and reload bookkeeping."""
+
+    def _feed(self, manager, device_id, count, start=0):
+        for i in range(start, start + count):
+            manager.process_reading(
+                device_id, sg=1.050 - 0.001 * i, temp=20.0, rssi=-60, time_hours=float(i)
+            )
+
+    def test_repeated_state_reuses_fit(self, monkeypatch):
+        """Same history, model and FG don't refit."""
+        manager = MLPipelineManager()
+        self._feed(manager, "device-1", 12)
+        fitter = manager.pipelines["device-1"].curve_fitter
+        calls = []
+        real_fit = fitter.fit
+        monkeypatch.setattr(fitter, "fit", lambda **kw: calls.append(kw) or real_fit(**kw))
+
+        first = manager.get_device_state("device-1", expected_fg=1.010)
+        second = manager.get_device_state("device-1", expected_fg=1.010)
+        assert first == second
+        assert len(calls) == 1
+
+        manager.get_device_state("device-1", expected_fg=1.012)
+        assert len(calls) == 2
+
+    def test_new_reading_invalidates_cache(self):
+        """A processed reading bumps the version and forces a refit."""
+        manager = MLPipelineManager()
+        self._feed(manager, "device-1", 12)
+        version = manager.history_version("device-1")
+        manager.get_device_state("device-1")
+
+        self._feed(manager, "device-1", 1, start=12)
+
+        assert manager.history_version("device-1") == version + 1
+        assert manager.get_device_state("device-1")["history_count"] == 13
+
+    def test_reload_skipped_until_history_changes(self):
+        """A finished reload isn't repeated for the same history version."""
+        manager = MLPipelineManager()
+        assert manager.needs_reload("device-1", 1)
+
+        pipeline = manager.get_or_create_pipeline("device-1")
+        manager._reloaded["device-1"] = (1, pipeline.history_version)
+        assert not manager.needs_reload("device-1", 1)
+        assert manager.needs_reload("device-1", 2)
+
+        self._feed(manager, "device-1", 1)
+        assert manager.needs_reload("device-1", 1)